@@ -0,0 +1,74 @@
+"""
+Cost of encoding proxied list payloads: FastAPI's default path vs FastJSONResponse.
+
+Run from the api-gateway directory:
+
+    python benchmarks/json_responses.py
+"""
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+
+from lms_shared.json_response import FastJSONResponse, orjson  # noqa: E402
+
+ROUNDS = 2_000
+
+
+def course(index: int) -> dict:
+    """A course as the course service returns it."""
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"Course {index}",
+        "description": "An introduction to the subject, with exercises. " * 4,
+        "organization_id": str(uuid.uuid4()),
+        "instructor_id": str(uuid.uuid4()),
+        "status": "PUBLISHED",
+        "tags": ["math", "beginner", "online"],
+        "settings": {"hidden": False, "enrollment_limit": 40, "self_paced": True},
+        "created_at": "2026-01-12T09:30:00.000000",
+        "updated_at": "2026-03-02T17:04:12.123456",
+    }
+
+
+def page(size: int) -> dict:
+    return {"courses": [course(i) for i in range(size)], "total_count": 1000, "page": 1, "page_size": size}
+
+
+async def default_path(payload: dict) -> bytes:
+    """What FastAPI does with a returned dict: jsonable_encoder, then json.dumps."""
+    return JSONResponse(await serialize_response(response_content=payload)).body
+
+
+async def fast_path(payload: dict) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+async def per_call(encode, payload: dict) -> float:
+    """Best of five, in microseconds per call."""
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            await encode(payload)
+        best = min(best, time.perf_counter() - started)
+    return best / ROUNDS * 1e6
+
+
+async def main() -> None:
+    print(f"Python {sys.version.split()[0]}, orjson {'installed' if orjson else 'not installed'}")
+    for size in (1, 20, 100):
+        payload = page(size)
+        default = await per_call(default_path, payload)
+        fast = await per_call(fast_path, payload)
+        print(f"{size:4d} courses: default {default:8.1f} us   fast {fast:8.1f} us   {default / fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Gateway throughput and latency with one worker process vs several.
+
+Each worker runs the per-request work the gateway does before forwarding:
+a rate-limit hit in shared memory, a routing table lookup over 1000
+services and encoding a page of courses. There is no upstream call, so
+the numbers show how far the workers scale on CPU alone. Run from the
+api-gateway directory:
+
+    python benchmarks/workers.py --workers 1,4 --clients 64
+
+The load generator runs on the same machine and takes CPU from the
+workers, so only compare runs made with the same ``--clients``; more
+workers than free cores cannot help.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import uvicorn  # noqa: E402
+
+from config.settings import Settings  # noqa: E402
+from domain.entities.service import Service  # noqa: E402
+from domain.services.routing_table import RoutingTable  # noqa: E402
+from infrastructure.lifecycle.drain import DrainCoordinator  # noqa: E402
+from infrastructure.lifecycle.supervisor import WorkerSupervisor  # noqa: E402
+from infrastructure.resilience.rate_limiter import RateLimiter  # noqa: E402
+from infrastructure.shared.state import SharedState  # noqa: E402
+from lms_shared.json_response import dumps  # noqa: E402
+
+HOST = "127.0.0.1"
+PORT = 8765
+REQUEST = f"GET /service-500/courses?page=1 HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode()
+
+SERVICES = [
+    Service(name=f"service-{i}", version="1.0.0", host="localhost", port=8000, health_check_url="/health")
+    for i in range(1000)
+]
+PAGE = {
+    "items": [
+        {"id": str(uuid.uuid4()), "title": f"Course {i}", "status": "PUBLISHED", "tags": ["math", "online"]}
+        for i in range(20)
+    ],
+    "total": 20,
+}
+
+
+def make_app(shared_state: SharedState):
+    rate_limiter = RateLimiter(shared_state.rate_limits, limit=10 ** 9, period=60.0)
+    routing_table = RoutingTable(SERVICES)
+
+    async def app(scope, receive, send):
+        rate_limiter.hit(scope["client"][0])
+        routing_table.match(scope["path"])
+        body = dumps(PAGE)
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def serve(workers: int) -> None:
+    """Run a supervisor with the given number of workers until SIGTERM."""
+    shared_state = SharedState(Settings())
+    config = uvicorn.Config(
+        make_app(shared_state),
+        host=HOST,
+        port=PORT,
+        lifespan="off",
+        access_log=False,
+        log_level="warning",
+    )
+    WorkerSupervisor(config, DrainCoordinator(), 0.0, shared_state, workers).run()
+
+
+def wait_until_listening(timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, PORT), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("The gateway workers did not start")
+
+
+async def connection_loop(deadline: float, latencies) -> None:
+    """Send requests one after another over a keep-alive connection."""
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        writer.write(REQUEST)
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = int(headers.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - started)
+    writer.close()
+
+
+def client(connections: int, deadline: float, results) -> None:
+    """Keep ``connections`` requests in flight until the run ends."""
+    latencies = []
+
+    async def load():
+        await asyncio.gather(*(connection_loop(deadline, latencies) for _ in range(connections)))
+
+    asyncio.run(load())
+    results.put(latencies)
+
+
+def run(workers: int, clients: int, client_processes: int, duration: float) -> None:
+    context = multiprocessing.get_context("fork")
+    server = context.Process(target=serve, args=(workers,))
+    server.start()
+    try:
+        wait_until_listening()
+        # Let every worker start accepting
+        time.sleep(1.0)
+        results = context.Queue()
+        deadline = time.monotonic() + duration
+        loaders = [
+            context.Process(target=client, args=(clients // client_processes, deadline, results))
+            for _ in range(client_processes)
+        ]
+        for loader in loaders:
+            loader.start()
+        latencies = sorted(latency for _ in loaders for latency in results.get())
+        for loader in loaders:
+            loader.join()
+    finally:
+        os.kill(server.pid, signal.SIGTERM)
+        server.join(10)
+
+    print(
+        f"  {workers} worker(s): {len(latencies) / duration:8.0f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:6.2f} ms   "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}", help="Comma-separated worker counts to compare")
+    parser.add_argument("--clients", type=int, default=64, help="Concurrent keep-alive connections")
+    parser.add_argument("--client-processes", type=int, default=2, help="Processes the connections are spread over")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, {os.cpu_count()} cores, {args.clients} connections")
+    for workers in dict.fromkeys(int(count) for count in args.workers.split(",")):
+        run(workers, args.clients, args.client_processes, args.duration)
+
+
+if __name__ == "__main__":
+    main()
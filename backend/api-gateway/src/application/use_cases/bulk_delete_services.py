@@ -0,0 +1,20 @@
+from typing import List
+from uuid import UUID
+
+from domain.entities.bulk_operation import BulkOperationResult
+from domain.services.gateway_service import GatewayService
+
+
+class BulkDeleteServicesUseCase:
+    """
+    Use case for deleting several services at once.
+    """
+    
+    def __init__(self, gateway_service: GatewayService):
+        self.gateway_service = gateway_service
+    
+    async def execute(self, service_ids: List[UUID]) -> List[BulkOperationResult]:
+        """
+        Execute the use case.
+        """
+        return await self.gateway_service.bulk_delete_services(service_ids)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from typing import Any, Dict, List
+
+from domain.entities.bulk_operation import BulkOperationResult
+from domain.services.gateway_service import GatewayService
+
+
+class BulkRegisterServicesUseCase:
+    """
+    Use case for registering several services at once.
+    """
+    
+    def __init__(self, gateway_service: GatewayService):
+        self.gateway_service = gateway_service
+    
+    async def execute(self, services_data: List[Dict[str, Any]]) -> List[BulkOperationResult]:
+        """
+        Execute the use case.
+        """
+        return await self.gateway_service.bulk_register_services(services_data)
\ No newline at end of file
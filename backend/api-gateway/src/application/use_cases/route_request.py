@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Union
 from uuid import UUID
 
 from domain.entities.request import Request
@@ -21,7 +21,7 @@ class RouteRequestUseCase:
         path: str,
         headers: Dict[str, str],
         query_params: Dict[str, Any],
-        body: Dict[str, Any],
+        body: Union[bytes, Dict[str, Any]],
         tenant_id: UUID = None,
         user_id: UUID = None,
         correlation_id: UUID = None,
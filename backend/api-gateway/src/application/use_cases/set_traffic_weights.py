@@ -0,0 +1,19 @@
+from typing import Dict, List
+
+from domain.entities.service import Service
+from domain.services.gateway_service import GatewayService
+
+
+class SetTrafficWeightsUseCase:
+    """
+    Use case for shifting traffic between versions of a service.
+    """
+    
+    def __init__(self, gateway_service: GatewayService):
+        self.gateway_service = gateway_service
+    
+    async def execute(self, name: str, weights: Dict[str, int]) -> List[Service]:
+        """
+        Execute the use case.
+        """
+        return await self.gateway_service.set_traffic_weights(name, weights)
\ No newline at end of file
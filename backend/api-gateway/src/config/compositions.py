@@ -0,0 +1,17 @@
+# Composition routes served under /api/compose.
+#
+# Each part is fetched through the gateway's own routing. Parts run
+# concurrently unless their path refers to another part's result
+# ({part.field}), in which case they wait for that part only.
+COMPOSITIONS = [
+    {
+        "name": "course_page",
+        "path": "/courses/{course_id}/page",
+        "cache_ttl": 30,
+        "parts": [
+            {"name": "course", "path": "/courses/{course_id}", "timeout": 1.0, "required": True},
+            {"name": "contents", "path": "/courses/{course_id}/contents", "timeout": 1.0},
+            {"name": "instructor", "path": "/users/{course.instructor_id}", "timeout": 0.5},
+        ],
+    },
+]
\ No newline at end of file
@@ -8,9 +8,11 @@ HTTP_403_FORBIDDEN = 403
 HTTP_404_NOT_FOUND = 404
 HTTP_409_CONFLICT = 409
 HTTP_422_UNPROCESSABLE_ENTITY = 422
+HTTP_429_TOO_MANY_REQUESTS = 429
 HTTP_500_INTERNAL_SERVER_ERROR = 500
 HTTP_502_BAD_GATEWAY = 502
 HTTP_503_SERVICE_UNAVAILABLE = 503
+HTTP_504_GATEWAY_TIMEOUT = 504
 
 # Error Messages
 ERROR_INVALID_CREDENTIALS = "Invalid credentials"
@@ -21,6 +23,8 @@ ERROR_CONFLICT = "Resource conflict"
 ERROR_VALIDATION = "Validation error"
 ERROR_INTERNAL = "Internal server error"
 ERROR_SERVICE_UNAVAILABLE = "Service unavailable"
+ERROR_RATE_LIMITED = "Too many requests"
+ERROR_DEADLINE_EXCEEDED = "Request deadline exceeded"
 
 # Headers
 HEADER_AUTHORIZATION = "Authorization"
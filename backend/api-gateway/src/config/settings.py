@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List
 from pydantic import BaseSettings, validator
 from pydantic.networks import AnyHttpUrl
 
@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     
+    # Worker processes (outside development; 0 means one per CPU core)
+    WORKERS: int = 1
+    WORKER_REUSE_PORT: bool = True  # each worker binds its own SO_REUSEPORT socket
+    ROUTING_SNAPSHOT_SIZE: int = 4 * 1024 * 1024  # bytes of shared memory for the routing table
+    
     # CORS settings
     CORS_ORIGINS: List[AnyHttpUrl] = []
     
@@ -23,7 +28,7 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
     
-    # Service URLs
+    # Service URLs (referenced by the route file)
     AUTH_SERVICE_URL: str = "http://auth-service:8001"
     USER_SERVICE_URL: str = "http://user-service:8002"
     COURSE_SERVICE_URL: str = "http://course-service:8003"
@@ -33,6 +38,12 @@ class Settings(BaseSettings):
     BADGE_SERVICE_URL: str = "http://badge-service:8007"
     ANALYTICS_SERVICE_URL: str = "http://analytics-service:8008"
     NOTIFICATION_SERVICE_URL: str = "http://notification-service:8009"
+    COURSE_SERVICE_GRPC_URL: str = "course-service:50051"
+    
+    # Declarative routes, reloaded when the file changes
+    ROUTES_FILE: str = os.path.join(os.path.dirname(__file__), "routes.toml")
+    ROUTES_RELOAD_INTERVAL: float = 2.0  # seconds between checks for changes
+    ROUTE_CACHE_SIZE: int = 10000  # responses of routes with a cache_ttl kept in memory
     
     # JWT settings
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key")
@@ -44,8 +55,114 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     
+    # Upstream connection pool settings
+    UPSTREAM_MAX_CONNECTIONS: int = 200
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    
+    # Request deadlines (clients may ask for less with X-Request-Timeout-Ms)
+    REQUEST_TIMEOUT: float = 30.0  # seconds a request gets by default
+    REQUEST_TIMEOUT_MAX: float = 60.0  # seconds a client may ask for at most
+    DEADLINE_EXEMPT_PREFIXES: List[str] = ["/health", "/metrics", "/api/debug"]
+    
+    # Upstream DNS cache (TTLs are clamped to [MIN_TTL, MAX_TTL])
+    DNS_CACHE_ENABLED: bool = True
+    DNS_CACHE_MIN_TTL: float = 5.0  # seconds
+    DNS_CACHE_MAX_TTL: float = 300.0  # seconds
+    DNS_CACHE_DEFAULT_TTL: float = 30.0  # seconds, when the resolver reports no TTL
+    DNS_CACHE_REFRESH_AHEAD: float = 0.2  # share of the TTL left when refreshing starts
+    DNS_CACHE_MAX_STALE: float = 600.0  # seconds expired addresses are served while lookups fail
+    
+    # Rate limiting (shared by all workers of an instance)
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_REQUESTS: int = 100
+    RATE_LIMIT_PERIOD: float = 60.0  # seconds
+    RATE_LIMIT_SLOTS: int = 65536  # clients tracked at once
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/health", "/metrics"]
+    
+    # Circuit breaker (shared by all workers of an instance)
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT: float = 30.0  # seconds
+    CIRCUIT_BREAKER_SLOTS: int = 1024
+    
+    # Idempotency settings
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_METHODS: List[str] = ["POST"]
+    IDEMPOTENCY_TTL: float = 86400.0  # seconds a response is replayed for
+    IDEMPOTENCY_LOCK_TTL: float = 60.0  # seconds a claim survives a crashed replica
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 30.0  # seconds a duplicate waits for the first request
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 65536
+    IDEMPOTENCY_LOCAL_CACHE_SIZE: int = 10000
+    
+    # Composition settings
+    COMPOSITION_CACHE_SIZE: int = 10000  # composed responses kept in memory
+    
+    # Streaming settings
+    STREAM_QUEUE_SIZE: int = 16  # events buffered per connection
+    STREAM_IDLE_TIMEOUT: float = 300.0  # seconds without events before a connection is closed
+    STREAM_HEARTBEAT_INTERVAL: float = 15.0  # seconds
+    STREAM_UPSTREAM_LINGER: float = 5.0  # seconds an unused upstream stream is kept open
+    
+    # Graceful shutdown settings
+    DRAIN_GRACE_PERIOD: float = 10.0  # seconds /health reports draining before requests are rejected
+    DRAIN_DEADLINE: float = 30.0  # seconds in-flight requests get to finish afterwards
+    
+    # Admission control settings
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 512
+    ADMISSION_QUEUE_SIZES: Dict[str, int] = {"critical": 256, "high": 512, "normal": 1024, "low": 256}
+    ADMISSION_WEIGHTS: Dict[str, int] = {"critical": 8, "high": 4, "normal": 2, "low": 1}
+    ADMISSION_TARGET_WAIT: float = 0.1  # seconds
+    ADMISSION_MAX_WAIT: float = 2.0  # seconds
+    ADMISSION_EXEMPT_PATHS: List[str] = ["/health", "/health/live", "/health/ready", "/metrics"]
+    
+    # Readiness checks (run in the background; /health/ready reads the cached result)
+    HEALTH_CHECK_INTERVAL: float = 5.0  # seconds
+    HEALTH_CHECK_TIMEOUT: float = 2.0  # seconds
+    HEALTH_MAX_LOOP_LAG: float = 1.0  # seconds of event loop lag before the worker reports not ready
+    
+    # Event loop lag admission
+    LOOP_LAG_INTERVAL: float = 0.05  # seconds
+    LOOP_LAG_ADMISSION_ENABLED: bool = False
+    LOOP_LAG_THRESHOLD: float = 0.2  # seconds
+    
+    # Priority classification (class names: critical, high, normal, low)
+    PRIORITY_ROUTE_CLASSES: Dict[str, str] = {}
+    PRIORITY_ROLE_CLASSES: Dict[str, str] = {
+        "super_admin": "critical",
+        "organization_admin": "critical",
+        "branch_manager": "high",
+        "teacher": "high",
+        "student": "normal",
+        "parent": "low",
+    }
+    PRIORITY_PLAN_CLASSES: Dict[str, str] = {"enterprise": "high", "standard": "normal", "free": "low"}
+    TENANT_PLANS: Dict[str, str] = {}
+    
+    # Tenant quotas, per plan (rate and burst in requests per second across
+    # workers; concurrency and queue per worker; weight is the fair share)
+    TENANT_QUOTAS_ENABLED: bool = True
+    PLAN_QUOTAS: Dict[str, Dict[str, float]] = {
+        "enterprise": {"max_concurrency": 128, "rate": 500, "burst": 1000, "max_queued": 256, "weight": 4},
+        "standard": {"max_concurrency": 64, "rate": 200, "burst": 400, "max_queued": 128, "weight": 2},
+        "free": {"max_concurrency": 16, "rate": 50, "burst": 100, "max_queued": 32, "weight": 1},
+    }
+    DEFAULT_TENANT_PLAN: str = "standard"
+    TENANT_QUOTA_SLOTS: int = 16384  # tenants tracked at once
+    
+    # On-demand profiling (/api/debug, for PROFILER_ROLES only)
+    PROFILER_ENABLED: bool = False
+    PROFILER_MAX_DURATION: float = 60.0  # seconds
+    PROFILER_ROLES: List[str] = ["super_admin"]
+    
     # Logging settings
     LOG_LEVEL: str = "INFO"
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # share of successful requests logged
+    ACCESS_LOG_SLOW_THRESHOLD: float = 1.0  # seconds; slower requests are always logged
+    ACCESS_LOG_QUEUE_SIZE: int = 10000
+    ACCESS_LOG_BATCH_SIZE: int = 256
+    ACCESS_LOG_FLUSH_INTERVAL: float = 0.5  # seconds
     
     class Config:
         env_file = ".env"
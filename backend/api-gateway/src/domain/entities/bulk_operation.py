@@ -0,0 +1,95 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from domain.entities.registry_change import RegistryChangeType
+from domain.entities.service import Service
+
+
+class BulkOperation:
+    """
+    One item of a bulk registry write.
+    """
+    
+    def __init__(
+        self,
+        change_type: RegistryChangeType,
+        service_id: UUID,
+        service: Optional[Service] = None,
+    ):
+        """
+        Initialize a new BulkOperation instance.
+        
+        Args:
+            change_type: Whether to register, update or delete the service
+            service_id: The ID of the service to change
+            service: The new service state (None for deletions)
+        """
+        self.change_type = change_type
+        self.service_id = service_id
+        self.service = service
+    
+    @classmethod
+    def register(cls, service: Service) -> "BulkOperation":
+        """Create a registration item."""
+        return cls(RegistryChangeType.REGISTERED, service.id, service)
+    
+    @classmethod
+    def update(cls, service: Service) -> "BulkOperation":
+        """Create an update item."""
+        return cls(RegistryChangeType.UPDATED, service.id, service)
+    
+    @classmethod
+    def delete(cls, service_id: UUID) -> "BulkOperation":
+        """Create a deletion item."""
+        return cls(RegistryChangeType.DELETED, service_id)
+
+
+class BulkOperationResult:
+    """
+    Outcome of one item of a bulk registry write.
+    """
+    
+    def __init__(
+        self,
+        index: int,
+        service_id: Optional[UUID],
+        success: bool,
+        revision: Optional[int] = None,
+        service: Optional[Service] = None,
+        error: Optional[str] = None,
+    ):
+        """
+        Initialize a new BulkOperationResult instance.
+        
+        Args:
+            index: Position of the item in the request
+            service_id: The ID of the affected service, if known
+            success: Whether the item was applied
+            revision: The registry revision the item produced
+            service: The service state after the change
+            error: Why the item was not applied
+        """
+        self.index = index
+        self.service_id = service_id
+        self.success = success
+        self.revision = revision
+        self.service = service
+        self.error = error
+    
+    @classmethod
+    def failed(cls, index: int, service_id: Optional[UUID], error: str) -> "BulkOperationResult":
+        """Create a result for an item that was not applied."""
+        return cls(index=index, service_id=service_id, success=False, error=error)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the result to a dictionary.
+        """
+        return {
+            "index": self.index,
+            "service_id": str(self.service_id) if self.service_id else None,
+            "success": self.success,
+            "revision": self.revision,
+            "service": self.service.to_dict() if self.service else None,
+            "error": self.error,
+        }
\ No newline at end of file
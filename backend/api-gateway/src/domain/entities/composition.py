@@ -0,0 +1,144 @@
+import re
+from urllib.parse import quote
+from typing import Any, Dict, List, Optional, Set
+
+# Placeholders in part paths: {param} or {part.field.subfield}
+PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+
+
+class CompositionPart:
+    """
+    One upstream call of a composed response.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        timeout: float = 1.0,
+        required: bool = False,
+    ):
+        """
+        Initialize a new CompositionPart instance.
+        
+        Args:
+            name: Key of the part's result in the composed response
+            path: Upstream path; ``{param}`` placeholders take route
+                parameters and ``{part.field}`` placeholders take a field
+                of another part's result, which makes this part wait for it
+            timeout: Seconds to wait for this part
+            required: Whether the composition fails without this part
+        """
+        self.name = name
+        self.path = path
+        self.timeout = timeout
+        self.required = required
+    
+    @property
+    def depends_on(self) -> Set[str]:
+        """Get the names of the parts this part's path refers to."""
+        return {
+            placeholder.split(".", 1)[0]
+            for placeholder in PLACEHOLDER.findall(self.path)
+            if "." in placeholder
+        }
+    
+    def render_path(self, params: Dict[str, Any], results: Dict[str, Any]) -> Optional[str]:
+        """
+        Fill in the path's placeholders.
+        
+        Returns:
+            The path, or None if a placeholder cannot be resolved
+        """
+        unresolved = False
+        
+        def replace(match: "re.Match") -> str:
+            nonlocal unresolved
+            name, _, field_path = match.group(1).partition(".")
+            value = results.get(name) if field_path else params.get(name)
+            for field in field_path.split(".") if field_path else ():
+                value = value.get(field) if isinstance(value, dict) else None
+            if value is None or value == "":
+                unresolved = True
+                return ""
+            # Values may come from upstream data; never let them add path segments
+            return quote(str(value), safe="")
+        
+        path = PLACEHOLDER.sub(replace, self.path)
+        return None if unresolved else path
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompositionPart":
+        """
+        Create a CompositionPart instance from a dictionary.
+        """
+        return cls(
+            name=data["name"],
+            path=data["path"],
+            timeout=float(data.get("timeout", 1.0)),
+            required=bool(data.get("required", False)),
+        )
+
+
+class CompositionRoute:
+    """
+    A gateway route whose response is assembled from several upstream calls.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        parts: List[CompositionPart],
+        cache_ttl: float = 0,
+    ):
+        """
+        Initialize a new CompositionRoute instance.
+        
+        Args:
+            name: The route name
+            path: The gateway path, with FastAPI-style ``{param}`` segments
+            parts: The upstream calls to make
+            cache_ttl: Seconds a complete composed response may be reused
+                (0 disables caching)
+        
+        Raises:
+            ValueError: If parts refer to unknown parts or to each other in a cycle
+        """
+        self.name = name
+        self.path = path
+        self.parts = parts
+        self.cache_ttl = cache_ttl
+        self._validate()
+    
+    def _validate(self) -> None:
+        names = {part.name for part in self.parts}
+        if len(names) != len(self.parts):
+            raise ValueError(f"Composition {self.name} has duplicate part names")
+        
+        dependencies = {part.name: part.depends_on for part in self.parts}
+        for part_name, depends_on in dependencies.items():
+            unknown = depends_on - names
+            if unknown:
+                raise ValueError(f"Part {part_name} of composition {self.name} refers to unknown parts: {unknown}")
+        
+        # Kahn's algorithm: every part must become resolvable
+        remaining = dict(dependencies)
+        while remaining:
+            ready = [name for name, depends_on in remaining.items() if not depends_on & remaining.keys()]
+            if not ready:
+                raise ValueError(f"Composition {self.name} has a dependency cycle: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompositionRoute":
+        """
+        Create a CompositionRoute instance from a dictionary.
+        """
+        return cls(
+            name=data["name"],
+            path=data["path"],
+            parts=[CompositionPart.from_dict(part) for part in data["parts"]],
+            cache_ttl=float(data.get("cache_ttl", 0)),
+        )
@@ -0,0 +1,84 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# One segment of a field path
+FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Field name -> True for the whole field, or the projection of its fields
+Tree = Dict[str, Union[bool, "Tree"]]
+
+
+class FieldProjection:
+    """
+    A sparse fieldset: the response fields a client asked for with ``fields=``.
+    
+    Paths are dot-separated and start at the top of the response body,
+    e.g. ``courses.id,courses.title,total_count``. Lists are passed
+    through, so a path into a list applies to each of its items. Asking
+    for a field also returns everything inside it.
+    """
+    
+    MAX_PATHS = 100
+    
+    def __init__(self, paths: Iterable[str]):
+        """
+        Initialize a new FieldProjection instance.
+        
+        Args:
+            paths: The field paths to keep
+        
+        Raises:
+            ValueError: If a path is malformed or there are too many
+        """
+        self.paths: List[str] = sorted(set(paths))
+        if not self.paths:
+            raise ValueError("At least one field is required")
+        if len(self.paths) > self.MAX_PATHS:
+            raise ValueError(f"At most {self.MAX_PATHS} fields may be requested")
+        
+        self._tree: Tree = {}
+        for path in self.paths:
+            segments = path.split(".")
+            if not all(FIELD_NAME.match(segment) for segment in segments):
+                raise ValueError(f"Invalid field path: {path!r}")
+            node = self._tree
+            for segment in segments[:-1]:
+                child = node.setdefault(segment, {})
+                if child is True:
+                    break
+                node = child
+            else:
+                node[segments[-1]] = True
+    
+    @classmethod
+    def parse(cls, value: Optional[str]) -> Optional["FieldProjection"]:
+        """
+        Parse a ``fields`` query parameter.
+        
+        Returns:
+            The projection, or None if no fields were given
+        
+        Raises:
+            ValueError: If the parameter is malformed
+        """
+        if value is None or not value.strip():
+            return None
+        return cls(path.strip() for path in value.split(",") if path.strip())
+    
+    def apply(self, value: Any) -> Any:
+        """
+        Keep only the projected fields of a JSON value.
+        """
+        return _prune(value, self._tree)
+
+
+def _prune(value: Any, tree: Tree) -> Any:
+    if isinstance(value, dict):
+        pruned = {}
+        for name, subtree in tree.items():
+            if name in value:
+                pruned[name] = value[name] if subtree is True else _prune(value[name], subtree)
+        return pruned
+    if isinstance(value, list):
+        return [_prune(item, tree) for item in value]
+    return value
@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Any, Callable, Optional, Type
+from uuid import UUID
+
+
+class LazyField:
+    """
+    A slotted entity attribute that is converted to its type on first read.
+    
+    The raw value (the string ``from_dict`` was given, or a cheaper form
+    the entity stored instead) lives in the slot named after the attribute
+    with a leading underscore. Reading the attribute converts it once and
+    keeps the result; ``text`` gives the string form for ``to_dict``,
+    reusing the original string when the value was never read. Malformed
+    values therefore only raise when they are read.
+    """
+    
+    __slots__ = ("slot", "type", "parse", "format")
+    
+    def __init__(self, type: Type, parse: Callable[[Any], Any], format: Callable[[Any], str] = str):
+        """
+        Initialize the field.
+        
+        Args:
+            type: The type values are converted to
+            parse: Converts a raw value to ``type``
+            format: Converts a value of ``type`` to a string
+        """
+        self.type = type
+        self.parse = parse
+        self.format = format
+        self.slot = ""
+    
+    def __set_name__(self, owner: Type, name: str) -> None:
+        self.slot = f"_{name}"
+    
+    def __get__(self, instance: Any, owner: Optional[Type] = None) -> Any:
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if value is None or isinstance(value, self.type):
+            return value
+        value = self.parse(value)
+        setattr(instance, self.slot, value)
+        return value
+    
+    def __set__(self, instance: Any, value: Any) -> None:
+        setattr(instance, self.slot, value)
+    
+    def text(self, instance: Any) -> Optional[str]:
+        """
+        Get the value of the field on an instance as a string, or None.
+        """
+        value = getattr(instance, self.slot)
+        if value is None or isinstance(value, str):
+            return value
+        return self.format(self.__get__(instance))
+
+
+def lazy_uuid() -> LazyField:
+    """
+    A UUID field that may be set from its string form.
+    """
+    return LazyField(UUID, UUID)
+
+
+def lazy_timestamp() -> LazyField:
+    """
+    A UTC timestamp that may be set from ``time.time()`` or an ISO string.
+    """
+    return LazyField(datetime, _parse_timestamp, datetime.isoformat)
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.utcfromtimestamp(value)
\ No newline at end of file
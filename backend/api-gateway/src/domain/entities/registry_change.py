@@ -0,0 +1,81 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from domain.entities.service import Service
+
+
+class RegistryChangeType(str, Enum):
+    """
+    Kind of change recorded in the service registry.
+    """
+    REGISTERED = "registered"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+class RegistryChange:
+    """
+    A single change to the service registry, tagged with the registry
+    revision it produced.
+    """
+    
+    def __init__(
+        self,
+        revision: int,
+        change_type: RegistryChangeType,
+        service_id: UUID,
+        service: Optional[Service] = None,
+        timestamp: Optional[datetime] = None,
+        batch_remaining: int = 0,
+    ):
+        """
+        Initialize a new RegistryChange instance.
+        
+        Args:
+            revision: The registry revision produced by this change
+            change_type: Whether the service was registered, updated or deleted
+            service_id: The ID of the affected service
+            service: The service state after the change (None for deletions)
+            timestamp: When the change was recorded
+            batch_remaining: How many changes of the same bulk operation follow
+                this one; watchers can defer applying until it reaches 0
+        """
+        self.revision = revision
+        self.change_type = change_type
+        self.service_id = service_id
+        self.service = service
+        self.timestamp = timestamp or datetime.utcnow()
+        self.batch_remaining = batch_remaining
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the change to a dictionary.
+        """
+        return {
+            "revision": self.revision,
+            "change_type": self.change_type.value,
+            "service_id": str(self.service_id),
+            "service": self.service.to_dict() if self.service else None,
+            "timestamp": self.timestamp.isoformat(),
+            "batch_remaining": self.batch_remaining,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RegistryChange":
+        """
+        Create a RegistryChange instance from a dictionary.
+        """
+        return cls(
+            revision=int(data["revision"]),
+            change_type=RegistryChangeType(data["change_type"]),
+            service_id=UUID(data["service_id"]),
+            service=Service.from_dict(data["service"]) if data.get("service") else None,
+            timestamp=datetime.fromisoformat(data["timestamp"]) if data.get("timestamp") else None,
+            batch_remaining=int(data.get("batch_remaining", 0)),
+        )
+    
+    def __str__(self) -> str:
+        """Get a string representation of the change."""
+        return f"r{self.revision} {self.change_type.value} {self.service_id}"
@@ -1,13 +1,44 @@
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, Union
 from uuid import UUID
 from datetime import datetime
 
+from domain.entities.lazy_field import lazy_timestamp, lazy_uuid
+
 
 class Request:
     """
     Request entity representing an incoming HTTP request.
+    
+    One is built for every routed request, so it is slotted and puts off
+    conversions until they are needed: the timestamp is kept as
+    ``time.time()`` until it is read, and IDs given as strings by
+    ``from_dict`` are parsed on first read (see ``LazyField``).
+    
+    ``body`` holds the raw bytes of a client request, forwarded as they
+    are with the client's ``Content-Type``, or a dict for requests the
+    gateway builds itself, sent as JSON.
     """
     
+    __slots__ = (
+        "_request_id",
+        "method",
+        "path",
+        "headers",
+        "query_params",
+        "body",
+        "_tenant_id",
+        "_user_id",
+        "_correlation_id",
+        "_timestamp",
+    )
+    
+    request_id = lazy_uuid()
+    tenant_id = lazy_uuid()
+    user_id = lazy_uuid()
+    correlation_id = lazy_uuid()
+    timestamp = lazy_timestamp()
+    
     def __init__(
         self,
         request_id: UUID,
@@ -15,54 +46,57 @@ class Request:
         path: str,
         headers: Dict[str, str],
         query_params: Dict[str, Any],
-        body: Optional[Dict[str, Any]] = None,
+        body: Optional[Union[bytes, Dict[str, Any]]] = None,
         tenant_id: Optional[UUID] = None,
         user_id: Optional[UUID] = None,
         correlation_id: Optional[UUID] = None,
         timestamp: Optional[datetime] = None,
     ):
-        self.request_id = request_id
+        self._request_id = request_id
         self.method = method
         self.path = path
         self.headers = headers
         self.query_params = query_params
         self.body = body or {}
-        self.tenant_id = tenant_id
-        self.user_id = user_id
-        self.correlation_id = correlation_id
-        self.timestamp = timestamp or datetime.utcnow()
+        self._tenant_id = tenant_id
+        self._user_id = user_id
+        self._correlation_id = correlation_id
+        self._timestamp = timestamp or time.time()
     
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the request to a dictionary.
         """
+        cls = type(self)
         return {
-            "request_id": str(self.request_id),
+            "request_id": cls.request_id.text(self),
             "method": self.method,
             "path": self.path,
             "headers": self.headers,
             "query_params": self.query_params,
             "body": self.body,
-            "tenant_id": str(self.tenant_id) if self.tenant_id else None,
-            "user_id": str(self.user_id) if self.user_id else None,
-            "correlation_id": str(self.correlation_id) if self.correlation_id else None,
-            "timestamp": self.timestamp.isoformat(),
+            "tenant_id": cls.tenant_id.text(self),
+            "user_id": cls.user_id.text(self),
+            "correlation_id": cls.correlation_id.text(self),
+            "timestamp": cls.timestamp.text(self),
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Request":
         """
         Create a Request instance from a dictionary.
+        
+        IDs and the timestamp are parsed when they are first read.
         """
         return cls(
-            request_id=UUID(data["request_id"]),
+            request_id=data["request_id"],
             method=data["method"],
             path=data["path"],
             headers=data["headers"],
             query_params=data["query_params"],
             body=data.get("body"),
-            tenant_id=UUID(data["tenant_id"]) if data.get("tenant_id") else None,
-            user_id=UUID(data["user_id"]) if data.get("user_id") else None,
-            correlation_id=UUID(data["correlation_id"]) if data.get("correlation_id") else None,
-            timestamp=datetime.fromisoformat(data["timestamp"]) if data.get("timestamp") else None,
+            tenant_id=data.get("tenant_id") or None,
+            user_id=data.get("user_id") or None,
+            correlation_id=data.get("correlation_id") or None,
+            timestamp=data.get("timestamp"),
         ) 
\ No newline at end of file
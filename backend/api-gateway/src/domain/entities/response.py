@@ -1,58 +1,109 @@
-from typing import Dict, Any, Optional, List
+import json
+import time
+from typing import Dict, Any, Optional, List, Union
 from uuid import UUID
 from datetime import datetime
 
+from domain.entities.lazy_field import lazy_timestamp, lazy_uuid
+
+
+class _ErrorAttribute:
+    """
+    ``Response.error(...)`` builds an error response, while
+    ``response.error`` is the error details of a response.
+    """
+    
+    def __init__(self, factory: classmethod):
+        self.factory = factory
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.factory.__get__(None, owner)
+        return instance._error
+    
+    def __set__(self, instance, value) -> None:
+        instance._error = value
+
 
 class Response:
     """
     Response entity representing an outgoing HTTP response.
+    
+    Slotted and lazy like ``Request``.
+    
+    ``body`` holds the raw bytes of an upstream response, sent on as they
+    are with the upstream's ``Content-Type``, or a dict for responses the
+    gateway builds itself, sent as JSON.
     """
     
+    __slots__ = ("_request_id", "status_code", "body", "headers", "_error", "metadata", "_timestamp")
+    
+    request_id = lazy_uuid()
+    timestamp = lazy_timestamp()
+    
     def __init__(
         self,
         request_id: UUID,
         status_code: int,
-        body: Dict[str, Any],
+        body: Union[bytes, Dict[str, Any]],
         headers: Dict[str, str],
         error: Optional[Dict[str, Any]] = None,
         metadata: Optional[Dict[str, Any]] = None,
         timestamp: Optional[datetime] = None,
     ):
-        self.request_id = request_id
+        self._request_id = request_id
         self.status_code = status_code
         self.body = body
         self.headers = headers
-        self.error = error
+        self._error = error
         self.metadata = metadata or {}
-        self.timestamp = timestamp or datetime.utcnow()
+        self._timestamp = timestamp or time.time()
+    
+    def json(self) -> Any:
+        """
+        Get the body as parsed JSON.
+        
+        A raw upstream body is parsed on the first call, for the features
+        that need its fields (projection, composition), and replaced by
+        the result.
+        
+        Raises:
+            ValueError: If the body is not JSON
+        """
+        if isinstance(self.body, (bytes, bytearray)):
+            self.body = json.loads(self.body)
+        return self.body
     
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the response to a dictionary.
         """
+        cls = type(self)
         return {
-            "request_id": str(self.request_id),
+            "request_id": cls.request_id.text(self),
             "status_code": self.status_code,
             "body": self.body,
             "headers": self.headers,
-            "error": self.error,
+            "error": self._error,
             "metadata": self.metadata,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": cls.timestamp.text(self),
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Response":
         """
         Create a Response instance from a dictionary.
+        
+        The request ID and the timestamp are parsed when they are first read.
         """
         return cls(
-            request_id=UUID(data["request_id"]),
+            request_id=data["request_id"],
             status_code=data["status_code"],
             body=data["body"],
             headers=data["headers"],
             error=data.get("error"),
             metadata=data.get("metadata"),
-            timestamp=datetime.fromisoformat(data["timestamp"]) if data.get("timestamp") else None,
+            timestamp=data.get("timestamp"),
         )
     
     @classmethod
@@ -82,6 +133,7 @@ class Response:
             metadata=metadata,
         )
     
+    @_ErrorAttribute
     @classmethod
     def error(
         cls,
@@ -0,0 +1,191 @@
+import hashlib
+import json
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+from urllib.parse import urlsplit
+from uuid import NAMESPACE_URL, uuid5
+
+from domain.entities.request import Request
+from domain.entities.service import Service
+
+# Methods that may be sent again without changing the outcome
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Headers that identify the caller, so cached responses are never shared between callers
+CALLER_HEADERS = ("authorization", "x-tenant-id", "x-user-id")
+
+
+class RetryPolicy:
+    """
+    How a route retries failed upstream calls.
+    """
+    
+    def __init__(
+        self,
+        attempts: int = 1,
+        backoff: float = 0.05,
+        statuses: Iterable[int] = (502, 503, 504),
+        methods: Iterable[str] = IDEMPOTENT_METHODS,
+    ):
+        """
+        Initialize a new RetryPolicy instance.
+        
+        Args:
+            attempts: Calls made at most, including the first
+            backoff: Seconds to wait before the first retry; doubled for each further retry
+            statuses: Upstream statuses that are retried
+            methods: Methods that are retried; never retry non-idempotent ones
+        
+        Raises:
+            ValueError: If attempts or backoff are out of range
+        """
+        if attempts < 1:
+            raise ValueError("Retry attempts must be at least 1")
+        if backoff < 0:
+            raise ValueError("Retry backoff must not be negative")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.statuses: FrozenSet[int] = frozenset(statuses)
+        self.methods: FrozenSet[str] = frozenset(method.upper() for method in methods)
+    
+    def should_retry(self, method: str, status_code: int, attempt: int) -> bool:
+        """
+        Check whether a call that got ``status_code`` on attempt ``attempt`` (from 1) is retried.
+        """
+        return attempt < self.attempts and status_code in self.statuses and method.upper() in self.methods
+    
+    def delay(self, attempt: int) -> float:
+        """
+        Get the seconds to wait after attempt ``attempt`` (from 1) failed.
+        """
+        return self.backoff * 2 ** (attempt - 1)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RetryPolicy":
+        """
+        Create a RetryPolicy instance from a dictionary.
+        """
+        return cls(
+            attempts=int(data.get("attempts", 1)),
+            backoff=float(data.get("backoff", 0.05)),
+            statuses=[int(status) for status in data.get("statuses", (502, 503, 504))],
+            methods=data.get("methods", IDEMPOTENT_METHODS),
+        )
+
+
+class RouteRule:
+    """
+    A declared gateway route: a path prefix sent to a fixed upstream with its own policies.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        prefix: str,
+        upstream: str,
+        timeout: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None,
+        cache_ttl: float = 0,
+        projection: bool = False,
+    ):
+        """
+        Initialize a new RouteRule instance.
+        
+        Args:
+            name: The route name
+            prefix: Path prefix the route matches, on segment boundaries
+            upstream: Base URL of the upstream, e.g. ``http://auth-service:8001``;
+                request paths are appended unchanged
+            timeout: Seconds to wait for an upstream response; the client
+                default if None
+            retry: Retry policy; no retries if None
+            cache_ttl: Seconds a successful GET response may be reused
+                for the same caller (0 disables caching)
+            projection: Whether the upstream applies ``fields=`` itself;
+                otherwise the gateway prunes the response
+        
+        Raises:
+            ValueError: If a field is invalid
+        """
+        if not name:
+            raise ValueError("Route name must not be empty")
+        if not prefix.startswith("/"):
+            raise ValueError(f"Route {name}: prefix must start with '/'")
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"Route {name}: timeout must be positive")
+        if cache_ttl < 0:
+            raise ValueError(f"Route {name}: cache_ttl must not be negative")
+        
+        self.name = name
+        self.prefix = "/" + prefix.strip("/")
+        self.upstream = upstream
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.cache_ttl = cache_ttl
+        self.projection = projection
+        self.service = self._upstream_service(name, self.prefix, upstream)
+    
+    @staticmethod
+    def _upstream_service(name: str, prefix: str, upstream: str) -> Service:
+        """
+        Describe the upstream as a service.
+        
+        The ID is derived from the route and URL, so per-service state such
+        as circuit breakers carries over when the route file is reloaded.
+        """
+        parts = urlsplit(upstream)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Route {name}: upstream must be an http:// URL, got {upstream!r}")
+        if parts.path.strip("/") or parts.query:
+            raise ValueError(f"Route {name}: upstream must not have a path or query")
+        try:
+            port = parts.port or 80
+        except ValueError as e:
+            raise ValueError(f"Route {name}: {e}") from e
+        
+        return Service(
+            id=uuid5(NAMESPACE_URL, f"route:{name}:{upstream}"),
+            name=name,
+            version="static",
+            host=parts.hostname,
+            port=port,
+            health_check_url="/health",
+            metadata={"route_prefix": prefix, "static": True},
+        )
+    
+    def cache_key(self, request: Request) -> Optional[str]:
+        """
+        Key a request's response by route, path, query and caller.
+        
+        Returns:
+            The key, or None if the request's response is not cached
+        """
+        if not self.cache_ttl or request.method.upper() != "GET":
+            return None
+        caller = json.dumps(sorted(
+            (name.lower(), value) for name, value in request.headers.items() if name.lower() in CALLER_HEADERS
+        ))
+        query = json.dumps(sorted(request.query_params.items()), default=str)
+        digest = hashlib.sha256(f"{query}:{caller}".encode()).hexdigest()[:32]
+        return f"route:{self.name}:{request.path}:{digest}"
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], defaults: Optional[Dict[str, Any]] = None) -> "RouteRule":
+        """
+        Create a RouteRule instance from a dictionary.
+        
+        Args:
+            data: The route's fields
+            defaults: Fields used when the route does not set them;
+                ``retry`` tables are merged key by key
+        """
+        defaults = defaults or {}
+        fields = {**defaults, **data}
+        timeout = fields.get("timeout")
+        return cls(
+            name=str(fields["name"]),
+            prefix=str(fields["prefix"]),
+            upstream=str(fields["upstream"]),
+            timeout=float(timeout) if timeout is not None else None,
+            retry=RetryPolicy.from_dict({**defaults.get("retry", {}), **data.get("retry", {})}),
+            cache_ttl=float(fields.get("cache_ttl", 0)),
+            projection=bool(fields.get("projection", False)),
+        )
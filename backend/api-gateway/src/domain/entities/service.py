@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from uuid import UUID, uuid4
 
 
@@ -47,6 +47,23 @@ class Service:
         self.created_at = created_at or datetime.utcnow()
         self.updated_at = updated_at or datetime.utcnow()
     
+    @property
+    def traffic_weight(self) -> Optional[int]:
+        """Get this version's share of traffic, if a split is configured."""
+        weight = self.metadata.get("traffic_weight")
+        return int(weight) if weight is not None else None
+    
+    @staticmethod
+    def version_key(version: str) -> Tuple:
+        """
+        Sort key for version strings: numeric parts compare numerically,
+        so "1.10.0" sorts after "1.9.0".
+        """
+        return tuple(
+            (0, int(part), "") if part.isdigit() else (1, 0, part)
+            for part in version.replace("-", ".").split(".")
+        )
+    
     @property
     def url(self) -> str:
         """Get the full URL of the service."""
@@ -57,4 +57,18 @@ class ServiceDeletionError(RepositoryError):
     Exception raised when service deletion fails.
     """
     def __init__(self, service_id: str, reason: str):
-        super().__init__(f"Failed to delete service {service_id}: {reason}") 
\ No newline at end of file
+        super().__init__(f"Failed to delete service {service_id}: {reason}") 
+
+
+class RegistryRevisionExpiredError(RepositoryError):
+    """
+    Exception raised when a watcher asks for changes that are no longer retained.
+    The watcher has to resynchronise from a full listing.
+    """
+    def __init__(self, revision: int, oldest_revision: int):
+        super().__init__(
+            f"Registry changes after revision {revision} are no longer retained "
+            f"(oldest retained revision: {oldest_revision})"
+        )
+        self.revision = revision
+        self.oldest_revision = oldest_revision
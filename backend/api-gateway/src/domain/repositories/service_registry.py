@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
+from ..entities.bulk_operation import BulkOperation, BulkOperationResult
+from ..entities.registry_change import RegistryChange
 from ..entities.service import Service
 
 
@@ -12,7 +14,7 @@ class ServiceRegistryRepository(ABC):
     """
     
     @abstractmethod
-    def register(self, service: Service) -> Service:
+    async def register(self, service: Service) -> Service:
         """
         Register a new service.
         
@@ -28,36 +30,40 @@ class ServiceRegistryRepository(ABC):
         pass
     
     @abstractmethod
-    def update(self, service: Service) -> Service:
+    async def update(self, service_id: UUID, service: Service) -> Optional[Service]:
         """
         Update an existing service.
         
         Args:
-            service: The service to update
+            service_id: The ID of the service to update
+            service: The updated service data
             
         Returns:
-            The updated service
+            The updated service if found, None otherwise
             
         Raises:
-            RepositoryError: If update fails or service doesn't exist
+            RepositoryError: If update fails
         """
         pass
     
     @abstractmethod
-    def delete(self, service_id: UUID) -> None:
+    async def delete(self, service_id: UUID) -> bool:
         """
         Delete a service.
         
         Args:
             service_id: The ID of the service to delete
             
+        Returns:
+            True if the service was deleted, False if it did not exist
+            
         Raises:
-            RepositoryError: If deletion fails or service doesn't exist
+            RepositoryError: If deletion fails
         """
         pass
     
     @abstractmethod
-    def get(self, service_id: UUID) -> Optional[Service]:
+    async def get(self, service_id: UUID) -> Optional[Service]:
         """
         Get a service by ID.
         
@@ -73,7 +79,7 @@ class ServiceRegistryRepository(ABC):
         pass
     
     @abstractmethod
-    def get_by_name(self, name: str) -> Optional[Service]:
+    async def get_by_name(self, name: str) -> Optional[Service]:
         """
         Get a service by name.
         
@@ -89,7 +95,7 @@ class ServiceRegistryRepository(ABC):
         pass
     
     @abstractmethod
-    def list(self) -> List[Service]:
+    async def list(self) -> List[Service]:
         """
         List all registered services.
         
@@ -101,22 +107,6 @@ class ServiceRegistryRepository(ABC):
         """
         pass
     
-    @abstractmethod
-    def check_health(self, service_id: UUID) -> bool:
-        """
-        Check if a service is healthy.
-        
-        Args:
-            service_id: The ID of the service to check
-            
-        Returns:
-            True if the service is healthy, False otherwise
-            
-        Raises:
-            RepositoryError: If health check fails or service doesn't exist
-        """
-        pass
-
     @abstractmethod
     async def get_service_for_path(self, path: str) -> Optional[Service]:
         """
@@ -136,4 +126,63 @@ class ServiceRegistryRepository(ABC):
         """
         Update the health status of a service.
         """
-        pass 
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def bulk_apply(self, operations: List[BulkOperation]) -> List[BulkOperationResult]:
+        """
+        Apply a batch of register, update and delete operations.
+        
+        Items that cannot be applied (e.g. updating an unknown service) are
+        reported as failed; all other items are written in one transaction
+        and recorded as one batch of consecutive registry changes.
+        
+        Args:
+            operations: The operations to apply, in order
+            
+        Returns:
+            One result per operation, in the same order
+            
+        Raises:
+            RepositoryError: If the batch could not be written
+        """
+        pass
+    
+    @abstractmethod
+    async def get_revision(self) -> int:
+        """
+        Get the current registry revision.
+        
+        Every register, update and delete increments the revision by one.
+        
+        Returns:
+            The revision of the most recent change, 0 if nothing has changed yet
+            
+        Raises:
+            RepositoryError: If retrieval fails
+        """
+        pass
+    
+    @abstractmethod
+    def watch(
+        self,
+        since_revision: int,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[RegistryChange]:
+        """
+        Stream registry changes made after a given revision, in revision order.
+        
+        Args:
+            since_revision: The last revision the caller has already applied
+            timeout: Stop after this many seconds without a new change;
+                wait indefinitely when None
+            
+        Returns:
+            An async iterator of registry changes
+            
+        Raises:
+            RegistryRevisionExpiredError: If changes after since_revision are no
+                longer retained and the caller must resynchronise from list()
+            RepositoryError: If reading the change log fails
+        """
+        pass
@@ -1,10 +1,23 @@
+import asyncio
+import copy
+import logging
+import time
 from typing import Dict, Any, Optional, List
 from uuid import UUID
 
+from domain.entities.bulk_operation import BulkOperation, BulkOperationResult
+from domain.entities.field_projection import FieldProjection
 from domain.entities.request import Request
 from domain.entities.response import Response
 from domain.entities.service import Service
+from domain.repositories.errors import RegistryRevisionExpiredError
 from domain.repositories.service_registry import ServiceRegistryRepository
+from lms_shared.deadline import deadline_expired, time_remaining
+from domain.services.route_rules import RouteRules
+from domain.services.routing_table import RoutingTable
+from domain.services.traffic_splitter import TrafficSplitter
+
+logger = logging.getLogger(__name__)
 
 
 class GatewayService:
@@ -12,16 +25,148 @@ class GatewayService:
     Domain service for the API Gateway.
     """
     
-    def __init__(self, service_registry: ServiceRegistryRepository):
+    # Upstream statuses that count as failures for the circuit breaker
+    CIRCUIT_FAILURE_STATUSES = (502, 503, 504)
+    
+    def __init__(
+        self,
+        service_registry: ServiceRegistryRepository,
+        metrics=None,
+        upstream_client=None,
+        routing_snapshot=None,
+        circuit_breaker=None,
+        response_cache=None,
+    ):
+        """
+        Initialize the gateway service.
+        
+        Args:
+            service_registry: The service registry
+            metrics: Metrics registry for upstream request metrics
+            upstream_client: Client that forwards requests; without one
+                requests get a mock response
+            routing_snapshot: Shared snapshot that publishes the routing
+                table to the other worker processes
+            circuit_breaker: Breaker that stops traffic to failing upstreams
+            response_cache: Cache for responses of routes with a ``cache_ttl``
+        """
         self.service_registry = service_registry
+        self.routing_table = RoutingTable()
+        self.traffic_splitter = TrafficSplitter()
+        self.metrics = metrics
+        self.upstream_client = upstream_client
+        self.routing_snapshot = routing_snapshot
+        self.circuit_breaker = circuit_breaker
+        self.response_cache = response_cache
+        self.route_rules = RouteRules()
+    
+    def set_route_rules(self, route_rules: RouteRules) -> None:
+        """
+        Swap in newly declared routes.
+        
+        Requests already past route matching finish with the rule they
+        matched; upstream connections and cached responses are kept.
+        """
+        self.route_rules = route_rules
+    
+    async def load_routing_table(self) -> RoutingTable:
+        """
+        Rebuild the routing table from a full registry listing.
+        """
+        # Read the revision first: changes racing with the listing are
+        # replayed by the watcher and skipped if already included.
+        revision = await self.service_registry.get_revision()
+        services = await self.service_registry.list()
+        self._set_routing_table(RoutingTable(services, revision))
+        return self.routing_table
+    
+    def _set_routing_table(self, routing_table: RoutingTable) -> None:
+        """
+        Swap in a new routing table and publish it to the other workers.
+        """
+        self.routing_table = routing_table
+        if self.routing_snapshot is not None:
+            try:
+                self.routing_snapshot.publish(routing_table)
+            except ValueError as e:
+                logger.error(f"Could not publish routing table revision {routing_table.revision}: {e}")
+    
+    def _sync_routing_table(self) -> None:
+        """
+        Pick up a newer routing table published by the leader worker.
+        """
+        if self.routing_snapshot is None:
+            return
+        routing_table = self.routing_snapshot.read_if_changed()
+        if routing_table is not None and routing_table.revision > self.routing_table.revision:
+            self.routing_table = routing_table
+    
+    async def follow_registry(self, retry_interval: float = 1.0) -> None:
+        """
+        Load the routing table and keep it in sync until cancelled.
+        
+        Registry errors are logged and retried with a full reload.
+        """
+        while True:
+            try:
+                await self.load_routing_table()
+                await self.watch_registry()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Registry sync failed, retrying in {retry_interval}s: {e}")
+                await asyncio.sleep(retry_interval)
+    
+    async def watch_registry(self, timeout: Optional[float] = None) -> None:
+        """
+        Keep the routing table in sync by applying registry changes as they arrive.
+        
+        Changes written by one bulk operation are buffered until the last of
+        the batch arrives, so the table is recompiled once per batch. Falls
+        back to a full reload only when the registry no longer retains the
+        changes after the table's revision.
+        """
+        while True:
+            batch = []
+            try:
+                async for change in self.service_registry.watch(self.routing_table.revision, timeout):
+                    batch.append(change)
+                    if change.batch_remaining == 0:
+                        self._set_routing_table(self.routing_table.apply(batch))
+                        batch = []
+                return
+            except RegistryRevisionExpiredError as e:
+                logger.warning(f"Routing table fell behind the registry, reloading: {e}")
+                await self.load_routing_table()
     
     async def route_request(self, request: Request) -> Response:
         """
         Route a request to the appropriate service.
+        
+        Registered services take precedence over declared routes. A
+        matching declared route applies its timeout, retry and cache
+        policies either way.
+        
+        A ``fields`` query parameter selects the response fields to return.
+        It is passed on to upstreams whose route declares ``projection``;
+        for the others it is removed and the gateway prunes the response.
         """
-        # Get the service for the request path
-        service = await self.service_registry.get_service_for_path(request.path)
+        rule = self.route_rules.match(request.path)
+        try:
+            projection = FieldProjection.parse(request.query_params.get("fields"))
+        except ValueError as e:
+            return Response.error(
+                request_id=request.request_id,
+                status_code=400,
+                message=f"Invalid fields parameter: {e}",
+            )
+        if projection is not None and (rule is None or not rule.projection):
+            request = copy.copy(request)
+            request.query_params = {name: value for name, value in request.query_params.items() if name != "fields"}
+        else:
+            projection = None
         
+        service = await self.select_service(request)
         if not service:
             return Response.error(
                 request_id=request.request_id,
@@ -29,68 +174,248 @@ class GatewayService:
                 message=f"No service found for path: {request.path}",
             )
         
-        # Check service health
-        health = await self.service_registry.get_service_health(service.service_id)
+        # Check service health; declared upstreams are not in the registry
+        if not service.metadata.get("static"):
+            health = await self.service_registry.get_service_health(service.id)
+            
+            if not health.get("healthy", False):
+                return Response.error(
+                    request_id=request.request_id,
+                    status_code=503,
+                    message=f"Service {service.name} is unhealthy",
+                )
+        
+        # Keyed without the gateway-applied fields, so every projection shares the entry
+        cache_key = rule.cache_key(request) if rule is not None and self.response_cache is not None else None
+        cached = self.response_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            body, headers = cached
+            response = Response(request.request_id, 200, body, headers, metadata={"cache": "hit"})
+        else:
+            attempt = 1
+            while True:
+                response = await self._call(service, request, rule.timeout if rule is not None else None)
+                if rule is None or not rule.retry.should_retry(request.method, response.status_code, attempt):
+                    break
+                delay = rule.retry.delay(attempt)
+                left = time_remaining()
+                if left is not None and left <= delay:
+                    # No time left for another attempt
+                    break
+                await asyncio.sleep(delay)
+                attempt += 1
+            
+            if cache_key and response.status_code == 200:
+                self.response_cache.set(cache_key, (response.body, response.headers), rule.cache_ttl)
         
-        if not health.get("healthy", False):
+        if projection is not None and response.status_code < 400:
+            try:
+                response.body = projection.apply(response.json())
+            except ValueError:
+                # Only JSON bodies have fields to select
+                pass
+        return response
+    
+    async def _call(self, service: Service, request: Request, timeout: Optional[float]) -> Response:
+        """
+        Make one upstream call through the circuit breaker.
+        """
+        breaker_key = str(service.id)
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow(breaker_key):
             return Response.error(
                 request_id=request.request_id,
                 status_code=503,
-                message=f"Service {service.name} is unhealthy",
+                message=f"Service {service.name} is temporarily unavailable",
             )
         
-        # TODO: Implement actual request forwarding logic
-        # This would involve making an HTTP request to the service
-        # and handling the response
+        started = time.perf_counter()
+        
+        if self.upstream_client is not None:
+            response = await self.upstream_client.forward(service, request, timeout)
+            self._observe_upstream(service, response.status_code, time.perf_counter() - started)
+            if self.circuit_breaker is not None:
+                if response.status_code not in self.CIRCUIT_FAILURE_STATUSES:
+                    self.circuit_breaker.record_success(breaker_key)
+                elif not deadline_expired():
+                    # Running out of the caller's budget says nothing about the service
+                    self.circuit_breaker.record_failure(breaker_key)
+            return response
         
-        # For now, return a mock response
-        return Response.success(
+        # Without an upstream client, return a mock response
+        response = Response.success(
             request_id=request.request_id,
             data={
                 "service": service.name,
+                "version": service.version,
                 "path": request.path,
                 "method": request.method,
             },
             message=f"Request routed to {service.name}",
         )
+        
+        self._observe_upstream(service, response.status_code, time.perf_counter() - started)
+        return response
+    
+    async def select_service(self, request: Request) -> Optional[Service]:
+        """
+        Get the service instance for the request path, picking a version by traffic weight.
+        """
+        self._sync_routing_table()
+        services = self.routing_table.match(request.path)
+        if services:
+            return self.traffic_splitter.select(services, self._sticky_key(request))
+        rule = self.route_rules.match(request.path)
+        if rule is not None:
+            return rule.service
+        return await self.service_registry.get_service_for_path(request.path)
+    
+    def upstream_health(self) -> Dict[str, bool]:
+        """
+        Get whether each upstream service has an active instance whose
+        circuit is closed.
+        
+        Only in-memory state is read: the routing table, the declared
+        routes and the shared circuit breaker.
+        """
+        self._sync_routing_table()
+        available: Dict[str, bool] = {}
+        for service in self.routing_table.services + [rule.service for rule in self.route_rules.rules]:
+            if not service.is_active:
+                continue
+            closed = self.circuit_breaker is None or not self.circuit_breaker.is_open(str(service.id))
+            available[service.name] = available.get(service.name, False) or closed
+        return available
+    
+    @staticmethod
+    def _sticky_key(request: Request) -> Optional[str]:
+        """
+        Get the key that pins a request to a service version: the user, else the tenant.
+        """
+        if request.user_id:
+            return f"user:{request.user_id}"
+        if request.tenant_id:
+            return f"tenant:{request.tenant_id}"
+        return None
+    
+    def _observe_upstream(self, service: Service, status_code: int, elapsed: float) -> None:
+        """
+        Record per-version request counts and latency so canaries can be compared.
+        """
+        if self.metrics is None:
+            return
+        
+        self.metrics.counter(
+            "gateway_upstream_requests_total",
+            "Requests routed to each service version",
+            ("service", "version", "status"),
+        ).inc(service=service.name, version=service.version, status=str(status_code))
+        self.metrics.histogram(
+            "gateway_upstream_latency_seconds",
+            "Upstream latency per service version",
+            ("service", "version"),
+        ).observe(elapsed, service=service.name, version=service.version)
+    
+    async def set_traffic_weights(self, name: str, weights: Dict[str, int]) -> List[Service]:
+        """
+        Set the share of traffic each version of a service receives.
+        
+        Versions missing from weights get 0. The new weights reach every
+        gateway replica through the registry watch.
+        """
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Traffic weights must not be negative")
+        
+        operations = []
+        for service in await self.service_registry.list():
+            if service.name != name:
+                continue
+            
+            data = service.to_dict()
+            data["metadata"] = {**service.metadata, "traffic_weight": int(weights.get(service.version, 0))}
+            operations.append(BulkOperation.update(Service.from_dict(data)))
+        
+        # One batch, so replicas never route on a half-applied split
+        results = await self.service_registry.bulk_apply(operations)
+        return [result.service for result in results if result.success]
+    
+    async def bulk_register_services(self, services_data: List[Dict[str, Any]]) -> List[BulkOperationResult]:
+        """
+        Register several services in one registry transaction.
+        """
+        return await self._bulk_apply(services_data, BulkOperation.register)
+    
+    async def bulk_update_services(self, services_data: List[Dict[str, Any]]) -> List[BulkOperationResult]:
+        """
+        Update several services in one registry transaction.
+        """
+        return await self._bulk_apply(services_data, BulkOperation.update)
+    
+    async def bulk_delete_services(self, service_ids: List[UUID]) -> List[BulkOperationResult]:
+        """
+        Delete several services in one registry transaction.
+        """
+        operations = [BulkOperation.delete(service_id) for service_id in service_ids]
+        return await self.service_registry.bulk_apply(operations)
+    
+    async def _bulk_apply(self, services_data: List[Dict[str, Any]], make_operation) -> List[BulkOperationResult]:
+        """
+        Build bulk operations from service data and apply the valid ones.
+        
+        Items that cannot be parsed are reported as failed without
+        aborting the rest of the batch.
+        """
+        results: List[Optional[BulkOperationResult]] = [None] * len(services_data)
+        operations = []
+        indexes = []
+        for index, service_data in enumerate(services_data):
+            try:
+                operations.append(make_operation(Service.from_dict(service_data)))
+                indexes.append(index)
+            except (KeyError, TypeError, ValueError) as e:
+                results[index] = BulkOperationResult.failed(index, None, f"Invalid service data: {e}")
+        
+        for index, result in zip(indexes, await self.service_registry.bulk_apply(operations)):
+            result.index = index
+            results[index] = result
+        return results
     
     async def register_service(self, service_data: Dict[str, Any]) -> Service:
         """
         Register a new service.
         """
         service = Service.from_dict(service_data)
-        return await self.service_registry.register_service(service)
+        return await self.service_registry.register(service)
     
-    async def update_service(self, service_id: UUID, service_data: Dict[str, Any]) -> Service:
+    async def update_service(self, service_id: UUID, service_data: Dict[str, Any]) -> Optional[Service]:
         """
         Update an existing service.
         """
         service = Service.from_dict(service_data)
-        return await self.service_registry.update_service(service)
+        return await self.service_registry.update(service_id, service)
     
     async def delete_service(self, service_id: UUID) -> bool:
         """
         Delete a service.
         """
-        return await self.service_registry.delete_service(service_id)
+        return await self.service_registry.delete(service_id)
     
     async def get_service(self, service_id: UUID) -> Optional[Service]:
         """
         Get a service by ID.
         """
-        return await self.service_registry.get_service(service_id)
+        return await self.service_registry.get(service_id)
     
     async def get_service_by_name(self, name: str) -> Optional[Service]:
         """
         Get a service by name.
         """
-        return await self.service_registry.get_service_by_name(name)
+        return await self.service_registry.get_by_name(name)
     
     async def list_services(self) -> List[Service]:
         """
         List all services.
         """
-        return await self.service_registry.list_services()
+        return await self.service_registry.list()
     
     async def check_service_health(self, service_id: UUID) -> Dict[str, Any]:
         """
@@ -0,0 +1,96 @@
+from enum import IntEnum
+from typing import Dict, Iterable, Optional
+
+
+class PriorityClass(IntEnum):
+    """
+    Request priority classes, most important first.
+    """
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
+    
+    @classmethod
+    def parse(cls, value: str) -> "PriorityClass":
+        """Get a class from its (case-insensitive) name."""
+        return cls[value.upper()]
+
+
+class PriorityClassifier:
+    """
+    Assigns a priority class to a request from its route, the caller's
+    role claim and the tenant's plan.
+    
+    A configured route rule is authoritative (so e.g. exports can be
+    pinned to LOW whoever calls them); otherwise the request gets the
+    most important class granted by its roles or its tenant's plan.
+    """
+    
+    def __init__(
+        self,
+        route_classes: Optional[Dict[str, str]] = None,
+        role_classes: Optional[Dict[str, str]] = None,
+        plan_classes: Optional[Dict[str, str]] = None,
+        tenant_plans: Optional[Dict[str, str]] = None,
+        default_plan: Optional[str] = None,
+        default_class: PriorityClass = PriorityClass.NORMAL,
+    ):
+        """
+        Initialize the classifier.
+        
+        Args:
+            route_classes: Path prefix -> class name
+            role_classes: Role -> class name
+            plan_classes: Tenant plan -> class name
+            tenant_plans: Tenant ID -> plan
+            default_plan: Plan of anonymous callers and unlisted tenants
+            default_class: Class for requests no rule applies to
+        """
+        self.route_classes = {
+            "/" + prefix.strip("/"): PriorityClass.parse(name)
+            for prefix, name in (route_classes or {}).items()
+        }
+        self.role_classes = {role: PriorityClass.parse(name) for role, name in (role_classes or {}).items()}
+        self.plan_classes = {plan: PriorityClass.parse(name) for plan, name in (plan_classes or {}).items()}
+        self.tenant_plans = dict(tenant_plans or {})
+        self.default_plan = default_plan
+        self.default_class = default_class
+    
+    def classify(
+        self,
+        path: str,
+        roles: Iterable[str] = (),
+        tenant_id: Optional[str] = None,
+    ) -> PriorityClass:
+        """
+        Get the priority class of a request.
+        
+        Args:
+            path: The request path
+            roles: Roles from the caller's verified token
+            tenant_id: The organization in the caller's verified token
+        
+        Returns:
+            The request's priority class
+        """
+        route_class = self._route_class(path)
+        if route_class is not None:
+            return route_class
+        
+        candidates = [self.role_classes[role] for role in roles if role in self.role_classes]
+        plan = self.tenant_plans.get(tenant_id, self.default_plan) if tenant_id else self.default_plan
+        if plan in self.plan_classes:
+            candidates.append(self.plan_classes[plan])
+        return min(candidates, default=self.default_class)
+    
+    def _route_class(self, path: str) -> Optional[PriorityClass]:
+        """Get the class of the longest configured route prefix matching a path."""
+        if not self.route_classes:
+            return None
+        segments = path.split("?", 1)[0].strip("/").split("/")
+        for length in range(len(segments), 0, -1):
+            route_class = self.route_classes.get("/" + "/".join(segments[:length]))
+            if route_class is not None:
+                return route_class
+        return None
@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import json
+import uuid
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from domain.entities.composition import CompositionPart, CompositionRoute
+from domain.entities.request import Request
+from domain.entities.response import Response
+from domain.entities.route_rule import CALLER_HEADERS
+from domain.services.gateway_service import GatewayService
+
+# Client headers passed on to every part; they are also part of the cache key
+FORWARDED_HEADERS = ("authorization", "x-tenant-id", "x-user-id", "x-request-id", "x-correlation-id")
+
+
+class ResponseComposer:
+    """
+    Builds one response out of several upstream calls.
+    
+    Parts run concurrently; a part whose path refers to another part's
+    result waits for that part only. Every part has its own timeout. A
+    failed optional part is reported under ``errors`` and the response is
+    marked partial; a failed required part fails the whole response.
+    Complete responses are cached for the route's ``cache_ttl``.
+    """
+    
+    def __init__(self, gateway_service: GatewayService, cache=None, metrics=None):
+        self.gateway_service = gateway_service
+        self.cache = cache
+        self.metrics = metrics
+    
+    async def compose(
+        self,
+        route: CompositionRoute,
+        params: Dict[str, Any],
+        headers: Dict[str, str],
+        request_id: Optional[UUID] = None,
+    ) -> Response:
+        """
+        Build the composed response for a route.
+        
+        Args:
+            route: The composition to build
+            params: The route's path parameters
+            headers: The client's request headers
+            request_id: The ID of the client request
+        
+        Returns:
+            The composed response; ``metadata["cache"]`` tells whether it was
+            served from the cache
+        """
+        request_id = request_id or uuid.uuid4()
+        forwarded = {
+            name: value for name, value in headers.items() if name.lower() in FORWARDED_HEADERS
+        }
+        
+        cache_key = self._cache_key(route, params, forwarded) if route.cache_ttl and self.cache is not None else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return Response(request_id, 200, cached, {}, metadata={"cache": "hit"})
+        
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Dict[str, Any]] = {}
+        
+        async def run(part: CompositionPart) -> None:
+            for dependency in part.depends_on:
+                await tasks[dependency]
+            failed = part.depends_on & errors.keys()
+            if failed:
+                errors[part.name] = {"status": 424, "message": f"Depends on failed part(s): {sorted(failed)}"}
+                return
+            
+            path = part.render_path(params, results)
+            if path is None:
+                errors[part.name] = {"status": 424, "message": "Could not resolve the part's path"}
+                return
+            
+            try:
+                response = await asyncio.wait_for(
+                    self.gateway_service.route_request(Request(
+                        request_id=request_id,
+                        method="GET",
+                        path=path,
+                        headers=forwarded,
+                        query_params={},
+                    )),
+                    part.timeout,
+                )
+            except asyncio.TimeoutError:
+                errors[part.name] = {"status": 504, "message": f"Timed out after {part.timeout}s"}
+                return
+            
+            if response.status_code >= 400:
+                errors[part.name] = {
+                    "status": response.status_code,
+                    "message": (response.error or {}).get("message") or "Upstream error",
+                }
+            else:
+                try:
+                    results[part.name] = response.json()
+                except ValueError:
+                    errors[part.name] = {"status": 502, "message": "Upstream returned a non-JSON body"}
+        
+        # Every task exists before any of them runs, so ``run`` can await its dependencies
+        tasks = {part.name: asyncio.ensure_future(run(part)) for part in route.parts}
+        await asyncio.gather(*tasks.values())
+        
+        for part_name, error in errors.items():
+            self._count_error(route, part_name, error["status"])
+        
+        failed_required = [part for part in route.parts if part.required and part.name in errors]
+        if failed_required:
+            status_code = 504 if errors[failed_required[0].name]["status"] == 504 else 502
+            return Response(
+                request_id=request_id,
+                status_code=status_code,
+                body={"success": False, "data": results, "errors": errors, "partial": True},
+                headers={},
+                error={"message": f"Required part {failed_required[0].name} failed"},
+            )
+        
+        body = {"success": True, "data": results, "errors": errors, "partial": bool(errors)}
+        if cache_key and not errors:
+            self.cache.set(cache_key, body, route.cache_ttl)
+        return Response(request_id, 200, body, {}, metadata={"cache": "miss" if cache_key else "bypass"})
+    
+    @staticmethod
+    def _cache_key(route: CompositionRoute, params: Dict[str, Any], forwarded: Dict[str, str]) -> str:
+        """
+        Key a composed response by route, parameters and caller.
+        """
+        caller = json.dumps(sorted(
+            (name.lower(), value) for name, value in forwarded.items() if name.lower() in CALLER_HEADERS
+        ))
+        digest = hashlib.sha256(caller.encode()).hexdigest()[:32]
+        return f"compose:{route.name}:{json.dumps(params, sort_keys=True, default=str)}:{digest}"
+    
+    def _count_error(self, route: CompositionRoute, part_name: str, status: int) -> None:
+        if self.metrics is None:
+            return
+        self.metrics.counter(
+            "gateway_composition_part_errors_total",
+            "Composition parts that failed or timed out",
+            ("composition", "part", "status"),
+        ).inc(composition=route.name, part=part_name, status=str(status))
@@ -0,0 +1,80 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from domain.entities.route_rule import RouteRule
+
+
+class RouteRules:
+    """
+    Declared routes compiled for longest-prefix matching.
+    
+    Like the routing table, instances are never mutated: a reloaded route
+    file compiles into a new instance that is swapped in whole, so a
+    request sees either the old routes or the new ones, never a mix.
+    """
+    
+    def __init__(self, rules: Iterable[RouteRule] = (), version: str = ""):
+        """
+        Compile route rules.
+        
+        Args:
+            rules: The declared routes
+            version: Identifies the source the rules were read from, for logging
+        
+        Raises:
+            ValueError: If two routes share a name or a prefix
+        """
+        self.version = version
+        self._rules: List[RouteRule] = list(rules)
+        self._prefixes: Dict[str, RouteRule] = {}
+        names = set()
+        for rule in self._rules:
+            if rule.name in names:
+                raise ValueError(f"Duplicate route name: {rule.name}")
+            if rule.prefix in self._prefixes:
+                raise ValueError(f"Routes {self._prefixes[rule.prefix].name} and {rule.name} share prefix {rule.prefix}")
+            names.add(rule.name)
+            self._prefixes[rule.prefix] = rule
+    
+    @property
+    def rules(self) -> List[RouteRule]:
+        """Get the declared routes in file order."""
+        return list(self._rules)
+    
+    def __len__(self) -> int:
+        return len(self._rules)
+    
+    def match(self, path: str) -> Optional[RouteRule]:
+        """
+        Get the route with the longest prefix matching a path.
+        """
+        if not self._prefixes:
+            return None
+        segments = path.split("?", 1)[0].strip("/").split("/")
+        for length in range(len(segments), -1, -1):
+            rule = self._prefixes.get("/" + "/".join(segments[:length]))
+            if rule is not None:
+                return rule
+        return None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], version: str = "") -> "RouteRules":
+        """
+        Compile a route document: an optional ``defaults`` table and a ``routes`` list.
+        
+        Raises:
+            ValueError: If the document or any route in it is invalid
+        """
+        defaults = data.get("defaults", {})
+        routes = data.get("routes", [])
+        if not isinstance(defaults, dict) or not isinstance(routes, list):
+            raise ValueError("Expected a 'defaults' table and a 'routes' list")
+        
+        rules = []
+        for index, route in enumerate(routes):
+            try:
+                rules.append(RouteRule.from_dict(route, defaults))
+            except KeyError as e:
+                raise ValueError(f"Route {index} is missing {e}") from e
+            except (TypeError, AttributeError) as e:
+                raise ValueError(f"Route {index} is invalid: {e}") from e
+        return cls(rules, version)
@@ -0,0 +1,164 @@
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from domain.entities.registry_change import RegistryChange, RegistryChangeType
+from domain.entities.service import Service
+
+
+class _BucketedMap:
+    """
+    Read-only map split into a fixed number of buckets.
+    
+    ``updated`` copies only the buckets its changes fall into and shares
+    every other bucket with this map, so deriving a map with a few
+    changes costs a few buckets, not the whole map.
+    """
+    
+    BUCKETS = 64
+    
+    __slots__ = ("_buckets",)
+    
+    def __init__(self, items: Iterable[Tuple[Hashable, Any]] = ()):
+        buckets = [{} for _ in range(self.BUCKETS)]
+        for key, value in items:
+            buckets[hash(key) % self.BUCKETS][key] = value
+        self._buckets = tuple(buckets)
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._buckets[hash(key) % self.BUCKETS].get(key, default)
+    
+    def values(self) -> Iterator[Any]:
+        for bucket in self._buckets:
+            yield from bucket.values()
+    
+    def updated(self, changes: Dict[Hashable, Any]) -> "_BucketedMap":
+        """
+        Get a new map with changes applied; a value of None removes the key.
+        """
+        buckets = list(self._buckets)
+        copied = set()
+        for key, value in changes.items():
+            index = hash(key) % self.BUCKETS
+            if index not in copied:
+                buckets[index] = dict(buckets[index])
+                copied.add(index)
+            if value is None:
+                buckets[index].pop(key, None)
+            else:
+                buckets[index][key] = value
+        
+        derived = _BucketedMap.__new__(_BucketedMap)
+        derived._buckets = tuple(buckets)
+        return derived
+
+
+class RoutingTable:
+    """
+    Path-prefix routing table compiled from the service registry.
+    
+    Instances are never mutated after construction: applying registry
+    changes returns a new table, so request handlers can keep using the
+    table they started with while a replica swaps in a newer one. The new
+    table recompiles only the route prefixes the changes touch and shares
+    the rest of its structure with the previous one.
+    """
+    
+    def __init__(self, services: Iterable[Service] = (), revision: int = 0):
+        """
+        Compile a routing table.
+        
+        Args:
+            services: The registered services to route to
+            revision: The registry revision the services were read at
+        """
+        self.revision = revision
+        services_by_id = {service.id: service for service in services}
+        routes: Dict[str, List[Service]] = {}
+        for service in services_by_id.values():
+            if service.is_active:
+                routes.setdefault(self.route_prefix(service), []).append(service)
+        self._services = _BucketedMap(services_by_id.items())
+        self._routes = _BucketedMap((prefix, tuple(services)) for prefix, services in routes.items())
+    
+    @staticmethod
+    def route_prefix(service: Service) -> str:
+        """
+        Get the path prefix a service is routed under.
+        
+        Services can set ``route_prefix`` in their metadata; otherwise they
+        are routed under ``/<service name>``.
+        """
+        prefix = service.metadata.get("route_prefix") or f"/{service.name}"
+        return "/" + prefix.strip("/")
+    
+    @property
+    def services(self) -> List[Service]:
+        """Get every service known to the table, active or not."""
+        return list(self._services.values())
+    
+    def match(self, path: str) -> List[Service]:
+        """
+        Get the active services for the longest route prefix matching a path.
+        """
+        segments = path.split("?", 1)[0].strip("/").split("/")
+        for length in range(len(segments), -1, -1):
+            services = self._routes.get("/" + "/".join(segments[:length]))
+            if services:
+                return list(services)
+        return []
+    
+    def get(self, service_id: UUID) -> Optional[Service]:
+        """Get a service by ID."""
+        return self._services.get(service_id)
+    
+    def apply(self, changes: Iterable[RegistryChange]) -> "RoutingTable":
+        """
+        Build a new table with registry changes applied.
+        
+        Only the route prefixes the changed services were or are now routed
+        under are recompiled; everything else is shared with this table.
+        Changes at or below the table's revision are skipped, so replaying
+        a change that was already part of the initial listing is harmless.
+        
+        Args:
+            changes: Registry changes in revision order
+        
+        Returns:
+            A new routing table, or this one if nothing applied
+        """
+        # Service ID -> new state, None for deleted services
+        changed: Dict[UUID, Optional[Service]] = {}
+        revision = self.revision
+        for change in changes:
+            if change.revision <= revision:
+                continue
+            if change.change_type == RegistryChangeType.DELETED:
+                changed[change.service_id] = None
+            elif change.service is not None:
+                changed[change.service_id] = change.service
+            revision = change.revision
+        
+        if revision == self.revision:
+            return self
+        
+        # The affected prefixes keep their unchanged services, then gain the
+        # active new states
+        routes: Dict[str, List[Service]] = {}
+        for service_id, service in changed.items():
+            for affected in (self._services.get(service_id), service):
+                if affected is None:
+                    continue
+                prefix = self.route_prefix(affected)
+                if prefix not in routes:
+                    routes[prefix] = [
+                        routed for routed in self._routes.get(prefix, ()) if routed.id not in changed
+                    ]
+        for service in changed.values():
+            if service is not None and service.is_active:
+                routes[self.route_prefix(service)].append(service)
+        
+        table = RoutingTable.__new__(RoutingTable)
+        table.revision = revision
+        table._services = self._services.updated(changed)
+        table._routes = self._routes.updated({prefix: tuple(services) or None for prefix, services in routes.items()})
+        return table
@@ -0,0 +1,88 @@
+import hashlib
+import random
+from typing import Dict, List, Optional
+
+from domain.entities.service import Service
+
+
+class TrafficSplitter:
+    """
+    Chooses which version of a service a request is routed to.
+    
+    Each version's share comes from its ``traffic_weight``. A request's
+    sticky key (user or tenant) is hashed into one of ``BUCKETS`` buckets
+    and versions own contiguous bucket ranges in ascending version order,
+    so a user keeps hitting the same version and raising a canary's weight
+    only moves the users at the boundary onto it.
+    """
+    
+    BUCKETS = 10000
+    
+    @staticmethod
+    def bucket(service_name: str, sticky_key: str) -> int:
+        """
+        Get the stable bucket for a sticky key.
+        """
+        digest = hashlib.blake2b(f"{service_name}:{sticky_key}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % TrafficSplitter.BUCKETS
+    
+    @staticmethod
+    def version_weights(services: List[Service]) -> Dict[str, int]:
+        """
+        Get the configured weight of each version, in ascending version order.
+        
+        Versions without a weight get 0. When no version has a positive
+        weight the highest version receives all traffic.
+        """
+        versions = sorted({service.version for service in services}, key=Service.version_key)
+        weights = {version: 0 for version in versions}
+        for service in services:
+            if service.traffic_weight is not None:
+                weights[service.version] = max(weights[service.version], service.traffic_weight)
+        
+        if not any(weights.values()):
+            weights[versions[-1]] = 1
+        return weights
+    
+    def select_version(self, services: List[Service], sticky_key: Optional[str] = None) -> Optional[str]:
+        """
+        Pick the version a request should be routed to.
+        
+        Args:
+            services: Active instances of one service, across versions
+            sticky_key: User or tenant identifier; a random bucket is used when None
+        
+        Returns:
+            The chosen version, or None if there are no services
+        """
+        if not services:
+            return None
+        
+        weights = self.version_weights(services)
+        if len(weights) == 1:
+            return next(iter(weights))
+        
+        if sticky_key is None:
+            bucket = random.randrange(self.BUCKETS)
+        else:
+            bucket = self.bucket(services[0].name, sticky_key)
+        
+        total = sum(weights.values())
+        boundary = 0
+        for version, weight in weights.items():
+            boundary += weight * self.BUCKETS / total
+            if bucket < boundary:
+                return version
+        return next(reversed(weights))
+    
+    def select(self, services: List[Service], sticky_key: Optional[str] = None) -> Optional[Service]:
+        """
+        Pick the service instance a request should be routed to.
+        
+        The version is chosen by weight and sticky key; load is spread
+        randomly across the instances of that version.
+        """
+        version = self.select_version(services, sticky_key)
+        if version is None:
+            return None
+        return random.choice([service for service in services if service.version == version])
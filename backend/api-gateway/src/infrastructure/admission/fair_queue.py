@@ -0,0 +1,115 @@
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+
+class DeficitRoundRobinQueue:
+    """
+    Per-flow FIFO queues served by deficit round robin.
+    
+    Active flows take turns in a ring. A flow at the head of the ring is
+    served while it has at least one unit of deficit; when it runs out it
+    is credited its quantum and moves to the back. Over time every flow
+    is served in proportion to its quantum, however many items it queued,
+    so one flow with a deep backlog cannot starve the others.
+    """
+    
+    def __init__(self, quantum: Optional[Callable[[str], int]] = None):
+        """
+        Initialize the queue.
+        
+        Args:
+            quantum: Items a flow may take per turn; 1 for every flow by default
+        """
+        self._quantum = quantum or (lambda flow: 1)
+        self._queues: Dict[str, Deque[Any]] = {}
+        self._deficits: Dict[str, int] = {}
+        self._ring: Deque[str] = deque()
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def queued(self, flow: str) -> int:
+        """
+        Get the number of items a flow has queued.
+        """
+        queue = self._queues.get(flow)
+        return len(queue) if queue else 0
+    
+    def push(self, flow: str, item: Any) -> None:
+        """
+        Queue an item for a flow.
+        """
+        queue = self._queues.get(flow)
+        if queue is None:
+            queue = self._queues[flow] = deque()
+            self._deficits[flow] = 0
+            self._ring.append(flow)
+        queue.append(item)
+        self._size += 1
+    
+    def pop(self, eligible: Optional[Callable[[str], bool]] = None) -> Optional[Tuple[str, Any]]:
+        """
+        Take the next item.
+        
+        Args:
+            eligible: Flows it returns False for are skipped this time,
+                keeping their place and deficit
+        
+        Returns:
+            The flow and item, or None if no eligible flow has items
+        """
+        skipped = 0
+        while skipped < len(self._ring):
+            flow = self._ring[0]
+            if eligible is not None and not eligible(flow):
+                self._ring.rotate(-1)
+                skipped += 1
+                continue
+            
+            if self._deficits[flow] >= 1:
+                self._deficits[flow] -= 1
+                item = self._queues[flow].popleft()
+                self._size -= 1
+                if not self._queues[flow]:
+                    self._remove_flow(flow)
+                return flow, item
+            
+            self._deficits[flow] += max(1, self._quantum(flow))
+            self._ring.rotate(-1)
+            skipped = 0
+        return None
+    
+    def remove(self, flow: str, item: Any) -> bool:
+        """
+        Remove a queued item; returns False if it is not queued.
+        """
+        queue = self._queues.get(flow)
+        if not queue:
+            return False
+        try:
+            queue.remove(item)
+        except ValueError:
+            return False
+        self._size -= 1
+        if not queue:
+            self._remove_flow(flow)
+        return True
+    
+    def drain(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Remove and yield every queued item.
+        """
+        while self._ring:
+            flow = self._ring[0]
+            queue = self._queues[flow]
+            while queue:
+                self._size -= 1
+                yield flow, queue.popleft()
+            self._remove_flow(flow)
+    
+    def _remove_flow(self, flow: str) -> None:
+        # An idle flow does not keep credit for later
+        self._ring.remove(flow)
+        del self._queues[flow]
+        del self._deficits[flow]
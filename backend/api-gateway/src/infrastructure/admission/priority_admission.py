@@ -0,0 +1,309 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+
+from domain.services.priority_classifier import PriorityClass
+from infrastructure.admission.fair_queue import DeficitRoundRobinQueue
+from lms_shared.monitoring.metrics import metrics as default_metrics
+
+# Queue flow of requests without a tenant; they are not subject to tenant quotas
+NO_TENANT = ""
+
+
+class AdmissionRejectedError(Exception):
+    """
+    Raised when a request is shed instead of admitted.
+    """
+    
+    def __init__(self, priority: PriorityClass, reason: str):
+        self.priority = priority
+        self.reason = reason
+        super().__init__(f"{priority.name.lower()} request rejected: {reason}")
+
+
+class PriorityAdmissionController:
+    """
+    Limits concurrent requests and queues the excess per priority class.
+    
+    Each class has its own bounded queue. When a slot frees up the next
+    class is picked by smooth weighted round robin over the non-empty
+    queues, so every class makes progress in proportion to its weight and
+    a flood of one class cannot starve the others.
+    
+    With tenant quotas, a request over its tenant's rate or queue quota is
+    rejected up front, and within a class tenants are served by deficit
+    round robin weighted by plan, skipping tenants at their concurrency
+    quota. A tenant with a large backlog therefore waits behind its own
+    requests instead of delaying everyone else's.
+    
+    Shedding is driven by queue wait: when a request is dispatched after
+    waiting longer than ``target_wait``, the lowest class still admitted
+    starts being rejected (queued and arriving requests alike). Once
+    waits drop below half the target, classes are re-admitted one at a
+    time. CRITICAL is never shed this way; it is only bounded by its
+    queue size and ``max_wait``.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int,
+        queue_sizes: Dict[PriorityClass, int],
+        weights: Dict[PriorityClass, int],
+        target_wait: float = 0.1,
+        max_wait: float = 2.0,
+        metrics=None,
+        tenant_quotas=None,
+    ):
+        """
+        Initialize the controller.
+        
+        Args:
+            max_concurrency: Requests processed at the same time
+            queue_sizes: Maximum queued requests per class
+            weights: Relative dequeue share per class
+            target_wait: Queue wait above which low classes are shed
+            max_wait: Hard limit on how long any request waits
+            metrics: Metrics registry to report queue depth, waits and sheds to
+            tenant_quotas: Per-tenant quotas and usage accounting
+        """
+        self.max_concurrency = max_concurrency
+        self.queue_sizes = {priority: queue_sizes.get(priority, 0) for priority in PriorityClass}
+        self.weights = {priority: max(1, weights.get(priority, 1)) for priority in PriorityClass}
+        self.target_wait = target_wait
+        self.max_wait = max_wait
+        self.tenant_quotas = tenant_quotas
+        
+        self.in_flight = 0
+        # Classes with a value >= shed_threshold are rejected
+        self.shed_threshold = len(PriorityClass)
+        self._last_threshold_change = 0.0
+        quantum = tenant_quotas.weight if tenant_quotas is not None else None
+        self._queues: Dict[PriorityClass, DeficitRoundRobinQueue] = {
+            priority: DeficitRoundRobinQueue(quantum) for priority in PriorityClass
+        }
+        self._current_weights = {priority: 0 for priority in PriorityClass}
+        
+        metrics = metrics or default_metrics
+        self._queue_depth = metrics.gauge(
+            "gateway_admission_queue_depth",
+            "Requests waiting for admission",
+            ("priority",),
+        )
+        self._queue_wait = metrics.histogram(
+            "gateway_admission_queue_wait_seconds",
+            "Time requests waited for admission",
+            ("priority",),
+        )
+        self._rejected = metrics.counter(
+            "gateway_admission_rejected_total",
+            "Requests shed by admission control",
+            ("priority", "reason"),
+        )
+    
+    @asynccontextmanager
+    async def admit(self, priority: PriorityClass, tenant_id: Optional[str] = None) -> AsyncIterator[None]:
+        """
+        Hold a processing slot for the duration of the block.
+        
+        Raises:
+            AdmissionRejectedError: If the request is shed
+        """
+        await self.acquire(priority, tenant_id)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(tenant_id, time.monotonic() - started)
+    
+    async def acquire(self, priority: PriorityClass, tenant_id: Optional[str] = None) -> None:
+        """
+        Wait for a processing slot.
+        
+        Args:
+            priority: The request's priority class
+            tenant_id: The tenant the request is made for, if known
+        
+        Raises:
+            AdmissionRejectedError: If the request is shed
+        """
+        flow = tenant_id or NO_TENANT
+        quotas = self.tenant_quotas if tenant_id else None
+        if quotas is not None and not quotas.take_token(tenant_id):
+            self._reject(priority, "tenant_rate_limited", tenant_id)
+        
+        if self.in_flight < self.max_concurrency and not self.queued() and self._eligible(flow):
+            self._start(flow)
+            self._queue_wait.observe(0, priority=priority.name.lower())
+            return
+        
+        if priority >= self.shed_threshold:
+            self._reject(priority, "overloaded", tenant_id)
+        queue = self._queues[priority]
+        if len(queue) >= self.queue_sizes[priority]:
+            self._reject(priority, "queue_full", tenant_id)
+        if quotas is not None and not quotas.can_queue(tenant_id, self._queued_for(flow)):
+            self._reject(priority, "tenant_queue_full", tenant_id)
+        
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (time.monotonic(), waiter)
+        queue.push(flow, entry)
+        self._queue_depth.inc(priority=priority.name.lower())
+        # Slots may be free while only tenants at their concurrency quota wait
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except asyncio.TimeoutError:
+            if self._discard(priority, flow, entry):
+                self._reject(priority, "timeout", tenant_id)
+            # Dispatched or shed just as the wait expired
+            waiter.result()
+        except asyncio.CancelledError:
+            if not self._discard(priority, flow, entry) and waiter.exception() is None:
+                # The slot was handed over but the client went away
+                self.release(tenant_id)
+            raise
+    
+    def release(self, tenant_id: Optional[str] = None, duration: float = 0.0) -> None:
+        """
+        Free a processing slot and hand it to the next waiter.
+        
+        Args:
+            tenant_id: The tenant the finished request was made for
+            duration: Seconds the request was in progress, for usage accounting
+        """
+        self.in_flight -= 1
+        if tenant_id and self.tenant_quotas is not None:
+            self.tenant_quotas.finished(tenant_id, duration)
+        self._dispatch()
+    
+    def queued(self, priority: Optional[PriorityClass] = None) -> int:
+        """
+        Get the number of waiting requests, for one class or overall.
+        """
+        if priority is not None:
+            return len(self._queues[priority])
+        return sum(len(queue) for queue in self._queues.values())
+    
+    def _dispatch(self) -> None:
+        """
+        Hand free slots to waiters by weighted round robin.
+        """
+        while self.in_flight < self.max_concurrency:
+            next_waiter = self._next_waiter()
+            if next_waiter is None:
+                if not self.queued():
+                    self._adjust_shedding(0.0)
+                return
+            
+            priority, flow, (enqueued_at, waiter) = next_waiter
+            self._queue_depth.dec(priority=priority.name.lower())
+            if waiter.done():
+                continue
+            
+            wait = time.monotonic() - enqueued_at
+            self._queue_wait.observe(wait, priority=priority.name.lower())
+            self._start(flow)
+            waiter.set_result(None)
+            self._adjust_shedding(wait)
+    
+    def _next_waiter(self) -> Optional[Tuple[PriorityClass, str, Tuple[float, asyncio.Future]]]:
+        """
+        Take the next waiter that may start, with its class and tenant.
+        """
+        excluded: Set[PriorityClass] = set()
+        while True:
+            priority = self._next_class(excluded)
+            if priority is None:
+                return None
+            popped = self._queues[priority].pop(self._eligible)
+            if popped is not None:
+                return (priority,) + popped
+            # Every tenant waiting in this class is at its concurrency quota
+            excluded.add(priority)
+    
+    def _next_class(self, excluded: Set[PriorityClass] = frozenset()) -> Optional[PriorityClass]:
+        """
+        Pick the queue to serve next (smooth weighted round robin).
+        """
+        active = [priority for priority, queue in self._queues.items() if queue and priority not in excluded]
+        if not active:
+            return None
+        
+        total = 0
+        for priority in active:
+            self._current_weights[priority] += self.weights[priority]
+            total += self.weights[priority]
+        chosen = max(active, key=lambda priority: (self._current_weights[priority], -priority))
+        self._current_weights[chosen] -= total
+        return chosen
+    
+    def _adjust_shedding(self, wait: float) -> None:
+        """
+        Move the shed threshold by at most one class per target interval.
+        """
+        now = time.monotonic()
+        if now - self._last_threshold_change < self.target_wait:
+            return
+        
+        if wait > self.target_wait and self.shed_threshold > PriorityClass.CRITICAL + 1:
+            self.shed_threshold -= 1
+            self._last_threshold_change = now
+            for priority in PriorityClass:
+                if priority >= self.shed_threshold:
+                    self._shed_queue(priority)
+        elif wait < self.target_wait / 2 and self.shed_threshold < len(PriorityClass):
+            self.shed_threshold += 1
+            self._last_threshold_change = now
+    
+    def _shed_queue(self, priority: PriorityClass) -> None:
+        """
+        Reject every request waiting in a class's queue.
+        """
+        for flow, (_, waiter) in self._queues[priority].drain():
+            self._queue_depth.dec(priority=priority.name.lower())
+            if not waiter.done():
+                waiter.set_exception(AdmissionRejectedError(priority, "overloaded"))
+                self._count_rejection(priority, "overloaded", flow)
+    
+    def _discard(self, priority: PriorityClass, flow: str, entry: Tuple[float, asyncio.Future]) -> bool:
+        """
+        Remove a waiter that gave up; returns False if it was already dispatched.
+        """
+        if not self._queues[priority].remove(flow, entry):
+            return False
+        self._queue_depth.dec(priority=priority.name.lower())
+        entry[1].cancel()
+        return True
+    
+    def _start(self, flow: str) -> None:
+        """
+        Take a processing slot for a request.
+        """
+        self.in_flight += 1
+        if flow and self.tenant_quotas is not None:
+            self.tenant_quotas.started(flow)
+    
+    def _eligible(self, flow: str) -> bool:
+        """
+        Check whether a tenant is below its concurrency quota.
+        """
+        return not flow or self.tenant_quotas is None or self.tenant_quotas.can_start(flow)
+    
+    def _queued_for(self, flow: str) -> int:
+        """
+        Get the number of a tenant's waiting requests across classes.
+        """
+        return sum(queue.queued(flow) for queue in self._queues.values())
+    
+    def _count_rejection(self, priority: PriorityClass, reason: str, tenant_id: Optional[str] = None) -> None:
+        self._rejected.inc(priority=priority.name.lower(), reason=reason)
+        if tenant_id and self.tenant_quotas is not None:
+            self.tenant_quotas.rejected(tenant_id, reason)
+    
+    def _reject(self, priority: PriorityClass, reason: str, tenant_id: Optional[str] = None) -> None:
+        """
+        Count and raise a rejection.
+        """
+        self._count_rejection(priority, reason, tenant_id)
+        raise AdmissionRejectedError(priority, reason)
@@ -0,0 +1,187 @@
+from typing import Dict, Optional
+
+from lms_shared.monitoring.metrics import metrics as default_metrics
+from infrastructure.shared.memory import SharedSlotTable, monotonic_ms
+
+
+class TenantQuota:
+    """
+    The limits of one plan.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate: float,
+        burst: float,
+        max_queued: int,
+        weight: int = 1,
+    ):
+        """
+        Initialize a new TenantQuota instance.
+        
+        Args:
+            max_concurrency: Requests a tenant may have in progress per worker
+            rate: Requests per second a tenant may start, across workers
+            burst: Requests a tenant may start at once after being idle
+            max_queued: Requests a tenant may have waiting for admission
+            weight: The tenant's share when admission is contended
+        """
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_queued = max_queued
+        self.weight = weight
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> "TenantQuota":
+        """
+        Create a TenantQuota instance from a dictionary.
+        """
+        return cls(
+            max_concurrency=int(data["max_concurrency"]),
+            rate=float(data["rate"]),
+            burst=float(data.get("burst", data["rate"])),
+            max_queued=int(data.get("max_queued", data["max_concurrency"])),
+            weight=int(data.get("weight", 1)),
+        )
+
+
+class TenantQuotas:
+    """
+    Per-tenant quota accounting for admission control.
+    
+    Throughput is limited by a token bucket per tenant kept in a shared
+    slot table, so the rate holds across worker processes. Concurrency is
+    counted per worker. Usage is exported as metrics labelled by tenant:
+    requests by outcome, busy seconds and requests in progress.
+    """
+    
+    # Tokens (thousandths of a request), last refill time (ms)
+    FIELDS = 2
+    
+    def __init__(
+        self,
+        table: SharedSlotTable,
+        plan_quotas: Dict[str, TenantQuota],
+        tenant_plans: Optional[Dict[str, str]] = None,
+        default_plan: str = "standard",
+        metrics=None,
+    ):
+        """
+        Initialize the quotas.
+        
+        Args:
+            table: Shared token buckets, created before workers are forked
+            plan_quotas: Plan -> quota
+            tenant_plans: Tenant ID -> plan
+            default_plan: Plan of tenants without one
+            metrics: Metrics registry to export usage to
+        
+        Raises:
+            ValueError: If the default plan has no quota
+        """
+        if default_plan not in plan_quotas:
+            raise ValueError(f"Default plan {default_plan} has no quota")
+        self.table = table
+        self.plan_quotas = plan_quotas
+        self.tenant_plans = dict(tenant_plans or {})
+        self.default_plan = default_plan
+        self._in_flight: Dict[str, int] = {}
+        
+        metrics = metrics or default_metrics
+        self._requests = metrics.counter(
+            "gateway_tenant_requests_total",
+            "Requests per tenant by admission outcome",
+            ("tenant", "outcome"),
+        )
+        self._busy_seconds = metrics.counter(
+            "gateway_tenant_busy_seconds_total",
+            "Time requests of each tenant spent in progress",
+            ("tenant",),
+        )
+        self._in_flight_gauge = metrics.gauge(
+            "gateway_tenant_in_flight",
+            "Requests of each tenant in progress",
+            ("tenant",),
+        )
+    
+    def quota(self, tenant_id: str) -> TenantQuota:
+        """
+        Get the quota of a tenant's plan.
+        """
+        plan = self.tenant_plans.get(tenant_id, self.default_plan)
+        return self.plan_quotas.get(plan) or self.plan_quotas[self.default_plan]
+    
+    def weight(self, tenant_id: str) -> int:
+        """
+        Get a tenant's share of contended admission.
+        """
+        return self.quota(tenant_id).weight
+    
+    def take_token(self, tenant_id: str) -> bool:
+        """
+        Spend one request of a tenant's throughput quota.
+        
+        Returns:
+            False if the tenant is over its rate
+        """
+        quota = self.quota(tenant_id)
+        capacity = int(quota.burst * 1000)
+        now = monotonic_ms()
+        
+        def take(fields):
+            tokens, refilled_at = fields
+            if refilled_at == 0:
+                tokens = capacity
+            else:
+                tokens = min(capacity, tokens + int((now - refilled_at) * quota.rate))
+            if tokens < 1000:
+                return [tokens, now], False
+            return [tokens - 1000, now], True
+        
+        return self.table.update(tenant_id, take)
+    
+    def can_start(self, tenant_id: str) -> bool:
+        """
+        Check whether a tenant is below its concurrency quota.
+        """
+        return self._in_flight.get(tenant_id, 0) < self.quota(tenant_id).max_concurrency
+    
+    def can_queue(self, tenant_id: str, queued: int) -> bool:
+        """
+        Check whether a tenant with ``queued`` waiting requests may queue another.
+        """
+        return queued < self.quota(tenant_id).max_queued
+    
+    def started(self, tenant_id: str) -> None:
+        """
+        Count a tenant's request as admitted and in progress.
+        """
+        self._in_flight[tenant_id] = self._in_flight.get(tenant_id, 0) + 1
+        self._in_flight_gauge.inc(tenant=tenant_id)
+        self._requests.inc(tenant=tenant_id, outcome="admitted")
+    
+    def finished(self, tenant_id: str, duration: float) -> None:
+        """
+        Count a tenant's request as finished.
+        """
+        remaining = self._in_flight.get(tenant_id, 0) - 1
+        if remaining > 0:
+            self._in_flight[tenant_id] = remaining
+        else:
+            self._in_flight.pop(tenant_id, None)
+        self._in_flight_gauge.dec(tenant=tenant_id)
+        self._busy_seconds.inc(duration, tenant=tenant_id)
+    
+    def rejected(self, tenant_id: str, reason: str) -> None:
+        """
+        Count a tenant's request as rejected.
+        """
+        self._requests.inc(tenant=tenant_id, outcome=reason)
+    
+    def in_flight(self, tenant_id: str) -> int:
+        """
+        Get the number of a tenant's requests in progress in this worker.
+        """
+        return self._in_flight.get(tenant_id, 0)
@@ -0,0 +1,53 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class MemoryCache:
+    """
+    In-process LRU cache with a per-entry time to live.
+    
+    Not thread-safe; meant to be used from a single event loop.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a value, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Store a value for ``ttl`` seconds.
+        """
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove a value if present.
+        """
+        self._entries.pop(key, None)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
\ No newline at end of file
@@ -0,0 +1,224 @@
+import asyncio
+import base64
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from infrastructure.cache.memory_cache import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+
+class StoredResponse:
+    """
+    A response kept for replaying to retried requests.
+    """
+    
+    def __init__(
+        self,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        body: Optional[bytes],
+    ):
+        """
+        Initialize a new StoredResponse instance.
+        
+        Args:
+            status_code: The original status code
+            headers: The original response headers
+            body: The original body, or None if it was too large to keep
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the response to a dictionary.
+        """
+        return {
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "body": base64.b64encode(self.body).decode() if self.body is not None else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StoredResponse":
+        """
+        Create a StoredResponse instance from a dictionary.
+        """
+        return cls(
+            status_code=data["status_code"],
+            headers=[tuple(header) for header in data["headers"]],
+            body=base64.b64decode(data["body"]) if data.get("body") is not None else None,
+        )
+
+
+class IdempotencyRecord:
+    """
+    The state of an idempotency key.
+    """
+    
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    
+    def __init__(self, state: str, fingerprint: str, response: Optional[StoredResponse] = None):
+        self.state = state
+        self.fingerprint = fingerprint
+        self.response = response
+    
+    def to_json(self) -> str:
+        return json.dumps({
+            "state": self.state,
+            "fingerprint": self.fingerprint,
+            "response": self.response.to_dict() if self.response else None,
+        })
+    
+    @classmethod
+    def from_json(cls, data: str) -> "IdempotencyRecord":
+        values = json.loads(data)
+        return cls(
+            state=values["state"],
+            fingerprint=values["fingerprint"],
+            response=StoredResponse.from_dict(values["response"]) if values.get("response") else None,
+        )
+
+
+class IdempotencyStore:
+    """
+    Tracks idempotency keys across gateway replicas.
+    
+    Redis holds the authoritative record: a key is claimed with
+    ``SET NX`` while the first request runs and then replaced by the
+    stored response for ``ttl`` seconds. Completed records are also kept
+    in a bounded in-process cache, and duplicates arriving at the same
+    replica while the first request runs wait on it in memory instead of
+    polling Redis.
+    """
+    
+    def __init__(
+        self,
+        redis_client,
+        ttl: float = 86400,
+        lock_ttl: float = 60,
+        local_cache_size: int = 10000,
+        poll_interval: float = 0.05,
+        key_prefix: str = "idempotency:",
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            redis_client: An asyncio Redis client
+            ttl: Seconds a completed response is replayed for
+            lock_ttl: Seconds a claim survives if its replica dies mid-request
+            local_cache_size: Completed records kept in process
+            poll_interval: Seconds between Redis reads while another replica runs the request
+            key_prefix: Prefix for Redis keys
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.key_prefix = key_prefix
+        self._completed = MemoryCache(max_entries=local_cache_size)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+    
+    async def claim(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        """
+        Claim a key for a new request.
+        
+        Returns:
+            None if the caller now owns the key and must process the
+            request; otherwise the existing record (completed, or still in
+            progress elsewhere)
+        """
+        record = self._completed.get(key)
+        if record is not None:
+            return record
+        
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            # Another request on this replica holds the key; share its outcome
+            record = await asyncio.shield(in_flight)
+            if record is not None:
+                return record
+            return await self.claim(key, fingerprint)
+        
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+        claim = IdempotencyRecord(IdempotencyRecord.IN_PROGRESS, fingerprint)
+        try:
+            claimed = await self.redis.set(
+                self.key_prefix + key,
+                claim.to_json(),
+                nx=True,
+                px=int(self.lock_ttl * 1000),
+            )
+            if claimed:
+                return None
+            data = await self.redis.get(self.key_prefix + key)
+        except RedisError as e:
+            # Without Redis, still deduplicate within this replica
+            logger.warning(f"Idempotency store unavailable, deduplicating locally: {e}")
+            return None
+        
+        record = IdempotencyRecord.from_json(data) if data else None
+        self._resolve(key, record if record and record.state == IdempotencyRecord.COMPLETED else None)
+        if record is None:
+            # Expired between SET and GET
+            return await self.claim(key, fingerprint)
+        if record.state == IdempotencyRecord.COMPLETED:
+            self._completed.set(key, record, self.ttl)
+        return record
+    
+    async def complete(self, key: str, fingerprint: str, response: StoredResponse) -> None:
+        """
+        Store the response of a claimed key and wake up waiting duplicates.
+        """
+        record = IdempotencyRecord(IdempotencyRecord.COMPLETED, fingerprint, response)
+        self._completed.set(key, record, self.ttl)
+        self._resolve(key, record)
+        try:
+            await self.redis.set(self.key_prefix + key, record.to_json(), px=int(self.ttl * 1000))
+        except RedisError as e:
+            logger.warning(f"Could not store idempotent response for {key}: {e}")
+    
+    async def release(self, key: str) -> None:
+        """
+        Give up a claimed key so the request can be retried.
+        """
+        self._resolve(key, None)
+        try:
+            await self.redis.delete(self.key_prefix + key)
+        except RedisError as e:
+            logger.warning(f"Could not release idempotency key {key}: {e}")
+    
+    async def wait(self, key: str, timeout: float) -> Optional[IdempotencyRecord]:
+        """
+        Wait for a request running on another replica to complete.
+        
+        Returns:
+            The completed record, or None if it was released or the wait timed out
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                data = await self.redis.get(self.key_prefix + key)
+            except RedisError:
+                return None
+            if data is None:
+                return None
+            record = IdempotencyRecord.from_json(data)
+            if record.state == IdempotencyRecord.COMPLETED:
+                self._completed.set(key, record, self.ttl)
+                return record
+        return None
+    
+    def _resolve(self, key: str, record: Optional[IdempotencyRecord]) -> None:
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(record)
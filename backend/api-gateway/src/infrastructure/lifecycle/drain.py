@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class DrainCoordinator:
+    """
+    Coordinates a graceful shutdown of the gateway.
+    
+    Draining happens in phases:
+    
+    1. ``start_draining``: ``/health`` reports draining so the load
+       balancer stops sending new connections, while requests are still
+       served. Responses carry ``Connection: close`` so keep-alive
+       clients move to other replicas one by one as their next request
+       completes, instead of all at once when the process exits.
+    2. ``stop_accepting``: after the grace period, new requests are
+       rejected with 503.
+    3. ``wait_idle``: in-flight requests (including streamed response
+       bodies) get until the deadline to finish.
+    4. ``close``: shutdown callbacks run, e.g. closing upstream
+       connection pools.
+    """
+    
+    def __init__(self):
+        self.draining = False
+        self.accepting = True
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._on_close: List[Callable[[], Awaitable[None]]] = []
+    
+    def on_close(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        Register a coroutine function to run once requests have drained.
+        """
+        self._on_close.append(callback)
+    
+    def request_started(self) -> None:
+        """Count a request as in flight."""
+        self.in_flight += 1
+        self._idle.clear()
+    
+    def request_finished(self) -> None:
+        """Count a request as done."""
+        self.in_flight -= 1
+        if self.in_flight <= 0:
+            self.in_flight = 0
+            self._idle.set()
+    
+    def start_draining(self) -> None:
+        """
+        Report draining on the health endpoint and start closing keep-alive connections.
+        """
+        if not self.draining:
+            logger.info("Draining: health check now reports draining")
+            self.draining = True
+    
+    def stop_accepting(self) -> None:
+        """
+        Reject new requests from now on.
+        """
+        if self.accepting:
+            logger.info(f"Draining: no longer accepting requests, {self.in_flight} in flight")
+            self.accepting = False
+    
+    async def wait_idle(self, timeout: float) -> bool:
+        """
+        Wait for in-flight requests to finish.
+        
+        Returns:
+            True if they all finished before the timeout
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Draining: deadline reached with {self.in_flight} requests in flight")
+            return False
+    
+    async def close(self) -> None:
+        """
+        Run the shutdown callbacks, logging (not raising) their failures.
+        """
+        for callback in self._on_close:
+            try:
+                await callback()
+            except Exception as e:
+                logger.error(f"Error during shutdown: {e}")
+        self._on_close.clear()
+    
+    async def drain(self, grace_period: float, deadline: float) -> None:
+        """
+        Run every drain phase in order.
+        
+        Args:
+            grace_period: Seconds between reporting draining and rejecting requests
+            deadline: Seconds, after the grace period, to wait for in-flight requests
+        """
+        self.start_draining()
+        if self.accepting:
+            await asyncio.sleep(grace_period)
+        self.stop_accepting()
+        await self.wait_idle(deadline)
+        await self.close()
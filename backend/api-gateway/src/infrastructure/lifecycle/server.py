@@ -0,0 +1,37 @@
+import asyncio
+
+import uvicorn
+
+from infrastructure.lifecycle.drain import DrainCoordinator
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    Uvicorn server that drains before it stops listening.
+    
+    Uvicorn closes its listening socket as soon as it receives SIGTERM.
+    This server first flips the drain coordinator to draining and waits
+    out the grace period, so the load balancer sees ``/health`` fail and
+    moves traffic away while this replica still serves it. A second
+    signal shuts down immediately.
+    """
+    
+    def __init__(self, config: uvicorn.Config, drain: DrainCoordinator, grace_period: float):
+        super().__init__(config)
+        self.drain = drain
+        self.grace_period = grace_period
+        self._drain_task = None
+    
+    def handle_exit(self, sig, frame) -> None:
+        if self._drain_task is not None or self.should_exit:
+            super().handle_exit(sig, frame)
+            return
+        self._drain_task = asyncio.ensure_future(self._drain_then_exit(sig, frame))
+    
+    async def _drain_then_exit(self, sig, frame) -> None:
+        self.drain.start_draining()
+        await asyncio.sleep(self.grace_period)
+        self.drain.stop_accepting()
+        # Uvicorn now stops listening, waits for open connections and runs
+        # the shutdown handlers, which wait for in-flight requests
+        super().handle_exit(sig, frame)
@@ -0,0 +1,131 @@
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict, Optional
+
+import uvicorn
+
+from infrastructure.lifecycle.drain import DrainCoordinator
+from infrastructure.lifecycle.server import DrainingServer
+from infrastructure.shared.state import SharedState
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerSupervisor:
+    """
+    Pre-forks gateway worker processes that serve the same port.
+    
+    Workers are forked after the shared state was created, so they all map
+    the same routing snapshot and rate-limit and circuit-breaker counters.
+    With ``reuse_port`` every worker binds its own ``SO_REUSEPORT`` socket
+    and the kernel spreads new connections evenly over them; otherwise the
+    supervisor binds one socket that all workers accept from.
+    
+    SIGTERM is forwarded to the workers, each of which drains like a
+    single-process gateway; SIGINT from a terminal already reaches every
+    worker. Workers that exit while the supervisor is not stopping are
+    restarted with the same index, so there is always a leader.
+    """
+    
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        drain: DrainCoordinator,
+        grace_period: float,
+        shared_state: SharedState,
+        workers: int,
+        reuse_port: bool = True,
+        restart_delay: float = 1.0,
+    ):
+        """
+        Initialize the supervisor.
+        
+        Args:
+            config: Uvicorn configuration each worker serves
+            drain: The drain coordinator (inherited by every worker)
+            grace_period: Seconds a worker reports draining before it stops listening
+            shared_state: Shared memory created before forking
+            workers: Number of worker processes
+            reuse_port: Whether each worker binds its own SO_REUSEPORT socket
+            restart_delay: Seconds to wait before restarting a crashed worker
+        """
+        self.config = config
+        self.drain = drain
+        self.grace_period = grace_period
+        self.shared_state = shared_state
+        self.workers = workers
+        self.reuse_port = reuse_port and hasattr(socket, "SO_REUSEPORT")
+        self.restart_delay = restart_delay
+        self._children: Dict[int, int] = {}
+        self._stopping = False
+    
+    def run(self) -> None:
+        """
+        Start the workers and supervise them until they have all exited.
+        """
+        shared_socket = None if self.reuse_port else self._bind()
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+        
+        for index in range(self.workers):
+            self._spawn(index, shared_socket)
+        logger.info(f"Started {self.workers} gateway workers on {self.config.host}:{self.config.port}")
+        
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = self._children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            logger.warning(f"Worker {index} (pid {pid}) exited with status {status}, restarting")
+            time.sleep(self.restart_delay)
+            self._spawn(index, shared_socket)
+    
+    def _spawn(self, index: int, shared_socket: Optional[socket.socket]) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            return
+        
+        # Worker process: uvicorn installs its own signal handlers
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            self.shared_state.worker_index = index
+            self.shared_state.workers = self.workers
+            server = DrainingServer(self.config, self.drain, self.grace_period)
+            server.run(sockets=[shared_socket or self._bind()])
+        except BaseException:
+            logger.exception(f"Worker {index} failed")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    
+    def _bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.config.host else socket.AF_INET
+        # IPPROTO_TCP, or asyncio does not set TCP_NODELAY on accepted
+        # connections and keep-alive responses stall on delayed ACKs
+        sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self.config.host, self.config.port))
+        sock.listen(self.config.backlog)
+        sock.set_inheritable(True)
+        return sock
+    
+    def _handle_exit(self, sig, frame) -> None:
+        self._stopping = True
+        if sig == signal.SIGINT:
+            return
+        for pid in list(self._children):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
@@ -1,13 +1,50 @@
 import json
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
-import redis
-from redis.exceptions import RedisError
+import redis.asyncio
+from redis.exceptions import RedisError, WatchError
 
+from domain.entities.bulk_operation import BulkOperation, BulkOperationResult
+from domain.entities.registry_change import RegistryChange, RegistryChangeType
 from domain.entities.service import Service
+from domain.repositories.errors import RegistryRevisionExpiredError, RepositoryError
 from domain.repositories.service_registry import ServiceRegistryRepository
-from infrastructure.exceptions import RepositoryError
+from domain.services.routing_table import RoutingTable
+
+
+# Applies a registry change and appends it to the change stream atomically.
+# The stream entry ID is "<revision>-0", so a revision maps directly onto a
+# stream position and watchers can resume with XREAD from "<revision>-0".
+#
+# Each name is indexed by a set of the IDs registered under it, so replicas
+# and versions of a service are added and removed independently.
+#
+# KEYS: service key, name index set, previous name index set (the same key if
+#       the name did not change), revision counter, change stream, health hash
+# ARGV: change type, service id, service json, stream max length, timestamp,
+#       number of changes following in the same batch
+_APPLY_CHANGE_SCRIPT = """
+local revision = redis.call('INCR', KEYS[4])
+if ARGV[1] == 'deleted' then
+    redis.call('DEL', KEYS[1])
+    redis.call('SREM', KEYS[2], ARGV[2])
+    redis.call('HDEL', KEYS[6], ARGV[2])
+else
+    redis.call('SET', KEYS[1], ARGV[3])
+    if KEYS[3] ~= KEYS[2] then
+        redis.call('SREM', KEYS[3], ARGV[2])
+    end
+    redis.call('SADD', KEYS[2], ARGV[2])
+end
+redis.call(
+    'XADD', KEYS[5], 'MAXLEN', '~', ARGV[4], revision .. '-0',
+    'type', ARGV[1], 'service_id', ARGV[2], 'service', ARGV[3], 'timestamp', ARGV[5],
+    'batch_remaining', ARGV[6]
+)
+return revision
+"""
 
 
 class RedisServiceRegistryRepository(ServiceRegistryRepository):
@@ -15,133 +52,208 @@ class RedisServiceRegistryRepository(ServiceRegistryRepository):
     Redis implementation of the service registry repository.
     """
     
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(
+        self,
+        redis_client: redis.asyncio.Redis,
+        change_log_size: int = 10000,
+        watch_block_timeout: float = 5.0,
+        bulk_retries: int = 5,
+    ):
         """
         Initialize the repository with a Redis client.
         
         Args:
-            redis_client: The Redis client to use for storage
+            redis_client: The asyncio Redis client to use for storage
+            change_log_size: Approximate number of changes kept in the change stream
+            watch_block_timeout: Seconds a change stream read waits for new entries
+                when watching without a timeout
+            bulk_retries: Attempts for a bulk write that races with other writers
         """
         self.redis = redis_client
         self.service_key_prefix = "service:"
-        self.service_name_index = "service_names"
+        self.service_name_index_prefix = "service_names:"
+        self.service_health_key = "service_health"
+        self.revision_key = "registry:revision"
+        self.changes_stream = "registry:changes"
+        self.change_log_size = change_log_size
+        self.watch_block_timeout = watch_block_timeout
+        self.bulk_retries = bulk_retries
+        self._apply_change = self.redis.register_script(_APPLY_CHANGE_SCRIPT)
     
     def _get_service_key(self, service_id: UUID) -> str:
         """Get the Redis key for a service."""
         return f"{self.service_key_prefix}{str(service_id)}"
     
-    def register(self, service: Service) -> Service:
+    def _get_name_key(self, name: str) -> str:
+        """Get the Redis key of the set of service IDs registered under a name."""
+        return f"{self.service_name_index_prefix}{name}"
+    
+    @staticmethod
+    def _decode(value) -> str:
+        """Decode a Redis reply that may be bytes."""
+        return value.decode() if isinstance(value, bytes) else value
+    
+    async def _record_change(
+        self,
+        change_type: RegistryChangeType,
+        service_id: UUID,
+        service: Optional[Service] = None,
+        name: str = "",
+        previous_name: str = "",
+        batch_remaining: int = 0,
+        client=None,
+    ):
+        """
+        Apply a change and append it to the change stream in one atomic step.
+        
+        Args:
+            change_type: The kind of change
+            service_id: The ID of the affected service
+            service: The new service state (None for deletions)
+            name: The service name to index (or unindex for deletions)
+            previous_name: The name currently indexed for this service, if different
+            batch_remaining: How many changes of the same batch follow this one
+            client: A pipeline to queue the change on instead of executing it
+        
+        Returns:
+            The new registry revision, or the pipeline when one is given
+        """
+        return await self._apply_change(
+            keys=[
+                self._get_service_key(service_id),
+                self._get_name_key(name),
+                self._get_name_key(previous_name or name),
+                self.revision_key,
+                self.changes_stream,
+                self.service_health_key,
+            ],
+            args=[
+                change_type.value,
+                str(service_id),
+                json.dumps(service.to_dict()) if service else "",
+                self.change_log_size,
+                datetime.utcnow().isoformat(),
+                batch_remaining,
+            ],
+            client=client,
+        )
+    
+    def _change_from_entry(self, entry_id, fields) -> RegistryChange:
+        """Build a RegistryChange from a change stream entry."""
+        fields = {self._decode(k): self._decode(v) for k, v in fields.items()}
+        return RegistryChange(
+            revision=int(self._decode(entry_id).split("-", 1)[0]),
+            change_type=RegistryChangeType(fields["type"]),
+            service_id=UUID(fields["service_id"]),
+            service=Service.from_dict(json.loads(fields["service"])) if fields.get("service") else None,
+            timestamp=datetime.fromisoformat(fields["timestamp"]) if fields.get("timestamp") else None,
+            batch_remaining=int(fields.get("batch_remaining") or 0),
+        )
+    
+    async def register(self, service: Service) -> Service:
         """
         Register a new service in Redis.
         
         Args:
             service: The service to register
-            
+        
         Returns:
             The registered service with its ID
-            
+        
         Raises:
             RepositoryError: If there is an error storing the service
         """
         try:
-            # Store service data
-            service_data = service.to_dict()
-            self.redis.set(
-                self._get_service_key(service.id),
-                json.dumps(service_data)
-            )
-            
-            # Add to name index
-            self.redis.hset(
-                self.service_name_index,
-                service.name,
-                str(service.id)
+            # Store service data, index it by name and record the change
+            await self._record_change(
+                RegistryChangeType.REGISTERED,
+                service.id,
+                service=service,
+                name=service.name,
             )
             
             return service
         except RedisError as e:
             raise RepositoryError(f"Failed to register service: {str(e)}")
     
-    def update(self, service_id: UUID, service: Service) -> Optional[Service]:
+    async def update(self, service_id: UUID, service: Service) -> Optional[Service]:
         """
         Update an existing service in Redis.
         
         Args:
             service_id: The ID of the service to update
             service: The updated service data
-            
+        
         Returns:
             The updated service if found, None otherwise
-            
+        
         Raises:
             RepositoryError: If there is an error updating the service
         """
         try:
             # Check if service exists
-            if not self.redis.exists(self._get_service_key(service_id)):
+            old_service = await self.get(service_id)
+            if not old_service:
                 return None
             
-            # Update service data
-            service_data = service.to_dict()
-            self.redis.set(
-                self._get_service_key(service_id),
-                json.dumps(service_data)
+            # Update service data, re-index the name if it changed and record the change
+            await self._record_change(
+                RegistryChangeType.UPDATED,
+                service_id,
+                service=service,
+                name=service.name,
+                previous_name=old_service.name,
             )
             
-            # Update name index if name changed
-            old_service = self.get(service_id)
-            if old_service and old_service.name != service.name:
-                self.redis.hdel(self.service_name_index, old_service.name)
-                self.redis.hset(self.service_name_index, service.name, str(service_id))
-            
             return service
         except RedisError as e:
             raise RepositoryError(f"Failed to update service: {str(e)}")
     
-    def delete(self, service_id: UUID) -> bool:
+    async def delete(self, service_id: UUID) -> bool:
         """
         Delete a service from Redis.
         
         Args:
             service_id: The ID of the service to delete
-            
+        
         Returns:
             True if the service was deleted, False otherwise
-            
+        
         Raises:
             RepositoryError: If there is an error deleting the service
         """
         try:
             # Get service to remove from name index
-            service = self.get(service_id)
+            service = await self.get(service_id)
             if not service:
                 return False
             
-            # Delete service data
-            self.redis.delete(self._get_service_key(service_id))
-            
-            # Remove from name index
-            self.redis.hdel(self.service_name_index, service.name)
+            # Delete service data, remove it from the name index and record the change
+            await self._record_change(
+                RegistryChangeType.DELETED,
+                service_id,
+                name=service.name,
+            )
             
             return True
         except RedisError as e:
             raise RepositoryError(f"Failed to delete service: {str(e)}")
     
-    def get(self, service_id: UUID) -> Optional[Service]:
+    async def get(self, service_id: UUID) -> Optional[Service]:
         """
         Get a service by ID from Redis.
         
         Args:
             service_id: The ID of the service to retrieve
-            
+        
         Returns:
             The service if found, None otherwise
-            
+        
         Raises:
             RepositoryError: If there is an error retrieving the service
         """
         try:
-            service_data = self.redis.get(self._get_service_key(service_id))
+            service_data = await self.redis.get(self._get_service_key(service_id))
             if not service_data:
                 return None
             
@@ -149,70 +261,298 @@ class RedisServiceRegistryRepository(ServiceRegistryRepository):
         except RedisError as e:
             raise RepositoryError(f"Failed to get service: {str(e)}")
     
-    def get_by_name(self, name: str) -> Optional[Service]:
+    async def get_by_name(self, name: str) -> Optional[Service]:
         """
         Get a service by name from Redis.
         
+        When several versions are registered an instance of the highest
+        one is returned, preferring active instances.
+        
         Args:
             name: The name of the service to retrieve
-            
+        
         Returns:
             The service if found, None otherwise
-            
+        
         Raises:
             RepositoryError: If there is an error retrieving the service
         """
         try:
-            service_id = self.redis.hget(self.service_name_index, name)
-            if not service_id:
+            service_ids = await self.redis.smembers(self._get_name_key(name))
+            if not service_ids:
+                return None
+            
+            keys = [self._get_service_key(UUID(self._decode(service_id))) for service_id in service_ids]
+            services = [
+                Service.from_dict(json.loads(service_data))
+                for service_data in await self.redis.mget(keys)
+                if service_data
+            ]
+            if not services:
                 return None
             
-            return self.get(UUID(service_id.decode()))
+            highest = max(Service.version_key(service.version) for service in services)
+            return min(
+                (service for service in services if Service.version_key(service.version) == highest),
+                key=lambda service: (not service.is_active, service.id),
+            )
         except RedisError as e:
             raise RepositoryError(f"Failed to get service by name: {str(e)}")
     
-    def list(self) -> List[Service]:
+    async def list(self) -> List[Service]:
         """
         List all registered services from Redis.
         
         Returns:
             A list of all registered services
-            
+        
         Raises:
             RepositoryError: If there is an error listing services
         """
         try:
-            services = []
-            for key in self.redis.scan_iter(f"{self.service_key_prefix}*"):
-                service_data = self.redis.get(key)
-                if service_data:
-                    services.append(Service.from_dict(json.loads(service_data)))
-            return services
+            keys = [key async for key in self.redis.scan_iter(f"{self.service_key_prefix}*")]
+            if not keys:
+                return []
+            
+            return [
+                Service.from_dict(json.loads(service_data))
+                for service_data in await self.redis.mget(keys)
+                if service_data
+            ]
         except RedisError as e:
             raise RepositoryError(f"Failed to list services: {str(e)}")
     
-    def check_health(self, service_id: UUID) -> str:
+    async def get_service_for_path(self, path: str) -> Optional[Service]:
         """
-        Check the health status of a service.
+        Get the active service with the longest route prefix matching a path.
+        
+        Reads the full registry, so the gateway only falls back to this
+        when its routing table has no match.
         
         Args:
-            service_id: The ID of the service to check
-            
+            path: The request path
+        
         Returns:
-            The health status message
+            The highest version among the matching services, None if none match
+        
+        Raises:
+            RepositoryError: If there is an error listing services
+        """
+        services = RoutingTable(await self.list()).match(path)
+        if not services:
+            return None
+        return max(services, key=lambda service: Service.version_key(service.version))
+    
+    async def get_service_health(self, service_id: UUID) -> Dict[str, Any]:
+        """
+        Get the last reported health status of a service.
+        
+        Args:
+            service_id: The ID of the service
+        
+        Returns:
+            The reported status; services that never reported one count
+            as healthy while they are active
+        
+        Raises:
+            RepositoryError: If there is an error reading the status
+        """
+        try:
+            health = await self.redis.hget(self.service_health_key, str(service_id))
+            if health:
+                return json.loads(health)
             
+            service = await self.get(service_id)
+            return {"healthy": service is not None and service.is_active}
+        except RedisError as e:
+            raise RepositoryError(f"Failed to get service health: {str(e)}")
+    
+    async def update_service_health(self, service_id: UUID, health: Dict[str, Any]) -> None:
+        """
+        Store the health status of a registered service.
+        
+        Args:
+            service_id: The ID of the service
+            health: The status to store
+        
         Raises:
-            RepositoryError: If there is an error checking service health
+            RepositoryError: If there is an error storing the status
         """
         try:
-            service = self.get(service_id)
-            if not service:
-                return "Service not found"
+            if await self.redis.exists(self._get_service_key(service_id)):
+                await self.redis.hset(self.service_health_key, str(service_id), json.dumps(health))
+        except RedisError as e:
+            raise RepositoryError(f"Failed to update service health: {str(e)}")
+    
+    async def bulk_apply(self, operations: List[BulkOperation]) -> List[BulkOperationResult]:
+        """
+        Apply a batch of register, update and delete operations in one
+        pipelined MULTI/EXEC transaction.
+        
+        The touched service keys are WATCHed while the batch is planned, so
+        a concurrent write to one of them makes the transaction retry
+        instead of applying a plan based on stale data.
+        
+        Args:
+            operations: The operations to apply, in order
+        
+        Returns:
+            One result per operation, in the same order
+        
+        Raises:
+            RepositoryError: If there is an error writing the batch
+        """
+        if not operations:
+            return []
+        
+        keys = list(dict.fromkeys(self._get_service_key(op.service_id) for op in operations))
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for _ in range(self.bulk_retries):
+                    try:
+                        await pipe.watch(*keys)
+                        current = dict(zip(keys, await pipe.mget(keys)))
+                        results, planned = self._plan_bulk(operations, current)
+                        
+                        pipe.multi()
+                        for position, (index, operation, existing) in enumerate(planned):
+                            await self._record_change(
+                                operation.change_type,
+                                operation.service_id,
+                                service=operation.service,
+                                name=operation.service.name if operation.service else existing.name,
+                                previous_name=existing.name if existing else "",
+                                batch_remaining=len(planned) - position - 1,
+                                client=pipe,
+                            )
+                        revisions = await pipe.execute() if planned else []
+                        break
+                    except WatchError:
+                        continue
+                else:
+                    raise RepositoryError("Failed to apply bulk registry operations: concurrent modification")
+        except RedisError as e:
+            raise RepositoryError(f"Failed to apply bulk registry operations: {str(e)}")
+        
+        for (index, operation, _), revision in zip(planned, revisions):
+            results[index] = BulkOperationResult(
+                index=index,
+                service_id=operation.service_id,
+                success=True,
+                revision=int(revision),
+                service=operation.service,
+            )
+        return results
+    
+    def _plan_bulk(self, operations: List[BulkOperation], current: dict):
+        """
+        Validate a batch against the stored services.
+        
+        Returns:
+            The results list (pre-filled for rejected items) and the
+            (index, operation, existing service) triples to write
+        """
+        results: List[Optional[BulkOperationResult]] = [None] * len(operations)
+        planned = []
+        # Tracks each service's state as the batch progresses, so e.g. a
+        # delete after a register of the same ID in one batch is valid
+        state = {}
+        for index, operation in enumerate(operations):
+            if operation.service_id not in state:
+                data = current.get(self._get_service_key(operation.service_id))
+                state[operation.service_id] = Service.from_dict(json.loads(data)) if data else None
+            existing = state[operation.service_id]
             
-            if not service.is_active:
-                return "Service is inactive"
+            if operation.change_type != RegistryChangeType.REGISTERED and existing is None:
+                results[index] = BulkOperationResult.failed(index, operation.service_id, "Service not found")
+                continue
+            if operation.change_type != RegistryChangeType.DELETED and operation.service is None:
+                results[index] = BulkOperationResult.failed(index, operation.service_id, "Missing service data")
+                continue
             
-            # TODO: Implement actual health check by calling service.health_check_url
-            return "Service is healthy"
+            planned.append((index, operation, existing))
+            state[operation.service_id] = operation.service
+        return results, planned
+    
+    async def get_revision(self) -> int:
+        """
+        Get the current registry revision from Redis.
+        
+        Returns:
+            The revision of the most recent change, 0 if nothing has changed yet
+        
+        Raises:
+            RepositoryError: If there is an error reading the revision
+        """
+        try:
+            revision = await self.redis.get(self.revision_key)
+            return int(revision) if revision else 0
+        except RedisError as e:
+            raise RepositoryError(f"Failed to get registry revision: {str(e)}")
+    
+    async def _check_retained(self, since_revision: int) -> None:
+        """
+        Make sure every change after since_revision is still in the change stream.
+        
+        Raises:
+            RegistryRevisionExpiredError: If the stream has been trimmed past since_revision
+        """
+        current = int(await self.redis.get(self.revision_key) or 0)
+        if since_revision >= current:
+            return
+        
+        oldest = await self.redis.xrange(self.changes_stream, count=1)
+        oldest_revision = int(self._decode(oldest[0][0]).split("-", 1)[0]) if oldest else current + 1
+        if oldest_revision > since_revision + 1:
+            raise RegistryRevisionExpiredError(since_revision, oldest_revision)
+    
+    async def watch(
+        self,
+        since_revision: int,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[RegistryChange]:
+        """
+        Stream registry changes made after a given revision from the change stream.
+        
+        Reads with XREAD BLOCK, so Redis answers as soon as a change is
+        appended and an idle watch costs one pending read on one pooled
+        connection rather than a poll loop.
+        
+        Args:
+            since_revision: The last revision the caller has already applied
+            timeout: Stop after this many seconds without a new change;
+                wait indefinitely when None
+        
+        Returns:
+            An async iterator of registry changes
+        
+        Raises:
+            RegistryRevisionExpiredError: If the changes are no longer retained
+            RepositoryError: If there is an error reading the change stream
+        """
+        try:
+            await self._check_retained(since_revision)
         except RedisError as e:
-            raise RepositoryError(f"Failed to check service health: {str(e)}") 
\ No newline at end of file
+            raise RepositoryError(f"Failed to watch registry: {str(e)}")
+        
+        last_id = f"{since_revision}-0"
+        block = self.watch_block_timeout if timeout is None else timeout
+        while True:
+            try:
+                entries = await self.redis.xread(
+                    {self.changes_stream: last_id},
+                    count=100,
+                    block=max(1, int(block * 1000)),
+                )
+            except RedisError as e:
+                raise RepositoryError(f"Failed to watch registry: {str(e)}")
+            
+            if not entries:
+                if timeout is not None:
+                    return
+                continue
+            
+            for _, messages in entries:
+                for entry_id, fields in messages:
+                    last_id = self._decode(entry_id)
+                    yield self._change_from_entry(entry_id, fields)
@@ -1,69 +1,278 @@
-from typing import Dict, List, Optional
+import asyncio
+from bisect import insort
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple, Union
 from uuid import UUID
 
+from domain.entities.bulk_operation import BulkOperation, BulkOperationResult
+from domain.entities.registry_change import RegistryChange, RegistryChangeType
 from domain.entities.service import Service
+from domain.repositories.errors import RegistryRevisionExpiredError
 from domain.repositories.service_registry import ServiceRegistryRepository
+from domain.services.routing_table import RoutingTable
 
 
 class InMemoryServiceRegistryRepository(ServiceRegistryRepository):
     """
     In-memory implementation of the service registry repository.
+    
+    Besides the primary ID map it maintains secondary indexes so that
+    lookups stay O(1) (or O(log n) for ordered versions) with tens of
+    thousands of services:
+    
+    - name -> version -> IDs of the instances (replicas) of that version
+    - name -> versions, sorted
+    - IDs of active services
+    - route prefix -> service IDs
+    
+    Writes hold a lock while updating every index and recording the
+    change, so concurrent coroutines never observe a half-applied write
+    and revisions are assigned in the order writes are applied. Reads
+    never await, so they always see a consistent snapshot.
     """
     
-    def __init__(self):
+    def __init__(self, change_log_size: int = 10000):
         self.services: Dict[UUID, Service] = {}
+        self.revision = 0
+        self._ids_by_name: Dict[str, Dict[str, Set[UUID]]] = {}
+        self._versions_by_name: Dict[str, List[str]] = {}
+        self._active_ids: Set[UUID] = set()
+        self._ids_by_route_prefix: Dict[str, Set[UUID]] = {}
+        self._health: Dict[UUID, Dict[str, Any]] = {}
+        self._write_lock = asyncio.Lock()
+        self._changes: Deque[RegistryChange] = deque(maxlen=change_log_size)
+        self._changed = asyncio.Condition()
     
-    async def register(self, service: Service) -> Service:
+    def _index(self, service: Service) -> None:
         """
-        Register a new service.
+        Add a service to the primary map and every secondary index.
         """
         self.services[service.id] = service
-        return service
+        
+        versions = self._ids_by_name.setdefault(service.name, {})
+        if service.version not in versions:
+            insort(
+                self._versions_by_name.setdefault(service.name, []),
+                service.version,
+                key=Service.version_key,
+            )
+        versions.setdefault(service.version, set()).add(service.id)
+        
+        if service.is_active:
+            self._active_ids.add(service.id)
+        
+        self._ids_by_route_prefix.setdefault(RoutingTable.route_prefix(service), set()).add(service.id)
+    
+    def _unindex(self, service: Service) -> None:
+        """
+        Remove a service from the primary map and every secondary index.
+        """
+        self.services.pop(service.id, None)
+        
+        versions = self._ids_by_name.get(service.name, {})
+        ids = versions.get(service.version)
+        if ids is not None:
+            ids.discard(service.id)
+            if not ids:
+                del versions[service.version]
+                self._versions_by_name[service.name].remove(service.version)
+                if not versions:
+                    del self._ids_by_name[service.name]
+                    del self._versions_by_name[service.name]
+        
+        self._active_ids.discard(service.id)
+        
+        prefix = RoutingTable.route_prefix(service)
+        ids = self._ids_by_route_prefix.get(prefix)
+        if ids is not None:
+            ids.discard(service.id)
+            if not ids:
+                del self._ids_by_route_prefix[prefix]
+    
+    async def _record_changes(self, changes: List[Tuple[RegistryChangeType, UUID, Optional[Service]]]) -> List[int]:
+        """
+        Bump the revision for each change, append them to the log as one
+        batch and wake up watchers.
+        
+        Returns:
+            The revision assigned to each change
+        """
+        revisions = []
+        async with self._changed:
+            for position, (change_type, service_id, service) in enumerate(changes):
+                self.revision += 1
+                self._changes.append(RegistryChange(
+                    self.revision,
+                    change_type,
+                    service_id,
+                    service,
+                    batch_remaining=len(changes) - position - 1,
+                ))
+                revisions.append(self.revision)
+            self._changed.notify_all()
+        return revisions
+    
+    def _apply_register(self, service: Service) -> None:
+        """
+        Index a registered service; the caller must hold the write lock.
+        
+        Instances are keyed by ID, so registering a replica of a version
+        that is already registered adds to it; re-registering an ID
+        replaces that instance.
+        """
+        existing = self.services.get(service.id)
+        if existing:
+            self._unindex(existing)
+        self._index(service)
     
-    async def update(self, service_id: UUID, service_data: Dict) -> Optional[Service]:
+    def _apply_update(self, service_id: UUID, service_data: Union[Service, Dict]) -> Optional[Service]:
         """
-        Update an existing service.
+        Re-index an updated service; the caller must hold the write lock.
         """
-        if service_id not in self.services:
+        if isinstance(service_data, Service):
+            service_data = service_data.to_dict()
+        
+        service = self.services.get(service_id)
+        if not service:
             return None
         
-        service = self.services[service_id]
         updated_service = Service(
             id=service.id,
             name=service_data.get("name", service.name),
-            description=service_data.get("description", service.description),
-            base_url=service_data.get("base_url", service.base_url),
+            version=service_data.get("version", service.version),
+            host=service_data.get("host", service.host),
+            port=service_data.get("port", service.port),
             health_check_url=service_data.get("health_check_url", service.health_check_url),
             is_active=service_data.get("is_active", service.is_active),
-            metadata=service_data.get("metadata", service.metadata)
+            metadata=service_data.get("metadata", service.metadata),
+            created_at=service.created_at,
+            updated_at=datetime.utcnow(),
         )
-        self.services[service_id] = updated_service
+        self._unindex(service)
+        self._index(updated_service)
         return updated_service
     
-    async def delete(self, service_id: UUID) -> bool:
+    def _apply_delete(self, service_id: UUID) -> bool:
         """
-        Delete a service.
+        Unindex a deleted service; the caller must hold the write lock.
         """
-        if service_id not in self.services:
+        service = self.services.get(service_id)
+        if not service:
             return False
         
-        del self.services[service_id]
+        self._unindex(service)
+        self._health.pop(service_id, None)
         return True
     
+    async def register(self, service: Service) -> Service:
+        """
+        Register a new service.
+        """
+        async with self._write_lock:
+            self._apply_register(service)
+            await self._record_changes([(RegistryChangeType.REGISTERED, service.id, service)])
+        return service
+    
+    async def update(self, service_id: UUID, service_data: Union[Service, Dict]) -> Optional[Service]:
+        """
+        Update an existing service from a Service or a dict of changed fields.
+        """
+        async with self._write_lock:
+            updated_service = self._apply_update(service_id, service_data)
+            if updated_service:
+                await self._record_changes([(RegistryChangeType.UPDATED, service_id, updated_service)])
+        return updated_service
+    
+    async def delete(self, service_id: UUID) -> bool:
+        """
+        Delete a service.
+        """
+        async with self._write_lock:
+            deleted = self._apply_delete(service_id)
+            if deleted:
+                await self._record_changes([(RegistryChangeType.DELETED, service_id, None)])
+        return deleted
+    
+    async def bulk_apply(self, operations: List[BulkOperation]) -> List[BulkOperationResult]:
+        """
+        Apply a batch of register, update and delete operations under a
+        single hold of the write lock, recording them as one batch.
+        """
+        results = []
+        # One change per successful result, in order
+        changes = []
+        async with self._write_lock:
+            for index, operation in enumerate(operations):
+                if operation.change_type == RegistryChangeType.REGISTERED:
+                    self._apply_register(operation.service)
+                    service = operation.service
+                    changes.append((RegistryChangeType.REGISTERED, operation.service_id, service))
+                elif operation.change_type == RegistryChangeType.UPDATED:
+                    service = self._apply_update(operation.service_id, operation.service)
+                    if not service:
+                        results.append(BulkOperationResult.failed(index, operation.service_id, "Service not found"))
+                        continue
+                    changes.append((RegistryChangeType.UPDATED, operation.service_id, service))
+                else:
+                    if not self._apply_delete(operation.service_id):
+                        results.append(BulkOperationResult.failed(index, operation.service_id, "Service not found"))
+                        continue
+                    service = None
+                    changes.append((RegistryChangeType.DELETED, operation.service_id, None))
+                
+                results.append(BulkOperationResult(index, operation.service_id, True, service=service))
+            
+            revisions = await self._record_changes(changes) if changes else []
+        
+        successful = (result for result in results if result.success)
+        for result, revision in zip(successful, revisions):
+            result.revision = revision
+        return results
+    
     async def get(self, service_id: UUID) -> Optional[Service]:
         """
         Get a service by ID.
         """
         return self.services.get(service_id)
     
+    def _instance(self, ids: Set[UUID]) -> Service:
+        """
+        Pick one instance out of the replicas of a version, preferring active ones.
+        """
+        return self.services[min(ids, key=lambda service_id: (service_id not in self._active_ids, service_id))]
+    
     async def get_by_name(self, name: str) -> Optional[Service]:
         """
         Get a service by name.
+        
+        When several versions are registered an instance of the highest
+        one is returned.
         """
-        for service in self.services.values():
-            if service.name == name:
-                return service
-        return None
+        versions = self._versions_by_name.get(name)
+        if not versions:
+            return None
+        return self._instance(self._ids_by_name[name][versions[-1]])
+    
+    async def get_by_name_and_version(self, name: str, version: str) -> Optional[Service]:
+        """
+        Get an instance of a specific version of a service.
+        """
+        ids = self._ids_by_name.get(name, {}).get(version)
+        return self._instance(ids) if ids else None
+    
+    async def list_instances(self, name: str, version: str) -> List[Service]:
+        """
+        List the registered instances of a specific version of a service.
+        """
+        return [self.services[service_id] for service_id in self._ids_by_name.get(name, {}).get(version, ())]
+    
+    async def list_versions(self, name: str) -> List[str]:
+        """
+        List the registered versions of a service, lowest first.
+        """
+        return list(self._versions_by_name.get(name, []))
     
     async def list(self) -> List[Service]:
         """
@@ -71,21 +280,74 @@ class InMemoryServiceRegistryRepository(ServiceRegistryRepository):
         """
         return list(self.services.values())
     
-    async def check_health(self, service_id: UUID) -> Dict:
+    async def list_active(self) -> List[Service]:
         """
-        Check the health of a service.
+        List the active services.
         """
-        service = await self.get(service_id)
-        if not service:
-            return {
-                "status": "error",
-                "message": "Service not found"
-            }
+        return [self.services[service_id] for service_id in self._active_ids]
+    
+    async def get_service_for_path(self, path: str) -> Optional[Service]:
+        """
+        Get the active service with the longest route prefix matching a path.
         
-        # In a real implementation, this would make an HTTP request to the service's health check endpoint
-        return {
-            "status": "ok" if service.is_active else "error",
-            "service_id": str(service.id),
-            "service_name": service.name,
-            "is_active": service.is_active
-        } 
\ No newline at end of file
+        Walks the path's own prefixes, so the cost depends on path depth,
+        not on the number of registered services.
+        """
+        segments = path.split("?", 1)[0].strip("/").split("/")
+        for length in range(len(segments), -1, -1):
+            ids = self._ids_by_route_prefix.get("/" + "/".join(segments[:length]))
+            if not ids:
+                continue
+            active = [self.services[service_id] for service_id in ids if service_id in self._active_ids]
+            if active:
+                return max(active, key=lambda service: Service.version_key(service.version))
+        return None
+    
+    async def get_service_health(self, service_id: UUID) -> Dict[str, Any]:
+        """
+        Get the last reported health status of a service.
+        """
+        if service_id in self._health:
+            return self._health[service_id]
+        return {"healthy": service_id in self._active_ids}
+    
+    async def update_service_health(self, service_id: UUID, health: Dict[str, Any]) -> None:
+        """
+        Update the health status of a service.
+        """
+        if service_id in self.services:
+            self._health[service_id] = health
+    
+    async def get_revision(self) -> int:
+        """
+        Get the current registry revision.
+        """
+        return self.revision
+    
+    async def watch(
+        self,
+        since_revision: int,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[RegistryChange]:
+        """
+        Stream registry changes made after a given revision.
+        """
+        last_revision = since_revision
+        while True:
+            oldest_revision = self._changes[0].revision if self._changes else self.revision + 1
+            if last_revision < self.revision and oldest_revision > last_revision + 1:
+                raise RegistryRevisionExpiredError(last_revision, oldest_revision)
+            
+            # Revisions in the log are contiguous, so the new tail starts at a known offset
+            start = max(0, last_revision + 1 - oldest_revision)
+            for change in list(islice(self._changes, start, None)):
+                last_revision = change.revision
+                yield change
+            
+            async with self._changed:
+                if self.revision > last_revision:
+                    continue
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    return
@@ -0,0 +1,74 @@
+from infrastructure.shared.memory import SharedSlotTable, monotonic_ms
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker shared by all worker processes.
+    
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail fast for ``recovery_timeout`` seconds. Then one request
+    is let through as a probe: success closes the circuit, failure opens
+    it again. The state lives in a shared slot table, so failures seen by
+    any worker count towards the threshold and all workers stop sending
+    traffic at the same time.
+    """
+    
+    # Consecutive failures, open until (ms), probe in flight until (ms)
+    FIELDS = 3
+    
+    def __init__(self, table: SharedSlotTable, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+        
+        Args:
+            table: Shared state, created before workers are forked
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before a probe
+        """
+        self.table = table
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout_ms = int(recovery_timeout * 1000)
+    
+    def allow(self, key: str) -> bool:
+        """
+        Check whether a request may be sent to an upstream.
+        """
+        now = monotonic_ms()
+        
+        def decide(fields):
+            failures, open_until, probe_until = fields
+            if not open_until:
+                return fields, True
+            if now < open_until or now < probe_until:
+                return fields, False
+            # Half-open: this request is the probe; others keep failing fast until it reports back
+            return [failures, open_until, now + self.recovery_timeout_ms], True
+        
+        return self.table.update(key, decide)
+    
+    def record_success(self, key: str) -> None:
+        """
+        Record a successful upstream call, closing the circuit.
+        """
+        self.table.update(key, lambda fields: ([0, 0, 0], None))
+    
+    def record_failure(self, key: str) -> None:
+        """
+        Record a failed upstream call.
+        """
+        now = monotonic_ms()
+        
+        def count(fields):
+            failures, open_until, _ = fields
+            failures += 1
+            if open_until or failures >= self.failure_threshold:
+                return [failures, now + self.recovery_timeout_ms, 0], None
+            return [failures, 0, 0], None
+        
+        self.table.update(key, count)
+    
+    def is_open(self, key: str) -> bool:
+        """
+        Check whether a circuit is open, without claiming a probe.
+        """
+        return bool(self.table.get(key)[1])
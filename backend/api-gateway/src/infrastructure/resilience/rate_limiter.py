@@ -0,0 +1,55 @@
+import time
+from typing import Tuple
+
+from infrastructure.shared.memory import SharedSlotTable
+
+
+class RateLimiter:
+    """
+    Sliding-window request limiter shared by all worker processes.
+    
+    Counts are kept per fixed window in a shared slot table; the current
+    rate is the current window's count plus the previous window's count
+    weighted by how much of it still overlaps the sliding window. Every
+    worker updates the same counters, so the limit holds for the gateway
+    instance as a whole.
+    """
+    
+    # Window number, requests in that window, requests in the window before
+    FIELDS = 3
+    
+    def __init__(self, table: SharedSlotTable, limit: int, period: float):
+        """
+        Initialize the limiter.
+        
+        Args:
+            table: Shared counters, created before workers are forked
+            limit: Requests allowed per period
+            period: Window length in seconds
+        """
+        self.table = table
+        self.limit = limit
+        self.period = period
+    
+    def hit(self, key: str) -> Tuple[bool, float]:
+        """
+        Count a request for a key.
+        
+        Returns:
+            Whether the request is allowed, and if not, the seconds until
+            the client should retry
+        """
+        now = time.monotonic()
+        window = int(now // self.period)
+        elapsed = (now % self.period) / self.period
+        
+        def count(fields):
+            counted_window, current, previous = fields
+            if counted_window != window:
+                previous = current if counted_window == window - 1 else 0
+                current = 0
+            if previous * (1 - elapsed) + current >= self.limit:
+                return [window, current, previous], (False, self.period * (1 - elapsed))
+            return [window, current + 1, previous], (True, 0.0)
+        
+        return self.table.update(key, count)
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import os
+import re
+import tomllib
+from typing import Any, Callable, Mapping, Optional, Tuple
+
+from domain.services.route_rules import RouteRules
+
+logger = logging.getLogger(__name__)
+
+# ${NAME} or ${NAME:-default} in string values
+VARIABLE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-([^}]*))?\}")
+
+
+class RouteFileWatcher:
+    """
+    Loads the declarative route file and reloads it when it changes.
+    
+    The file is TOML with an optional ``[defaults]`` table and a
+    ``[[routes]]`` list. String values may refer to variables as
+    ``${NAME}`` or ``${NAME:-default}``, so upstream URLs can still be set
+    per environment.
+    
+    The watcher polls the file's modification time, size and inode (the
+    inode catches files replaced by rename, as config map updates are).
+    A changed file is parsed and compiled off to the side and handed to
+    ``on_change`` only if it is valid; an invalid file is logged and the
+    current routes stay in place. Nothing else is touched by a reload, so
+    pooled upstream connections and cached responses survive it.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[RouteRules], None],
+        variables: Optional[Mapping[str, Any]] = None,
+        interval: float = 2.0,
+    ):
+        """
+        Initialize the watcher.
+        
+        Args:
+            path: The route file
+            on_change: Called with the compiled routes after every successful load
+            variables: Values for ``${NAME}`` references
+            interval: Seconds between checks for changes
+        """
+        self.path = path
+        self.on_change = on_change
+        self.variables = dict(variables or {})
+        self.interval = interval
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def load(self) -> RouteRules:
+        """
+        Read and compile the route file, then hand it to ``on_change``.
+        
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not valid TOML or declares invalid routes
+        """
+        signature = self._stat()
+        with open(self.path, "rb") as f:
+            try:
+                document = tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise ValueError(f"Invalid TOML: {e}") from e
+        rules = RouteRules.from_dict(self._expand(document), version=f"{signature[0]}")
+        self._signature = signature
+        self.on_change(rules)
+        logger.info(f"Loaded {len(rules)} routes from {self.path}")
+        return rules
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Load the file if it changed since the last load.
+        
+        Errors are logged, not raised; the last good routes stay in use.
+        
+        Returns:
+            Whether new routes were loaded
+        """
+        try:
+            if self._stat() == self._signature:
+                return False
+            self.load()
+            return True
+        except (OSError, ValueError) as e:
+            logger.error(f"Keeping the current routes, could not load {self.path}: {e}")
+            # Do not retry the same broken file on every check
+            try:
+                self._signature = self._stat()
+            except OSError:
+                pass
+            return False
+    
+    def start(self) -> None:
+        """
+        Start watching the file from the running event loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self) -> None:
+        """
+        Stop watching the file.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.reload_if_changed()
+    
+    def _stat(self) -> Tuple[int, int, int]:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+    
+    def _expand(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return VARIABLE.sub(self._substitute, value)
+        if isinstance(value, dict):
+            return {key: self._expand(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._expand(item) for item in value]
+        return value
+    
+    def _substitute(self, match: "re.Match") -> str:
+        name, default = match.group(1), match.group(2)
+        value = self.variables.get(name)
+        if value is None or value == "":
+            if default is None:
+                raise ValueError(f"Variable {name} is not set")
+            return default
+        return str(value)
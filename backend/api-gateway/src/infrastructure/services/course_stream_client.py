@@ -0,0 +1,129 @@
+import inspect
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import grpc
+from google.protobuf.field_mask_pb2 import FieldMask
+from google.protobuf.json_format import MessageToDict
+
+from lms_shared.deadline import time_remaining
+# Generated from course-service/proto/course.proto, see docs/development/setup.md
+from infrastructure.proto import course_pb2, course_pb2_grpc
+
+# Keeps fields at their default value; the option was renamed in protobuf 5.26
+DEFAULT_VALUE_FIELDS = (
+    {"always_print_fields_with_no_presence": True}
+    if "always_print_fields_with_no_presence" in inspect.signature(MessageToDict).parameters
+    else {"including_default_value_fields": True}
+)
+
+
+class CourseStreamClient:
+    """
+    Client for the course-service ``WatchCourse`` server-streaming RPC and
+    the course read RPCs.
+    
+    Read RPCs take the fields to return, which course-service applies as a
+    ``FieldMask`` so unrequested fields are neither built nor sent. They
+    carry the time left of the request's deadline as their gRPC deadline.
+    """
+    
+    def __init__(self, target: str):
+        """
+        Initialize the client.
+        
+        Args:
+            target: The course-service gRPC address, e.g. ``course_service:50051``
+        """
+        self.target = target
+        # Created on first use, so it binds to the serving event loop
+        self._channel = None
+        self._stub = None
+    
+    def _get_stub(self) -> course_pb2_grpc.CourseServiceStub:
+        if self._stub is None:
+            self._channel = grpc.aio.insecure_channel(
+                self.target,
+                options=[
+                    # Keep idle streams alive through load balancers and NAT
+                    ("grpc.keepalive_time_ms", 30000),
+                    ("grpc.keepalive_permit_without_calls", 1),
+                ],
+            )
+            self._stub = course_pb2_grpc.CourseServiceStub(self._channel)
+        return self._stub
+    
+    async def watch_course(self, course_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a course's state; the current state first, then each update.
+        """
+        call = self._get_stub().WatchCourse(course_pb2.WatchCourseRequest(course_id=course_id))
+        try:
+            async for course in call:
+                yield MessageToDict(course, preserving_proto_field_name=True)
+        finally:
+            call.cancel()
+    
+    async def get_course(self, course_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get a course.
+        
+        Args:
+            course_id: The course ID
+            fields: Course fields to return; all if None
+        
+        Raises:
+            grpc.aio.AioRpcError: If the call fails, e.g. with NOT_FOUND
+        """
+        course = await self._get_stub().GetCourse(course_pb2.GetCourseRequest(
+            course_id=course_id,
+            read_mask=FieldMask(paths=fields) if fields else None,
+        ), timeout=time_remaining())
+        return self._to_dict(course)
+    
+    async def list_courses(
+        self,
+        page: int,
+        page_size: int,
+        fields: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        **filters: Any,
+    ) -> Dict[str, Any]:
+        """
+        List courses.
+        
+        Args:
+            page: The page, from 1
+            page_size: Courses per page
+            fields: Fields of each course to return; all if None
+            tags: Only courses with these tags
+            filters: ``ListCoursesRequest`` filters that are set, e.g. ``status="PUBLISHED"``
+        
+        Raises:
+            grpc.aio.AioRpcError: If the call fails
+            ValueError: If a filter has an invalid value
+        """
+        if "status" in filters:
+            filters["status"] = course_pb2.CourseStatus.Value(filters["status"])
+        result = await self._get_stub().ListCourses(course_pb2.ListCoursesRequest(
+            page=page,
+            page_size=page_size,
+            tags=tags or [],
+            read_mask=FieldMask(paths=fields) if fields else None,
+            **filters,
+        ), timeout=time_remaining())
+        return self._to_dict(result)
+    
+    @staticmethod
+    def _to_dict(message) -> Dict[str, Any]:
+        # Fields at their default value are kept, so a course in DRAFT
+        # (status 0) still has a status; masked-out fields are pruned by the caller
+        return MessageToDict(message, preserving_proto_field_name=True, **DEFAULT_VALUE_FIELDS)
+    
+    async def aclose(self) -> None:
+        """
+        Close the gRPC channel.
+        """
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+            self._stub = None
\ No newline at end of file
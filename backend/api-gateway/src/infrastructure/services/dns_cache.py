@@ -0,0 +1,199 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+from lms_shared.monitoring.metrics import metrics as default_metrics
+
+try:
+    import aiodns
+except ImportError:  # Without it TTLs are unknown and default_ttl applies
+    aiodns = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    """
+    The addresses of one host and when they need refreshing.
+    """
+    
+    __slots__ = ("addresses", "refresh_at", "expires_at", "stale_until", "next_index", "refreshing")
+    
+    def __init__(self):
+        self.addresses: List[str] = []
+        self.refresh_at = 0.0
+        self.expires_at = 0.0
+        self.stale_until = 0.0
+        self.next_index = 0
+        self.refreshing: Optional[asyncio.Task] = None
+
+
+class DnsCache:
+    """
+    Caches upstream host addresses so connecting does not wait on DNS.
+    
+    Record TTLs are honored, clamped to ``[min_ttl, max_ttl]``; they are
+    known when ``aiodns`` is installed, otherwise the system resolver is
+    used and ``default_ttl`` applies. Once ``refresh_ahead`` of an entry's
+    TTL is left it is refreshed in the background while requests keep
+    using it, so only the first lookup of a host and lookups of expired
+    entries wait for the resolver. When a lookup fails, the last known
+    addresses keep being served for up to ``max_stale`` seconds.
+    
+    ``resolve`` hands out a host's A and AAAA records in turn, so new
+    upstream connections are spread over all of them.
+    """
+    
+    def __init__(
+        self,
+        min_ttl: float = 5.0,
+        max_ttl: float = 300.0,
+        default_ttl: float = 30.0,
+        refresh_ahead: float = 0.2,
+        max_stale: float = 600.0,
+        metrics=None,
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            min_ttl: Seconds an entry is kept at least, whatever its TTL
+            max_ttl: Seconds an entry is kept at most, whatever its TTL
+            default_ttl: Seconds an entry is kept when the TTL is unknown
+            refresh_ahead: Share of the TTL left when the background refresh starts
+            max_stale: Seconds past expiry an entry is served while lookups fail
+            metrics: Metrics registry to count lookups in
+        """
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.default_ttl = default_ttl
+        self.refresh_ahead = refresh_ahead
+        self.max_stale = max_stale
+        self._entries: Dict[str, _Entry] = {}
+        self._resolver = None
+        
+        metrics = metrics or default_metrics
+        self._lookups = metrics.counter("gateway_dns_lookups_total", "Upstream DNS lookups by result", ("result",))
+        self._stale = metrics.counter("gateway_dns_stale_total", "Addresses served past their TTL because lookups failed")
+    
+    async def resolve(self, host: str) -> str:
+        """
+        Get an address for a host, taking turns over all of its addresses.
+        
+        Raises:
+            OSError: If the host cannot be resolved and no address is cached
+        """
+        addresses = await self.resolve_all(host)
+        entry = self._entries.get(host)
+        if entry is None or len(addresses) == 1:
+            return addresses[0]
+        index = entry.next_index % len(addresses)
+        entry.next_index = index + 1
+        return addresses[index]
+    
+    async def resolve_all(self, host: str) -> List[str]:
+        """
+        Get every address of a host.
+        
+        Raises:
+            OSError: If the host cannot be resolved and no address is cached
+        """
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        
+        entry = self._entries.get(host)
+        if entry is None:
+            entry = self._entries[host] = _Entry()
+        
+        now = time.monotonic()
+        if now < entry.refresh_at:
+            return entry.addresses
+        
+        refreshing = entry.refreshing
+        if refreshing is None:
+            refreshing = entry.refreshing = asyncio.get_running_loop().create_task(self._refresh(host, entry))
+        if now < entry.expires_at:
+            # Still valid: serve it while the refresh runs
+            return entry.addresses
+        
+        # Expired or never resolved: wait for the lookup; the task is
+        # shielded so a cancelled request does not cancel it for everyone
+        await asyncio.shield(refreshing)
+        if entry.addresses and time.monotonic() < entry.stale_until:
+            return entry.addresses
+        raise socket.gaierror(socket.EAI_NONAME, f"Could not resolve {host}")
+    
+    async def _refresh(self, host: str, entry: _Entry) -> None:
+        try:
+            addresses, ttl = await self._lookup(host)
+        except (OSError, asyncio.TimeoutError) as e:
+            self._lookups.inc(result="error")
+            now = time.monotonic()
+            if entry.addresses and now < entry.stale_until:
+                logger.warning(f"DNS lookup of {host} failed, serving cached addresses: {e}")
+                self._stale.inc()
+                # Try again after min_ttl rather than on every request
+                entry.refresh_at = entry.expires_at = min(now + self.min_ttl, entry.stale_until)
+            else:
+                logger.warning(f"DNS lookup of {host} failed: {e}")
+                entry.refresh_at = entry.expires_at = 0.0
+            return
+        except Exception:
+            # Leave no broken entry behind for unexpected resolver errors
+            entry.refresh_at = entry.expires_at = 0.0
+            raise
+        finally:
+            entry.refreshing = None
+        
+        self._lookups.inc(result="ok")
+        ttl = min(self.max_ttl, max(self.min_ttl, ttl if ttl is not None else self.default_ttl))
+        now = time.monotonic()
+        entry.addresses = addresses
+        entry.expires_at = now + ttl
+        entry.refresh_at = entry.expires_at - ttl * self.refresh_ahead
+        entry.stale_until = entry.expires_at + self.max_stale
+    
+    async def _lookup(self, host: str) -> Tuple[List[str], Optional[float]]:
+        """
+        Resolve a host's A and AAAA records.
+        
+        Returns:
+            The addresses and the lowest record TTL, or None for the TTL if unknown
+        """
+        if aiodns is not None:
+            if self._resolver is None:
+                self._resolver = aiodns.DNSResolver()
+            results = await asyncio.gather(
+                self._resolver.query(host, "A"),
+                self._resolver.query(host, "AAAA"),
+                return_exceptions=True,
+            )
+            records = [record for result in results if isinstance(result, list) for record in result]
+            if records:
+                return _unique(record.host for record in records), min(record.ttl for record in records)
+            # Names only the system resolver knows, such as /etc/hosts entries
+        
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = _unique(info[4][0] for info in infos)
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, f"No addresses for {host}")
+        return addresses, None
+    
+    async def aclose(self) -> None:
+        """
+        Cancel refreshes in progress.
+        """
+        for entry in self._entries.values():
+            if entry.refreshing is not None:
+                entry.refreshing.cancel()
+
+
+def _unique(addresses) -> List[str]:
+    """Drop duplicate addresses, keeping the resolver's order."""
+    return list(dict.fromkeys(addresses))
@@ -0,0 +1,210 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+from config.constants import CONNECT_TIMEOUT, REQUEST_TIMEOUT
+from domain.entities.request import Request
+from domain.entities.response import Response
+from domain.entities.service import Service
+from lms_shared.deadline import HEADER_REQUEST_TIMEOUT, time_remaining, timeout_header_value
+from infrastructure.services.dns_cache import DnsCache
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe a single connection and must not be forwarded
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+    "content-length",
+    # Each hop sends what is left of the budget
+    HEADER_REQUEST_TIMEOUT.lower(),
+}
+
+# Response headers that describe the body as the upstream encoded it; httpx
+# hands over the decoded body, so they no longer apply
+DECODED_BODY_HEADERS = {"content-encoding"}
+
+
+def _forwardable(headers: Dict[str, str]) -> Dict[str, str]:
+    """Drop hop-by-hop headers."""
+    return {name: value for name, value in headers.items() if name.lower() not in HOP_BY_HOP_HEADERS}
+
+
+class UpstreamClient:
+    """
+    Forwards requests to upstream services over pooled keep-alive
+    connections.
+    
+    With a DNS cache, upstream hosts are resolved through it and requests
+    go to the address it hands out, with the host name in the ``Host``
+    header. Connections are pooled per address, so they are spread over
+    every address of a host and new ones never wait on DNS.
+    """
+    
+    def __init__(
+        self,
+        timeout: float = REQUEST_TIMEOUT,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        max_connections: int = 200,
+        max_keepalive_connections: int = 50,
+        dns_cache: Optional[DnsCache] = None,
+    ):
+        """
+        Initialize the client.
+        
+        Args:
+            timeout: Seconds to wait for an upstream response
+            connect_timeout: Seconds to wait for a new upstream connection
+            max_connections: Upper bound on open upstream connections
+            max_keepalive_connections: Idle connections kept for reuse
+            dns_cache: Cache to resolve upstream hosts through; without one
+                every new connection resolves its host
+        """
+        self.dns_cache = dns_cache
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+    
+    @property
+    def closed(self) -> bool:
+        """Whether the connection pool has been closed."""
+        return self._client.is_closed
+    
+    async def forward(self, service: Service, request: Request, timeout: Optional[float] = None) -> Response:
+        """
+        Forward a request to a service.
+        
+        Args:
+            service: The service instance to call
+            request: The request to forward
+            timeout: Seconds to wait for the response instead of the
+                client's default
+        
+        The wait is also cut short by the request's deadline, and the
+        upstream is told the time left in the ``X-Request-Timeout-Ms``
+        header.
+        
+        Returns:
+            The upstream response, with the body as the bytes it arrived
+            as (see ``Response.json``), or a 502/504 error response if the
+            service could not be reached in time
+        """
+        budget = time_remaining(timeout or self._client.timeout.read)
+        if budget is not None and budget <= 0:
+            return Response.error(
+                request_id=request.request_id,
+                status_code=504,
+                message=f"Deadline exceeded before calling {service.name}",
+            )
+        # Client bodies go out byte for byte under the client's Content-Type,
+        # which the forwarded headers carry; only gateway-built bodies are JSON
+        headers = _forwardable(request.headers)
+        if isinstance(request.body, (bytes, bytearray)):
+            payload = {"content": bytes(request.body)}
+        elif request.body:
+            payload = {"json": request.body}
+        else:
+            payload = {}
+        if budget is not None:
+            headers[HEADER_REQUEST_TIMEOUT] = timeout_header_value(budget)
+        try:
+            url, host_header = await self._target(service, request.path)
+            upstream = await self._client.request(
+                request.method,
+                url,
+                params=request.query_params,
+                headers={**headers, **host_header},
+                timeout=httpx.Timeout(budget, connect=self._client.timeout.connect) if budget else httpx.USE_CLIENT_DEFAULT,
+                **payload,
+            )
+        except httpx.TimeoutException:
+            return Response.error(
+                request_id=request.request_id,
+                status_code=504,
+                message=f"Service {service.name} timed out",
+            )
+        except (httpx.TransportError, OSError) as e:
+            logger.warning(f"Error forwarding request to {service}: {e}")
+            return Response.error(
+                request_id=request.request_id,
+                status_code=502,
+                message=f"Service {service.name} is unreachable",
+            )
+        
+        headers = {
+            name: value for name, value in _forwardable(dict(upstream.headers)).items()
+            if name.lower() not in DECODED_BODY_HEADERS
+        }
+        return Response(
+            request_id=request.request_id,
+            status_code=upstream.status_code,
+            body=upstream.content,
+            headers=headers,
+        )
+    
+    async def stream_events(self, service: Service, path: str) -> AsyncIterator[Any]:
+        """
+        Read a server-sent event stream from a service.
+        
+        No client headers are forwarded: the stream may be shared by many
+        clients, so it must not depend on any one client's credentials.
+        
+        Yields:
+            Each event's data, decoded from JSON when possible
+        
+        Raises:
+            httpx.HTTPError: If the stream cannot be opened or breaks
+            OSError: If the service's host cannot be resolved
+        """
+        url, host_header = await self._target(service, path)
+        async with self._client.stream(
+            "GET",
+            url,
+            headers={"Accept": "text/event-stream", **host_header},
+            # Streams stay open indefinitely; only connecting is bounded
+            timeout=httpx.Timeout(None, connect=self._client.timeout.connect),
+        ) as response:
+            response.raise_for_status()
+            data = []
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    data.append(line[5:].lstrip())
+                elif not line and data:
+                    payload = "\n".join(data)
+                    data = []
+                    try:
+                        yield json.loads(payload)
+                    except ValueError:
+                        yield payload
+    
+    async def _target(self, service: Service, path: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Get the URL to request and the Host header to send, if any.
+        """
+        if self.dns_cache is None:
+            return service.get_full_url(path), {}
+        address = await self.dns_cache.resolve(service.host)
+        if ":" in address:
+            address = f"[{address}]"
+        return f"http://{address}:{service.port}/{path.lstrip('/')}", {"Host": f"{service.host}:{service.port}"}
+    
+    async def aclose(self) -> None:
+        """
+        Close every pooled upstream connection.
+        """
+        if self.dns_cache is not None:
+            await self.dns_cache.aclose()
+        await self._client.aclose()
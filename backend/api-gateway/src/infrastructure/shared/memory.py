@@ -0,0 +1,173 @@
+import hashlib
+import mmap
+import multiprocessing
+import struct
+import time
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Sequence number and payload length at the start of a seqlock buffer
+SEQLOCK_HEADER = struct.Struct("<QQ")
+
+
+def monotonic_ms() -> int:
+    """
+    Get a monotonic clock in milliseconds that is comparable across processes.
+    """
+    return int(time.monotonic() * 1000)
+
+
+class SeqlockBuffer:
+    """
+    A byte buffer in shared memory with one writer and lock-free readers.
+    
+    The memory is an anonymous shared mapping, so processes forked after
+    the buffer was created all see the same bytes. The writer makes the
+    sequence number odd while it writes and even again when it is done;
+    readers retry when the number was odd or changed under them, so they
+    never see a half-written payload and never block the writer.
+    """
+    
+    def __init__(self, size: int, max_read_attempts: int = 1000):
+        """
+        Initialize the buffer.
+        
+        Args:
+            size: Maximum payload size in bytes
+            max_read_attempts: Reads given up before returning nothing, in
+                case a writer died in the middle of a write
+        """
+        self.size = size
+        self.max_read_attempts = max_read_attempts
+        self._memory = mmap.mmap(-1, SEQLOCK_HEADER.size + size)
+    
+    def generation(self) -> int:
+        """
+        Get the current sequence number; it changes whenever a payload is written.
+        """
+        return SEQLOCK_HEADER.unpack_from(self._memory, 0)[0]
+    
+    def write(self, payload: bytes) -> int:
+        """
+        Replace the payload. Only one process may write.
+        
+        Returns:
+            The generation of the new payload
+        
+        Raises:
+            ValueError: If the payload does not fit
+        """
+        if len(payload) > self.size:
+            raise ValueError(f"Payload of {len(payload)} bytes exceeds the shared buffer size of {self.size} bytes")
+        
+        sequence = self.generation()
+        SEQLOCK_HEADER.pack_into(self._memory, 0, sequence + 1, 0)
+        self._memory[SEQLOCK_HEADER.size:SEQLOCK_HEADER.size + len(payload)] = payload
+        SEQLOCK_HEADER.pack_into(self._memory, 0, sequence + 2, len(payload))
+        return sequence + 2
+    
+    def read(self) -> Tuple[int, Optional[bytes]]:
+        """
+        Get a consistent copy of the payload.
+        
+        Returns:
+            The generation and the payload, or no payload if nothing was
+            written yet or no consistent read succeeded
+        """
+        sequence = 0
+        for _ in range(self.max_read_attempts):
+            sequence, length = SEQLOCK_HEADER.unpack_from(self._memory, 0)
+            if sequence % 2:
+                # Write in progress
+                time.sleep(0)
+                continue
+            payload = self._memory[SEQLOCK_HEADER.size:SEQLOCK_HEADER.size + length]
+            if self.generation() == sequence:
+                return sequence, payload if sequence else None
+        return sequence, None
+
+
+class SharedSlotTable:
+    """
+    A fixed-size hash table of integer records in shared memory.
+    
+    Each record holds ``fields`` signed 64-bit integers and lives in one of
+    ``GROUP_SIZE`` slots picked by a hash of its key; when the group is
+    full the least recently updated record is evicted. Updates hold one of
+    a set of process-shared locks, so every worker forked after the table
+    was created reads and changes the same records.
+    """
+    
+    GROUP_SIZE = 8
+    
+    def __init__(self, slots: int, fields: int, locks: int = 64):
+        """
+        Initialize the table.
+        
+        Args:
+            slots: Number of records the table can hold
+            fields: Number of integer fields per record
+            locks: Number of locks that groups of slots are spread over
+        """
+        self.fields = fields
+        self.groups = max(1, slots // self.GROUP_SIZE)
+        # Key hash, last update time (ms), fields
+        self._record = struct.Struct(f"<Qq{fields}q")
+        self._memory = mmap.mmap(-1, self.groups * self.GROUP_SIZE * self._record.size)
+        context = multiprocessing.get_context("fork")
+        self._locks = [context.Lock() for _ in range(max(1, min(locks, self.groups)))]
+    
+    @staticmethod
+    def _hash(key: str) -> int:
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        # 0 marks an empty slot
+        return int.from_bytes(digest, "big") or 1
+    
+    def update(self, key: str, update: Callable[[List[int]], Tuple[List[int], T]]) -> T:
+        """
+        Read, change and write a record atomically across processes.
+        
+        Args:
+            key: The record key
+            update: Gets the record's fields (all 0 for a new record) and
+                returns the new fields and a result; it runs under the
+                lock, so it must be quick and must not block
+        
+        Returns:
+            The result returned by ``update``
+        """
+        key_hash = self._hash(key)
+        group = key_hash % self.groups
+        with self._locks[group % len(self._locks)]:
+            offset = self._find(group, key_hash)
+            record = self._record.unpack_from(self._memory, offset)
+            fields = list(record[2:]) if record[0] == key_hash else [0] * self.fields
+            fields, result = update(fields)
+            self._record.pack_into(self._memory, offset, key_hash, monotonic_ms(), *fields)
+        return result
+    
+    def get(self, key: str) -> List[int]:
+        """
+        Get a record's fields, all 0 if the key has no record.
+        """
+        key_hash = self._hash(key)
+        group = key_hash % self.groups
+        with self._locks[group % len(self._locks)]:
+            record = self._record.unpack_from(self._memory, self._find(group, key_hash))
+        return list(record[2:]) if record[0] == key_hash else [0] * self.fields
+    
+    def _find(self, group: int, key_hash: int) -> int:
+        """
+        Get the offset of the key's slot, or of the slot to store it in.
+        """
+        oldest_offset, oldest_update = 0, None
+        for slot in range(group * self.GROUP_SIZE, (group + 1) * self.GROUP_SIZE):
+            offset = slot * self._record.size
+            slot_hash, updated = struct.unpack_from("<Qq", self._memory, offset)
+            # Records are never removed, only replaced, so the key is not past an empty slot
+            if slot_hash == key_hash or slot_hash == 0:
+                return offset
+            if oldest_update is None or updated < oldest_update:
+                oldest_offset, oldest_update = offset, updated
+        return oldest_offset
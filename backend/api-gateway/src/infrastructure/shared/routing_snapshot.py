@@ -0,0 +1,50 @@
+import json
+from typing import Optional
+
+from domain.entities.service import Service
+from domain.services.routing_table import RoutingTable
+from infrastructure.shared.memory import SeqlockBuffer
+
+
+class SharedRoutingSnapshot:
+    """
+    Publishes the compiled routing table to every worker process.
+    
+    The leader worker writes the table's services into a shared seqlock
+    buffer whenever its table changes. Other workers compare the buffer's
+    generation on each lookup, which reads only the buffer header, and
+    decode a new table only when the generation moved, so a registry
+    change is decoded once per worker rather than fetched from the
+    registry by each of them.
+    """
+    
+    def __init__(self, buffer: SeqlockBuffer):
+        self.buffer = buffer
+        self._generation = 0
+    
+    def publish(self, table: RoutingTable) -> None:
+        """
+        Make a routing table the current snapshot.
+        
+        Raises:
+            ValueError: If the table does not fit in the shared buffer
+        """
+        payload = json.dumps({
+            "revision": table.revision,
+            "services": [service.to_dict() for service in table.services],
+        }).encode()
+        # The publisher already has this table; do not decode it back
+        self._generation = self.buffer.write(payload)
+    
+    def read_if_changed(self) -> Optional[RoutingTable]:
+        """
+        Get the snapshot if it changed since the last call, else None.
+        """
+        if self.buffer.generation() == self._generation:
+            return None
+        generation, payload = self.buffer.read()
+        if payload is None:
+            return None
+        data = json.loads(payload)
+        self._generation = generation
+        return RoutingTable((Service.from_dict(service) for service in data["services"]), data["revision"])
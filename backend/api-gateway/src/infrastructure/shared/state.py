@@ -0,0 +1,46 @@
+from typing import Optional
+
+from config.settings import Settings
+from infrastructure.admission.tenant_quotas import TenantQuotas
+from infrastructure.resilience.circuit_breaker import CircuitBreaker
+from infrastructure.resilience.rate_limiter import RateLimiter
+from infrastructure.shared.memory import SeqlockBuffer, SharedSlotTable
+
+
+class SharedState:
+    """
+    Shared-memory structures used by every worker process of a gateway instance.
+    
+    Created once, before workers are forked, so all workers map the same
+    memory; with a single process it is simply private memory. Worker 0
+    is the leader: it watches the registry and publishes the routing
+    snapshot the other workers read.
+    """
+    
+    def __init__(self, settings: Settings):
+        self.routing_snapshot = SeqlockBuffer(settings.ROUTING_SNAPSHOT_SIZE)
+        self.rate_limits = SharedSlotTable(settings.RATE_LIMIT_SLOTS, RateLimiter.FIELDS)
+        self.circuit_breakers = SharedSlotTable(settings.CIRCUIT_BREAKER_SLOTS, CircuitBreaker.FIELDS)
+        self.tenant_buckets = SharedSlotTable(settings.TENANT_QUOTA_SLOTS, TenantQuotas.FIELDS)
+        self.worker_index = 0
+        self.workers = 1
+    
+    @property
+    def is_leader(self) -> bool:
+        """Check whether this process watches the registry for all workers."""
+        return self.worker_index == 0
+
+
+_shared_state: Optional[SharedState] = None
+
+
+def get_shared_state(settings: Settings) -> SharedState:
+    """
+    Get the process's shared state, creating it on first use.
+    
+    Forked workers inherit the instance created by the supervisor.
+    """
+    global _shared_state
+    if _shared_state is None:
+        _shared_state = SharedState(settings)
+    return _shared_state
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+from lms_shared.monitoring.metrics import metrics as default_metrics
+
+logger = logging.getLogger(__name__)
+
+# Queued in place of an event to tell a subscriber its stream has ended
+_CLOSED = object()
+
+
+class StreamSubscriber:
+    """
+    One client connection's view of a shared stream.
+    
+    Holds a small bounded queue of already-encoded events. When the client
+    reads slower than events arrive, the oldest queued event is dropped:
+    streamed events are state snapshots, so a slow client skips straight
+    to the latest state instead of stalling the shared upstream.
+    """
+    
+    def __init__(self, queue_size: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+    
+    def offer(self, event: Any) -> bool:
+        """
+        Queue an event without waiting; returns False if an older one was dropped.
+        """
+        dropped = False
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+            dropped = True
+        self._queue.put_nowait(event)
+        return not dropped
+    
+    def close(self) -> None:
+        """
+        End the stream once queued events are read.
+        """
+        self.offer(_CLOSED)
+    
+    async def events(
+        self,
+        idle_timeout: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+    ) -> AsyncIterator[Optional[str]]:
+        """
+        Iterate over encoded events.
+        
+        Yields None when ``heartbeat_interval`` passes without an event, so
+        the caller can keep the connection alive through proxies. Ends when
+        the upstream stream ends or no event arrives for ``idle_timeout``.
+        """
+        loop = asyncio.get_running_loop()
+        idle_deadline = loop.time() + idle_timeout if idle_timeout else None
+        while True:
+            wait = heartbeat_interval
+            if idle_deadline is not None:
+                remaining = idle_deadline - loop.time()
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining) if wait else remaining
+            
+            try:
+                event = await asyncio.wait_for(self._queue.get(), wait)
+            except asyncio.TimeoutError:
+                if idle_deadline is None or loop.time() < idle_deadline:
+                    yield None
+                continue
+            
+            if event is _CLOSED:
+                return
+            if idle_timeout:
+                idle_deadline = loop.time() + idle_timeout
+            yield event
+
+
+class _Topic:
+    """
+    A shared upstream subscription and the clients attached to it.
+    """
+    
+    def __init__(self, key: str):
+        self.key = key
+        self.subscribers: Set[StreamSubscriber] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.latest: Optional[str] = None
+        self.stop_handle: Optional[asyncio.TimerHandle] = None
+
+
+class StreamHub:
+    """
+    Fans upstream event streams out to many client connections.
+    
+    Clients subscribing to the same key share a single upstream stream,
+    opened on the first subscription. Each event is JSON-encoded once and
+    the same string is queued for every subscriber, so an idle connection
+    costs a queue and a few references rather than its own upstream call.
+    New subscribers immediately receive the latest event. After the last
+    subscriber leaves, the upstream stream is kept for ``linger`` seconds
+    so reconnecting clients can reuse it.
+    """
+    
+    def __init__(self, queue_size: int = 16, linger: float = 5.0, metrics=None):
+        """
+        Initialize the hub.
+        
+        Args:
+            queue_size: Events buffered per connection before the oldest is dropped
+            linger: Seconds an upstream stream is kept without subscribers
+            metrics: Metrics registry to report connections and drops to
+        """
+        self.queue_size = queue_size
+        self.linger = linger
+        self._topics: Dict[str, _Topic] = {}
+        
+        metrics = metrics or default_metrics
+        self._connections = metrics.gauge("gateway_stream_connections", "Open streaming client connections")
+        self._upstreams = metrics.gauge("gateway_stream_upstreams", "Open shared upstream streams")
+        self._dropped = metrics.counter(
+            "gateway_stream_dropped_events_total",
+            "Events dropped for clients reading slower than the stream",
+        )
+    
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        key: str,
+        source: Callable[[], AsyncIterator[Any]],
+    ) -> AsyncIterator[StreamSubscriber]:
+        """
+        Attach to the shared stream for a key for the duration of the block.
+        
+        Args:
+            key: Identifies the upstream stream, e.g. ``course:<id>``
+            source: Opens the upstream stream; only called if none is open for the key
+        """
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = self._topics[key] = _Topic(key)
+        if topic.stop_handle is not None:
+            topic.stop_handle.cancel()
+            topic.stop_handle = None
+        
+        subscriber = StreamSubscriber(self.queue_size)
+        if topic.latest is not None:
+            subscriber.offer(topic.latest)
+        topic.subscribers.add(subscriber)
+        self._connections.inc()
+        
+        if topic.task is None:
+            topic.task = asyncio.get_running_loop().create_task(self._pump(topic, source))
+            self._upstreams.inc()
+        
+        try:
+            yield subscriber
+        finally:
+            topic.subscribers.discard(subscriber)
+            self._connections.dec()
+            if not topic.subscribers and topic.task is not None:
+                topic.stop_handle = asyncio.get_running_loop().call_later(self.linger, self._stop, topic)
+    
+    def topics(self) -> int:
+        """Get the number of open upstream streams."""
+        return len(self._topics)
+    
+    async def close(self) -> None:
+        """
+        Close every upstream stream and end every subscription.
+        """
+        for topic in list(self._topics.values()):
+            self._stop(topic)
+    
+    async def _pump(self, topic: _Topic, source: Callable[[], AsyncIterator[Any]]) -> None:
+        """
+        Read the upstream stream and hand each event to every subscriber.
+        """
+        try:
+            async for event in source():
+                topic.latest = json.dumps(event, default=str)
+                for subscriber in list(topic.subscribers):
+                    if not subscriber.offer(topic.latest):
+                        self._dropped.inc()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Upstream stream {topic.key} failed: {e}")
+        finally:
+            # Subscribers reconnect and open a fresh upstream stream
+            for subscriber in topic.subscribers:
+                subscriber.close()
+            if self._topics.get(topic.key) is topic:
+                del self._topics[topic.key]
+            if topic.stop_handle is not None:
+                topic.stop_handle.cancel()
+            self._upstreams.dec()
+    
+    def _stop(self, topic: _Topic) -> None:
+        """
+        Cancel a topic's upstream stream.
+        """
+        topic.stop_handle = None
+        if topic.task is not None and not topic.task.done():
+            topic.task.cancel()
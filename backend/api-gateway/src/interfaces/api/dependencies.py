@@ -0,0 +1,100 @@
+import os
+
+import redis.asyncio
+
+from config.settings import Settings
+from domain.services.gateway_service import GatewayService
+from domain.services.response_composer import ResponseComposer
+from infrastructure.admission.tenant_quotas import TenantQuota, TenantQuotas
+from infrastructure.cache.memory_cache import MemoryCache
+from infrastructure.idempotency.store import IdempotencyStore
+from infrastructure.lifecycle.drain import DrainCoordinator
+from lms_shared.monitoring.metrics import metrics
+from lms_shared.monitoring.profiler import SamplingProfiler
+from infrastructure.repositories.redis_service_registry import RedisServiceRegistryRepository
+from infrastructure.resilience.circuit_breaker import CircuitBreaker
+from infrastructure.resilience.rate_limiter import RateLimiter
+from infrastructure.routing.route_file import RouteFileWatcher
+from infrastructure.services.course_stream_client import CourseStreamClient
+from infrastructure.services.dns_cache import DnsCache
+from infrastructure.services.upstream_client import UpstreamClient
+from infrastructure.shared.routing_snapshot import SharedRoutingSnapshot
+from infrastructure.shared.state import get_shared_state
+from infrastructure.streaming.hub import StreamHub
+
+# Initialize settings and shared clients
+settings = Settings()
+async_redis_client = redis.asyncio.Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+)
+upstream_client = UpstreamClient(
+    timeout=settings.REQUEST_TIMEOUT,
+    max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+    dns_cache=DnsCache(
+        min_ttl=settings.DNS_CACHE_MIN_TTL,
+        max_ttl=settings.DNS_CACHE_MAX_TTL,
+        default_ttl=settings.DNS_CACHE_DEFAULT_TTL,
+        refresh_ahead=settings.DNS_CACHE_REFRESH_AHEAD,
+        max_stale=settings.DNS_CACHE_MAX_STALE,
+        metrics=metrics,
+    ) if settings.DNS_CACHE_ENABLED else None,
+)
+# Created before workers are forked, so every worker shares it
+shared_state = get_shared_state(settings)
+rate_limiter = RateLimiter(shared_state.rate_limits, settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_PERIOD)
+circuit_breaker = CircuitBreaker(
+    shared_state.circuit_breakers,
+    failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+) if settings.CIRCUIT_BREAKER_ENABLED else None
+tenant_quotas = TenantQuotas(
+    shared_state.tenant_buckets,
+    {plan: TenantQuota.from_dict(quota) for plan, quota in settings.PLAN_QUOTAS.items()},
+    tenant_plans=settings.TENANT_PLANS,
+    default_plan=settings.DEFAULT_TENANT_PLAN,
+    metrics=metrics,
+) if settings.TENANT_QUOTAS_ENABLED else None
+service_registry = RedisServiceRegistryRepository(async_redis_client)
+gateway_service = GatewayService(
+    service_registry,
+    metrics=metrics,
+    upstream_client=upstream_client,
+    routing_snapshot=SharedRoutingSnapshot(shared_state.routing_snapshot),
+    circuit_breaker=circuit_breaker,
+    response_cache=MemoryCache(max_entries=settings.ROUTE_CACHE_SIZE),
+)
+route_file = RouteFileWatcher(
+    settings.ROUTES_FILE,
+    gateway_service.set_route_rules,
+    variables={**os.environ, **settings.dict()},
+    interval=settings.ROUTES_RELOAD_INTERVAL,
+)
+response_composer = ResponseComposer(
+    gateway_service,
+    cache=MemoryCache(max_entries=settings.COMPOSITION_CACHE_SIZE),
+    metrics=metrics,
+)
+course_stream_client = CourseStreamClient(settings.COURSE_SERVICE_GRPC_URL)
+stream_hub = StreamHub(
+    queue_size=settings.STREAM_QUEUE_SIZE,
+    linger=settings.STREAM_UPSTREAM_LINGER,
+    metrics=metrics,
+)
+idempotency_store = IdempotencyStore(
+    async_redis_client,
+    ttl=settings.IDEMPOTENCY_TTL,
+    lock_ttl=settings.IDEMPOTENCY_LOCK_TTL,
+    local_cache_size=settings.IDEMPOTENCY_LOCAL_CACHE_SIZE,
+)
+drain = DrainCoordinator()
+profiler = SamplingProfiler(max_duration=settings.PROFILER_MAX_DURATION)
+
+
+async def get_gateway_service() -> GatewayService:
+    """
+    Get the gateway service.
+    """
+    return gateway_service
\ No newline at end of file
@@ -0,0 +1,56 @@
+import asyncio
+from typing import Callable, Iterable
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from config.constants import ERROR_DEADLINE_EXCEEDED, HTTP_504_GATEWAY_TIMEOUT
+from lms_shared.deadline import (
+    HEADER_REQUEST_TIMEOUT,
+    parse_timeout_header,
+    reset_deadline,
+    set_deadline,
+)
+from lms_shared.monitoring.metrics import metrics
+
+
+def create_deadline_middleware(
+    default_timeout: float,
+    max_timeout: float,
+    exempt_prefixes: Iterable[str] = (),
+) -> Callable:
+    """
+    Build a middleware that gives every request a deadline.
+    
+    Clients may send their own budget in the ``X-Request-Timeout-Ms``
+    header, capped at ``max_timeout``; otherwise ``default_timeout``
+    applies. Upstream calls made for the request get what is left of it,
+    and once it passes the work is cancelled and the client gets a 504.
+    Only the wait for the response headers is bounded, so streamed
+    response bodies are not cut off.
+    """
+    exempt_prefixes = tuple(exempt_prefixes)
+    exceeded = metrics.counter(
+        "gateway_deadline_exceeded_total",
+        "Requests abandoned because their deadline passed",
+    )
+    
+    async def deadline_middleware(request: Request, call_next):
+        if request.url.path.startswith(exempt_prefixes):
+            return await call_next(request)
+        
+        timeout = parse_timeout_header(request.headers.get(HEADER_REQUEST_TIMEOUT))
+        timeout = min(timeout, max_timeout) if timeout is not None else default_timeout
+        token = set_deadline(timeout)
+        try:
+            return await asyncio.wait_for(call_next(request), timeout)
+        except asyncio.TimeoutError:
+            exceeded.inc()
+            return JSONResponse(
+                content={"detail": ERROR_DEADLINE_EXCEEDED},
+                status_code=HTTP_504_GATEWAY_TIMEOUT,
+            )
+        finally:
+            reset_deadline(token)
+    
+    return deadline_middleware
\ No newline at end of file
@@ -0,0 +1,53 @@
+from typing import Iterable
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.constants import ERROR_SERVICE_UNAVAILABLE, HTTP_503_SERVICE_UNAVAILABLE
+from infrastructure.lifecycle.drain import DrainCoordinator
+
+
+class DrainMiddleware:
+    """
+    Tracks in-flight requests for graceful shutdown.
+    
+    Implemented as plain ASGI middleware so a request counts as in flight
+    until its last body chunk is sent, which also covers streamed
+    responses, and so client disconnects still release the request.
+    """
+    
+    def __init__(self, app: ASGIApp, drain: DrainCoordinator, exempt_paths: Iterable[str] = ()):
+        self.app = app
+        self.drain = drain
+        self.exempt_paths = set(exempt_paths)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        if not self.drain.accepting:
+            if scope["type"] == "websocket":
+                await send({"type": "websocket.close", "code": 1001})
+                return
+            response = JSONResponse(
+                content={"detail": ERROR_SERVICE_UNAVAILABLE, "reason": "draining"},
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Connection": "close", "Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+        
+        async def send_wrapper(message: Message) -> None:
+            # Ask keep-alive clients to reconnect elsewhere once we are draining
+            if message["type"] == "http.response.start" and self.drain.draining:
+                message["headers"] = [
+                    (name, value) for name, value in message.get("headers", []) if name.lower() != b"connection"
+                ] + [(b"connection", b"close")]
+            await send(message)
+        
+        self.drain.request_started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.drain.request_finished()
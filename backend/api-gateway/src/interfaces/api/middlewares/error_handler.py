@@ -0,0 +1,52 @@
+import logging
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from config.constants import (
+    ERROR_INTERNAL,
+    ERROR_SERVICE_UNAVAILABLE,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
+from domain.repositories.errors import RepositoryError
+
+logger = logging.getLogger(__name__)
+
+
+def _unwrap(error: Exception) -> Exception:
+    """
+    Return the error a route raised.
+    
+    With anyio 4, ``call_next`` re-raises errors from inner middlewares
+    wrapped in an ExceptionGroup.
+    """
+    while isinstance(error, ExceptionGroup) and len(error.exceptions) == 1:
+        error = error.exceptions[0]
+    return error
+
+
+async def error_handler_middleware(request: Request, call_next):
+    """
+    Turn errors that escaped the route handlers into JSON responses.
+    
+    Registry failures mean the gateway cannot route right now (503); any
+    other error is a bug in the gateway (500) and is logged with its
+    traceback.
+    """
+    try:
+        return await call_next(request)
+    except Exception as e:
+        error = _unwrap(e)
+        if isinstance(error, RepositoryError):
+            logger.error(f"Service registry error on {request.method} {request.url.path}: {error}")
+            return JSONResponse(
+                content={"detail": ERROR_SERVICE_UNAVAILABLE, "reason": "registry_unavailable"},
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+        logger.exception(f"Unhandled error on {request.method} {request.url.path}")
+        return JSONResponse(
+            content={"detail": ERROR_INTERNAL},
+            status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+        )
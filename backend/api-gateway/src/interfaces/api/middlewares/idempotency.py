@@ -0,0 +1,157 @@
+import hashlib
+from typing import List
+
+from fastapi.responses import JSONResponse, Response
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.constants import HEADER_AUTHORIZATION, HEADER_TENANT_ID
+from config.settings import Settings
+from infrastructure.idempotency.store import IdempotencyRecord, IdempotencyStore, StoredResponse
+from interfaces.api.token_claims import verified_claims
+
+HEADER_IDEMPOTENCY_KEY = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyMiddleware:
+    """
+    Makes retried requests carrying an ``Idempotency-Key`` header safe.
+    
+    The first request with a key is processed and its response stored;
+    duplicates that arrive while it runs wait for that response, and
+    duplicates within the TTL get it replayed (with an
+    ``Idempotent-Replayed: true`` header). Keys are scoped by tenant and
+    user, and reusing a key for a different request is rejected with 422.
+    5xx responses are not stored, so the client can retry them.
+    
+    Implemented as plain ASGI middleware because it must read the request
+    body (for the fingerprint) and still pass it on unchanged.
+    """
+    
+    def __init__(self, app: ASGIApp, store: IdempotencyStore, settings: Settings):
+        self.app = app
+        self.store = store
+        self.settings = settings
+        self.methods = {method.upper() for method in settings.IDEMPOTENCY_METHODS}
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+        
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get(HEADER_IDEMPOTENCY_KEY)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": f"{HEADER_IDEMPOTENCY_KEY} is too long"}, status_code=400)
+            await response(scope, receive, send)
+            return
+        
+        # Buffer the body so it can be fingerprinted and then replayed to the app
+        messages: List[Message] = []
+        body = b""
+        while True:
+            message = await receive()
+            messages.append(message)
+            body += message.get("body", b"")
+            if message["type"] != "http.request" or not message.get("more_body", False):
+                break
+        
+        key = self._scoped_key(scope, headers, idempotency_key)
+        fingerprint = hashlib.sha256(
+            b"\0".join([scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body])
+        ).hexdigest()
+        
+        record = await self.store.claim(key, fingerprint)
+        if record is not None and record.state == IdempotencyRecord.IN_PROGRESS:
+            record = await self.store.wait(key, self.settings.IDEMPOTENCY_WAIT_TIMEOUT)
+            if record is None:
+                response = JSONResponse(
+                    {"detail": f"A request with this {HEADER_IDEMPOTENCY_KEY} is still in progress"},
+                    status_code=409,
+                    headers={"Retry-After": "1"},
+                )
+                await response(scope, receive, send)
+                return
+        
+        if record is not None:
+            await self._replay(record, fingerprint, scope, receive, send)
+            return
+        
+        async def replay_receive() -> Message:
+            if messages:
+                return messages.pop(0)
+            return await receive()
+        
+        max_body_bytes = self.settings.IDEMPOTENCY_MAX_BODY_BYTES
+        status_code = 500
+        response_headers = []
+        response_body = bytearray()
+        too_large = False
+        
+        async def capture_send(message: Message) -> None:
+            nonlocal status_code, response_headers, too_large
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = [
+                    (name.decode("latin-1"), value.decode("latin-1")) for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body" and not too_large:
+                response_body.extend(message.get("body", b""))
+                if len(response_body) > max_body_bytes:
+                    too_large = True
+                    response_body.clear()
+            await send(message)
+        
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await self.store.release(key)
+            raise
+        
+        if status_code >= 500:
+            await self.store.release(key)
+            return
+        
+        stored_body = None if too_large else bytes(response_body)
+        await self.store.complete(key, fingerprint, StoredResponse(status_code, response_headers, stored_body))
+    
+    def _scoped_key(self, scope: Scope, headers: Headers, idempotency_key: str) -> str:
+        """
+        Scope a client's key by tenant and user (or client address when anonymous).
+        """
+        claims = verified_claims(headers.get(HEADER_AUTHORIZATION, ""), self.settings)
+        tenant = claims.get("org_id") or headers.get(HEADER_TENANT_ID) or "-"
+        if claims.get("sub"):
+            user = f"user:{claims['sub']}"
+        else:
+            client = scope.get("client")
+            user = f"anonymous:{client[0] if client else '-'}"
+        return f"{tenant}:{user}:{idempotency_key}"
+    
+    async def _replay(self, record: IdempotencyRecord, fingerprint: str, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Send a stored response.
+        """
+        if record.fingerprint != fingerprint:
+            response = JSONResponse(
+                {"detail": f"{HEADER_IDEMPOTENCY_KEY} was already used for a different request"},
+                status_code=422,
+            )
+        elif record.response.body is None:
+            response = JSONResponse(
+                {"detail": "The request was already processed; its response was too large to store"},
+                status_code=record.response.status_code,
+                headers={"Idempotent-Replayed": "true"},
+            )
+        else:
+            response = Response(content=record.response.body, status_code=record.response.status_code)
+            response.raw_headers = [
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in record.response.headers
+                if name.lower() not in ("date", "server")
+            ] + [(b"idempotent-replayed", b"true")]
+        await response(scope, receive, send)
@@ -0,0 +1,35 @@
+from typing import Callable, Iterable
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from config.constants import ERROR_SERVICE_UNAVAILABLE, HTTP_503_SERVICE_UNAVAILABLE
+from lms_shared.monitoring.loop_lag import LoopLagMonitor
+from lms_shared.monitoring.metrics import metrics
+
+
+def create_loop_lag_admission_middleware(
+    monitor: LoopLagMonitor,
+    threshold: float,
+    exempt_paths: Iterable[str] = (),
+) -> Callable:
+    """
+    Build a middleware that rejects new requests while the event loop lags.
+    """
+    exempt_paths = set(exempt_paths)
+    rejected = metrics.counter(
+        "event_loop_lag_rejected_total",
+        "Requests rejected because event loop lag exceeded the threshold",
+    )
+    
+    async def loop_lag_admission_middleware(request: Request, call_next):
+        if request.url.path not in exempt_paths and monitor.current_lag() > threshold:
+            rejected.inc()
+            return JSONResponse(
+                content={"detail": ERROR_SERVICE_UNAVAILABLE, "reason": "event_loop_lag"},
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+        return await call_next(request)
+    
+    return loop_lag_admission_middleware
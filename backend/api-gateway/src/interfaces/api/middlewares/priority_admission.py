@@ -0,0 +1,82 @@
+import time
+from typing import Callable, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from config.constants import (
+    ERROR_RATE_LIMITED,
+    ERROR_SERVICE_UNAVAILABLE,
+    HEADER_AUTHORIZATION,
+    HTTP_429_TOO_MANY_REQUESTS,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
+from config.settings import Settings
+from domain.services.priority_classifier import PriorityClass, PriorityClassifier
+from infrastructure.admission.priority_admission import AdmissionRejectedError, PriorityAdmissionController
+from infrastructure.admission.tenant_quotas import TenantQuotas
+from interfaces.api.token_claims import token_roles, verified_claims
+
+
+# Rejections caused by the tenant's own quota rather than gateway overload
+TENANT_REJECTION_REASONS = ("tenant_rate_limited", "tenant_queue_full")
+
+
+def create_priority_admission_middleware(settings: Settings, tenant_quotas: Optional[TenantQuotas] = None) -> Callable:
+    """
+    Build the admission middleware from the gateway settings.
+    
+    Plan-based priority and tenant quotas apply to the organization in
+    the caller's verified token, never to the unverified tenant header,
+    so a client can neither claim another tenant's plan nor spend its
+    quota. Anonymous callers get the default plan.
+    """
+    classifier = PriorityClassifier(
+        route_classes=settings.PRIORITY_ROUTE_CLASSES,
+        role_classes=settings.PRIORITY_ROLE_CLASSES,
+        plan_classes=settings.PRIORITY_PLAN_CLASSES,
+        tenant_plans=settings.TENANT_PLANS,
+        default_plan=settings.DEFAULT_TENANT_PLAN,
+    )
+    controller = PriorityAdmissionController(
+        max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+        queue_sizes={PriorityClass.parse(name): size for name, size in settings.ADMISSION_QUEUE_SIZES.items()},
+        weights={PriorityClass.parse(name): weight for name, weight in settings.ADMISSION_WEIGHTS.items()},
+        target_wait=settings.ADMISSION_TARGET_WAIT,
+        max_wait=settings.ADMISSION_MAX_WAIT,
+        tenant_quotas=tenant_quotas,
+    )
+    exempt_paths = set(settings.ADMISSION_EXEMPT_PATHS)
+    
+    async def priority_admission_middleware(request: Request, call_next):
+        if request.url.path in exempt_paths:
+            return await call_next(request)
+        
+        claims = verified_claims(request.headers.get(HEADER_AUTHORIZATION, ""), settings)
+        org_id = str(claims["org_id"]) if claims.get("org_id") else None
+        priority = classifier.classify(request.url.path, roles=token_roles(claims), tenant_id=org_id)
+        tenant_id = org_id if tenant_quotas is not None else None
+        request.state.priority = priority
+        try:
+            await controller.acquire(priority, tenant_id)
+        except AdmissionRejectedError as e:
+            if e.reason in TENANT_REJECTION_REASONS:
+                return JSONResponse(
+                    content={"detail": ERROR_RATE_LIMITED, "reason": e.reason},
+                    status_code=HTTP_429_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": "1"},
+                )
+            return JSONResponse(
+                content={"detail": ERROR_SERVICE_UNAVAILABLE, "reason": e.reason},
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+        
+        started = time.monotonic()
+        try:
+            return await call_next(request)
+        finally:
+            controller.release(tenant_id, time.monotonic() - started)
+    
+    priority_admission_middleware.controller = controller
+    return priority_admission_middleware
@@ -0,0 +1,41 @@
+import math
+from typing import Callable
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from config.constants import ERROR_RATE_LIMITED, HEADER_AUTHORIZATION, HTTP_429_TOO_MANY_REQUESTS
+from config.settings import Settings
+from lms_shared.monitoring.metrics import metrics
+from infrastructure.resilience.rate_limiter import RateLimiter
+from interfaces.api.token_claims import verified_claims
+
+
+def create_rate_limit_middleware(limiter: RateLimiter, settings: Settings) -> Callable:
+    """
+    Build a middleware that limits requests per user, or per client address when anonymous.
+    """
+    exempt_paths = set(settings.RATE_LIMIT_EXEMPT_PATHS)
+    rejected = metrics.counter("gateway_rate_limited_total", "Requests rejected by the rate limiter")
+    
+    async def rate_limit_middleware(request: Request, call_next):
+        if request.url.path in exempt_paths:
+            return await call_next(request)
+        
+        user_id = verified_claims(request.headers.get(HEADER_AUTHORIZATION, ""), settings).get("sub")
+        if user_id:
+            key = f"user:{user_id}"
+        else:
+            key = f"client:{request.client.host if request.client else '-'}"
+        
+        allowed, retry_after = limiter.hit(key)
+        if not allowed:
+            rejected.inc()
+            return JSONResponse(
+                content={"detail": ERROR_RATE_LIMITED},
+                status_code=HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+        return await call_next(request)
+    
+    return rate_limit_middleware
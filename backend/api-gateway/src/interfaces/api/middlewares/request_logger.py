@@ -0,0 +1,33 @@
+import time
+from typing import Callable
+
+from fastapi import Request
+
+from config.constants import HEADER_REQUEST_ID
+from lms_shared.monitoring.access_log import AccessLog
+
+
+def create_request_logger_middleware(access_log: AccessLog) -> Callable:
+    """
+    Build a middleware that records every request in the access log.
+    """
+    
+    async def request_logger_middleware(request: Request, call_next):
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            access_log.record(
+                method=request.method,
+                path=request.url.path,
+                query=request.url.query,
+                status_code=status_code,
+                duration=time.perf_counter() - started,
+                client=request.client.host if request.client else "-",
+                request_id=request.headers.get(HEADER_REQUEST_ID),
+            )
+    
+    return request_logger_middleware
\ No newline at end of file
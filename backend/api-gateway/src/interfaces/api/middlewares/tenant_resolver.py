@@ -0,0 +1,34 @@
+from typing import Callable
+
+from fastapi import Request
+
+from config.constants import HEADER_AUTHORIZATION, HEADER_TENANT_ID
+from config.settings import Settings
+from interfaces.api.token_claims import verified_claims
+
+_TENANT_HEADER = HEADER_TENANT_ID.lower().encode()
+
+
+def create_tenant_resolver_middleware(settings: Settings) -> Callable:
+    """
+    Build a middleware that resolves the tenant a request is made for.
+    
+    The organization in the caller's verified token is authoritative: it
+    replaces any ``X-Tenant-ID`` header the client sent, so upstream
+    services can trust the header the gateway forwards. Anonymous
+    requests keep the header they came with. The result is available to
+    route handlers as ``request.state.tenant_id`` (None when unknown).
+    """
+    
+    async def tenant_resolver_middleware(request: Request, call_next):
+        claims = verified_claims(request.headers.get(HEADER_AUTHORIZATION, ""), settings)
+        tenant_id = str(claims["org_id"]) if claims.get("org_id") else request.headers.get(HEADER_TENANT_ID)
+        
+        if claims.get("org_id"):
+            headers = [(name, value) for name, value in request.scope["headers"] if name != _TENANT_HEADER]
+            headers.append((_TENANT_HEADER, tenant_id.encode()))
+            request.scope["headers"] = headers
+        request.state.tenant_id = tenant_id or None
+        return await call_next(request)
+    
+    return tenant_resolver_middleware
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from interfaces.api.routes.compositions import router as compositions_router
+from interfaces.api.routes.courses import router as courses_router
+from interfaces.api.routes.streams import router as streams_router
+
+router = APIRouter()
+
+router.include_router(compositions_router)
+router.include_router(courses_router)
+router.include_router(streams_router)
\ No newline at end of file
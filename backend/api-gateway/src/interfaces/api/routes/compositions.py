@@ -0,0 +1,52 @@
+import hashlib
+import uuid
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from config.compositions import COMPOSITIONS
+from domain.entities.composition import CompositionRoute
+from interfaces.api.dependencies import response_composer
+from lms_shared.json_response import FastJSONResponse, dumps
+
+router = APIRouter(
+    prefix="/compose",
+    tags=["compositions"],
+)
+
+
+def _add_composition_route(route: CompositionRoute) -> None:
+    async def compose(request: Request):
+        response = await response_composer.compose(
+            route,
+            dict(request.path_params),
+            dict(request.headers),
+            request_id=uuid.uuid4(),
+        )
+        if response.status_code >= 400:
+            return FastJSONResponse(content=response.body, status_code=response.status_code)
+        
+        content = dumps(response.body)
+        etag = '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+        headers = {"ETag": etag, "X-Cache": response.metadata.get("cache", "bypass")}
+        if route.cache_ttl and not response.body["partial"]:
+            # Responses depend on the caller's credentials, so only the client may cache them
+            headers["Cache-Control"] = f"private, max-age={int(route.cache_ttl)}"
+        else:
+            headers["Cache-Control"] = "no-store"
+        
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=content, media_type="application/json", headers=headers)
+    
+    router.add_api_route(
+        route.path,
+        compose,
+        methods=["GET"],
+        name=route.name,
+        summary=f"Composed response: {', '.join(part.name for part in route.parts)}",
+    )
+
+
+for composition in COMPOSITIONS:
+    _add_composition_route(CompositionRoute.from_dict(composition))
\ No newline at end of file
@@ -0,0 +1,97 @@
+from typing import List, Optional
+from uuid import UUID
+
+import grpc
+from fastapi import APIRouter, HTTPException, Query, status
+
+from domain.entities.field_projection import FieldProjection
+from interfaces.api.dependencies import course_stream_client
+from lms_shared.json_response import FastJSONResponse
+
+router = APIRouter(
+    prefix="/courses",
+    tags=["courses"],
+)
+
+# course-service gRPC status -> HTTP status
+GRPC_HTTP_STATUSES = {
+    grpc.StatusCode.INVALID_ARGUMENT: status.HTTP_400_BAD_REQUEST,
+    grpc.StatusCode.NOT_FOUND: status.HTTP_404_NOT_FOUND,
+    grpc.StatusCode.UNAVAILABLE: status.HTTP_503_SERVICE_UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED: status.HTTP_504_GATEWAY_TIMEOUT,
+}
+
+FIELDS_DESCRIPTION = "Comma-separated course fields to return, e.g. id,title,status,settings.hidden"
+
+
+def _projection(fields: Optional[str]) -> Optional[FieldProjection]:
+    try:
+        return FieldProjection.parse(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid fields parameter: {e}")
+
+
+def _upstream_error(error: grpc.aio.AioRpcError) -> HTTPException:
+    return HTTPException(
+        status_code=GRPC_HTTP_STATUSES.get(error.code(), status.HTTP_502_BAD_GATEWAY),
+        detail=error.details() or "Course service error",
+    )
+
+
+@router.get("")
+async def list_courses(
+    organization_id: Optional[UUID] = None,
+    branch_id: Optional[UUID] = None,
+    instructor_id: Optional[UUID] = None,
+    course_status: Optional[str] = Query(None, alias="status", regex="^(DRAFT|PUBLISHED|ARCHIVED)$"),
+    search: Optional[str] = None,
+    tags: List[str] = Query([]),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    sort_by: Optional[str] = None,
+    sort_desc: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """List courses; ``fields`` applies to each course, pagination fields are always returned"""
+    projection = _projection(fields)
+    filters = {
+        "organization_id": str(organization_id) if organization_id else None,
+        "branch_id": str(branch_id) if branch_id else None,
+        "instructor_id": str(instructor_id) if instructor_id else None,
+        "status": course_status,
+        "search_text": search,
+        "sort_by": sort_by,
+        "sort_desc": sort_desc,
+    }
+    try:
+        result = await course_stream_client.list_courses(
+            page,
+            page_size,
+            fields=projection.paths if projection else None,
+            tags=tags,
+            **{name: value for name, value in filters.items() if value is not None},
+        )
+    except grpc.aio.AioRpcError as e:
+        raise _upstream_error(e)
+    
+    if projection is not None:
+        result["courses"] = projection.apply(result.get("courses", []))
+    # Already plain JSON types, so skip jsonable_encoder
+    return FastJSONResponse(result)
+
+
+@router.get("/{course_id}")
+async def get_course(
+    course_id: UUID,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Get a course"""
+    projection = _projection(fields)
+    try:
+        course = await course_stream_client.get_course(
+            str(course_id),
+            fields=projection.paths if projection else None,
+        )
+    except grpc.aio.AioRpcError as e:
+        raise _upstream_error(e)
+    return FastJSONResponse(projection.apply(course) if projection else course)
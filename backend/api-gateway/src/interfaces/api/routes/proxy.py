@@ -0,0 +1,73 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from config.constants import HEADER_AUTHORIZATION, HEADER_CORRELATION_ID, HEADER_REQUEST_ID
+from domain.entities.request import Request as GatewayRequest
+from domain.entities.response import Response as GatewayResponse
+from interfaces.api.dependencies import gateway_service, settings
+from interfaces.api.token_claims import verified_claims
+from lms_shared.json_response import FastJSONResponse
+
+router = APIRouter(tags=["proxy"])
+
+PROXY_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]
+
+
+def _uuid(value: Optional[str]) -> Optional[uuid.UUID]:
+    """Parse an ID the client sent, or None if it is missing or malformed."""
+    try:
+        return uuid.UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def to_gateway_request(request: Request, body: bytes) -> GatewayRequest:
+    """
+    Build the request to route from an incoming request under ``/api``.
+    
+    The body is kept as raw bytes, so it is forwarded under the client's
+    own ``Content-Type``. The user comes from the verified token and the
+    tenant from the tenant resolver; IDs that are not UUIDs are dropped.
+    """
+    claims = verified_claims(request.headers.get(HEADER_AUTHORIZATION, ""), settings)
+    return GatewayRequest(
+        request_id=_uuid(request.headers.get(HEADER_REQUEST_ID)) or uuid.uuid4(),
+        method=request.method,
+        path="/" + request.path_params["path"],
+        headers=dict(request.headers),
+        query_params=dict(request.query_params),
+        body=body or None,
+        tenant_id=_uuid(getattr(request.state, "tenant_id", None)),
+        user_id=_uuid(claims.get("sub")),
+        correlation_id=_uuid(request.headers.get(HEADER_CORRELATION_ID)),
+    )
+
+
+def to_http_response(response: GatewayResponse) -> Response:
+    """
+    Turn a routed response into the response sent to the client.
+    
+    Upstream bodies are sent as they arrived, with the upstream's
+    ``Content-Type``; bodies the gateway built or parsed are sent as JSON.
+    """
+    headers = dict(response.headers)
+    if "cache" in response.metadata:
+        headers["X-Cache"] = response.metadata["cache"]
+    if isinstance(response.body, (bytes, bytearray)):
+        return Response(content=bytes(response.body), status_code=response.status_code, headers=headers)
+    
+    headers = {name: value for name, value in headers.items() if name.lower() != "content-type"}
+    content = response.body
+    if response.error is not None:
+        content = {**response.body, "error": response.error}
+    return FastJSONResponse(content=content, status_code=response.status_code, headers=headers)
+
+
+@router.api_route("/{path:path}", methods=PROXY_METHODS, include_in_schema=False)
+async def proxy(request: Request):
+    """Route any other request under ``/api`` to the service registered for its path"""
+    gateway_request = to_gateway_request(request, await request.body())
+    return to_http_response(await gateway_service.route_request(gateway_request))
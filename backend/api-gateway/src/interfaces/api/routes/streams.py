@@ -0,0 +1,107 @@
+import asyncio
+import random
+import uuid
+from typing import Any, AsyncIterator, Callable
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from domain.entities.request import Request
+from interfaces.api.dependencies import (
+    course_stream_client,
+    drain,
+    gateway_service,
+    settings,
+    stream_hub,
+)
+
+router = APIRouter(
+    prefix="/streams",
+    tags=["streams"],
+)
+
+HEARTBEAT_MESSAGE = '{"type": "heartbeat"}'
+
+
+async def _sse_events(key: str, source: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[str]:
+    """
+    Encode a shared stream as server-sent events.
+    """
+    async with stream_hub.subscribe(key, source) as subscriber:
+        # Spread out reconnects when many streams end at once (upstream restart, drain)
+        yield f"retry: {random.randint(1000, 10000)}\n\n"
+        async for event in subscriber.events(settings.STREAM_IDLE_TIMEOUT, settings.STREAM_HEARTBEAT_INTERVAL):
+            if drain.draining:
+                return
+            yield ": keep-alive\n\n" if event is None else f"data: {event}\n\n"
+
+
+def _sse_response(key: str, source: Callable[[], AsyncIterator[Any]]) -> StreamingResponse:
+    return StreamingResponse(
+        _sse_events(key, source),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _bridge_websocket(websocket: WebSocket, key: str, source: Callable[[], AsyncIterator[Any]]) -> None:
+    """
+    Send a shared stream's events to a WebSocket client.
+    """
+    await websocket.accept()
+    
+    async def read_until_disconnect():
+        # Clients do not send anything meaningful; reading detects disconnects
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+    
+    reader = asyncio.create_task(read_until_disconnect())
+    try:
+        async with stream_hub.subscribe(key, source) as subscriber:
+            async for event in subscriber.events(settings.STREAM_IDLE_TIMEOUT, settings.STREAM_HEARTBEAT_INTERVAL):
+                if reader.done() or drain.draining:
+                    break
+                await websocket.send_text(HEARTBEAT_MESSAGE if event is None else event)
+        if not reader.done():
+            await websocket.close(code=1001)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
+
+
+def _course_source(course_id: UUID) -> Callable[[], AsyncIterator[Any]]:
+    return lambda: course_stream_client.watch_course(str(course_id))
+
+
+@router.get("/courses/{course_id}")
+async def course_events(course_id: UUID):
+    """Stream live updates of a course as server-sent events"""
+    return _sse_response(f"course:{course_id}", _course_source(course_id))
+
+
+@router.websocket("/courses/{course_id}/ws")
+async def course_events_ws(websocket: WebSocket, course_id: UUID):
+    """Stream live updates of a course over a WebSocket"""
+    await _bridge_websocket(websocket, f"course:{course_id}", _course_source(course_id))
+
+
+@router.get("/services/{path:path}")
+async def service_events(path: str):
+    """Proxy a server-sent event stream from the service routed for a path"""
+    service = await gateway_service.select_service(Request(
+        request_id=uuid.uuid4(),
+        method="GET",
+        path=f"/{path}",
+        headers={},
+        query_params={},
+    ))
+    if not service:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No service found for path: /{path}")
+    
+    source = lambda: gateway_service.upstream_client.stream_events(service, f"/{path}")
+    return _sse_response(f"service:{service.id}:/{path}", source)
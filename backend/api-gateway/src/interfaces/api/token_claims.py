@@ -0,0 +1,30 @@
+from typing import Any, Dict, List
+
+from jose import JWTError, jwt
+
+from config.constants import TOKEN_PREFIX
+from config.settings import Settings
+
+
+def verified_claims(authorization: str, settings: Settings) -> Dict[str, Any]:
+    """
+    Get the claims of a bearer token, or no claims if it does not verify.
+    
+    The signature is checked so callers cannot claim another identity or
+    role; the token is still authenticated again by the upstream service.
+    """
+    scheme, _, token = authorization.partition(" ")
+    if scheme != TOKEN_PREFIX or not token:
+        return {}
+    try:
+        return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return {}
+
+
+def token_roles(claims: Dict[str, Any]) -> List[str]:
+    """
+    Get the role claim of verified token claims.
+    """
+    roles = claims.get("roles") or []
+    return [str(role) for role in roles] if isinstance(roles, list) else []
\ No newline at end of file
@@ -1,17 +1,81 @@
+import asyncio
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 import uvicorn
 
 from config.settings import Settings
+from infrastructure.lifecycle.server import DrainingServer
+from infrastructure.lifecycle.supervisor import WorkerSupervisor
+from lms_shared.monitoring.access_log import AccessLog
+from lms_shared.monitoring.health import HealthMonitor
+from lms_shared.monitoring.loop_lag import LoopLagMonitor
+from lms_shared.monitoring.metrics import metrics
+from interfaces.api.dependencies import (
+    async_redis_client,
+    course_stream_client,
+    drain,
+    gateway_service,
+    idempotency_store,
+    rate_limiter,
+    route_file,
+    shared_state,
+    stream_hub,
+    tenant_quotas,
+    upstream_client,
+)
+from lms_shared.json_response import FastJSONResponse
 from interfaces.api.routes import router as api_router
+from interfaces.api.routes.debug import router as debug_router
+from interfaces.api.routes.proxy import router as proxy_router
+from interfaces.api.middlewares.deadline import create_deadline_middleware
+from interfaces.api.middlewares.drain import DrainMiddleware
 from interfaces.api.middlewares.error_handler import error_handler_middleware
-from interfaces.api.middlewares.request_logger import request_logger_middleware
-from interfaces.api.middlewares.tenant_resolver import tenant_resolver_middleware
+from interfaces.api.middlewares.idempotency import IdempotencyMiddleware
+from interfaces.api.middlewares.loop_lag_admission import create_loop_lag_admission_middleware
+from interfaces.api.middlewares.priority_admission import create_priority_admission_middleware
+from interfaces.api.middlewares.rate_limit import create_rate_limit_middleware
+from interfaces.api.middlewares.request_logger import create_request_logger_middleware
+from interfaces.api.middlewares.tenant_resolver import create_tenant_resolver_middleware
 
 # Load settings
 settings = Settings()
+loop_lag_monitor = LoopLagMonitor(interval=settings.LOOP_LAG_INTERVAL)
+access_log = AccessLog(
+    sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    slow_threshold=settings.ACCESS_LOG_SLOW_THRESHOLD,
+    queue_size=settings.ACCESS_LOG_QUEUE_SIZE,
+    batch_size=settings.ACCESS_LOG_BATCH_SIZE,
+    flush_interval=settings.ACCESS_LOG_FLUSH_INTERVAL,
+)
+health_monitor = HealthMonitor(
+    "api-gateway",
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+    loop_lag_monitor=loop_lag_monitor,
+    max_loop_lag=settings.HEALTH_MAX_LOOP_LAG,
+)
+
+
+async def check_redis():
+    await async_redis_client.ping()
+
+
+async def check_upstreams():
+    upstreams = gateway_service.upstream_health()
+    unavailable = sorted(name for name, available in upstreams.items() if not available)
+    if unavailable:
+        raise RuntimeError(f"Circuit open for {', '.join(unavailable)}")
+    return {"services": len(upstreams)}
+
+
+# Redis is shared by every replica, so failing readiness on it would take
+# them all out at once; routing keeps working from the last known table
+health_monitor.add_check("redis", check_redis, critical=False)
+health_monitor.add_check("upstreams", check_upstreams, critical=False)
 
 # Create FastAPI app
 app = FastAPI(
@@ -20,6 +84,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
+    default_response_class=FastJSONResponse,
 )
 
 # Add CORS middleware
@@ -33,25 +98,139 @@ app.add_middleware(
 
 # Add custom middlewares
 app.middleware("http")(error_handler_middleware)
-app.middleware("http")(request_logger_middleware)
-app.middleware("http")(tenant_resolver_middleware)
+app.middleware("http")(create_tenant_resolver_middleware(settings))
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware, store=idempotency_store, settings=settings)
+if settings.RATE_LIMIT_ENABLED:
+    app.middleware("http")(create_rate_limit_middleware(rate_limiter, settings))
+if settings.ADMISSION_ENABLED:
+    # Registered last so it runs first and shed requests do no other work
+    app.middleware("http")(create_priority_admission_middleware(settings, tenant_quotas))
+if settings.LOOP_LAG_ADMISSION_ENABLED:
+    app.middleware("http")(create_loop_lag_admission_middleware(
+        loop_lag_monitor,
+        settings.LOOP_LAG_THRESHOLD,
+        settings.ADMISSION_EXEMPT_PATHS,
+    ))
+# Outside admission control, so time spent queued counts against the deadline
+app.middleware("http")(create_deadline_middleware(
+    settings.REQUEST_TIMEOUT,
+    settings.REQUEST_TIMEOUT_MAX,
+    settings.DEADLINE_EXEMPT_PREFIXES,
+))
+# Outside admission control, so rejected requests are still tracked while in flight
+app.add_middleware(
+    DrainMiddleware,
+    drain=drain,
+    exempt_paths=["/health", "/health/live", "/health/ready", "/metrics"],
+)
+# Outside everything that rejects requests, so 429s and 503s are logged too
+if settings.ACCESS_LOG_ENABLED:
+    app.middleware("http")(create_request_logger_middleware(access_log))
 
 # Include API routes
 app.include_router(api_router, prefix="/api")
+if settings.PROFILER_ENABLED:
+    app.include_router(debug_router, prefix="/api")
+# Everything else under /api goes to the registered services; must come last
+app.include_router(proxy_router, prefix="/api")
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
+    if drain.draining:
+        # Fail the check so the load balancer stops routing to this replica
+        return JSONResponse(
+            content={"status": "draining", "service": "api-gateway"},
+            status_code=503,
+        )
     return JSONResponse(
         content={"status": "healthy", "service": "api-gateway"},
         status_code=200,
     )
 
+# Liveness: the process serves requests; says nothing about dependencies
+@app.get("/health/live")
+async def liveness_check():
+    return JSONResponse(
+        content={"status": "alive", "service": "api-gateway"},
+        status_code=200,
+    )
+
+# Readiness: cached results of the background dependency checks
+@app.get("/health/ready")
+async def readiness_check():
+    report = health_monitor.report()
+    if drain.draining:
+        report["status"], report["reason"] = "not_ready", "draining"
+    return JSONResponse(
+        content=report,
+        status_code=503 if report["status"] == "not_ready" else 200,
+    )
+
+# Metrics endpoint (Prometheus text format)
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Startup event
+@app.on_event("startup")
+async def startup_event():
+    drain.on_close(stream_hub.close)
+    drain.on_close(course_stream_client.aclose)
+    drain.on_close(upstream_client.aclose)
+    drain.on_close(async_redis_client.close)
+    # Fails startup on an invalid route file; later errors keep the last good routes
+    route_file.load()
+    route_file.start()
+    drain.on_close(route_file.stop)
+    loop_lag_monitor.start()
+    health_monitor.start()
+    drain.on_close(health_monitor.stop)
+    access_log.start()
+    if shared_state.is_leader:
+        # The leader keeps the routing table in sync and publishes it to the other workers
+        registry_task = asyncio.create_task(gateway_service.follow_registry())
+        
+        async def stop_registry_sync():
+            registry_task.cancel()
+        
+        drain.on_close(stop_registry_sync)
+
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Usually already draining (DrainingServer); otherwise the grace period runs here
+    await drain.drain(settings.DRAIN_GRACE_PERIOD, settings.DRAIN_DEADLINE)
+    await loop_lag_monitor.stop()
+    # Writes the last batch; runs in a thread so a blocked stdout cannot stall shutdown
+    await asyncio.get_running_loop().run_in_executor(None, access_log.stop)
+
 # Run the application
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host=settings.HOST,
-        port=settings.PORT,
-        reload=settings.ENVIRONMENT == "development",
-    ) 
\ No newline at end of file
+    if settings.ENVIRONMENT == "development":
+        uvicorn.run(
+            "main:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            reload=True,
+        )
+    else:
+        config = uvicorn.Config(
+            "main:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            timeout_graceful_shutdown=int(settings.DRAIN_DEADLINE),
+        )
+        workers = settings.WORKERS or os.cpu_count() or 1
+        if workers > 1:
+            WorkerSupervisor(
+                config,
+                drain,
+                settings.DRAIN_GRACE_PERIOD,
+                shared_state,
+                workers,
+                reuse_port=settings.WORKER_REUSE_PORT,
+            ).run()
+        else:
+            DrainingServer(config, drain, settings.DRAIN_GRACE_PERIOD).run() 
\ No newline at end of file
@@ -0,0 +1,183 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from domain.services.priority_classifier import PriorityClass
+from infrastructure.admission.fair_queue import DeficitRoundRobinQueue
+from infrastructure.admission.priority_admission import AdmissionRejectedError, PriorityAdmissionController
+from infrastructure.admission.tenant_quotas import TenantQuota, TenantQuotas
+from infrastructure.shared.memory import SharedSlotTable
+from lms_shared.monitoring.metrics import MetricsRegistry
+
+
+def test_flows_are_served_in_proportion_to_their_quantum():
+    queue = DeficitRoundRobinQueue(lambda flow: 3 if flow == "gold" else 1)
+    for i in range(40):
+        queue.push("gold", i)
+        queue.push("free", i)
+    
+    served = Counter(queue.pop()[0] for _ in range(40))
+    
+    assert served == {"gold": 30, "free": 10}
+
+
+def test_a_deep_backlog_does_not_starve_other_flows():
+    queue = DeficitRoundRobinQueue()
+    for i in range(100):
+        queue.push("noisy", i)
+    queue.push("quiet", "only")
+    
+    served = [queue.pop() for _ in range(3)]
+    
+    assert ("quiet", "only") in served
+    assert [item for flow, item in served if flow == "noisy"] == [0, 1]
+
+
+def test_ineligible_flows_are_skipped_and_keep_their_items():
+    queue = DeficitRoundRobinQueue()
+    queue.push("busy", 1)
+    queue.push("idle", 2)
+    
+    assert queue.pop(lambda flow: flow != "busy") == ("idle", 2)
+    assert queue.pop(lambda flow: flow != "busy") is None
+    assert queue.pop() == ("busy", 1)
+    assert len(queue) == 0
+
+
+def test_remove_and_drain():
+    queue = DeficitRoundRobinQueue()
+    queue.push("a", 1)
+    queue.push("a", 2)
+    queue.push("b", 3)
+    
+    assert queue.remove("a", 1)
+    assert not queue.remove("a", 1)
+    assert queue.queued("a") == 1
+    assert sorted(queue.drain()) == [("a", 2), ("b", 3)]
+    assert len(queue) == 0 and queue.queued("a") == 0
+
+
+def make_controller(weights=None, tenant_quotas=None, **kwargs) -> PriorityAdmissionController:
+    return PriorityAdmissionController(
+        max_concurrency=1,
+        queue_sizes={priority: 100 for priority in PriorityClass},
+        weights=weights or {priority: 1 for priority in PriorityClass},
+        target_wait=60.0,
+        metrics=MetricsRegistry(),
+        tenant_quotas=tenant_quotas,
+        **kwargs,
+    )
+
+
+async def admitted_order(controller, requests):
+    """Queue requests behind a held slot and record the order they are admitted in."""
+    await controller.acquire(PriorityClass.CRITICAL)
+    order = []
+    
+    async def request(label, priority, tenant_id):
+        await controller.acquire(priority, tenant_id)
+        order.append(label)
+        await asyncio.sleep(0)
+        controller.release(tenant_id)
+    
+    tasks = [asyncio.ensure_future(request(*args)) for args in requests]
+    await asyncio.sleep(0)
+    controller.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def test_classes_are_served_by_smooth_weighted_round_robin():
+    controller = make_controller({PriorityClass.HIGH: 3, PriorityClass.LOW: 1})
+    requests = [(f"high-{i}", PriorityClass.HIGH, None) for i in range(6)]
+    requests += [(f"low-{i}", PriorityClass.LOW, None) for i in range(2)]
+    
+    order = await admitted_order(controller, requests)
+    
+    # Interleaved rather than HIGH first
+    assert [label.split("-")[0] for label in order] == ["high", "high", "low", "high"] * 2
+
+
+def make_quotas(**plans) -> TenantQuotas:
+    return TenantQuotas(
+        SharedSlotTable(slots=64, fields=TenantQuotas.FIELDS),
+        {plan: TenantQuota(**quota) for plan, quota in plans.items()},
+        tenant_plans={"gold": "gold"},
+        default_plan="free",
+        metrics=MetricsRegistry(),
+    )
+
+
+async def test_tenants_within_a_class_are_served_by_plan_weight():
+    quotas = make_quotas(
+        gold=dict(max_concurrency=10, rate=1000, burst=1000, max_queued=100, weight=2),
+        free=dict(max_concurrency=10, rate=1000, burst=1000, max_queued=100, weight=1),
+    )
+    controller = make_controller(tenant_quotas=quotas)
+    requests = [("gold", PriorityClass.NORMAL, "gold") for _ in range(8)]
+    requests += [("other", PriorityClass.NORMAL, "other") for _ in range(8)]
+    
+    order = await admitted_order(controller, requests)
+    
+    assert Counter(order[:6]) == {"gold": 4, "other": 2}
+
+
+async def test_tenant_over_its_rate_is_rejected():
+    quotas = make_quotas(free=dict(max_concurrency=10, rate=0.001, burst=2, max_queued=10))
+    controller = make_controller(tenant_quotas=quotas)
+    
+    for _ in range(2):
+        async with controller.admit(PriorityClass.NORMAL, "tenant"):
+            pass
+    with pytest.raises(AdmissionRejectedError) as error:
+        await controller.acquire(PriorityClass.NORMAL, "tenant")
+    
+    assert error.value.reason == "tenant_rate_limited"
+    # Other tenants have their own bucket
+    async with controller.admit(PriorityClass.NORMAL, "other"):
+        pass
+
+
+async def test_tenant_at_its_concurrency_quota_does_not_block_others():
+    quotas = make_quotas(free=dict(max_concurrency=1, rate=1000, burst=1000, max_queued=10))
+    controller = PriorityAdmissionController(
+        max_concurrency=2,
+        queue_sizes={priority: 10 for priority in PriorityClass},
+        weights={},
+        target_wait=60.0,
+        metrics=MetricsRegistry(),
+        tenant_quotas=quotas,
+    )
+    await controller.acquire(PriorityClass.NORMAL, "busy")
+    
+    queued = asyncio.ensure_future(controller.acquire(PriorityClass.NORMAL, "busy"))
+    await asyncio.sleep(0)
+    await asyncio.wait_for(controller.acquire(PriorityClass.NORMAL, "other"), 1)
+    
+    assert not queued.done()
+    controller.release("busy")
+    await asyncio.wait_for(queued, 1)
+
+
+async def test_full_queue_and_timeout_are_rejected():
+    controller = PriorityAdmissionController(
+        max_concurrency=1,
+        queue_sizes={PriorityClass.NORMAL: 1},
+        weights={},
+        target_wait=60.0,
+        max_wait=0.05,
+        metrics=MetricsRegistry(),
+    )
+    await controller.acquire(PriorityClass.CRITICAL)
+    
+    waiting = asyncio.ensure_future(controller.acquire(PriorityClass.NORMAL))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejectedError) as full:
+        await controller.acquire(PriorityClass.NORMAL)
+    with pytest.raises(AdmissionRejectedError) as timeout:
+        await waiting
+    
+    assert full.value.reason == "queue_full"
+    assert timeout.value.reason == "timeout"
+    assert controller.queued() == 0 and controller.in_flight == 1
@@ -0,0 +1,118 @@
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# The client and routes need the generated course stubs
+course_pb2 = pytest.importorskip("infrastructure.proto.course_pb2")
+
+from infrastructure.services.course_stream_client import CourseStreamClient  # noqa: E402
+from interfaces.api.routes import courses  # noqa: E402
+
+
+class RecordingCourseStub:
+    """Stands in for the gRPC stub, recording the requests it gets"""
+    
+    def __init__(self):
+        self.requests = []
+    
+    async def GetCourse(self, request, timeout=None):
+        self.requests.append(request)
+        return course_pb2.CourseResponse(id=request.course_id, title="Algebra")
+    
+    async def ListCourses(self, request, timeout=None):
+        self.requests.append(request)
+        return course_pb2.ListCoursesResponse(
+            courses=[course_pb2.CourseResponse(id="c1", title="Algebra")],
+            total_count=1,
+        )
+
+
+class FakeCourseClient:
+    def __init__(self, course):
+        self.course = course
+        self.calls = []
+    
+    async def get_course(self, course_id, fields=None):
+        self.calls.append((course_id, fields))
+        return self.course
+    
+    async def list_courses(self, page, page_size, fields=None, tags=None, **filters):
+        self.calls.append((page, fields))
+        return {"courses": [self.course], "total_count": 1}
+
+
+@pytest.fixture
+def stub() -> RecordingCourseStub:
+    return RecordingCourseStub()
+
+
+@pytest.fixture
+def stream_client(stub) -> CourseStreamClient:
+    client = CourseStreamClient("course-service:50051")
+    client._stub = stub
+    return client
+
+
+@pytest.fixture
+def fake_client(monkeypatch) -> FakeCourseClient:
+    client = FakeCourseClient({"id": "c1", "title": "Algebra", "settings": {"hidden": True, "max_students": 30}})
+    monkeypatch.setattr(courses, "course_stream_client", client)
+    return client
+
+
+@pytest.fixture
+def http() -> TestClient:
+    app = FastAPI()
+    app.include_router(courses.router, prefix="/api")
+    return TestClient(app)
+
+
+async def test_get_course_sends_the_fields_as_a_read_mask(stream_client, stub):
+    course = await stream_client.get_course("c1", fields=["id", "settings.hidden"])
+    
+    assert stub.requests[0].HasField("read_mask")
+    assert list(stub.requests[0].read_mask.paths) == ["id", "settings.hidden"]
+    assert course["id"] == "c1"
+    # Fields at their default value are kept
+    assert course["status"] == "DRAFT"
+
+
+async def test_get_course_without_fields_sends_no_read_mask(stream_client, stub):
+    await stream_client.get_course("c1")
+    
+    assert not stub.requests[0].HasField("read_mask")
+
+
+async def test_list_courses_sends_the_fields_as_a_read_mask(stream_client, stub):
+    result = await stream_client.list_courses(1, 20, fields=["id"], status="PUBLISHED")
+    
+    assert list(stub.requests[0].read_mask.paths) == ["id"]
+    assert stub.requests[0].status == course_pb2.CourseStatus.Value("PUBLISHED")
+    assert result["total_count"] == 1
+
+
+def test_get_course_route_prunes_to_the_requested_fields(http, fake_client):
+    course_id = uuid.uuid4()
+    
+    response = http.get(f"/api/courses/{course_id}", params={"fields": "id,settings.hidden"})
+    
+    assert response.status_code == 200
+    assert response.json() == {"id": "c1", "settings": {"hidden": True}}
+    assert fake_client.calls == [(str(course_id), ["id", "settings.hidden"])]
+
+
+def test_list_courses_route_prunes_each_course(http, fake_client):
+    response = http.get("/api/courses", params={"fields": "title"})
+    
+    assert response.status_code == 200
+    assert response.json() == {"courses": [{"title": "Algebra"}], "total_count": 1}
+    assert fake_client.calls == [(1, ["title"])]
+
+
+def test_routes_reject_invalid_fields(http, fake_client):
+    response = http.get(f"/api/courses/{uuid.uuid4()}", params={"fields": "id,bad-field"})
+    
+    assert response.status_code == 400
+    assert fake_client.calls == []
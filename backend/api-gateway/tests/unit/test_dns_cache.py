@@ -0,0 +1,126 @@
+import asyncio
+import socket
+from types import SimpleNamespace
+
+import pytest
+
+from infrastructure.services import dns_cache as dns_cache_module
+from infrastructure.services.dns_cache import DnsCache
+from lms_shared.monitoring.metrics import MetricsRegistry
+
+
+class FakeResolver:
+    """Answers lookups with scripted results: (addresses, ttl) or an exception"""
+    
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.lookups = 0
+    
+    async def lookup(self, host):
+        self.lookups += 1
+        answer = self.answers.pop(0) if len(self.answers) > 1 else self.answers[0]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    # Only the cache's clock; the event loop keeps the real one
+    monkeypatch.setattr(dns_cache_module, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def make_cache(resolver: FakeResolver, metrics=None) -> DnsCache:
+    cache = DnsCache(min_ttl=5, max_ttl=300, refresh_ahead=0.2, max_stale=60, metrics=metrics or MetricsRegistry())
+    cache._lookup = resolver.lookup
+    return cache
+
+
+async def test_addresses_are_cached_for_their_ttl(clock):
+    resolver = FakeResolver((["10.0.0.1"], 100), (["10.0.0.2"], 100))
+    cache = make_cache(resolver)
+    
+    assert await cache.resolve("courses") == "10.0.0.1"
+    clock.now += 79
+    assert await cache.resolve("courses") == "10.0.0.1"
+    assert resolver.lookups == 1
+    
+    clock.now += 30
+    # Expired: waits for the new lookup
+    assert await cache.resolve("courses") == "10.0.0.2"
+    assert resolver.lookups == 2
+
+
+async def test_ttls_are_clamped(clock):
+    resolver = FakeResolver((["10.0.0.1"], 0))
+    cache = make_cache(resolver)
+    
+    await cache.resolve("courses")
+    clock.now += 3
+    await cache.resolve("courses")
+    
+    assert resolver.lookups == 1
+
+
+async def test_entries_are_refreshed_in_the_background(clock):
+    resolver = FakeResolver((["10.0.0.1"], 100), (["10.0.0.2"], 100))
+    cache = make_cache(resolver)
+    await cache.resolve("courses")
+    
+    clock.now += 85
+    # Inside the refresh window: answered from the cache right away
+    assert await cache.resolve("courses") == "10.0.0.1"
+    await asyncio.sleep(0)
+    
+    assert resolver.lookups == 2
+    assert await cache.resolve("courses") == "10.0.0.2"
+
+
+async def test_stale_addresses_are_served_while_lookups_fail(clock):
+    metrics = MetricsRegistry()
+    resolver = FakeResolver((["10.0.0.1"], 100), socket.gaierror("resolver down"))
+    cache = make_cache(resolver, metrics)
+    await cache.resolve("courses")
+    
+    clock.now += 101
+    assert await cache.resolve("courses") == "10.0.0.1"
+    # Not retried on every request
+    assert await cache.resolve("courses") == "10.0.0.1"
+    assert resolver.lookups == 2
+    assert metrics.counter("gateway_dns_stale_total", "").get() == 1
+    
+    clock.now += 60
+    with pytest.raises(OSError):
+        await cache.resolve("courses")
+
+
+async def test_unknown_host_fails_without_a_cached_address(clock):
+    cache = make_cache(FakeResolver(socket.gaierror("no such host")))
+    
+    with pytest.raises(OSError):
+        await cache.resolve("nowhere")
+
+
+async def test_addresses_are_handed_out_in_turn(clock):
+    cache = make_cache(FakeResolver((["10.0.0.1", "10.0.0.2"], 100)))
+    
+    assert [await cache.resolve("courses") for _ in range(3)] == ["10.0.0.1", "10.0.0.2", "10.0.0.1"]
+
+
+async def test_ip_addresses_are_not_looked_up(clock):
+    resolver = FakeResolver((["10.0.0.1"], 100))
+    cache = make_cache(resolver)
+    
+    assert await cache.resolve("192.168.1.5") == "192.168.1.5"
+    assert await cache.resolve("::1") == "::1"
+    assert resolver.lookups == 0
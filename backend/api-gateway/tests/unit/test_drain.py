@@ -0,0 +1,124 @@
+import asyncio
+
+import httpx
+import pytest
+
+from infrastructure.lifecycle.drain import DrainCoordinator
+from interfaces.api.middlewares.drain import DrainMiddleware
+
+
+class BlockingApp:
+    """ASGI app whose responses wait until released"""
+    
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+    
+    async def __call__(self, scope, receive, send):
+        self.started.set()
+        await self.release.wait()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/plain"), (b"connection", b"keep-alive")],
+        })
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.fixture
+def drain() -> DrainCoordinator:
+    return DrainCoordinator()
+
+
+@pytest.fixture
+def app() -> BlockingApp:
+    return BlockingApp()
+
+
+@pytest.fixture
+def client(app, drain) -> httpx.AsyncClient:
+    middleware = DrainMiddleware(app, drain, exempt_paths=["/health"])
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://gateway")
+
+
+async def test_serves_normally_before_draining(client):
+    response = await client.get("/api/courses")
+    
+    assert response.status_code == 200
+    assert response.headers["connection"] == "keep-alive"
+
+
+async def test_asks_clients_to_reconnect_while_draining(client, drain):
+    drain.start_draining()
+    
+    response = await client.get("/api/courses")
+    
+    assert response.status_code == 200
+    assert response.headers.get_list("connection") == ["close"]
+
+
+async def test_rejects_requests_once_no_longer_accepting(client, drain, app):
+    drain.start_draining()
+    drain.stop_accepting()
+    
+    response = await client.get("/api/courses")
+    
+    assert response.status_code == 503
+    assert response.json()["reason"] == "draining"
+    assert response.headers["connection"] == "close"
+    assert response.headers["retry-after"] == "1"
+    assert not app.started.is_set()
+
+
+async def test_exempt_paths_are_served_while_draining(client, drain):
+    drain.stop_accepting()
+    
+    response = await client.get("/health")
+    
+    assert response.status_code == 200
+
+
+async def test_in_flight_requests_finish_before_shutdown(client, drain, app):
+    closed = []
+    
+    async def close_pools():
+        closed.append(drain.in_flight)
+    
+    drain.on_close(close_pools)
+    app.release.clear()
+    request = asyncio.create_task(client.get("/api/courses"))
+    await app.started.wait()
+    assert drain.in_flight == 1
+    
+    shutdown = asyncio.create_task(drain.drain(grace_period=0, deadline=5))
+    await asyncio.sleep(0.05)
+    assert not drain.accepting
+    assert closed == []
+    
+    app.release.set()
+    response = await request
+    await shutdown
+    
+    assert response.status_code == 200
+    assert response.headers["connection"] == "close"
+    assert closed == [0]
+
+
+async def test_shutdown_goes_ahead_at_the_deadline(client, drain, app):
+    closed = []
+    
+    async def close_pools():
+        closed.append(drain.in_flight)
+    
+    drain.on_close(close_pools)
+    app.release.clear()
+    request = asyncio.create_task(client.get("/api/courses"))
+    await app.started.wait()
+    
+    await drain.drain(grace_period=0, deadline=0.05)
+    
+    assert closed == [1]
+    app.release.set()
+    await request
+    assert drain.in_flight == 0
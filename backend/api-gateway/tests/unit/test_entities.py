@@ -0,0 +1,177 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from domain.entities.lazy_field import LazyField, lazy_timestamp, lazy_uuid
+from domain.entities.request import Request
+from domain.entities.response import Response
+
+REQUEST_ID = uuid.UUID("6f1c2a3e-0b5d-4c1a-9e7f-2d3b4c5d6e7f")
+TENANT_ID = uuid.UUID("0a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d")
+
+
+class Counted:
+    """A slotted entity whose ID parser counts its calls"""
+    
+    __slots__ = ("_id", "_created_at")
+    
+    parses = 0
+    
+    id = LazyField(uuid.UUID, lambda value: Counted.count(uuid.UUID(value)))
+    created_at = lazy_timestamp()
+    
+    def __init__(self, id, created_at=None):
+        self._id = id
+        self._created_at = created_at
+    
+    @classmethod
+    def count(cls, value):
+        cls.parses += 1
+        return value
+
+
+def make_request(**overrides) -> Request:
+    fields = {
+        "request_id": REQUEST_ID,
+        "method": "POST",
+        "path": "/courses",
+        "headers": {"content-type": "application/json"},
+        "query_params": {"page": "1"},
+        "body": b'{"title": "Algebra"}',
+        "tenant_id": TENANT_ID,
+    }
+    fields.update(overrides)
+    return Request(**fields)
+
+
+def test_lazy_field_parses_once_on_first_read():
+    Counted.parses = 0
+    entity = Counted(str(REQUEST_ID))
+    
+    assert Counted.parses == 0
+    assert entity.id == REQUEST_ID
+    assert entity.id == REQUEST_ID
+    assert Counted.parses == 1
+
+
+def test_lazy_field_text_reuses_the_unread_string():
+    Counted.parses = 0
+    entity = Counted(str(REQUEST_ID).upper())
+    
+    assert Counted.id.text(entity) == str(REQUEST_ID).upper()
+    assert Counted.parses == 0
+
+
+def test_lazy_field_keeps_none():
+    entity = Counted(None)
+    
+    assert entity.id is None
+    assert Counted.id.text(entity) is None
+    assert Counted.created_at.text(entity) is None
+
+
+def test_lazy_timestamp_accepts_epoch_seconds_and_iso_strings():
+    assert Counted(None, 0.0).created_at == datetime(1970, 1, 1)
+    assert Counted(None, "2024-05-01T12:00:00").created_at == datetime(2024, 5, 1, 12)
+    assert Counted.created_at.text(Counted(None, 0.0)) == "1970-01-01T00:00:00"
+
+
+def test_lazy_fields_are_descriptors_on_the_class():
+    assert isinstance(Request.request_id, LazyField)
+    assert isinstance(lazy_uuid(), LazyField)
+    with pytest.raises(AttributeError):
+        make_request().unknown = 1
+
+
+def test_request_timestamp_is_only_converted_when_read():
+    request = make_request()
+    
+    assert isinstance(request._timestamp, float)
+    assert isinstance(request.timestamp, datetime)
+
+
+def test_request_round_trips_through_a_dict():
+    request = make_request(user_id=uuid.uuid4(), correlation_id=uuid.uuid4())
+    
+    data = request.to_dict()
+    copy = Request.from_dict(data)
+    
+    assert data["request_id"] == str(REQUEST_ID)
+    assert data["tenant_id"] == str(TENANT_ID)
+    assert copy.to_dict() == data
+    assert copy.request_id == request.request_id
+    assert copy.user_id == request.user_id
+    assert copy.timestamp == request.timestamp
+
+
+def test_request_from_dict_treats_empty_ids_as_missing():
+    data = make_request().to_dict()
+    data["tenant_id"] = ""
+    
+    assert Request.from_dict(data).tenant_id is None
+
+
+def test_request_without_a_body_has_an_empty_one():
+    assert make_request(body=None).body == {}
+
+
+def test_malformed_ids_only_raise_when_read():
+    data = make_request().to_dict()
+    data["tenant_id"] = "not-a-uuid"
+    data["timestamp"] = "yesterday"
+    
+    request = Request.from_dict(data)
+    
+    assert request.path == "/courses"
+    assert request.to_dict()["tenant_id"] == "not-a-uuid"
+    with pytest.raises(ValueError):
+        request.tenant_id
+    with pytest.raises(ValueError):
+        request.timestamp
+
+
+def test_response_round_trips_through_a_dict():
+    response = Response(REQUEST_ID, 201, {"id": "c1"}, {"x-upstream": "courses"}, metadata={"cache": "miss"})
+    
+    data = response.to_dict()
+    copy = Response.from_dict(data)
+    
+    assert copy.to_dict() == data
+    assert copy.request_id == REQUEST_ID
+    assert copy.metadata == {"cache": "miss"}
+
+
+def test_response_error_is_a_factory_on_the_class_and_details_on_instances():
+    error = Response.error(REQUEST_ID, 404, "No service found", errors=[{"field": "path"}])
+    
+    assert error.status_code == 404
+    assert error.body == {"success": False}
+    assert error.error == {"message": "No service found", "errors": [{"field": "path"}]}
+    assert Response(REQUEST_ID, 200, b"", {}).error is None
+    
+    error.error = None
+    assert error.error is None
+
+
+def test_response_success_wraps_the_data():
+    response = Response.success(REQUEST_ID, {"id": "c1"}, message="Created")
+    
+    assert response.body == {"success": True, "data": {"id": "c1"}, "message": "Created"}
+    assert response.error is None
+
+
+def test_response_json_parses_a_raw_body_once():
+    response = Response(REQUEST_ID, 200, b'{"id": "c1"}', {})
+    
+    assert response.json() == {"id": "c1"}
+    assert response.body == {"id": "c1"}
+    assert response.json() is response.body
+
+
+def test_response_json_raises_for_non_json_bodies():
+    response = Response(REQUEST_ID, 200, b"<html></html>", {})
+    
+    with pytest.raises(ValueError):
+        response.json()
+    assert response.body == b"<html></html>"
@@ -0,0 +1,140 @@
+import json
+import uuid
+
+import pytest
+
+from domain.entities.field_projection import FieldProjection
+from domain.entities.request import Request
+from domain.entities.response import Response
+from domain.entities.route_rule import RouteRule
+from domain.services.gateway_service import GatewayService
+from domain.services.route_rules import RouteRules
+from infrastructure.repositories.service_registry import InMemoryServiceRegistryRepository
+
+COURSE = {
+    "id": "c1",
+    "title": "Algebra",
+    "settings": {"hidden": False, "max_students": 30},
+    "tags": ["math"],
+}
+
+
+class RecordingUpstreamClient:
+    """Answers every request with a canned body, recording the requests"""
+    
+    def __init__(self, body, content_type: str = "application/json"):
+        self.body = body
+        self.content_type = content_type
+        self.requests = []
+    
+    async def forward(self, service, request, timeout):
+        self.requests.append(request)
+        return Response(request.request_id, 200, self.body, {"content-type": self.content_type})
+
+
+def make_gateway(upstream_client, projection: bool = False) -> GatewayService:
+    gateway = GatewayService(InMemoryServiceRegistryRepository(), upstream_client=upstream_client)
+    gateway.set_route_rules(RouteRules([
+        RouteRule("courses", "/courses", "http://course-service:8002", projection=projection),
+    ]))
+    return gateway
+
+
+def make_request(fields: str) -> Request:
+    return Request(
+        request_id=uuid.uuid4(),
+        method="GET",
+        path="/courses/c1",
+        headers={},
+        query_params={"fields": fields, "page": "1"},
+    )
+
+
+def test_keeps_only_the_requested_fields():
+    projection = FieldProjection(["id", "title", "unknown"])
+    
+    assert projection.apply(COURSE) == {"id": "c1", "title": "Algebra"}
+
+
+def test_nested_paths_select_inside_objects():
+    projection = FieldProjection(["id", "settings.hidden"])
+    
+    assert projection.apply(COURSE) == {"id": "c1", "settings": {"hidden": False}}
+
+
+def test_a_field_includes_everything_inside_it():
+    projection = FieldProjection(["settings", "settings.hidden"])
+    
+    assert projection.apply(COURSE) == {"settings": COURSE["settings"]}
+
+
+def test_paths_into_lists_apply_to_each_item():
+    projection = FieldProjection(["courses.id", "total_count"])
+    page = {"courses": [COURSE, {**COURSE, "id": "c2"}], "total_count": 2, "page": 1}
+    
+    assert projection.apply(page) == {"courses": [{"id": "c1"}, {"id": "c2"}], "total_count": 2}
+
+
+def test_parse_splits_and_strips_the_parameter():
+    projection = FieldProjection.parse(" id , title,,title ")
+    
+    assert projection.paths == ["id", "title"]
+
+
+@pytest.mark.parametrize("value", [None, "", "  "])
+def test_parse_without_fields_returns_none(value):
+    assert FieldProjection.parse(value) is None
+
+
+@pytest.mark.parametrize("paths", [
+    [],
+    ["id", "settings..hidden"],
+    ["1st"],
+    ["title-case"],
+    [f"field_{i}" for i in range(FieldProjection.MAX_PATHS + 1)],
+])
+def test_rejects_invalid_paths(paths):
+    with pytest.raises(ValueError):
+        FieldProjection(paths)
+
+
+async def test_gateway_prunes_a_raw_json_body():
+    upstream = RecordingUpstreamClient(json.dumps(COURSE).encode())
+    gateway = make_gateway(upstream)
+    
+    response = await gateway.route_request(make_request("id,settings.hidden"))
+    
+    assert response.body == {"id": "c1", "settings": {"hidden": False}}
+    # Applied by the gateway, so the upstream never sees the parameter
+    assert upstream.requests[0].query_params == {"page": "1"}
+
+
+async def test_gateway_passes_fields_on_to_projecting_upstreams():
+    body = json.dumps({"id": "c1"}).encode()
+    upstream = RecordingUpstreamClient(body)
+    gateway = make_gateway(upstream, projection=True)
+    
+    response = await gateway.route_request(make_request("id"))
+    
+    assert response.body == body
+    assert upstream.requests[0].query_params == {"fields": "id", "page": "1"}
+
+
+async def test_gateway_leaves_non_json_bodies_alone():
+    upstream = RecordingUpstreamClient(b"<html></html>", content_type="text/html")
+    gateway = make_gateway(upstream)
+    
+    response = await gateway.route_request(make_request("id"))
+    
+    assert response.status_code == 200
+    assert response.body == b"<html></html>"
+
+
+async def test_gateway_rejects_invalid_fields():
+    upstream = RecordingUpstreamClient(b"{}")
+    gateway = make_gateway(upstream)
+    
+    response = await gateway.route_request(make_request("id,bad-field"))
+    
+    assert response.status_code == 400
+    assert upstream.requests == []
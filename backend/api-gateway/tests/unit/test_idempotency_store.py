@@ -0,0 +1,88 @@
+import asyncio
+
+from fakeredis import aioredis
+from redis.exceptions import ConnectionError
+
+from infrastructure.idempotency.store import IdempotencyRecord, IdempotencyStore, StoredResponse
+
+RESPONSE = StoredResponse(201, [("content-type", "application/json")], b'{"id": 1}')
+
+
+def make_store(redis_client=None, **kwargs) -> IdempotencyStore:
+    return IdempotencyStore(redis_client or aioredis.FakeRedis(), poll_interval=0.01, **kwargs)
+
+
+async def test_first_request_claims_and_a_retry_gets_the_stored_response():
+    store = make_store()
+    
+    assert await store.claim("key", "fingerprint") is None
+    await store.complete("key", "fingerprint", RESPONSE)
+    record = await store.claim("key", "fingerprint")
+    
+    assert record.state == IdempotencyRecord.COMPLETED
+    assert record.fingerprint == "fingerprint"
+    assert (record.response.status_code, record.response.headers, record.response.body) == (
+        RESPONSE.status_code, RESPONSE.headers, RESPONSE.body,
+    )
+
+
+async def test_another_replica_sees_the_claim_and_then_the_response():
+    redis_client = aioredis.FakeRedis()
+    first, second = make_store(redis_client), make_store(redis_client)
+    
+    assert await first.claim("key", "fingerprint") is None
+    in_progress = await second.claim("key", "fingerprint")
+    waiting = asyncio.ensure_future(second.wait("key", timeout=1))
+    await first.complete("key", "fingerprint", RESPONSE)
+    
+    assert in_progress.state == IdempotencyRecord.IN_PROGRESS
+    assert (await waiting).response.body == RESPONSE.body
+
+
+async def test_duplicates_on_the_same_replica_share_the_outcome():
+    store = make_store()
+    assert await store.claim("key", "fingerprint") is None
+    
+    duplicate = asyncio.ensure_future(store.claim("key", "fingerprint"))
+    await asyncio.sleep(0)
+    assert not duplicate.done()
+    await store.complete("key", "fingerprint", RESPONSE)
+    
+    assert (await duplicate).state == IdempotencyRecord.COMPLETED
+
+
+async def test_released_key_can_be_claimed_again():
+    store = make_store()
+    assert await store.claim("key", "fingerprint") is None
+    
+    duplicate = asyncio.ensure_future(store.claim("key", "fingerprint"))
+    await asyncio.sleep(0)
+    await store.release("key")
+    
+    # The waiting duplicate takes over the key
+    assert await duplicate is None
+
+
+async def test_claim_expires_if_its_replica_dies():
+    redis_client = aioredis.FakeRedis()
+    assert await make_store(redis_client, lock_ttl=0.05).claim("key", "fingerprint") is None
+    await asyncio.sleep(0.1)
+    
+    assert await make_store(redis_client).claim("key", "fingerprint") is None
+
+
+class UnavailableRedis:
+    async def set(self, *args, **kwargs):
+        raise ConnectionError("down")
+    
+    async def get(self, *args, **kwargs):
+        raise ConnectionError("down")
+
+
+async def test_without_redis_duplicates_are_still_caught_locally():
+    store = make_store(UnavailableRedis())
+    
+    assert await store.claim("key", "fingerprint") is None
+    await store.complete("key", "fingerprint", RESPONSE)
+    
+    assert (await store.claim("key", "fingerprint")).state == IdempotencyRecord.COMPLETED
@@ -0,0 +1,30 @@
+import inspect
+
+import pytest
+
+from domain.repositories.service_registry import ServiceRegistryRepository
+from infrastructure.repositories.redis_service_registry import RedisServiceRegistryRepository
+from infrastructure.repositories.service_registry import InMemoryServiceRegistryRepository
+
+
+def test_registry_repositories_implement_every_abstract_method():
+    """Both registry repositories can be instantiated."""
+    assert not RedisServiceRegistryRepository.__abstractmethods__
+    assert not InMemoryServiceRegistryRepository.__abstractmethods__
+
+
+def test_registry_repository_methods_are_async():
+    """Every registry method is awaited by the gateway, so none may be sync."""
+    for name in ServiceRegistryRepository.__abstractmethods__:
+        for repository in (RedisServiceRegistryRepository, InMemoryServiceRegistryRepository):
+            method = getattr(repository, name)
+            assert inspect.iscoroutinefunction(method) or inspect.isasyncgenfunction(method), f"{repository.__name__}.{name}"
+
+
+def test_dependencies_import():
+    """The shared clients and services are built at import time."""
+    # Generated by tests/conftest.py when grpc_tools is installed
+    pytest.importorskip("infrastructure.proto.course_pb2")
+    from interfaces.api import dependencies
+    
+    assert isinstance(dependencies.service_registry, ServiceRegistryRepository)
@@ -0,0 +1,84 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from config.settings import Settings
+from domain.repositories.errors import RepositoryError
+from interfaces.api.middlewares.error_handler import error_handler_middleware
+from interfaces.api.middlewares.tenant_resolver import create_tenant_resolver_middleware
+
+
+def test_main_builds_the_app():
+    # main imports the dependencies, which need the generated course stubs
+    pytest.importorskip("infrastructure.proto.course_pb2")
+    import main
+    
+    paths = {route.path for route in main.app.routes}
+    # Without entering the client, startup (Redis, route file) does not run
+    response = TestClient(main.app).get("/health/live")
+    
+    assert {"/health", "/health/live", "/health/ready", "/metrics"} <= paths
+    assert response.status_code == 200
+
+
+def make_client(settings: Settings) -> TestClient:
+    app = FastAPI()
+    app.middleware("http")(create_tenant_resolver_middleware(settings))
+    app.middleware("http")(error_handler_middleware)
+    
+    @app.get("/tenant")
+    async def tenant(request: Request):
+        return {"state": request.state.tenant_id, "header": request.headers.get("X-Tenant-ID")}
+    
+    @app.get("/registry-down")
+    async def registry_down():
+        raise RepositoryError("connection refused")
+    
+    @app.get("/bug")
+    async def bug():
+        raise KeyError("missing")
+    
+    return TestClient(app)
+
+
+def test_verified_org_claim_replaces_the_tenant_header():
+    settings = Settings()
+    token = jwt.encode({"sub": "user", "org_id": "org-1"}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    
+    response = make_client(settings).get("/tenant", headers={"Authorization": f"Bearer {token}", "X-Tenant-ID": "org-2"})
+    
+    assert response.json() == {"state": "org-1", "header": "org-1"}
+
+
+def test_anonymous_requests_keep_their_tenant_header():
+    client = make_client(Settings())
+    
+    assert client.get("/tenant", headers={"X-Tenant-ID": "org-2"}).json() == {"state": "org-2", "header": "org-2"}
+    assert client.get("/tenant").json() == {"state": None, "header": None}
+
+
+def test_unhandled_errors_become_json_responses():
+    client = make_client(Settings())
+    
+    registry_down = client.get("/registry-down")
+    bug = client.get("/bug")
+    
+    assert registry_down.status_code == 503
+    assert registry_down.json()["reason"] == "registry_unavailable"
+    assert bug.status_code == 500
+    assert bug.json() == {"detail": "Internal server error"}
+
+
+def test_rejected_requests_reach_the_access_log(monkeypatch):
+    pytest.importorskip("infrastructure.proto.course_pb2")
+    import main
+    
+    records = []
+    monkeypatch.setattr(main.access_log, "record", lambda **record: records.append(record))
+    monkeypatch.setattr(main.drain, "accepting", False)
+    
+    response = TestClient(main.app).get("/api/courses")
+    
+    assert response.status_code == 503
+    assert [(record["path"], record["status_code"]) for record in records] == [("/api/courses", 503)]
@@ -0,0 +1,42 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from config.settings import Settings
+from interfaces.api.middlewares.priority_admission import create_priority_admission_middleware
+
+
+def make_client(settings: Settings) -> TestClient:
+    app = FastAPI()
+    app.middleware("http")(create_priority_admission_middleware(settings))
+    
+    @app.get("/api/courses")
+    async def courses(request: Request):
+        return {"priority": request.state.priority.name}
+    
+    return TestClient(app)
+
+
+def make_settings() -> Settings:
+    return Settings(
+        TENANT_PLANS={"org-enterprise": "enterprise"},
+        DEFAULT_TENANT_PLAN="free",
+        PRIORITY_ROUTE_CLASSES={},
+    )
+
+
+def test_priority_comes_from_the_verified_org_claim():
+    settings = make_settings()
+    token = jwt.encode({"sub": "user", "org_id": "org-enterprise"}, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    
+    response = make_client(settings).get("/api/courses", headers={"Authorization": f"Bearer {token}"})
+    
+    assert response.json() == {"priority": "HIGH"}
+
+
+def test_tenant_header_does_not_raise_priority():
+    settings = make_settings()
+    
+    response = make_client(settings).get("/api/courses", headers={"X-Tenant-ID": "org-enterprise"})
+    
+    assert response.json() == {"priority": "LOW"}
@@ -0,0 +1,37 @@
+from domain.services.priority_classifier import PriorityClass, PriorityClassifier
+
+
+def make_classifier() -> PriorityClassifier:
+    return PriorityClassifier(
+        route_classes={"/api/exports": "low"},
+        role_classes={"admin": "critical"},
+        plan_classes={"enterprise": "high", "standard": "normal", "free": "low"},
+        tenant_plans={"org-enterprise": "enterprise", "org-free": "free"},
+        default_plan="standard",
+    )
+
+
+def test_tenant_plan_sets_the_class():
+    classifier = make_classifier()
+    
+    assert classifier.classify("/api/courses", tenant_id="org-enterprise") == PriorityClass.HIGH
+    assert classifier.classify("/api/courses", tenant_id="org-free") == PriorityClass.LOW
+
+
+def test_anonymous_and_unlisted_tenants_get_the_default_plan():
+    classifier = make_classifier()
+    
+    assert classifier.classify("/api/courses") == PriorityClass.NORMAL
+    assert classifier.classify("/api/courses", tenant_id="org-unknown") == PriorityClass.NORMAL
+
+
+def test_most_important_of_role_and_plan_wins():
+    classifier = make_classifier()
+    
+    assert classifier.classify("/api/courses", roles=["admin"], tenant_id="org-free") == PriorityClass.CRITICAL
+
+
+def test_route_rule_is_authoritative():
+    classifier = make_classifier()
+    
+    assert classifier.classify("/api/exports/report", roles=["admin"], tenant_id="org-enterprise") == PriorityClass.LOW
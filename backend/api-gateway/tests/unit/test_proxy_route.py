@@ -0,0 +1,81 @@
+import uuid
+from typing import Tuple
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from domain.entities.response import Response
+
+# The routes import the shared clients, which need the generated course stubs
+pytest.importorskip("infrastructure.proto.course_pb2")
+
+from interfaces.api.routes import proxy  # noqa: E402
+
+
+class RecordingGatewayService:
+    def __init__(self, response: Response):
+        self.response = response
+        self.requests = []
+    
+    async def route_request(self, request):
+        self.requests.append(request)
+        return self.response
+
+
+def make_client(monkeypatch, response: Response) -> Tuple[TestClient, RecordingGatewayService]:
+    gateway_service = RecordingGatewayService(response)
+    monkeypatch.setattr(proxy, "gateway_service", gateway_service)
+    app = FastAPI()
+    app.include_router(proxy.router, prefix="/api")
+    return TestClient(app), gateway_service
+
+
+def test_requests_under_api_are_routed(monkeypatch):
+    client, gateway_service = make_client(monkeypatch, Response(uuid.uuid4(), 201, b"", {}))
+    tenant_id = uuid.uuid4()
+    
+    response = client.post(
+        "/api/files/upload?folder=docs",
+        content=b"\x00\xff",
+        headers={"Content-Type": "application/octet-stream", "X-Tenant-ID": str(tenant_id)},
+    )
+    
+    request = gateway_service.requests[0]
+    assert response.status_code == 201
+    assert (request.method, request.path, request.query_params) == ("POST", "/files/upload", {"folder": "docs"})
+    assert request.body == b"\x00\xff"
+    assert request.headers["content-type"] == "application/octet-stream"
+    # Set by the tenant resolver, which this app does not run
+    assert request.tenant_id is None
+
+
+def test_malformed_ids_are_dropped(monkeypatch):
+    client, gateway_service = make_client(monkeypatch, Response(uuid.uuid4(), 204, b"", {}))
+    
+    client.get("/api/files", headers={"X-Request-ID": "not-a-uuid", "X-Correlation-ID": "also-not"})
+    
+    request = gateway_service.requests[0]
+    assert isinstance(request.request_id, uuid.UUID)
+    assert request.correlation_id is None
+    assert request.body == {}
+
+
+def test_upstream_bodies_are_sent_as_they_arrived(monkeypatch):
+    upstream = Response(uuid.uuid4(), 200, b"id,title\n1,Algebra\n", {"content-type": "text/csv"})
+    client, _ = make_client(monkeypatch, upstream)
+    
+    response = client.get("/api/reports/courses.csv")
+    
+    assert response.content == b"id,title\n1,Algebra\n"
+    assert response.headers["content-type"] == "text/csv"
+
+
+def test_gateway_errors_are_sent_as_json(monkeypatch):
+    error = Response.error(request_id=uuid.uuid4(), status_code=404, message="No service found for path: /nowhere")
+    client, _ = make_client(monkeypatch, error)
+    
+    response = client.get("/api/nowhere")
+    
+    assert response.status_code == 404
+    assert response.json() == {"success": False, "error": {"message": "No service found for path: /nowhere"}}
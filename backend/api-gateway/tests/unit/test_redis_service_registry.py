@@ -0,0 +1,166 @@
+import asyncio
+import uuid
+
+import pytest
+
+from domain.entities.bulk_operation import BulkOperation
+from domain.entities.service import Service
+from domain.repositories.errors import RegistryRevisionExpiredError
+from infrastructure.repositories.redis_service_registry import RedisServiceRegistryRepository
+
+fakeredis = pytest.importorskip("fakeredis")
+# fakeredis runs the registry's Lua scripts with lupa
+pytest.importorskip("lupa")
+
+
+def make_service(name: str = "courses", version: str = "1.0.0", is_active: bool = True) -> Service:
+    return Service(
+        name=name,
+        version=version,
+        host="localhost",
+        port=8000,
+        health_check_url="/health",
+        is_active=is_active,
+    )
+
+
+@pytest.fixture
+def registry() -> RedisServiceRegistryRepository:
+    return RedisServiceRegistryRepository(fakeredis.FakeAsyncRedis())
+
+
+async def test_deleting_one_replica_keeps_the_name(registry):
+    first = await registry.register(make_service())
+    second = await registry.register(make_service())
+    
+    await registry.delete(first.id)
+    
+    assert (await registry.get_by_name("courses")).id == second.id
+    
+    await registry.delete(second.id)
+    
+    assert await registry.get_by_name("courses") is None
+
+
+async def test_registering_a_replica_keeps_the_highest_version(registry):
+    current = await registry.register(make_service(version="2.0.0"))
+    await registry.register(make_service(version="1.0.0"))
+    await registry.register(make_service(version="1.10.0"))
+    
+    assert (await registry.get_by_name("courses")).id == current.id
+
+
+async def test_active_instances_are_preferred(registry):
+    await registry.register(make_service(is_active=False))
+    active = await registry.register(make_service())
+    
+    assert (await registry.get_by_name("courses")).id == active.id
+
+
+async def test_renaming_moves_the_service_between_names(registry):
+    service = await registry.register(make_service())
+    renamed = Service.from_dict({**service.to_dict(), "name": "catalog"})
+    
+    await registry.update(service.id, renamed)
+    
+    assert await registry.get_by_name("courses") is None
+    assert (await registry.get_by_name("catalog")).id == service.id
+
+
+async def collect(registry, since_revision: int):
+    return [change async for change in registry.watch(since_revision, timeout=0.05)]
+
+
+async def test_bulk_apply_writes_the_batch_in_one_transaction(registry):
+    existing = await registry.register(make_service(name="users"))
+    first, second = make_service(), make_service(version="2.0.0")
+    
+    results = await registry.bulk_apply([
+        BulkOperation.register(first),
+        BulkOperation.delete(uuid.uuid4()),
+        BulkOperation.register(second),
+        BulkOperation.delete(existing.id),
+    ])
+    
+    assert [result.success for result in results] == [True, False, True, True]
+    assert results[1].error == "Service not found"
+    assert [result.revision for result in results if result.success] == [2, 3, 4]
+    assert {service.id for service in await registry.list()} == {first.id, second.id}
+    assert await registry.get_by_name("users") is None
+
+
+async def test_bulk_apply_marks_how_much_of_the_batch_follows(registry):
+    await registry.register(make_service(name="users"))
+    since = await registry.get_revision()
+    
+    await registry.bulk_apply([BulkOperation.register(make_service()) for _ in range(3)])
+    
+    changes = await collect(registry, since)
+    assert [change.revision for change in changes] == [since + 1, since + 2, since + 3]
+    assert [change.batch_remaining for change in changes] == [2, 1, 0]
+
+
+async def test_bulk_apply_retries_when_a_watched_service_changes():
+    server = fakeredis.FakeServer()
+    registry = RedisServiceRegistryRepository(fakeredis.FakeAsyncRedis(server=server))
+    other_writer = fakeredis.FakeAsyncRedis(server=server)
+    service = await registry.register(make_service())
+    reads = []
+    pipeline = registry.redis.pipeline
+    
+    def pipeline_with_a_concurrent_write(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        mget = pipe.mget
+        
+        async def mget_then_write(keys):
+            values = await mget(keys)
+            reads.append(values)
+            if len(reads) == 1:
+                # Another writer lands between WATCH and EXEC
+                await other_writer.set(keys[0], values[0])
+            return values
+        
+        pipe.mget = mget_then_write
+        return pipe
+    
+    registry.redis.pipeline = pipeline_with_a_concurrent_write
+    update = Service.from_dict({**service.to_dict(), "port": 9000})
+    
+    results = await registry.bulk_apply([BulkOperation.update(update)])
+    
+    assert len(reads) == 2
+    assert results[0].success
+    assert (await registry.get(service.id)).port == 9000
+
+
+async def test_watch_resumes_after_a_revision(registry):
+    services = [await registry.register(make_service(version=f"1.{minor}.0")) for minor in range(3)]
+    
+    changes = await collect(registry, 1)
+    
+    assert [change.revision for change in changes] == [2, 3]
+    assert [change.service.id for change in changes] == [services[1].id, services[2].id]
+    assert await collect(registry, 3) == []
+
+
+async def test_watch_wakes_up_on_a_new_change(registry):
+    watch = registry.watch(0, timeout=5)
+    next_change = asyncio.ensure_future(watch.__anext__())
+    await asyncio.sleep(0.05)
+    assert not next_change.done()
+    
+    service = await registry.register(make_service())
+    
+    change = await asyncio.wait_for(next_change, 1)
+    assert (change.revision, change.service_id) == (1, service.id)
+    await watch.aclose()
+
+
+async def test_watch_fails_when_the_changes_were_trimmed():
+    registry = RedisServiceRegistryRepository(fakeredis.FakeAsyncRedis())
+    await registry.register(make_service())
+    await registry.redis.xtrim(registry.changes_stream, maxlen=0)
+    await registry.register(make_service())
+    
+    with pytest.raises(RegistryRevisionExpiredError):
+        await collect(registry, 0)
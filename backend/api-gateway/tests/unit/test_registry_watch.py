@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from domain.entities.bulk_operation import BulkOperation
+from domain.entities.registry_change import RegistryChangeType
+from domain.entities.service import Service
+from domain.repositories.errors import RegistryRevisionExpiredError
+from domain.services.gateway_service import GatewayService
+from infrastructure.repositories.service_registry import InMemoryServiceRegistryRepository
+
+
+def make_service(name: str = "courses", version: str = "1.0.0") -> Service:
+    return Service(name=name, version=version, host="localhost", port=8000, health_check_url="/health")
+
+
+async def collect(registry, since_revision: int):
+    return [change async for change in registry.watch(since_revision, timeout=0.01)]
+
+
+async def test_watch_streams_changes_after_a_revision():
+    registry = InMemoryServiceRegistryRepository()
+    service = await registry.register(make_service())
+    since = await registry.get_revision()
+    await registry.update(service.id, {"port": 9000})
+    await registry.delete(service.id)
+    
+    changes = await collect(registry, since)
+    
+    assert [change.revision for change in changes] == [since + 1, since + 2]
+    assert [change.change_type for change in changes] == [RegistryChangeType.UPDATED, RegistryChangeType.DELETED]
+    assert changes[0].service.port == 9000
+    assert changes[1].service is None
+
+
+async def test_watch_returns_after_the_timeout_without_changes():
+    registry = InMemoryServiceRegistryRepository()
+    await registry.register(make_service())
+    
+    assert await collect(registry, await registry.get_revision()) == []
+
+
+async def test_watch_wakes_up_on_a_new_change():
+    registry = InMemoryServiceRegistryRepository()
+    watch = registry.watch(0)
+    
+    next_change = asyncio.ensure_future(watch.__anext__())
+    await asyncio.sleep(0)
+    assert not next_change.done()
+    
+    service = await registry.register(make_service())
+    change = await asyncio.wait_for(next_change, 1)
+    
+    assert change.service_id == service.id
+    await watch.aclose()
+
+
+async def test_bulk_changes_are_tagged_as_one_batch():
+    registry = InMemoryServiceRegistryRepository()
+    await registry.bulk_apply([BulkOperation.register(make_service(f"service-{i}")) for i in range(3)])
+    
+    changes = await collect(registry, 0)
+    
+    assert [change.batch_remaining for change in changes] == [2, 1, 0]
+
+
+async def test_watch_from_a_revision_no_longer_retained_raises():
+    registry = InMemoryServiceRegistryRepository(change_log_size=2)
+    for i in range(4):
+        await registry.register(make_service(f"service-{i}"))
+    
+    with pytest.raises(RegistryRevisionExpiredError) as error:
+        await collect(registry, 1)
+    
+    assert error.value.oldest_revision == 3
+    assert [change.revision for change in await collect(registry, 2)] == [3, 4]
+
+
+async def test_gateway_applies_changes_to_the_routing_table():
+    registry = InMemoryServiceRegistryRepository()
+    gateway = GatewayService(registry)
+    await gateway.load_routing_table()
+    
+    service = await registry.register(make_service())
+    await gateway.watch_registry(timeout=0.01)
+    
+    assert [match.id for match in gateway.routing_table.match("/courses/1")] == [service.id]
+    assert gateway.routing_table.revision == await registry.get_revision()
+
+
+async def test_gateway_reloads_when_it_fell_behind_the_change_log():
+    registry = InMemoryServiceRegistryRepository(change_log_size=2)
+    gateway = GatewayService(registry)
+    await gateway.load_routing_table()
+    
+    for i in range(4):
+        await registry.register(make_service(f"service-{i}"))
+    await gateway.watch_registry(timeout=0.01)
+    
+    assert len(gateway.routing_table.services) == 4
+    assert gateway.routing_table.revision == 4
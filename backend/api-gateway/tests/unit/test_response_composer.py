@@ -0,0 +1,146 @@
+import asyncio
+import json
+import uuid
+from typing import Dict, List
+
+import pytest
+
+from domain.entities.composition import CompositionRoute
+from domain.entities.response import Response
+from domain.services.response_composer import ResponseComposer
+from infrastructure.cache.memory_cache import MemoryCache
+
+COURSE_PAGE = CompositionRoute.from_dict({
+    "name": "course_page",
+    "path": "/courses/{course_id}/page",
+    "cache_ttl": 30,
+    "parts": [
+        {"name": "course", "path": "/courses/{course_id}", "timeout": 0.5, "required": True},
+        {"name": "contents", "path": "/courses/{course_id}/contents", "timeout": 0.5},
+        {"name": "instructor", "path": "/users/{course.instructor_id}", "timeout": 0.5},
+    ],
+})
+
+
+class StubGatewayService:
+    """Answers each path with a canned body, status or delay, recording the calls"""
+    
+    def __init__(self, bodies: Dict[str, object], delays: Dict[str, float] = None):
+        self.bodies = bodies
+        self.delays = delays or {}
+        self.calls: List[str] = []
+    
+    async def route_request(self, request):
+        self.calls.append(request.path)
+        await asyncio.sleep(self.delays.get(request.path, 0))
+        body = self.bodies.get(request.path)
+        if body is None:
+            return Response.error(request_id=request.request_id, status_code=502, message="Bad gateway")
+        if isinstance(body, bytes):
+            return Response(request.request_id, 200, body, {})
+        return Response(request.request_id, 200, json.dumps(body).encode(), {"content-type": "application/json"})
+
+
+def course_page_bodies() -> Dict[str, object]:
+    return {
+        "/courses/c1": {"id": "c1", "instructor_id": "u1"},
+        "/courses/c1/contents": {"items": []},
+        "/users/u1": {"id": "u1", "name": "Ada"},
+    }
+
+
+async def test_parts_wait_for_the_parts_they_refer_to():
+    gateway_service = StubGatewayService(course_page_bodies(), delays={"/courses/c1": 0.05})
+    
+    response = await ResponseComposer(gateway_service).compose(COURSE_PAGE, {"course_id": "c1"}, {})
+    
+    assert response.status_code == 200
+    assert response.body["data"]["instructor"] == {"id": "u1", "name": "Ada"}
+    assert response.body["partial"] is False
+    # contents does not depend on course, so it is not held back by it
+    assert gateway_service.calls.index("/courses/c1/contents") < gateway_service.calls.index("/users/u1")
+    assert gateway_service.calls[-1] == "/users/u1"
+
+
+async def test_dependents_of_a_failed_part_fail_with_424():
+    bodies = course_page_bodies()
+    bodies["/courses/c1"] = {"id": "c1"}
+    
+    response = await ResponseComposer(StubGatewayService(bodies)).compose(COURSE_PAGE, {"course_id": "c1"}, {})
+    
+    assert response.status_code == 200
+    assert response.body["errors"]["instructor"]["status"] == 424
+    assert response.body["partial"] is True
+
+
+async def test_slow_optional_part_times_out_and_the_response_is_partial():
+    gateway_service = StubGatewayService(course_page_bodies(), delays={"/courses/c1/contents": 1.0})
+    
+    response = await ResponseComposer(gateway_service).compose(COURSE_PAGE, {"course_id": "c1"}, {})
+    
+    assert response.status_code == 200
+    assert response.body["errors"] == {"contents": {"status": 504, "message": "Timed out after 0.5s"}}
+    assert set(response.body["data"]) == {"course", "instructor"}
+    assert response.body["partial"] is True
+
+
+@pytest.mark.parametrize("delays, status_code", [({}, 502), ({"/courses/c1": 1.0}, 504)])
+async def test_failed_required_part_fails_the_response(delays, status_code):
+    bodies = course_page_bodies()
+    if not delays:
+        del bodies["/courses/c1"]
+    
+    response = await ResponseComposer(StubGatewayService(bodies, delays)).compose(COURSE_PAGE, {"course_id": "c1"}, {})
+    
+    assert response.status_code == status_code
+    assert response.error == {"message": "Required part course failed"}
+    assert response.body["errors"]["instructor"]["status"] == 424
+
+
+async def test_non_json_part_counts_as_failed():
+    bodies = course_page_bodies()
+    bodies["/courses/c1/contents"] = b"<html>maintenance</html>"
+    
+    response = await ResponseComposer(StubGatewayService(bodies)).compose(COURSE_PAGE, {"course_id": "c1"}, {})
+    
+    assert response.body["errors"]["contents"] == {"status": 502, "message": "Upstream returned a non-JSON body"}
+
+
+async def test_complete_responses_are_cached_per_caller():
+    gateway_service = StubGatewayService(course_page_bodies())
+    composer = ResponseComposer(gateway_service, cache=MemoryCache())
+    ada = {"Authorization": "Bearer ada", "X-Request-ID": str(uuid.uuid4())}
+    
+    first = await composer.compose(COURSE_PAGE, {"course_id": "c1"}, ada)
+    # Only the caller's identity is part of the key, not per-request headers
+    second = await composer.compose(COURSE_PAGE, {"course_id": "c1"}, {**ada, "X-Request-ID": str(uuid.uuid4())})
+    other_caller = await composer.compose(COURSE_PAGE, {"course_id": "c1"}, {"Authorization": "Bearer bob"})
+    
+    assert [first.metadata["cache"], second.metadata["cache"], other_caller.metadata["cache"]] == ["miss", "hit", "miss"]
+    assert second.body == first.body
+    assert len(gateway_service.calls) == 6
+
+
+async def test_partial_responses_are_not_cached():
+    bodies = course_page_bodies()
+    del bodies["/courses/c1/contents"]
+    gateway_service = StubGatewayService(bodies)
+    composer = ResponseComposer(gateway_service, cache=MemoryCache())
+    
+    await composer.compose(COURSE_PAGE, {"course_id": "c1"}, {})
+    response = await composer.compose(COURSE_PAGE, {"course_id": "c1"}, {})
+    
+    assert response.metadata["cache"] == "miss"
+    assert len(gateway_service.calls) == 6
+
+
+def test_compositions_with_a_dependency_cycle_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        CompositionRoute.from_dict({
+            "name": "loop",
+            "path": "/loop",
+            "parts": [
+                {"name": "a", "path": "/a/{b.id}"},
+                {"name": "b", "path": "/b/{a.id}"},
+            ],
+        })
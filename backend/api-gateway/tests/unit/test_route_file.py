@@ -0,0 +1,154 @@
+import asyncio
+import os
+
+import pytest
+
+from domain.entities.request import Request
+from domain.entities.route_rule import RetryPolicy, RouteRule
+from domain.services.route_rules import RouteRules
+from infrastructure.routing.route_file import RouteFileWatcher
+
+ROUTES = """
+[defaults]
+timeout = 2.0
+retry = { attempts = 2, backoff = 0.1 }
+
+[[routes]]
+name = "auth"
+prefix = "/auth"
+upstream = "${AUTH_URL:-http://auth-service:8001}"
+
+[[routes]]
+name = "courses"
+prefix = "/courses"
+upstream = "http://course-service:8002"
+timeout = 5.0
+cache_ttl = 30
+retry = { attempts = 3 }
+"""
+
+
+def make_request(path: str, method: str = "GET", **headers: str) -> Request:
+    return Request(request_id=None, method=method, path=path, headers=headers, query_params={})
+
+
+def write(path, content: str, mtime: int) -> None:
+    path.write_text(content)
+    # Each write gets its own modification time, however fast the test runs
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def route_file(tmp_path):
+    path = tmp_path / "routes.toml"
+    write(path, ROUTES, 1_000_000_000)
+    return path
+
+
+def test_routes_are_loaded_with_defaults_and_variables(route_file):
+    loaded = []
+    watcher = RouteFileWatcher(str(route_file), loaded.append, variables={"AUTH_URL": "http://localhost:9001"})
+    
+    rules = watcher.load()
+    
+    assert loaded == [rules]
+    auth, courses = rules.rules
+    assert (auth.service.host, auth.service.port, auth.timeout) == ("localhost", 9001, 2.0)
+    assert (courses.timeout, courses.retry.attempts, courses.retry.backoff) == (5.0, 3, 0.1)
+
+
+def test_changed_file_is_reloaded(route_file):
+    loaded = []
+    watcher = RouteFileWatcher(str(route_file), loaded.append)
+    watcher.load()
+    
+    assert not watcher.reload_if_changed()
+    write(route_file, ROUTES.replace('"/courses"', '"/catalog"'), 2_000_000_000)
+    
+    assert watcher.reload_if_changed()
+    assert loaded[-1].match("/catalog/1").name == "courses"
+
+
+async def test_running_watcher_picks_up_changes(route_file):
+    loaded = []
+    watcher = RouteFileWatcher(str(route_file), loaded.append, interval=0.01)
+    watcher.load()
+    watcher.start()
+    try:
+        write(route_file, ROUTES.replace('"/courses"', '"/catalog"'), 2_000_000_000)
+        await asyncio.sleep(0.1)
+    finally:
+        await watcher.stop()
+    
+    assert len(loaded) == 2
+    assert loaded[-1].match("/catalog") is not None
+
+
+@pytest.mark.parametrize("content", [
+    "[[routes]\nname = ",
+    '[[routes]]\nname = "auth"\nprefix = "/auth"',
+    '[[routes]]\nname = "auth"\nprefix = "/auth"\nupstream = "https://auth-service"',
+    ROUTES + '\n[[routes]]\nname = "other"\nprefix = "/auth"\nupstream = "http://other"',
+    '[[routes]]\nname = "auth"\nprefix = "/auth"\nupstream = "${UNSET_URL}"',
+])
+def test_invalid_file_keeps_the_current_routes(route_file, content):
+    loaded = []
+    watcher = RouteFileWatcher(str(route_file), loaded.append)
+    watcher.load()
+    
+    write(route_file, content, 2_000_000_000)
+    
+    assert not watcher.reload_if_changed()
+    assert len(loaded) == 1
+    # The broken file is not parsed again until it changes
+    assert watcher._signature == watcher._stat()
+
+
+def test_missing_file_keeps_the_current_routes(route_file):
+    loaded = []
+    watcher = RouteFileWatcher(str(route_file), loaded.append)
+    watcher.load()
+    route_file.unlink()
+    
+    assert not watcher.reload_if_changed()
+    assert len(loaded) == 1
+
+
+def test_longest_prefix_wins_on_segment_boundaries():
+    rules = RouteRules([
+        RouteRule("courses", "/courses", "http://course-service"),
+        RouteRule("contents", "/courses/contents", "http://content-service"),
+    ])
+    
+    assert rules.match("/courses/1").name == "courses"
+    assert rules.match("/courses/contents/2?page=1").name == "contents"
+    assert rules.match("/coursesx") is None
+    assert RouteRules().match("/courses") is None
+
+
+def test_upstream_id_survives_reloads():
+    first = RouteRule("courses", "/courses", "http://course-service:8002")
+    second = RouteRule("courses", "/courses", "http://course-service:8002", timeout=1.0)
+    
+    assert first.service.id == second.service.id
+    assert first.service.metadata == {"route_prefix": "/courses", "static": True}
+
+
+def test_only_idempotent_methods_are_retried():
+    policy = RetryPolicy(attempts=3, backoff=0.1)
+    
+    assert policy.should_retry("GET", 503, 1)
+    assert not policy.should_retry("GET", 503, 3)
+    assert not policy.should_retry("POST", 503, 1)
+    assert not policy.should_retry("GET", 500, 1)
+    assert [policy.delay(attempt) for attempt in (1, 2)] == [0.1, 0.2]
+
+
+def test_cache_key_depends_on_the_caller():
+    rule = RouteRule("courses", "/courses", "http://course-service", cache_ttl=30)
+    
+    ada = rule.cache_key(make_request("/courses/1", Authorization="Bearer ada"))
+    
+    assert ada == rule.cache_key(make_request("/courses/1", Authorization="Bearer ada", **{"X-Request-ID": "1"}))
+    assert ada != rule.cache_key(make_request("/courses/1", Authorization="Bearer bob"))
+    assert rule.cache_key(make_request("/courses/1", method="POST")) is None
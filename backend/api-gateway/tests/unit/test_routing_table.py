@@ -0,0 +1,123 @@
+import random
+
+from domain.entities.registry_change import RegistryChange, RegistryChangeType
+from domain.entities.service import Service
+from domain.services.routing_table import RoutingTable
+
+
+def make_service(name: str = "courses", version: str = "1.0.0", is_active: bool = True, **metadata) -> Service:
+    return Service(
+        name=name,
+        version=version,
+        host="localhost",
+        port=8000,
+        health_check_url="/health",
+        is_active=is_active,
+        metadata=metadata,
+    )
+
+
+def registered(revision: int, service: Service) -> RegistryChange:
+    return RegistryChange(revision, RegistryChangeType.REGISTERED, service.id, service)
+
+
+def updated(revision: int, service: Service) -> RegistryChange:
+    return RegistryChange(revision, RegistryChangeType.UPDATED, service.id, service)
+
+
+def deleted(revision: int, service: Service) -> RegistryChange:
+    return RegistryChange(revision, RegistryChangeType.DELETED, service.id, None)
+
+
+def ids(services) -> set:
+    return {service.id for service in services}
+
+
+def test_match_uses_the_longest_prefix():
+    courses = make_service("courses")
+    lessons = make_service("lessons", route_prefix="/courses/lessons")
+    table = RoutingTable([courses, lessons])
+    
+    assert ids(table.match("/courses/lessons/1?page=2")) == {lessons.id}
+    assert ids(table.match("/courses/1")) == {courses.id}
+    assert table.match("/unknown") == []
+
+
+def test_inactive_services_are_known_but_not_routed():
+    inactive = make_service(is_active=False)
+    table = RoutingTable([inactive])
+    
+    assert table.get(inactive.id) is inactive
+    assert table.match("/courses") == []
+
+
+def test_apply_returns_a_new_table_and_leaves_the_old_one():
+    service = make_service()
+    table = RoutingTable([service], revision=1)
+    
+    new_table = table.apply([deleted(2, service)])
+    
+    assert new_table.revision == 2
+    assert new_table.match("/courses") == []
+    assert ids(table.match("/courses")) == {service.id}
+
+
+def test_apply_skips_changes_already_in_the_table():
+    service = make_service()
+    table = RoutingTable([service], revision=5)
+    
+    assert table.apply([deleted(4, service), deleted(5, service)]) is table
+
+
+def test_apply_moves_a_service_between_prefixes():
+    service = make_service()
+    table = RoutingTable([service], revision=1)
+    moved = Service.from_dict({**service.to_dict(), "metadata": {"route_prefix": "/learning"}})
+    
+    table = table.apply([updated(2, moved)])
+    
+    assert table.match("/courses") == []
+    assert ids(table.match("/learning/1")) == {service.id}
+
+
+def test_apply_keeps_other_replicas_of_the_prefix():
+    first, second = make_service(), make_service()
+    table = RoutingTable([first, second], revision=2)
+    
+    table = table.apply([updated(3, Service.from_dict({**first.to_dict(), "is_active": False}))])
+    
+    assert ids(table.match("/courses")) == {second.id}
+    assert ids(table.services) == {first.id, second.id}
+
+
+def test_apply_shares_untouched_buckets():
+    services = [make_service(f"service-{index}") for index in range(500)]
+    table = RoutingTable(services, revision=1)
+    
+    new_table = table.apply([deleted(2, services[0])])
+    
+    shared = sum(old is new for old, new in zip(table._services._buckets, new_table._services._buckets))
+    assert shared == len(table._services._buckets) - 1
+
+
+def test_apply_matches_a_full_rebuild():
+    rng = random.Random(7)
+    names = ["courses", "lessons", "users", "grades"]
+    services = {}
+    table = RoutingTable()
+    for revision in range(1, 400):
+        service_id = rng.choice(list(services)) if services and rng.random() < 0.6 else None
+        if service_id is not None and rng.random() < 0.4:
+            change = deleted(revision, services.pop(service_id))
+        else:
+            service = make_service(rng.choice(names), is_active=rng.random() < 0.8)
+            if service_id is not None:
+                service.id = service_id
+            services[service.id] = service
+            change = registered(revision, service)
+        table = table.apply([change])
+        
+        rebuilt = RoutingTable(services.values(), revision)
+        assert ids(table.services) == ids(rebuilt.services)
+        for name in names:
+            assert ids(table.match(f"/{name}/1")) == ids(rebuilt.match(f"/{name}/1"))
@@ -0,0 +1,88 @@
+from domain.entities.bulk_operation import BulkOperation
+from domain.entities.service import Service
+from infrastructure.repositories.service_registry import InMemoryServiceRegistryRepository
+
+
+def make_service(name: str = "courses", version: str = "1.0.0", is_active: bool = True, **metadata) -> Service:
+    return Service(
+        name=name,
+        version=version,
+        host="localhost",
+        port=8000,
+        health_check_url="/health",
+        is_active=is_active,
+        metadata=metadata,
+    )
+
+
+async def test_replicas_of_a_version_are_kept():
+    registry = InMemoryServiceRegistryRepository()
+    first = await registry.register(make_service())
+    second = await registry.register(make_service())
+    
+    assert {service.id for service in await registry.list()} == {first.id, second.id}
+    assert {service.id for service in await registry.list_instances("courses", "1.0.0")} == {first.id, second.id}
+    assert await registry.list_versions("courses") == ["1.0.0"]
+
+
+async def test_deleting_one_replica_keeps_the_version():
+    registry = InMemoryServiceRegistryRepository()
+    first = await registry.register(make_service())
+    second = await registry.register(make_service())
+    
+    await registry.delete(first.id)
+    
+    assert await registry.list_versions("courses") == ["1.0.0"]
+    assert (await registry.get_by_name_and_version("courses", "1.0.0")).id == second.id
+    
+    await registry.delete(second.id)
+    
+    assert await registry.list_versions("courses") == []
+    assert await registry.get_by_name("courses") is None
+
+
+async def test_re_registering_an_id_replaces_that_instance():
+    registry = InMemoryServiceRegistryRepository()
+    service = await registry.register(make_service())
+    moved = Service.from_dict({**service.to_dict(), "version": "1.1.0"})
+    
+    await registry.register(moved)
+    
+    assert [s.version for s in await registry.list()] == ["1.1.0"]
+    assert await registry.list_versions("courses") == ["1.1.0"]
+
+
+async def test_get_by_name_returns_the_highest_version_preferring_active_instances():
+    registry = InMemoryServiceRegistryRepository()
+    await registry.register(make_service(version="1.9.0"))
+    await registry.register(make_service(version="1.10.0", is_active=False))
+    active = await registry.register(make_service(version="1.10.0"))
+    
+    assert (await registry.get_by_name("courses")).id == active.id
+
+
+async def test_get_service_for_path_uses_the_longest_prefix():
+    registry = InMemoryServiceRegistryRepository()
+    await registry.register(make_service("courses"))
+    lessons = await registry.register(make_service("lessons", route_prefix="/courses/lessons"))
+    
+    assert (await registry.get_service_for_path("/courses/lessons/1?x=1")).id == lessons.id
+    assert (await registry.get_service_for_path("/courses/2")).name == "courses"
+    assert await registry.get_service_for_path("/unknown") is None
+
+
+async def test_bulk_apply_reports_revisions_and_failures():
+    registry = InMemoryServiceRegistryRepository()
+    first, second = make_service(), make_service()
+    missing = make_service()
+    
+    results = await registry.bulk_apply([
+        BulkOperation.register(first),
+        BulkOperation.register(second),
+        BulkOperation.delete(missing.id),
+        BulkOperation.delete(first.id),
+    ])
+    
+    assert [result.success for result in results] == [True, True, False, True]
+    assert [result.revision for result in results if result.success] == [1, 2, 3]
+    assert [service.id for service in await registry.list()] == [second.id]
@@ -0,0 +1,98 @@
+import multiprocessing
+
+import pytest
+
+from domain.entities.service import Service
+from domain.services.routing_table import RoutingTable
+from infrastructure.shared.memory import SEQLOCK_HEADER, SeqlockBuffer, SharedSlotTable
+from infrastructure.shared.routing_snapshot import SharedRoutingSnapshot
+
+
+def run_in_child(target, *args) -> None:
+    process = multiprocessing.get_context("fork").Process(target=target, args=args)
+    process.start()
+    process.join(10)
+    assert process.exitcode == 0
+
+
+def test_seqlock_reads_the_latest_payload():
+    buffer = SeqlockBuffer(64)
+    assert buffer.read() == (0, None)
+    
+    first = buffer.write(b"first")
+    second = buffer.write(b"second")
+    
+    assert second > first
+    assert buffer.generation() == second
+    assert buffer.read() == (second, b"second")
+
+
+def test_seqlock_rejects_a_payload_that_does_not_fit():
+    buffer = SeqlockBuffer(4)
+    generation = buffer.write(b"fits")
+    
+    with pytest.raises(ValueError):
+        buffer.write(b"too large")
+    assert buffer.read() == (generation, b"fits")
+
+
+def test_seqlock_read_gives_up_on_a_write_that_never_finishes():
+    buffer = SeqlockBuffer(64, max_read_attempts=10)
+    buffer.write(b"payload")
+    # A writer that died after marking the write as started
+    SEQLOCK_HEADER.pack_into(buffer._memory, 0, buffer.generation() + 1, 0)
+    
+    assert buffer.read()[1] is None
+
+
+def test_seqlock_writes_are_seen_by_forked_processes():
+    buffer = SeqlockBuffer(64)
+    run_in_child(buffer.write, b"from the child")
+    
+    assert buffer.read()[1] == b"from the child"
+
+
+def increment(table: SharedSlotTable, key: str, times: int) -> None:
+    for _ in range(times):
+        table.update(key, lambda fields: ([fields[0] + 1], None))
+
+
+def test_slot_table_updates_are_shared_across_processes():
+    table = SharedSlotTable(slots=64, fields=1)
+    processes = [multiprocessing.get_context("fork").Process(target=increment, args=(table, "tenant", 200)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    increment(table, "tenant", 200)
+    for process in processes:
+        process.join(10)
+    
+    assert table.get("tenant") == [800]
+    assert table.get("other") == [0]
+
+
+def test_slot_table_evicts_the_least_recently_updated_record():
+    table = SharedSlotTable(slots=SharedSlotTable.GROUP_SIZE, fields=1)
+    keys = [f"key-{i}" for i in range(SharedSlotTable.GROUP_SIZE + 1)]
+    for value, key in enumerate(keys[:-1], start=1):
+        table.update(key, lambda fields, value=value: ([value], None))
+    
+    table.update(keys[-1], lambda fields: ([fields[0] + 100], None))
+    
+    # The new key started from an empty record in the oldest slot
+    assert table.get(keys[-1]) == [100]
+    assert sum(table.get(key) != [0] for key in keys) == SharedSlotTable.GROUP_SIZE
+
+
+def test_routing_snapshot_is_decoded_once_per_change():
+    service = Service(name="courses", version="1.0.0", host="localhost", port=8000, health_check_url="/health")
+    buffer = SeqlockBuffer(64 * 1024)
+    leader, follower = SharedRoutingSnapshot(buffer), SharedRoutingSnapshot(buffer)
+    
+    assert follower.read_if_changed() is None
+    leader.publish(RoutingTable([service], revision=7))
+    table = follower.read_if_changed()
+    
+    assert table.revision == 7
+    assert [match.id for match in table.match("/courses")] == [service.id]
+    assert follower.read_if_changed() is None
+    assert leader.read_if_changed() is None
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+from infrastructure.streaming.hub import StreamHub, StreamSubscriber
+from lms_shared.monitoring.metrics import MetricsRegistry
+
+
+class FakeUpstream:
+    """An upstream stream fed by the test, counting how often it is opened"""
+    
+    def __init__(self):
+        self.opened = 0
+        self.queue: asyncio.Queue = asyncio.Queue()
+    
+    async def source(self):
+        self.opened += 1
+        while True:
+            event = await self.queue.get()
+            if event is None:
+                return
+            yield event
+    
+    async def send(self, event) -> None:
+        await self.queue.put(event)
+        # Let the hub hand the event out
+        await asyncio.sleep(0.01)
+
+
+async def next_event(subscriber: StreamSubscriber):
+    return await asyncio.wait_for(subscriber.events().__anext__(), 1)
+
+
+async def test_subscribers_of_a_key_share_one_upstream():
+    hub = StreamHub(metrics=MetricsRegistry())
+    upstream = FakeUpstream()
+    
+    async with hub.subscribe("course:1", upstream.source) as first:
+        async with hub.subscribe("course:1", upstream.source) as second:
+            await upstream.send({"title": "Algebra"})
+            
+            first_event = await next_event(first)
+            second_event = await next_event(second)
+    
+    assert upstream.opened == 1
+    assert hub.topics() == 1
+    assert json.loads(first_event) == {"title": "Algebra"}
+    # Encoded once for every subscriber
+    assert first_event is second_event
+
+
+async def test_new_subscribers_get_the_latest_event_first():
+    hub = StreamHub(metrics=MetricsRegistry())
+    upstream = FakeUpstream()
+    
+    async with hub.subscribe("course:1", upstream.source):
+        await upstream.send({"version": 1})
+        await upstream.send({"version": 2})
+        
+        async with hub.subscribe("course:1", upstream.source) as late:
+            assert json.loads(await next_event(late)) == {"version": 2}
+
+
+async def test_slow_subscribers_skip_to_the_latest_events():
+    metrics = MetricsRegistry()
+    hub = StreamHub(queue_size=2, metrics=metrics)
+    upstream = FakeUpstream()
+    
+    async with hub.subscribe("course:1", upstream.source) as slow:
+        async with hub.subscribe("course:1", upstream.source) as fast:
+            received = []
+            for version in range(5):
+                await upstream.send({"version": version})
+                received.append(json.loads(await next_event(fast)))
+            
+            queued = [json.loads(await next_event(slow)) for _ in range(2)]
+    
+    assert received == [{"version": version} for version in range(5)]
+    assert queued == [{"version": 3}, {"version": 4}]
+    assert slow.dropped == 3 and fast.dropped == 0
+    assert metrics.counter("gateway_stream_dropped_events_total", "").get() == 3
+
+
+async def test_upstream_lingers_after_the_last_subscriber_leaves():
+    hub = StreamHub(linger=0.05, metrics=MetricsRegistry())
+    upstream = FakeUpstream()
+    
+    async with hub.subscribe("course:1", upstream.source):
+        await asyncio.sleep(0)
+    async with hub.subscribe("course:1", upstream.source):
+        await asyncio.sleep(0)
+    
+    assert upstream.opened == 1
+    await asyncio.sleep(0.1)
+    assert hub.topics() == 0
+
+
+async def test_subscribers_end_when_the_upstream_ends():
+    hub = StreamHub(metrics=MetricsRegistry())
+    upstream = FakeUpstream()
+    
+    async with hub.subscribe("course:1", upstream.source) as subscriber:
+        await upstream.send({"version": 1})
+        await upstream.send(None)
+        
+        events = [event async for event in subscriber.events()]
+    
+    assert [json.loads(event) for event in events] == [{"version": 1}]
+    assert hub.topics() == 0
+
+
+async def test_heartbeats_until_the_idle_timeout():
+    subscriber = StreamSubscriber(queue_size=1)
+    
+    events = [event async for event in subscriber.events(idle_timeout=0.1, heartbeat_interval=0.03)]
+    
+    assert events and set(events) == {None}
@@ -0,0 +1,77 @@
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from infrastructure.streaming.hub import StreamHub
+from lms_shared.monitoring.metrics import MetricsRegistry
+
+# The routes import the shared clients, which need the generated course stubs
+pytest.importorskip("infrastructure.proto.course_pb2")
+
+from interfaces.api.routes import streams  # noqa: E402
+
+
+class FakeCourseStreamClient:
+    def __init__(self, events):
+        self.events = events
+        self.watched = []
+    
+    async def watch_course(self, course_id: str):
+        self.watched.append(course_id)
+        for event in self.events:
+            yield event
+
+
+@pytest.fixture
+def course_stream_client(monkeypatch) -> FakeCourseStreamClient:
+    client = FakeCourseStreamClient([{"version": 1}, {"version": 2}])
+    monkeypatch.setattr(streams, "course_stream_client", client)
+    monkeypatch.setattr(streams, "stream_hub", StreamHub(metrics=MetricsRegistry()))
+    return client
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(streams.router, prefix="/api")
+    return TestClient(app)
+
+
+def test_course_events_are_sent_as_server_sent_events(client, course_stream_client):
+    course_id = uuid.uuid4()
+    
+    response = client.get(f"/api/streams/courses/{course_id}")
+    
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    retry, *events = [block for block in response.text.split("\n\n") if block]
+    assert retry.startswith("retry: ")
+    assert events == ['data: {"version": 1}', 'data: {"version": 2}']
+    assert course_stream_client.watched == [str(course_id)]
+
+
+def test_course_events_are_sent_over_websockets(client, course_stream_client):
+    with client.websocket_connect(f"/api/streams/courses/{uuid.uuid4()}/ws") as websocket:
+        received = [websocket.receive_json(), websocket.receive_json()]
+        
+        # The server closes the socket once the upstream stream ends
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_text()
+    
+    assert received == [{"version": 1}, {"version": 2}]
+    assert closed.value.code == 1001
+
+
+def test_service_stream_for_an_unrouted_path_is_not_found(client, monkeypatch):
+    class NoServices:
+        async def select_service(self, request):
+            return None
+    
+    monkeypatch.setattr(streams, "gateway_service", NoServices())
+    
+    response = client.get("/api/streams/services/nowhere/events")
+    
+    assert response.status_code == 404
@@ -0,0 +1,30 @@
+import asyncio
+import socket
+
+import uvicorn
+
+from config.settings import Settings
+from infrastructure.lifecycle.drain import DrainCoordinator
+from infrastructure.lifecycle.supervisor import WorkerSupervisor
+from infrastructure.shared.state import SharedState
+
+
+async def test_worker_connections_disable_nagle():
+    config = uvicorn.Config(None, host="127.0.0.1", port=0)
+    supervisor = WorkerSupervisor(config, DrainCoordinator(), 0.0, SharedState(Settings()), workers=1)
+    accepted = asyncio.get_running_loop().create_future()
+    
+    class Protocol(asyncio.Protocol):
+        def connection_made(self, transport):
+            accepted.set_result(transport.get_extra_info("socket").getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+            transport.close()
+    
+    server = await asyncio.get_running_loop().create_server(Protocol, sock=supervisor._bind())
+    try:
+        _, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        # Responses are written in several parts; with Nagle each keep-alive
+        # request waited for the client's delayed ACK
+        assert await asyncio.wait_for(accepted, 1)
+        writer.close()
+    finally:
+        server.close()
@@ -0,0 +1,59 @@
+from collections import Counter
+
+from domain.entities.service import Service
+from domain.services.traffic_splitter import TrafficSplitter
+
+
+def make_service(version: str, traffic_weight=None) -> Service:
+    return Service(
+        name="courses",
+        version=version,
+        host="localhost",
+        port=8000,
+        health_check_url="/health",
+        metadata={} if traffic_weight is None else {"traffic_weight": traffic_weight},
+    )
+
+
+def test_highest_version_gets_all_traffic_without_weights():
+    services = [make_service("1.0.0"), make_service("1.10.0"), make_service("1.9.0")]
+    
+    assert TrafficSplitter.version_weights(services) == {"1.0.0": 0, "1.9.0": 0, "1.10.0": 1}
+    assert {TrafficSplitter().select_version(services, str(user)) for user in range(100)} == {"1.10.0"}
+
+
+def test_sticky_key_keeps_its_version():
+    splitter = TrafficSplitter()
+    services = [make_service("1.0.0", 50), make_service("2.0.0", 50)]
+    
+    for user in range(100):
+        versions = {splitter.select_version(services, f"user-{user}") for _ in range(5)}
+        assert len(versions) == 1
+
+
+def test_traffic_follows_the_weights():
+    splitter = TrafficSplitter()
+    services = [make_service("1.0.0", 90), make_service("2.0.0", 10)]
+    
+    counts = Counter(splitter.select_version(services, f"user-{user}") for user in range(10000))
+    
+    assert 800 < counts["2.0.0"] < 1200
+    assert counts["1.0.0"] + counts["2.0.0"] == 10000
+
+
+def test_raising_the_canary_weight_only_moves_users_onto_it():
+    splitter = TrafficSplitter()
+    before = [make_service("1.0.0", 90), make_service("2.0.0", 10)]
+    after = [make_service("1.0.0", 70), make_service("2.0.0", 30)]
+    
+    for user in range(2000):
+        if splitter.select_version(before, f"user-{user}") == "2.0.0":
+            assert splitter.select_version(after, f"user-{user}") == "2.0.0"
+
+
+def test_select_picks_an_instance_of_the_chosen_version():
+    splitter = TrafficSplitter()
+    services = [make_service("1.0.0", 0), make_service("2.0.0", 100), make_service("2.0.0", 100)]
+    
+    assert splitter.select(services, "user").version == "2.0.0"
+    assert splitter.select([], "user") is None
@@ -0,0 +1,103 @@
+import gzip
+import json
+import uuid
+
+import httpx
+
+from domain.entities.request import Request
+from domain.entities.service import Service
+from infrastructure.services.upstream_client import UpstreamClient
+
+SERVICE = Service(name="files", version="1.0.0", host="files", port=8000, health_check_url="/health")
+
+
+def make_client(received: list) -> UpstreamClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(201, json={"ok": True})
+    
+    client = UpstreamClient()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def make_request(body, headers=None) -> Request:
+    return Request(
+        request_id=uuid.uuid4(),
+        method="POST",
+        path="/files/upload",
+        headers=headers or {},
+        query_params={},
+        body=body,
+    )
+
+
+async def test_client_bodies_are_forwarded_byte_for_byte():
+    received = []
+    client = make_client(received)
+    body = b"--boundary\r\nContent-Disposition: form-data; name=\"file\"\r\n\r\n\x00\xff\r\n--boundary--\r\n"
+    content_type = "multipart/form-data; boundary=boundary"
+    
+    response = await client.forward(SERVICE, make_request(body, {"Content-Type": content_type, "Content-Length": "1"}))
+    
+    assert response.status_code == 201
+    assert received[0].content == body
+    assert received[0].headers["content-type"] == content_type
+    assert received[0].headers["content-length"] == str(len(body))
+
+
+async def test_form_bodies_keep_their_encoding():
+    received = []
+    client = make_client(received)
+    
+    await client.forward(SERVICE, make_request(b"a=1&b=two", {"Content-Type": "application/x-www-form-urlencoded"}))
+    
+    assert received[0].content == b"a=1&b=two"
+    assert received[0].headers["content-type"] == "application/x-www-form-urlencoded"
+
+
+async def test_gateway_built_bodies_are_sent_as_json():
+    received = []
+    client = make_client(received)
+    
+    await client.forward(SERVICE, make_request({"title": "Algebra"}))
+    
+    assert received[0].headers["content-type"] == "application/json"
+    assert json.loads(received[0].content) == {"title": "Algebra"}
+
+
+def make_responding_client(response: httpx.Response) -> UpstreamClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return response
+    
+    client = UpstreamClient()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+async def test_upstream_bodies_are_kept_as_bytes():
+    csv = b"id,title\n1,Algebra\n"
+    client = make_responding_client(httpx.Response(200, content=csv, headers={"Content-Type": "text/csv"}))
+    
+    response = await client.forward(SERVICE, make_request(None))
+    
+    assert response.body == csv
+    assert response.headers["content-type"] == "text/csv"
+    assert "content-length" not in response.headers
+
+
+async def test_decompressed_bodies_lose_their_content_encoding():
+    body = json.dumps({"id": 1}).encode()
+    client = make_responding_client(httpx.Response(
+        200,
+        content=gzip.compress(body),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    ))
+    
+    response = await client.forward(SERVICE, make_request(None))
+    
+    assert response.body == body
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"id": 1}
+    # Parsed once, then kept
+    assert response.body == {"id": 1}
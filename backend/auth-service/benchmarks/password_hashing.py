@@ -0,0 +1,83 @@
+"""
+Login throughput and /me latency while logins run: bcrypt on the event loop vs PasswordHasher.
+
+Each "login" verifies a bcrypt password; each "/me" is a request that does
+no hashing, so its latency is the time it waits for the event loop. Run
+from the auth-service directory:
+
+    python benchmarks/password_hashing.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from passlib.context import CryptContext  # noqa: E402
+
+from infrastructure.password_hasher import PasswordHasher, PasswordHasherBusyError  # noqa: E402
+
+DURATION = 5.0
+CONCURRENT_LOGINS = 16
+ME_INTERVAL = 0.01
+
+CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PASSWORD = "correct horse battery staple"
+HASHED = CONTEXT.hash(PASSWORD)
+
+
+async def inline_verify() -> bool:
+    """What AuthService did before: verify on the event loop."""
+    return CONTEXT.verify(PASSWORD, HASHED)
+
+
+async def run(verify) -> None:
+    logins = shed = 0
+    me_latencies = []
+    deadline = time.monotonic() + DURATION
+
+    async def login_client():
+        nonlocal logins, shed
+        while time.monotonic() < deadline:
+            try:
+                await verify()
+                logins += 1
+            except PasswordHasherBusyError as e:
+                shed += 1
+                await asyncio.sleep(e.retry_after)
+
+    async def me_client():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            await asyncio.sleep(ME_INTERVAL)
+            me_latencies.append(time.perf_counter() - started - ME_INTERVAL)
+
+    await asyncio.gather(me_client(), *(login_client() for _ in range(CONCURRENT_LOGINS)))
+
+    me_latencies.sort()
+    p50 = statistics.median(me_latencies) * 1000
+    p99 = me_latencies[int(len(me_latencies) * 0.99)] * 1000
+    print(
+        f"  logins {logins / DURATION:7.1f}/s   shed {shed:4d}   "
+        f"/me wait p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   max {me_latencies[-1] * 1000:7.2f} ms"
+    )
+
+
+async def main() -> None:
+    print(f"Python {sys.version.split()[0]}, {os.cpu_count()} cores, {CONCURRENT_LOGINS} concurrent logins")
+    print("bcrypt on the event loop:")
+    await run(inline_verify)
+
+    hasher = PasswordHasher()
+    hasher.start()
+    # Let the workers start before measuring
+    await hasher.verify(PASSWORD, HASHED)
+    print(f"PasswordHasher ({hasher.workers} processes):")
+    await run(lambda: hasher.verify(PASSWORD, HASHED))
+    hasher.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
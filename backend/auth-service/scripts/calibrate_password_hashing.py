@@ -0,0 +1,122 @@
+"""
+Measure password hashing cost on this machine and recommend settings.
+
+Run it on the hardware the service runs on (e.g. inside its container),
+from the auth-service directory:
+
+    python scripts/calibrate_password_hashing.py --target-ms 250 --logins-per-second 40
+
+For each scheme it picks the highest cost whose hash takes at most the
+target latency and, with one pool process per core, still sustains the
+target login rate. The result is printed as environment variables.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from infrastructure.password_hasher import crypt_context, hash_options  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+
+BCRYPT_ROUNDS = range(10, 17)
+ARGON2_MAX_TIME_COST = 10
+# OWASP's minimum for argon2id: 19 MiB with 2 iterations
+ARGON2_MIN_MEMORY_COST = 19456
+
+
+def measure(scheme: str, repeat: int, **costs) -> float:
+    """Median seconds to hash a password with the given costs."""
+    context = crypt_context([scheme], hash_options(**costs))
+    context.hash(PASSWORD)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        context.hash(PASSWORD)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def calibrate_bcrypt(budget: float, repeat: int):
+    best = None
+    for rounds in BCRYPT_ROUNDS:
+        seconds = measure("bcrypt", repeat, bcrypt_rounds=rounds)
+        print(f"  bcrypt rounds={rounds:2d}: {seconds * 1000:7.1f} ms")
+        if seconds > budget:
+            break
+        best = ({"BCRYPT_ROUNDS": rounds}, seconds)
+    return best
+
+
+def calibrate_argon2(budget: float, memory_cost: int, parallelism: int, repeat: int):
+    # More memory is what makes argon2id expensive for attackers, so keep
+    # it and raise iterations; halve memory only if one iteration is too slow
+    while True:
+        best = None
+        for time_cost in range(1, ARGON2_MAX_TIME_COST + 1):
+            seconds = measure(
+                "argon2",
+                repeat,
+                argon2_time_cost=time_cost,
+                argon2_memory_cost=memory_cost,
+                argon2_parallelism=parallelism,
+            )
+            print(f"  argon2id m={memory_cost} KiB t={time_cost:2d} p={parallelism}: {seconds * 1000:7.1f} ms")
+            if seconds > budget:
+                break
+            best = (
+                {
+                    "ARGON2_TIME_COST": time_cost,
+                    "ARGON2_MEMORY_COST": memory_cost,
+                    "ARGON2_PARALLELISM": parallelism,
+                },
+                seconds,
+            )
+        if best is not None or memory_cost // 2 < ARGON2_MIN_MEMORY_COST:
+            return best
+        memory_cost //= 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Hash time to aim for per login")
+    parser.add_argument("--logins-per-second", type=float, help="Login rate one instance must sustain")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool processes (PASSWORD_HASH_WORKERS)")
+    parser.add_argument("--scheme", choices=("argon2", "bcrypt", "all"), default="all")
+    parser.add_argument("--memory-kib", type=int, default=65536, help="argon2id memory to start from")
+    parser.add_argument("--parallelism", type=int, default=1, help="argon2id lanes; the pool already uses every core")
+    parser.add_argument("--repeat", type=int, default=5, help="Hashes timed per setting")
+    args = parser.parse_args()
+
+    budget = args.target_ms / 1000
+    if args.logins_per_second:
+        # Each worker hashes one password at a time
+        budget = min(budget, args.workers / args.logins_per_second)
+    print(f"{args.workers} workers, at most {budget * 1000:.0f} ms per hash")
+
+    results = {}
+    if args.scheme in ("bcrypt", "all"):
+        results["bcrypt"] = calibrate_bcrypt(budget, args.repeat)
+    if args.scheme in ("argon2", "all"):
+        results["argon2"] = calibrate_argon2(budget, args.memory_kib, args.parallelism, args.repeat)
+
+    for scheme, result in results.items():
+        print()
+        if result is None:
+            print(f"{scheme}: even the lowest cost takes longer than {budget * 1000:.0f} ms; add workers or lower the login rate")
+            continue
+        settings, seconds = result
+        print(f"{scheme}: {seconds * 1000:.0f} ms per hash, about {args.workers / seconds:.0f} logins/s with {args.workers} workers")
+        if scheme == "argon2":
+            print(f"  uses up to {settings['ARGON2_MEMORY_COST'] * args.workers // 1024} MiB with every worker busy")
+            # bcrypt hashes keep verifying and are rehashed on login
+            print('  PASSWORD_HASH_SCHEMES=["argon2","bcrypt"]')
+        for name, value in settings.items():
+            print(f"  {name}={value}")
+
+
+if __name__ == "__main__":
+    main()
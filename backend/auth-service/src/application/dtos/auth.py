@@ -43,6 +43,10 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
 class ResetPasswordRequest(BaseModel):
     email: EmailStr
 
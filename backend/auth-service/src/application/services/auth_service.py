@@ -1,8 +1,7 @@
 from datetime import datetime, timedelta
 import uuid
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Callable, Awaitable
 
-from passlib.context import CryptContext
 from jose import jwt, JWTError
 
 from domain.entities.user import User, UserStatus, UserRole
@@ -16,6 +15,7 @@ from application.dtos.auth import (
     TokenResponse, 
     UserResponse,
     RefreshTokenRequest,
+    LogoutRequest,
     ResetPasswordRequest,
     ConfirmResetPasswordRequest,
     VerifyEmailRequest
@@ -29,6 +29,7 @@ from application.exceptions.auth_exceptions import (
     UserNotActiveException
 )
 from config.settings import Settings
+from infrastructure.password_hasher import PasswordHasher
 
 
 class AuthService:
@@ -36,20 +37,24 @@ class AuthService:
         self, 
         user_repository: UserRepository,
         token_repository: TokenRepository,
-        settings: Settings
+        settings: Settings,
+        password_hasher: PasswordHasher,
+        replace_password_hash: Optional[Callable[[uuid.UUID, str, str], Awaitable[bool]]] = None
     ):
         self.user_repository = user_repository
         self.token_repository = token_repository
         self.settings = settings
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.password_hasher = password_hasher
+        # Stores rehashed passwords after the request; without it they are never upgraded
+        self.replace_password_hash = replace_password_hash
     
-    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against a hash"""
-        return self.pwd_context.verify(plain_password, hashed_password)
+    async def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash (in the hasher's process pool)"""
+        return await self.password_hasher.verify(plain_password, hashed_password)
     
-    def _get_password_hash(self, password: str) -> str:
-        """Hash a password for storing"""
-        return self.pwd_context.hash(password)
+    async def _get_password_hash(self, password: str) -> str:
+        """Hash a password for storing (in the hasher's process pool)"""
+        return await self.password_hasher.hash(password)
     
     def _create_token(self, data: Dict[str, Any], expires_delta: timedelta) -> str:
         """Create a JWT token"""
@@ -83,12 +88,20 @@ class AuthService:
         if not user:
             raise InvalidCredentialsException("Invalid email or password")
         
-        if not self._verify_password(login_request.password, user.password_hash):
+        if not await self._verify_password(login_request.password, user.password_hash):
             raise InvalidCredentialsException("Invalid email or password")
         
         if user.status != UserStatus.ACTIVE:
             raise UserNotActiveException(f"User account is {user.status}")
         
+        # Upgrade an outdated scheme or cost without making the user wait for it
+        if self.replace_password_hash and self.password_hasher.needs_update(user.password_hash):
+            user_id, old_hash = user.id, user.password_hash
+            self.password_hasher.rehash_in_background(
+                login_request.password,
+                lambda new_hash: self.replace_password_hash(user_id, old_hash, new_hash),
+            )
+        
         # Update last login
         user = await self.user_repository.update_last_login(user.id)
         
@@ -119,7 +132,7 @@ class AuthService:
             username=register_request.username,
             first_name=register_request.first_name,
             last_name=register_request.last_name,
-            password_hash=self._get_password_hash(register_request.password),
+            password_hash=await self._get_password_hash(register_request.password),
             roles=[UserRole.STUDENT],  # Default role
             status=UserStatus.PENDING_VERIFICATION,
             organization_id=register_request.organization_id,
@@ -158,7 +171,7 @@ class AuthService:
         
         # Verify JWT
         try:
-            payload = self._verify_token(token.token_value, "refresh")
+            payload = self._verify_token(refresh_request.refresh_token, "refresh")
             user_id = uuid.UUID(payload.get("sub"))
         except (InvalidTokenException, ValueError):
             await self.token_repository.revoke(token.id)
@@ -183,6 +196,32 @@ class AuthService:
         
         return new_token_response
     
+    async def logout(self, access_token: str, logout_request: LogoutRequest) -> bool:
+        """Revoke an access token and, if given, the user's refresh token"""
+        payload = self._verify_token(access_token, "access")
+        user_id = uuid.UUID(payload["sub"])
+        jti = payload.get("jti")
+        if jti:
+            # Kept until the access token would have expired anyway; a
+            # concurrent logout with the same token may have stored it already
+            await self.token_repository.create_if_absent(Token(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                token_type=TokenType.ACCESS,
+                token_value=jti,
+                expires_at=datetime.utcfromtimestamp(payload["exp"]),
+                created_at=datetime.utcnow(),
+                revoked=True,
+                revoked_at=datetime.utcnow()
+            ))
+        
+        if logout_request.refresh_token:
+            token = await self.token_repository.get_by_value(logout_request.refresh_token)
+            if token and token.token_type == TokenType.REFRESH and token.user_id == user_id and not token.revoked:
+                await self.token_repository.revoke(token.id)
+        
+        return True
+    
     async def reset_password(self, reset_request: ResetPasswordRequest) -> bool:
         """Request a password reset"""
         user = await self.user_repository.get_by_email(reset_request.email)
@@ -244,7 +283,7 @@ class AuthService:
             raise UserNotFoundException("User not found")
         
         # Update password
-        password_hash = self._get_password_hash(reset_confirm.new_password)
+        password_hash = await self._get_password_hash(reset_confirm.new_password)
         await self.user_repository.update_password(user.id, password_hash)
         
         # Revoke token
@@ -300,6 +339,8 @@ class AuthService:
             "roles": [role.value for role in user.roles],
             "org_id": str(user.organization_id) if user.organization_id else None,
             "branch_id": str(user.branch_id) if user.branch_id else None,
+            # Lets the token be revoked before it expires (see logout)
+            "jti": str(uuid.uuid4()),
             "type": "access"
         }
         access_token = self._create_token(
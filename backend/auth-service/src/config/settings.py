@@ -34,6 +34,11 @@ class Settings(BaseSettings):
     
     # Redis Settings (for token blacklisting and session management)
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Keep refresh token state and the access token denylist in Redis;
+    # the database stays the durable copy
+    TOKEN_CACHE_ENABLED: bool = True
+    # Store token values next to their SHA-256 digest; lookups only use the digest
+    TOKEN_STORE_VALUES: bool = True
     
     # Password Settings
     PASSWORD_MIN_LENGTH: int = 8
@@ -53,6 +58,46 @@ class Settings(BaseSettings):
     APPLE_CLIENT_ID: Optional[str] = os.getenv("APPLE_CLIENT_ID")
     APPLE_CLIENT_SECRET: Optional[str] = os.getenv("APPLE_CLIENT_SECRET")
     
+    # Event Loop Lag Admission Settings
+    LOOP_LAG_INTERVAL: float = 0.05  # seconds
+    LOOP_LAG_ADMISSION_ENABLED: bool = False
+    LOOP_LAG_THRESHOLD: float = 0.2  # seconds
+    LOOP_LAG_EXEMPT_PATHS: List[str] = ["/health", "/health/live", "/health/ready", "/metrics"]
+    
+    # Password Hashing Settings (hashing runs in a process pool)
+    # The first scheme hashes new passwords; hashes in the others still verify
+    # and are rehashed on login. Tune costs with scripts/calibrate_password_hashing.py
+    PASSWORD_HASH_SCHEMES: List[str] = ["bcrypt"]  # "argon2" (argon2id), "bcrypt"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 1  # the pool already runs one hash per core
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # processes; defaults to the number of cores
+    PASSWORD_HASH_MAX_PENDING: int = 64  # operations queued or running at most
+    PASSWORD_HASH_MAX_WAIT: float = 2.0  # seconds of expected queueing before a login is shed
+    
+    # Readiness Settings (checks run in the background; /health/ready reads the cached result)
+    HEALTH_CHECK_INTERVAL: float = 5.0  # seconds
+    HEALTH_CHECK_TIMEOUT: float = 2.0  # seconds
+    HEALTH_MAX_LOOP_LAG: float = 1.0  # seconds of event loop lag before the service reports not ready
+    
+    # Request Deadline Settings (the gateway sends X-Request-Timeout-Ms)
+    REQUEST_TIMEOUT: float = 30.0  # seconds a request gets by default
+    REQUEST_TIMEOUT_MAX: float = 60.0  # seconds a caller may ask for at most
+    DEADLINE_EXEMPT_PREFIXES: List[str] = ["/health", "/metrics", "/api/debug"]
+    
+    # Access Log Settings
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # share of successful requests logged
+    ACCESS_LOG_SLOW_THRESHOLD: float = 1.0  # seconds; slower requests are always logged
+    ACCESS_LOG_QUEUE_SIZE: int = 10000
+    ACCESS_LOG_BATCH_SIZE: int = 256
+    ACCESS_LOG_FLUSH_INTERVAL: float = 0.5  # seconds
+    
+    # Profiler Settings (/api/debug, super admins only)
+    PROFILER_ENABLED: bool = False
+    PROFILER_MAX_DURATION: float = 60.0  # seconds
+    
     # Token Settings
     @property
     def ACCESS_TOKEN_EXPIRE_DELTA(self) -> timedelta:
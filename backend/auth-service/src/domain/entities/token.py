@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field, UUID4
+import hashlib
+from pydantic import BaseModel, Field, UUID4, field_validator, model_validator
 from typing import Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -12,11 +13,19 @@ class TokenType(str, Enum):
     API_KEY = "api_key"
 
 
+def digest_token(token_value: str) -> str:
+    """SHA-256 of a token value, hex encoded; tokens are stored and looked up by it"""
+    return hashlib.sha256(token_value.encode()).hexdigest()
+
+
 class Token(BaseModel):
     id: UUID4
     user_id: UUID4
     token_type: TokenType
-    token_value: str
+    # Not kept in storage unless configured to (TOKEN_STORE_VALUES); revoked
+    # access tokens hold their jti here
+    token_value: Optional[str] = None
+    token_digest: Optional[str] = None
     expires_at: datetime
     created_at: datetime
     revoked: bool = False
@@ -24,5 +33,17 @@ class Token(BaseModel):
     device_info: Optional[Dict[str, Any]] = Field(default_factory=dict)
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
+    @field_validator("token_digest", mode="before")
+    @classmethod
+    def digest_to_hex(cls, value):
+        """The database stores the raw 32 bytes"""
+        return value.hex() if isinstance(value, bytes) else value
+    
+    @model_validator(mode="after")
+    def fill_digest(self):
+        if self.token_digest is None and self.token_value is not None:
+            self.token_digest = digest_token(self.token_value)
+        return self
+    
     class Config:
         from_attributes = True 
\ No newline at end of file
@@ -12,6 +12,11 @@ class TokenRepository(ABC):
         """Create a new token"""
         pass
     
+    @abstractmethod
+    async def create_if_absent(self, token: Token) -> bool:
+        """Create a token unless one with the same value exists; returns whether it was created"""
+        pass
+    
     @abstractmethod
     async def get_by_id(self, token_id: UUID) -> Optional[Token]:
         """Get a token by ID"""
@@ -47,6 +52,16 @@ class TokenRepository(ABC):
         """Check if a token is valid (exists, not expired, not revoked)"""
         pass
     
+    @abstractmethod
+    async def is_access_token_revoked(self, jti: str) -> bool:
+        """Check if an access token has been revoked, by its jti"""
+        pass
+    
+    @abstractmethod
+    async def get_revoked_access_tokens(self) -> List[Token]:
+        """Get revoked access tokens that have not expired yet"""
+        pass
+    
     @abstractmethod
     async def clean_expired_tokens(self, before_date: datetime) -> int:
         """Remove expired tokens from the database"""
@@ -61,6 +61,11 @@ class UserRepository(ABC):
         """Update a user's password hash"""
         pass
     
+    @abstractmethod
+    async def replace_password_hash(self, user_id: UUID, old_hash: str, new_hash: str) -> bool:
+        """Replace a user's password hash if it is still old_hash; return whether it was replaced"""
+        pass
+    
     @abstractmethod
     async def update_last_login(self, user_id: UUID) -> User:
         """Update a user's last login timestamp"""
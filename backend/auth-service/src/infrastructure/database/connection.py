@@ -1,8 +1,26 @@
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
 
 from config.settings import Settings
+from lms_shared.deadline import time_remaining
+
+
+class DeadlineSession(Session):
+    """
+    Session whose transactions may run no longer than the request's deadline.
+    """
+
+
+@event.listens_for(DeadlineSession, "after_begin")
+def apply_statement_timeout(session, transaction, connection):
+    """Give each transaction the time left of the request as statement_timeout"""
+    left = time_remaining()
+    if left is not None and connection.dialect.name == "postgresql":
+        # SET LOCAL ends with the transaction; 0 would mean no timeout at all
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}")
 
 
 class Database:
@@ -27,6 +45,7 @@ class Database:
         self.session_factory = sessionmaker(
             self.engine, 
             class_=AsyncSession, 
+            sync_session_class=DeadlineSession,
             expire_on_commit=False
         )
     
@@ -42,6 +61,26 @@ class Database:
             raise
         finally:
             await session.close()
+        
+        # Only reached once the transaction has committed
+        for callback in session.info.pop("after_commit", []):
+            await callback()
+    
+    @staticmethod
+    def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+        """Run a coroutine function once a session from session() has committed; dropped on rollback"""
+        session.info.setdefault("after_commit", []).append(callback)
+    
+    async def check(self):
+        """Check the database over a pooled connection and report pool usage"""
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        pool = self.engine.pool
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
     
     async def create_tables(self):
         """Create database tables"""
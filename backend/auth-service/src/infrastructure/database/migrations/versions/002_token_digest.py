@@ -0,0 +1,102 @@
+"""Look tokens up by a SHA-256 digest instead of the full value
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+Runs without locking the tokens table for longer than a moment:
+
+- token_digest is added as a nullable column (no table rewrite), and a
+  trigger fills it for rows written by instances still on the old code;
+  revision 003 drops the trigger once the rollout is complete
+- existing rows are backfilled in batches, each in its own transaction,
+  skipping rows other transactions have locked (``--sql`` output has a
+  single UPDATE instead, since batches need live row counts)
+- the unique index is built CONCURRENTLY, and NOT NULL is set through a
+  CHECK constraint added NOT VALID and validated in a later transaction,
+  so the table is never scanned under an exclusive lock
+- the old index on token_value is dropped CONCURRENTLY and token_value
+  becomes nullable, so TOKEN_STORE_VALUES=false can stop storing it
+
+The batch size can be set with ``alembic -x token_digest_batch_size=N upgrade head``.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    batch_size = int(context.get_x_argument(as_dictionary=True).get("token_digest_batch_size", DEFAULT_BATCH_SIZE))
+    
+    op.add_column('tokens', sa.Column('token_digest', sa.LargeBinary(), nullable=True))
+    
+    # Keeps the digest right for rows written by the old code during the rollout
+    op.execute("""
+        CREATE FUNCTION tokens_set_digest() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.token_digest IS NULL AND NEW.token_value IS NOT NULL THEN
+                NEW.token_digest := sha256(convert_to(NEW.token_value, 'UTF8'));
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tokens_set_digest BEFORE INSERT OR UPDATE ON tokens
+        FOR EACH ROW EXECUTE FUNCTION tokens_set_digest()
+    """)
+    
+    with op.get_context().autocommit_block():
+        if context.is_offline_mode():
+            op.execute("UPDATE tokens SET token_digest = sha256(convert_to(token_value, 'UTF8')) WHERE token_digest IS NULL")
+        else:
+            connection = op.get_bind()
+            backfill = sa.text("""
+                UPDATE tokens SET token_digest = sha256(convert_to(token_value, 'UTF8'))
+                WHERE id IN (
+                    SELECT id FROM tokens WHERE token_digest IS NULL
+                    LIMIT :batch_size FOR UPDATE SKIP LOCKED
+                )
+            """)
+            while connection.execute(backfill, {"batch_size": batch_size}).rowcount:
+                pass
+        
+        op.create_index(
+            'ix_tokens_token_digest', 'tokens', ['token_digest'],
+            unique=True, postgresql_concurrently=True,
+        )
+    
+    # Adding the constraint takes an exclusive lock only for a moment, and is
+    # committed before validating, which scans the table under a lock that
+    # lets reads and writes continue. SET NOT NULL then trusts the constraint
+    # instead of scanning the table.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE tokens ADD CONSTRAINT ck_tokens_token_digest_not_null CHECK (token_digest IS NOT NULL) NOT VALID")
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE tokens VALIDATE CONSTRAINT ck_tokens_token_digest_not_null")
+    op.alter_column('tokens', 'token_digest', nullable=False)
+    op.drop_constraint('ck_tokens_token_digest_not_null', 'tokens', type_='check')
+    
+    op.alter_column('tokens', 'token_value', nullable=True)
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tokens_token_value', 'tokens', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    # Tokens stored without their value cannot be looked up by value any more
+    op.execute("DELETE FROM tokens WHERE token_value IS NULL")
+    op.alter_column('tokens', 'token_value', nullable=False)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tokens_token_value', 'tokens', ['token_value'], postgresql_concurrently=True)
+        op.drop_index('ix_tokens_token_digest', 'tokens', postgresql_concurrently=True)
+    
+    op.execute("DROP TRIGGER tokens_set_digest ON tokens")
+    op.execute("DROP FUNCTION tokens_set_digest()")
+    op.drop_column('tokens', 'token_digest')
@@ -0,0 +1,38 @@
+"""Drop the trigger that filled token digests during the 002 rollout
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+Apply once no instance older than 002 is running: every writer now sets
+token_digest itself, so the trigger only adds work to each token write.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tokens_set_digest ON tokens")
+    op.execute("DROP FUNCTION IF EXISTS tokens_set_digest()")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE FUNCTION tokens_set_digest() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.token_digest IS NULL AND NEW.token_value IS NOT NULL THEN
+                NEW.token_digest := sha256(convert_to(NEW.token_value, 'UTF8'));
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tokens_set_digest BEFORE INSERT OR UPDATE ON tokens
+        FOR EACH ROW EXECUTE FUNCTION tokens_set_digest()
+    """)
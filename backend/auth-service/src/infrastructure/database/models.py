@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, JSON, Enum, ARRAY, Text
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, JSON, Enum, ARRAY, Text, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -43,7 +43,9 @@ class TokenModel(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     token_type = Column(Enum(TokenType, name="token_type"), nullable=False)
-    token_value = Column(Text, nullable=False, index=True)
+    # Tokens are looked up by the SHA-256 of their value; the value itself is optional
+    token_digest = Column(LargeBinary(32), nullable=False, unique=True, index=True)
+    token_value = Column(Text, nullable=True)
     expires_at = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     revoked = Column(Boolean, nullable=False, default=False)
@@ -0,0 +1,271 @@
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set, Tuple
+
+from passlib.context import CryptContext
+
+from lms_shared.monitoring.metrics import metrics as default_metrics
+
+logger = logging.getLogger(__name__)
+
+# Schemes that can hash new passwords, by their name in settings
+SCHEMES = ("argon2", "bcrypt")
+
+# Set in each pool process; hashing never runs in the server process
+_context: Optional[CryptContext] = None
+
+
+def hash_options(
+    bcrypt_rounds: int = 12,
+    argon2_time_cost: int = 3,
+    argon2_memory_cost: int = 65536,
+    argon2_parallelism: int = 1,
+) -> Dict[str, Any]:
+    """
+    Get the passlib options for the given hashing costs.
+    
+    Hashes made with a lower cost (or, for argon2, any other memory cost
+    or parallelism) count as outdated and are rehashed on login.
+    
+    Args:
+        bcrypt_rounds: bcrypt cost, log2 of the number of rounds
+        argon2_time_cost: argon2id iterations
+        argon2_memory_cost: argon2id memory in KiB
+        argon2_parallelism: argon2id lanes
+    """
+    return {
+        "bcrypt__rounds": bcrypt_rounds,
+        "bcrypt__min_rounds": bcrypt_rounds,
+        "argon2__type": "ID",
+        "argon2__rounds": argon2_time_cost,
+        "argon2__min_rounds": argon2_time_cost,
+        "argon2__memory_cost": argon2_memory_cost,
+        "argon2__parallelism": argon2_parallelism,
+    }
+
+
+def crypt_context(schemes: Sequence[str], options: Dict[str, Any]) -> CryptContext:
+    """
+    Build the passlib context: the first scheme hashes new passwords,
+    the others are only verified and count as outdated.
+    
+    Raises:
+        ValueError: If a scheme is unknown
+    """
+    unknown = [scheme for scheme in schemes if scheme not in SCHEMES]
+    if not schemes or unknown:
+        raise ValueError(f"Password hash schemes must be some of {', '.join(SCHEMES)}, got {list(schemes)}")
+    options = {
+        name: value for name, value in options.items()
+        if name.split("__", 1)[0] in schemes
+    }
+    return CryptContext(schemes=list(schemes), deprecated="auto", **options)
+
+
+def _init_worker(schemes: Sequence[str], options: Dict[str, Any]) -> None:
+    global _context
+    _context = crypt_context(schemes, options)
+
+
+def _hash(password: str) -> Tuple[str, float]:
+    started = time.perf_counter()
+    return _context.hash(password), time.perf_counter() - started
+
+
+def _verify(password: str, hashed_password: str) -> Tuple[bool, float]:
+    started = time.perf_counter()
+    return _context.verify(password, hashed_password), time.perf_counter() - started
+
+
+class PasswordHasherBusyError(Exception):
+    """
+    Raised when a password operation would wait longer than allowed.
+    """
+    
+    def __init__(self, retry_after: float):
+        super().__init__("Too many password operations in progress")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords in a pool of worker processes.
+    
+    bcrypt and argon2id are deliberately slow (100-300 ms per call), so
+    running them on the event loop stalls every other request in the
+    worker for that long. Here they run in ``workers`` processes (one per
+    core by default) and the event loop only waits for the result.
+    
+    Hashes made with an older scheme or a lower cost still verify;
+    ``needs_update`` tells them apart so they can be replaced after a
+    successful login with ``rehash_in_background``.
+    
+    The pool queues at most ``max_pending`` operations. Before queueing
+    one, the wait is estimated from the operations ahead of it and the
+    average time an operation takes; past ``max_wait`` seconds it is
+    rejected with ``PasswordHasherBusyError`` right away, since a login
+    that answers after the client gave up is wasted work that delays
+    the logins behind it.
+    """
+    
+    def __init__(
+        self,
+        schemes: Sequence[str] = ("bcrypt",),
+        options: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+        max_pending: int = 64,
+        max_wait: float = 2.0,
+        metrics=None,
+    ):
+        """
+        Initialize the hasher.
+        
+        Args:
+            schemes: Hash schemes; the first one hashes new passwords
+            options: passlib options for the schemes, see ``hash_options``
+            workers: Number of worker processes (defaults to the number of cores)
+            max_pending: Operations queued or running at most
+            max_wait: Seconds an operation may be expected to wait for a worker
+            metrics: Metrics registry to export pool usage to
+        """
+        self.schemes = tuple(schemes)
+        self.options = options if options is not None else hash_options()
+        # Only reads hashes in this process, to tell whether they are outdated
+        self._context = crypt_context(self.schemes, self.options)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.max_wait = max_wait
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._rehashing: Set[asyncio.Task] = set()
+        # Average seconds per operation, refined as operations complete
+        self._operation_time = 0.25
+        
+        metrics = metrics or default_metrics
+        self._duration = metrics.histogram(
+            "password_hash_duration_seconds",
+            "Time to hash or verify a password, including the wait for a worker",
+            ("operation",),
+        )
+        self._rejected = metrics.counter(
+            "password_hash_rejected_total",
+            "Password operations rejected because the pool was saturated",
+            ("operation",),
+        )
+        self._rehashed = metrics.counter(
+            "password_rehash_total",
+            "Outdated password hashes replaced after login, by result",
+            ("result",),
+        )
+        self._pending_gauge = metrics.gauge("password_hash_pending", "Password operations queued or running")
+    
+    def start(self) -> None:
+        """
+        Start the worker processes.
+        """
+        if self._executor is None:
+            # Forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.schemes, self.options),
+            )
+    
+    def close(self) -> None:
+        """
+        Stop the worker processes, dropping queued operations and rehashes.
+        """
+        for task in self._rehashing:
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def expected_wait(self) -> float:
+        """
+        Get the estimated seconds a new operation would wait for a worker.
+        """
+        return (self._pending // self.workers) * self._operation_time
+    
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password for storing.
+        
+        Raises:
+            PasswordHasherBusyError: If the pool is saturated
+        """
+        return await self._run("hash", _hash, password)
+    
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against a hash.
+        
+        Raises:
+            PasswordHasherBusyError: If the pool is saturated
+        """
+        return await self._run("verify", _verify, password, hashed_password)
+    
+    def needs_update(self, hashed_password: str) -> bool:
+        """
+        Get whether a hash uses an outdated scheme or cost.
+        """
+        return self._context.needs_update(hashed_password)
+    
+    def rehash_in_background(self, password: str, store: Callable[[str], Awaitable[bool]]) -> None:
+        """
+        Hash a password with the current scheme and cost and hand the
+        new hash to ``store``, without waiting for either.
+        
+        Rehashing is skipped while operations are queued for the pool, so
+        it never delays logins; the next login tries again.
+        
+        Args:
+            password: The password, already verified against the old hash
+            store: Coroutine function that saves the new hash; returns False
+                if the stored hash changed meanwhile and was left alone
+        """
+        if self._pending >= self.workers:
+            self._rehashed.inc(result="skipped")
+            return
+        # Outlives the request, so it must not inherit the request's context
+        # (e.g. its deadline, which would time out the store)
+        task = asyncio.get_running_loop().create_task(self._rehash(password, store), context=contextvars.Context())
+        self._rehashing.add(task)
+        task.add_done_callback(self._rehashing.discard)
+    
+    async def _rehash(self, password: str, store: Callable[[str], Awaitable[bool]]) -> None:
+        try:
+            stored = await store(await self.hash(password))
+        except PasswordHasherBusyError:
+            self._rehashed.inc(result="skipped")
+        except Exception as e:
+            self._rehashed.inc(result="error")
+            logger.warning(f"Could not rehash password: {e}")
+        else:
+            # A password change or another login's rehash got there first
+            self._rehashed.inc(result="ok" if stored else "conflict")
+    
+    async def _run(self, operation: str, function, *args):
+        wait = self.expected_wait()
+        if self._pending >= self.max_pending or wait > self.max_wait:
+            self._rejected.inc(operation=operation)
+            raise PasswordHasherBusyError(retry_after=max(1.0, wait))
+        
+        self.start()
+        started = time.perf_counter()
+        self._pending += 1
+        self._pending_gauge.set(self._pending)
+        try:
+            result, elapsed = await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            self._pending -= 1
+            self._pending_gauge.set(self._pending)
+        self._operation_time = 0.9 * self._operation_time + 0.1 * elapsed
+        self._duration.observe(time.perf_counter() - started, operation=operation)
+        return result
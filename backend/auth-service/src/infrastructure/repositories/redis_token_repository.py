@@ -0,0 +1,266 @@
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable, List, Optional
+from uuid import UUID
+
+import redis.asyncio
+from redis.exceptions import RedisError
+
+from domain.entities.token import Token, TokenType, digest_token
+from domain.repositories.token_repository import TokenRepository
+from lms_shared.monitoring.metrics import metrics as default_metrics
+
+logger = logging.getLogger(__name__)
+
+# Seconds one instance may spend restoring the denylist before another may retry
+RESTORE_LOCK_TTL = 60
+
+
+class RedisCachedTokenRepository(TokenRepository):
+    """
+    Token repository that keeps token state in Redis in front of the
+    database repository.
+    
+    The database stays the durable source. Redis holds the state of each
+    token that was created or looked up (``token:<digest>``, without the
+    token value) and a denylist of revoked access tokens (``denylist:<jti>``),
+    both expiring with the token, so the checks made on every refresh and
+    authenticated request are single key lookups.
+    
+    New state is written to Redis only after the database transaction
+    commits (through ``after_commit``), so a rolled back request leaves
+    nothing behind. Revoking also deletes the cached state before the
+    commit; if that fails the error propagates and the transaction rolls
+    back, rather than leaving Redis answering "valid" for a token the
+    database says is revoked. State read from the database is only cached
+    if no newer state was written meanwhile (``SET NX``).
+    
+    A miss on the denylist is only trusted while ``denylist:restored`` is
+    set. The key is written when the denylist is copied from the database;
+    if Redis loses its data (flush, failover to an empty replica) the key
+    is gone too, and checks read the database until one instance has
+    restored the denylist again.
+    """
+    
+    def __init__(
+        self,
+        repository: TokenRepository,
+        redis_client: redis.asyncio.Redis,
+        after_commit: Callable[[Callable[[], Awaitable[None]]], None],
+        key_prefix: str = "auth:",
+        metrics=None,
+    ):
+        """
+        Initialize the repository.
+        
+        Args:
+            repository: The database repository
+            redis_client: The Redis client to use
+            after_commit: Registers a coroutine function to run once the
+                repository's transaction has committed
+            key_prefix: Prefix for every key
+            metrics: Metrics registry to count cache lookups in
+        """
+        self.repository = repository
+        self.redis = redis_client
+        self.after_commit = after_commit
+        self.key_prefix = key_prefix
+        
+        metrics = metrics or default_metrics
+        self._lookups = metrics.counter(
+            "token_cache_lookups_total",
+            "Token state lookups in Redis by result",
+            ("result",),
+        )
+    
+    def _token_key(self, token_digest: str) -> str:
+        return f"{self.key_prefix}token:{token_digest}"
+    
+    def _denylist_key(self, jti: str) -> str:
+        return f"{self.key_prefix}denylist:{jti}"
+    
+    @property
+    def _restored_key(self) -> str:
+        return f"{self.key_prefix}denylist:restored"
+    
+    @property
+    def _restore_lock_key(self) -> str:
+        return f"{self.key_prefix}denylist:restoring"
+    
+    @staticmethod
+    def _ttl(token: Token) -> int:
+        """Seconds until the token expires."""
+        return int((token.expires_at - datetime.utcnow()).total_seconds())
+    
+    async def _store(self, tokens: Iterable[Token], only_new: bool = False) -> None:
+        """Write the state of tokens that have not expired yet."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for token in tokens:
+                ttl = self._ttl(token)
+                if ttl <= 0:
+                    continue
+                if token.token_type == TokenType.ACCESS:
+                    if token.revoked:
+                        pipe.set(self._denylist_key(token.token_value), 1, ex=ttl)
+                else:
+                    # The state without the credential itself
+                    state = token.model_dump_json(exclude={"token_value"})
+                    pipe.set(self._token_key(token.token_digest), state, ex=ttl, nx=only_new)
+            await pipe.execute()
+    
+    async def _invalidate(self, tokens: Iterable[Token]) -> None:
+        """Delete cached state before a change to it commits, so reads go to the database."""
+        keys = [self._token_key(token.token_digest) for token in tokens if token.token_type != TokenType.ACCESS]
+        if keys:
+            await self.redis.delete(*keys)
+    
+    def _store_after_commit(self, tokens: Iterable[Token]) -> None:
+        """Write the state of tokens once the transaction has committed."""
+        tokens = list(tokens)
+        
+        async def store():
+            try:
+                await self._store(tokens)
+            except RedisError as e:
+                logger.error(f"Could not write committed token state to Redis: {e}")
+                if any(token.token_type == TokenType.ACCESS and token.revoked for token in tokens):
+                    # Make denylist checks read the database until it is restored
+                    try:
+                        await self.redis.delete(self._restored_key)
+                    except RedisError:
+                        pass
+        
+        self.after_commit(store)
+    
+    async def create(self, token: Token) -> Token:
+        """Create a new token"""
+        token = await self.repository.create(token)
+        self._store_after_commit([token])
+        return token
+    
+    async def create_if_absent(self, token: Token) -> bool:
+        """Create a token unless one with the same value exists; returns whether it was created"""
+        created = await self.repository.create_if_absent(token)
+        if created:
+            # Otherwise the transaction that created it stores the state
+            self._store_after_commit([token])
+        return created
+    
+    async def get_by_id(self, token_id: UUID) -> Optional[Token]:
+        """Get a token by ID"""
+        return await self.repository.get_by_id(token_id)
+    
+    async def get_by_value(self, token_value: str) -> Optional[Token]:
+        """Get a token by its value"""
+        try:
+            cached = await self.redis.get(self._token_key(digest_token(token_value)))
+        except RedisError as e:
+            self._lookups.inc(result="error")
+            logger.warning(f"Token cache unavailable, reading from the database: {e}")
+            return await self.repository.get_by_value(token_value)
+        
+        if cached is not None:
+            self._lookups.inc(result="hit")
+            return Token.model_validate_json(cached)
+        
+        self._lookups.inc(result="miss")
+        token = await self.repository.get_by_value(token_value)
+        if token is not None and token.token_type != TokenType.ACCESS:
+            try:
+                await self._store([token], only_new=True)
+            except RedisError as e:
+                logger.warning(f"Could not cache token state: {e}")
+        return token
+    
+    async def get_active_by_user_and_type(self, user_id: UUID, token_type: TokenType) -> List[Token]:
+        """Get active tokens for a user by token type"""
+        return await self.repository.get_active_by_user_and_type(user_id, token_type)
+    
+    async def revoke(self, token_id: UUID) -> Token:
+        """Revoke a token by ID"""
+        token = await self.repository.revoke(token_id)
+        if token is not None:
+            await self._invalidate([token])
+            self._store_after_commit([token])
+        return token
+    
+    async def revoke_by_value(self, token_value: str) -> Token:
+        """Revoke a token by its value"""
+        token = await self.repository.revoke_by_value(token_value)
+        if token is not None:
+            await self._invalidate([token])
+            self._store_after_commit([token])
+        return token
+    
+    async def revoke_all_for_user(self, user_id: UUID, token_type: Optional[TokenType] = None) -> int:
+        """Revoke all tokens for a user, optionally filtering by token type"""
+        token_types = [token_type] if token_type else list(TokenType)
+        active = []
+        for active_type in token_types:
+            active.extend(await self.repository.get_active_by_user_and_type(user_id, active_type))
+        
+        count = await self.repository.revoke_all_for_user(user_id, token_type)
+        await self._invalidate(active)
+        revoked_at = datetime.utcnow()
+        self._store_after_commit(
+            token.model_copy(update={"revoked": True, "revoked_at": revoked_at})
+            for token in active
+        )
+        return count
+    
+    async def is_token_valid(self, token_value: str) -> bool:
+        """Check if a token is valid (exists, not expired, not revoked)"""
+        token = await self.get_by_value(token_value)
+        return token is not None and not token.revoked and token.expires_at > datetime.utcnow()
+    
+    async def is_access_token_revoked(self, jti: str) -> bool:
+        """Check if an access token has been revoked, by its jti"""
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.exists(self._denylist_key(jti))
+                pipe.exists(self._restored_key)
+                revoked, restored = await pipe.execute()
+        except RedisError as e:
+            self._lookups.inc(result="error")
+            logger.warning(f"Token denylist unavailable, reading from the database: {e}")
+            return await self.repository.is_access_token_revoked(jti)
+        
+        if revoked:
+            self._lookups.inc(result="hit")
+            return True
+        if restored:
+            self._lookups.inc(result="miss")
+            return False
+        
+        # Redis lost the denylist: answer from the database and restore it
+        self._lookups.inc(result="unrestored")
+        revoked = await self.repository.is_access_token_revoked(jti)
+        try:
+            if await self.redis.set(self._restore_lock_key, 1, ex=RESTORE_LOCK_TTL, nx=True):
+                restored_count = await self.restore_denylist()
+                logger.warning(f"Token denylist was missing from Redis, restored {restored_count} revoked access tokens")
+        except RedisError as e:
+            logger.warning(f"Could not restore the token denylist: {e}")
+        return revoked
+    
+    async def get_revoked_access_tokens(self) -> List[Token]:
+        """Get revoked access tokens that have not expired yet"""
+        return await self.repository.get_revoked_access_tokens()
+    
+    async def restore_denylist(self) -> int:
+        """
+        Copy the revoked access tokens from the database to Redis, for
+        when Redis lost its data, and mark the denylist as complete.
+        
+        Returns:
+            The number of revoked access tokens
+        """
+        tokens = await self.repository.get_revoked_access_tokens()
+        await self._store(tokens)
+        await self.redis.set(self._restored_key, 1)
+        return len(tokens)
+    
+    async def clean_expired_tokens(self, before_date: datetime) -> int:
+        """Remove expired tokens from the database"""
+        # Cached state expires with its token
+        return await self.repository.clean_expired_tokens(before_date)
@@ -3,24 +3,34 @@ from typing import List, Optional
 from datetime import datetime
 
 from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from domain.entities.token import Token, TokenType
+from domain.entities.token import Token, TokenType, digest_token
 from domain.repositories.token_repository import TokenRepository
 from infrastructure.database.models import TokenModel
 
 
+def _digest(token_value: str) -> bytes:
+    return bytes.fromhex(digest_token(token_value))
+
+
 class SQLAlchemyTokenRepository(TokenRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, store_token_values: bool = True):
         self.session = session
+        # Without the values a database leak exposes no usable tokens
+        self.store_token_values = store_token_values
     
-    async def create(self, token: Token) -> Token:
-        """Create a new token"""
-        token_model = TokenModel(
+    def _columns(self, token: Token) -> dict:
+        """Get the column values to store for a token"""
+        # Revoked access tokens are stored by jti, which is no secret
+        keep_value = self.store_token_values or token.token_type == TokenType.ACCESS
+        return dict(
             id=token.id,
             user_id=token.user_id,
             token_type=token.token_type,
-            token_value=token.token_value,
+            token_digest=bytes.fromhex(token.token_digest),
+            token_value=token.token_value if keep_value else None,
             expires_at=token.expires_at,
             created_at=token.created_at,
             revoked=token.revoked,
@@ -28,6 +38,10 @@ class SQLAlchemyTokenRepository(TokenRepository):
             device_info=token.device_info,
             metadata=token.metadata
         )
+    
+    async def create(self, token: Token) -> Token:
+        """Create a new token"""
+        token_model = TokenModel(**self._columns(token))
         
         self.session.add(token_model)
         await self.session.flush()
@@ -35,6 +49,19 @@ class SQLAlchemyTokenRepository(TokenRepository):
         
         return Token.model_validate(token_model)
     
+    async def create_if_absent(self, token: Token) -> bool:
+        """Create a token unless one with the same value exists; returns whether it was created"""
+        # Waits for a concurrent insert of the same digest to commit instead
+        # of failing on the unique index and aborting the transaction
+        tokens = TokenModel.__table__
+        result = await self.session.execute(
+            insert(tokens)
+            .values(**self._columns(token))
+            .on_conflict_do_nothing(index_elements=[tokens.c.token_digest])
+            .returning(tokens.c.id)
+        )
+        return result.first() is not None
+    
     async def get_by_id(self, token_id: UUID) -> Optional[Token]:
         """Get a token by ID"""
         result = await self.session.execute(
@@ -50,7 +77,7 @@ class SQLAlchemyTokenRepository(TokenRepository):
     async def get_by_value(self, token_value: str) -> Optional[Token]:
         """Get a token by its value"""
         result = await self.session.execute(
-            select(TokenModel).where(TokenModel.token_value == token_value)
+            select(TokenModel).where(TokenModel.token_digest == _digest(token_value))
         )
         token_model = result.scalars().first()
         
@@ -118,7 +145,7 @@ class SQLAlchemyTokenRepository(TokenRepository):
         """Check if a token is valid (exists, not expired, not revoked)"""
         result = await self.session.execute(
             select(TokenModel).where(
-                TokenModel.token_value == token_value,
+                TokenModel.token_digest == _digest(token_value),
                 TokenModel.revoked == False,
                 TokenModel.expires_at > datetime.utcnow()
             )
@@ -127,6 +154,32 @@ class SQLAlchemyTokenRepository(TokenRepository):
         
         return token_model is not None
     
+    async def is_access_token_revoked(self, jti: str) -> bool:
+        """Check if an access token has been revoked, by its jti"""
+        # Revoked access tokens are stored with their jti as the value
+        result = await self.session.execute(
+            select(TokenModel.id).where(
+                TokenModel.token_type == TokenType.ACCESS,
+                TokenModel.token_digest == _digest(jti),
+                TokenModel.revoked == True
+            ).limit(1)
+        )
+        
+        return result.first() is not None
+    
+    async def get_revoked_access_tokens(self) -> List[Token]:
+        """Get revoked access tokens that have not expired yet"""
+        result = await self.session.execute(
+            select(TokenModel).where(
+                TokenModel.token_type == TokenType.ACCESS,
+                TokenModel.revoked == True,
+                TokenModel.expires_at > datetime.utcnow()
+            )
+        )
+        token_models = result.scalars().all()
+        
+        return [Token.model_validate(token_model) for token_model in token_models]
+    
     async def clean_expired_tokens(self, before_date: datetime) -> int:
         """Remove expired tokens from the database"""
         result = await self.session.execute(
@@ -179,6 +179,17 @@ class SQLAlchemyUserRepository(UserRepository):
         
         return await self.get_by_id(user_id)
     
+    async def replace_password_hash(self, user_id: UUID, old_hash: str, new_hash: str) -> bool:
+        """Replace a user's password hash if it is still old_hash"""
+        # Same password, new encoding: updated_at is left alone, and a
+        # password changed in the meantime is not overwritten
+        result = await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id, UserModel.password_hash == old_hash)
+            .values(password_hash=new_hash)
+        )
+        return result.rowcount > 0
+    
     async def update_last_login(self, user_id: UUID) -> User:
         """Update a user's last login timestamp"""
         await self.session.execute(
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime, timedelta
+from functools import partial
 
 from infrastructure.database.connection import Database
 from config.settings import Settings
@@ -18,7 +19,7 @@ async def initialize_database(settings: Settings, db: Database):
         raise
 
 
-async def initialize_app(settings: Settings, db: Database):
+async def initialize_app(settings: Settings, db: Database, redis_client=None):
     """Initialize the application"""
     # Initialize database
     await initialize_database(settings, db)
@@ -36,6 +37,22 @@ async def initialize_app(settings: Settings, db: Database):
     except Exception as e:
         logger.warning(f"Error cleaning expired tokens: {e}")
     
+    # Restore the access token denylist in case Redis lost it; the database has every revocation
+    if redis_client is not None:
+        try:
+            from infrastructure.repositories.token_repository import SQLAlchemyTokenRepository
+            from infrastructure.repositories.redis_token_repository import RedisCachedTokenRepository
+            async with db.session() as session:
+                token_repository = RedisCachedTokenRepository(
+                    SQLAlchemyTokenRepository(session),
+                    redis_client,
+                    partial(db.after_commit, session),
+                )
+                restored_count = await token_repository.restore_denylist()
+                logger.info(f"Restored {restored_count} revoked access tokens to Redis")
+        except Exception as e:
+            logger.warning(f"Error restoring the token denylist: {e}")
+    
     # Add more initialization steps as needed
     
     logger.info("Application initialized successfully") 
\ No newline at end of file
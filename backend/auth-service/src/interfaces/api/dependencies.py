@@ -1,7 +1,9 @@
 from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+import redis.asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
+from functools import partial
 from typing import Optional, List
 import uuid
 
@@ -9,7 +11,10 @@ from config.settings import Settings
 from infrastructure.database.connection import Database
 from infrastructure.repositories.user_repository import SQLAlchemyUserRepository
 from infrastructure.repositories.token_repository import SQLAlchemyTokenRepository
+from infrastructure.repositories.redis_token_repository import RedisCachedTokenRepository
 from infrastructure.repositories.oauth2_repository import SQLAlchemyOAuth2Repository
+from lms_shared.monitoring.profiler import SamplingProfiler
+from infrastructure.password_hasher import PasswordHasher, hash_options
 from application.services.auth_service import AuthService
 from application.services.oauth2_service import OAuth2Service
 from domain.entities.user import UserRole
@@ -24,6 +29,20 @@ oauth2_scheme = OAuth2PasswordBearer(
 # Initialize settings and database
 settings = Settings()
 db = Database(settings)
+redis_client = redis.asyncio.Redis.from_url(settings.REDIS_URL)
+profiler = SamplingProfiler(max_duration=settings.PROFILER_MAX_DURATION)
+password_hasher = PasswordHasher(
+    schemes=settings.PASSWORD_HASH_SCHEMES,
+    options=hash_options(
+        bcrypt_rounds=settings.BCRYPT_ROUNDS,
+        argon2_time_cost=settings.ARGON2_TIME_COST,
+        argon2_memory_cost=settings.ARGON2_MEMORY_COST,
+        argon2_parallelism=settings.ARGON2_PARALLELISM,
+    ),
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    max_wait=settings.PASSWORD_HASH_MAX_WAIT,
+)
 
 
 async def get_db_session() -> AsyncSession:
@@ -32,6 +51,12 @@ async def get_db_session() -> AsyncSession:
         yield session
 
 
+async def replace_password_hash(user_id: uuid.UUID, old_hash: str, new_hash: str) -> bool:
+    """Store a rehashed password in its own session (the request's may be closed by then)"""
+    async with db.session() as session:
+        return await SQLAlchemyUserRepository(session).replace_password_hash(user_id, old_hash, new_hash)
+
+
 async def get_user_repository(session: AsyncSession = Depends(get_db_session)):
     """Get a user repository"""
     return SQLAlchemyUserRepository(session)
@@ -39,7 +64,10 @@ async def get_user_repository(session: AsyncSession = Depends(get_db_session)):
 
 async def get_token_repository(session: AsyncSession = Depends(get_db_session)):
     """Get a token repository"""
-    return SQLAlchemyTokenRepository(session)
+    repository = SQLAlchemyTokenRepository(session, store_token_values=settings.TOKEN_STORE_VALUES)
+    if settings.TOKEN_CACHE_ENABLED:
+        return RedisCachedTokenRepository(repository, redis_client, partial(db.after_commit, session))
+    return repository
 
 
 async def get_oauth2_repository(session: AsyncSession = Depends(get_db_session)):
@@ -52,7 +80,13 @@ async def get_auth_service(
     token_repository=Depends(get_token_repository)
 ):
     """Get an authentication service"""
-    return AuthService(user_repository, token_repository, settings)
+    return AuthService(
+        user_repository,
+        token_repository,
+        settings,
+        password_hasher,
+        replace_password_hash=replace_password_hash,
+    )
 
 
 async def get_oauth2_service(
@@ -89,6 +123,11 @@ async def get_current_user_id(
         if not user_id:
             return None
         
+        # Revoked before it expired (logout)
+        jti = payload.get("jti")
+        if jti and await token_repository.is_access_token_revoked(jti):
+            return None
+        
         return uuid.UUID(user_id)
     except (JWTError, ValueError):
         return None
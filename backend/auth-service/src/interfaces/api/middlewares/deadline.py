@@ -0,0 +1,49 @@
+import asyncio
+from typing import Callable, Iterable
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from lms_shared.deadline import HEADER_REQUEST_TIMEOUT, parse_timeout_header, reset_deadline, set_deadline
+from lms_shared.monitoring.metrics import metrics
+
+
+def create_deadline_middleware(
+    default_timeout: float,
+    max_timeout: float,
+    exempt_prefixes: Iterable[str] = (),
+) -> Callable:
+    """
+    Build a middleware that gives every request a deadline.
+    
+    The gateway sends what is left of its own deadline in the
+    ``X-Request-Timeout-Ms`` header, capped here at ``max_timeout``;
+    requests without it get ``default_timeout``. Database transactions
+    started for the request get the time left as ``statement_timeout``,
+    and once the deadline passes the work is cancelled with a 504.
+    """
+    exempt_prefixes = tuple(exempt_prefixes)
+    exceeded = metrics.counter(
+        "deadline_exceeded_total",
+        "Requests abandoned because their deadline passed",
+    )
+    
+    async def deadline_middleware(request: Request, call_next):
+        if request.url.path.startswith(exempt_prefixes):
+            return await call_next(request)
+        
+        timeout = parse_timeout_header(request.headers.get(HEADER_REQUEST_TIMEOUT))
+        timeout = min(timeout, max_timeout) if timeout is not None else default_timeout
+        token = set_deadline(timeout)
+        try:
+            return await asyncio.wait_for(call_next(request), timeout)
+        except asyncio.TimeoutError:
+            exceeded.inc()
+            return JSONResponse(
+                content={"detail": "Request deadline exceeded"},
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            )
+        finally:
+            reset_deadline(token)
+    
+    return deadline_middleware
\ No newline at end of file
@@ -4,6 +4,7 @@ import logging
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from application.exceptions.auth_exceptions import AuthException
+from infrastructure.password_hasher import PasswordHasherBusyError
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,17 @@ async def error_handler_middleware(request: Request, call_next):
                 "details": exc.details,
             },
         )
+    except PasswordHasherBusyError as exc:
+        logger.warning(f"Shedding request: {exc}")
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": "error",
+                "message": "Too many sign-in attempts in progress, please retry shortly",
+                "details": None,
+            },
+            headers={"Retry-After": str(int(exc.retry_after + 0.5))},
+        )
     except Exception as exc:
         logger.exception(f"Unhandled exception: {exc}")
         return JSONResponse(
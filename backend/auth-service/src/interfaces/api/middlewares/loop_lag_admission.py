@@ -0,0 +1,32 @@
+from typing import Callable, Iterable
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from lms_shared.monitoring.loop_lag import LoopLagMonitor
+from lms_shared.monitoring.metrics import metrics
+
+
+def create_loop_lag_admission_middleware(
+    monitor: LoopLagMonitor,
+    threshold: float,
+    exempt_paths: Iterable[str] = (),
+) -> Callable:
+    """Build a middleware that rejects new requests while the event loop lags"""
+    exempt_paths = set(exempt_paths)
+    rejected = metrics.counter(
+        "event_loop_lag_rejected_total",
+        "Requests rejected because event loop lag exceeded the threshold",
+    )
+    
+    async def loop_lag_admission_middleware(request: Request, call_next):
+        if request.url.path not in exempt_paths and monitor.current_lag() > threshold:
+            rejected.inc()
+            return JSONResponse(
+                content={"detail": "Service temporarily overloaded", "reason": "event_loop_lag"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+        return await call_next(request)
+    
+    return loop_lag_admission_middleware
\ No newline at end of file
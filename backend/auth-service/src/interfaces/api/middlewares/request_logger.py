@@ -1,33 +1,34 @@
 import time
-import logging
+from typing import Callable
+
 from fastapi import Request
 
-logger = logging.getLogger(__name__)
+from lms_shared.monitoring.access_log import AccessLog
 
 
-async def request_logger_middleware(request: Request, call_next):
-    """Middleware for logging requests and their processing time"""
-    start_time = time.time()
-    
-    # Get request info
-    path = request.url.path
-    if request.query_params:
-        path += f"?{request.query_params}"
-    
-    method = request.method
-    
-    # Log request start
-    logger.info(f"Request started: {method} {path}")
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Log request completion
-    process_time = time.time() - start_time
-    status_code = response.status_code
-    logger.info(f"Request completed: {method} {path} - Status: {status_code} - Time: {process_time:.3f}s")
+def create_request_logger_middleware(access_log: AccessLog) -> Callable:
+    """Build a middleware that records requests and their processing time in the access log"""
     
-    # Add processing time header
-    response.headers["X-Process-Time"] = str(process_time)
+    async def request_logger_middleware(request: Request, call_next):
+        start_time = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            
+            # Add processing time header
+            response.headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+            
+            return response
+        finally:
+            access_log.record(
+                method=request.method,
+                path=request.url.path,
+                query=request.url.query,
+                status_code=status_code,
+                duration=time.perf_counter() - start_time,
+                client=request.client.host if request.client else "-",
+                request_id=request.headers.get("X-Request-ID"),
+            )
     
-    return response 
\ No newline at end of file
+    return request_logger_middleware
\ No newline at end of file
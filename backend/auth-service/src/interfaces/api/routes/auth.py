@@ -7,13 +7,15 @@ from application.dtos.auth import (
     TokenResponse, 
     UserResponse,
     RefreshTokenRequest,
+    LogoutRequest,
     ResetPasswordRequest,
     ConfirmResetPasswordRequest,
     VerifyEmailRequest
 )
 from application.services.auth_service import AuthService
 from application.exceptions.auth_exceptions import AuthException
-from interfaces.api.dependencies import get_auth_service, require_authenticated
+from interfaces.api.dependencies import get_auth_service, oauth2_scheme, require_authenticated
+from lms_shared.json_response import FastJSONResponse
 
 router = APIRouter(
     prefix="/auth",
@@ -33,7 +35,8 @@ async def login(
             email=form_data.username,  # OAuth2 spec uses 'username' field
             password=form_data.password
         )
-        return await auth_service.login(login_request)
+        # Built by the service from trusted data: returned as-is, without revalidation
+        return FastJSONResponse(await auth_service.login(login_request))
     except AuthException as e:
         raise HTTPException(
             status_code=e.status_code,
@@ -49,7 +52,7 @@ async def register(
 ):
     """Register a new user"""
     try:
-        return await auth_service.register(register_request)
+        return FastJSONResponse(await auth_service.register(register_request))
     except AuthException as e:
         raise HTTPException(
             status_code=e.status_code,
@@ -64,7 +67,26 @@ async def refresh_token(
 ):
     """Refresh an access token using a refresh token"""
     try:
-        return await auth_service.refresh_token(refresh_request)
+        return FastJSONResponse(await auth_service.refresh_token(refresh_request))
+    except AuthException as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.post("/logout", status_code=status.HTTP_200_OK)
+async def logout(
+    logout_request: LogoutRequest = Body(LogoutRequest()),
+    token: str = Depends(oauth2_scheme),
+    user = Depends(require_authenticated),
+    auth_service: AuthService = Depends(get_auth_service)
+):
+    """Revoke the current access token and, if given, the refresh token"""
+    try:
+        await auth_service.logout(token, logout_request)
+        return {"status": "success", "message": "Logged out successfully"}
     except AuthException as e:
         raise HTTPException(
             status_code=e.status_code,
@@ -121,4 +143,4 @@ async def get_current_user(
     user = Depends(require_authenticated)
 ):
     """Get the current user's profile"""
-    return UserResponse.model_validate(user) 
\ No newline at end of file
+    return FastJSONResponse(UserResponse.model_validate(user)) 
\ No newline at end of file
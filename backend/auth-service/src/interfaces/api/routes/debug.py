@@ -0,0 +1,59 @@
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from domain.entities.user import UserRole
+from lms_shared.monitoring.profiler import ProfilerBusyError
+from interfaces.api.dependencies import profiler, require_authenticated
+
+
+async def require_super_admin(user = Depends(require_authenticated)):
+    """Require a super admin"""
+    if UserRole.SUPER_ADMIN not in user.roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    return user
+
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    include_in_schema=False,
+    dependencies=[Depends(require_super_admin)],
+)
+
+
+def _profile_response(content: str, **headers: str) -> PlainTextResponse:
+    # With several workers, each request profiles the worker that serves it
+    return PlainTextResponse(content, headers={"X-Profile-Pid": str(os.getpid()), **headers})
+
+
+@router.get("/profile")
+async def cpu_profile(
+    seconds: float = Query(10.0, gt=0),
+    interval: float = Query(0.01, gt=0),
+    idle: bool = False,
+):
+    """Sample every thread's stack for a while; returns collapsed stacks for flame graphs"""
+    try:
+        stacks, samples = await profiler.sample(seconds, interval, include_idle=idle)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return _profile_response(stacks, **{"X-Profile-Samples": str(samples)})
+
+
+@router.get("/allocations")
+async def allocation_profile(
+    seconds: float = Query(10.0, gt=0),
+    limit: int = Query(50, ge=1, le=1000),
+    output: str = Query("collapsed", alias="format", regex="^(collapsed|top)$"),
+):
+    """Trace allocations for a while; returns where memory grew, as collapsed stacks or top sites"""
+    try:
+        report = await profiler.allocations(seconds, limit=limit, collapsed=output == "collapsed")
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return _profile_response(report)
\ No newline at end of file
@@ -4,6 +4,7 @@ from application.dtos.auth import SocialLoginRequest, AuthResponse
 from application.services.oauth2_service import OAuth2Service
 from application.exceptions.auth_exceptions import AuthException
 from interfaces.api.dependencies import get_oauth2_service, require_authenticated
+from lms_shared.json_response import FastJSONResponse
 
 router = APIRouter(
     prefix="/oauth",
@@ -18,7 +19,7 @@ async def social_login(
 ):
     """Login with an OAuth2 provider"""
     try:
-        return await oauth2_service.social_login(social_login_request)
+        return FastJSONResponse(await oauth2_service.social_login(social_login_request))
     except AuthException as e:
         raise HTTPException(
             status_code=e.status_code,
@@ -1,15 +1,24 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
+import asyncio
 import logging
 
 from config.settings import Settings
+from lms_shared.json_response import FastJSONResponse
 from interfaces.api.routes import router as api_router
+from interfaces.api.routes.debug import router as debug_router
 from interfaces.api.middlewares.error_handler import error_handler_middleware
-from interfaces.api.middlewares.request_logger import request_logger_middleware
-from interfaces.api.dependencies import db
+from interfaces.api.middlewares.request_logger import create_request_logger_middleware
+from interfaces.api.middlewares.loop_lag_admission import create_loop_lag_admission_middleware
+from interfaces.api.middlewares.deadline import create_deadline_middleware
+from interfaces.api.dependencies import db, password_hasher, redis_client
 from infrastructure.startup import initialize_app
+from lms_shared.monitoring.access_log import AccessLog
+from lms_shared.monitoring.health import HealthMonitor
+from lms_shared.monitoring.loop_lag import LoopLagMonitor
+from lms_shared.monitoring.metrics import metrics
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +28,28 @@ logging.basicConfig(
 
 # Load settings
 settings = Settings()
+loop_lag_monitor = LoopLagMonitor(interval=settings.LOOP_LAG_INTERVAL)
+access_log = AccessLog(
+    sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    slow_threshold=settings.ACCESS_LOG_SLOW_THRESHOLD,
+    queue_size=settings.ACCESS_LOG_QUEUE_SIZE,
+    batch_size=settings.ACCESS_LOG_BATCH_SIZE,
+    flush_interval=settings.ACCESS_LOG_FLUSH_INTERVAL,
+)
+health_monitor = HealthMonitor(
+    "auth-service",
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+    loop_lag_monitor=loop_lag_monitor,
+    max_loop_lag=settings.HEALTH_MAX_LOOP_LAG,
+)
+health_monitor.add_check("database", db.check)
+if settings.TOKEN_CACHE_ENABLED:
+    async def check_redis():
+        await redis_client.ping()
+    
+    # Token lookups fall back to the database, so the service keeps working without it
+    health_monitor.add_check("redis", check_redis, critical=False)
 
 # Create FastAPI app
 app = FastAPI(
@@ -27,6 +58,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
+    default_response_class=FastJSONResponse,
 )
 
 # Add CORS middleware
@@ -40,10 +72,24 @@ app.add_middleware(
 
 # Add custom middlewares
 app.middleware("http")(error_handler_middleware)
-app.middleware("http")(request_logger_middleware)
+if settings.ACCESS_LOG_ENABLED:
+    app.middleware("http")(create_request_logger_middleware(access_log))
+if settings.LOOP_LAG_ADMISSION_ENABLED:
+    app.middleware("http")(create_loop_lag_admission_middleware(
+        loop_lag_monitor,
+        settings.LOOP_LAG_THRESHOLD,
+        settings.LOOP_LAG_EXEMPT_PATHS,
+    ))
+app.middleware("http")(create_deadline_middleware(
+    settings.REQUEST_TIMEOUT,
+    settings.REQUEST_TIMEOUT_MAX,
+    settings.DEADLINE_EXEMPT_PREFIXES,
+))
 
 # Include API routes
 app.include_router(api_router, prefix="/api")
+if settings.PROFILER_ENABLED:
+    app.include_router(debug_router, prefix="/api")
 
 # Health check endpoint
 @app.get("/health")
@@ -53,16 +99,48 @@ async def health_check():
         status_code=200,
     )
 
+# Liveness: the process serves requests; says nothing about dependencies
+@app.get("/health/live")
+async def liveness_check():
+    return JSONResponse(
+        content={"status": "alive", "service": "auth-service"},
+        status_code=200,
+    )
+
+# Readiness: cached results of the background dependency checks
+@app.get("/health/ready")
+async def readiness_check():
+    report = health_monitor.report()
+    return JSONResponse(
+        content=report,
+        status_code=503 if report["status"] == "not_ready" else 200,
+    )
+
+# Metrics endpoint (Prometheus text format)
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize app on startup"""
-    await initialize_app(settings, db)
+    await initialize_app(settings, db, redis_client if settings.TOKEN_CACHE_ENABLED else None)
+    password_hasher.start()
+    loop_lag_monitor.start()
+    health_monitor.start()
+    access_log.start()
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on shutdown"""
+    await health_monitor.stop()
+    await loop_lag_monitor.stop()
+    # Writes the last batch; runs in a thread so a blocked stdout cannot stall shutdown
+    await asyncio.get_running_loop().run_in_executor(None, access_log.stop)
+    password_hasher.close()
+    await redis_client.close()
     await db.close()
 
 # Run the application
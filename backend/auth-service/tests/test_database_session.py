@@ -0,0 +1,39 @@
+import pytest
+
+from config.settings import Settings
+from infrastructure.database.connection import Database
+
+
+@pytest.fixture
+async def db():
+    # Sessions that run no statements never connect
+    database = Database(Settings())
+    yield database
+    await database.close()
+
+
+async def test_after_commit_callbacks_run_after_commit(db):
+    calls = []
+    
+    async def callback():
+        calls.append("callback")
+    
+    async with db.session() as session:
+        db.after_commit(session, callback)
+        assert calls == []
+    
+    assert calls == ["callback"]
+
+
+async def test_after_commit_callbacks_are_dropped_on_rollback(db):
+    calls = []
+    
+    async def callback():
+        calls.append("callback")
+    
+    with pytest.raises(RuntimeError):
+        async with db.session() as session:
+            db.after_commit(session, callback)
+            raise RuntimeError("request failed")
+    
+    assert calls == []
@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from infrastructure.database.connection import apply_statement_timeout
+from interfaces.api.middlewares.deadline import create_deadline_middleware
+from lms_shared.deadline import HEADER_REQUEST_TIMEOUT, reset_deadline, set_deadline, time_remaining
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.middleware("http")(create_deadline_middleware(default_timeout=5.0, max_timeout=10.0, exempt_prefixes=("/health",)))
+    
+    @app.get("/remaining")
+    async def remaining():
+        return {"remaining": time_remaining()}
+    
+    @app.get("/health/remaining")
+    async def health_remaining():
+        return {"remaining": time_remaining()}
+    
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(1)
+        return {}
+    
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+async def test_requests_get_the_default_deadline(client):
+    remaining = (await client.get("/remaining")).json()["remaining"]
+    
+    assert 4.5 < remaining <= 5.0
+
+
+async def test_the_gateway_budget_is_used_up_to_the_maximum(client):
+    propagated = (await client.get("/remaining", headers={HEADER_REQUEST_TIMEOUT: "1500"})).json()["remaining"]
+    capped = (await client.get("/remaining", headers={HEADER_REQUEST_TIMEOUT: "60000"})).json()["remaining"]
+    invalid = (await client.get("/remaining", headers={HEADER_REQUEST_TIMEOUT: "soon"})).json()["remaining"]
+    
+    assert 1.0 < propagated <= 1.5
+    assert 9.5 < capped <= 10.0
+    assert 4.5 < invalid <= 5.0
+
+
+async def test_exempt_paths_have_no_deadline(client):
+    assert (await client.get("/health/remaining")).json()["remaining"] is None
+
+
+async def test_requests_past_their_deadline_get_504(client):
+    response = await client.get("/slow", headers={HEADER_REQUEST_TIMEOUT: "50"})
+    
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+
+
+def test_transactions_get_the_time_left_as_statement_timeout():
+    statements = []
+    connection = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"), exec_driver_sql=statements.append)
+    
+    apply_statement_timeout(None, None, connection)
+    token = set_deadline(2.0)
+    try:
+        apply_statement_timeout(None, None, connection)
+    finally:
+        reset_deadline(token)
+    
+    assert len(statements) == 1
+    milliseconds = int(statements[0].rsplit("=", 1)[1])
+    assert statements[0].startswith("SET LOCAL statement_timeout") and 1900 < milliseconds <= 2000
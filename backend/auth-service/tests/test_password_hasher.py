@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from passlib.context import CryptContext
+
+from infrastructure.password_hasher import PasswordHasher, PasswordHasherBusyError, hash_options
+from interfaces.api.middlewares.error_handler import error_handler_middleware
+from lms_shared.deadline import reset_deadline, set_deadline, time_remaining
+from lms_shared.monitoring.metrics import MetricsRegistry
+
+PASSWORD = "correct horse battery staple"
+
+
+@pytest.fixture(scope="module")
+def hasher():
+    # Cheap costs keep the tests fast; the pool is shared by the module
+    hasher = PasswordHasher(
+        schemes=("argon2", "bcrypt"),
+        options=hash_options(bcrypt_rounds=4, argon2_time_cost=1, argon2_memory_cost=1024),
+        workers=1,
+    )
+    hasher.start()
+    yield hasher
+    hasher.close()
+
+
+async def test_hash_and_verify(hasher):
+    hashed = await hasher.hash(PASSWORD)
+    
+    assert hashed.startswith("$argon2id$")
+    assert await hasher.verify(PASSWORD, hashed)
+    assert not await hasher.verify("wrong", hashed)
+
+
+async def test_older_scheme_verifies_but_needs_update(hasher):
+    bcrypt_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(PASSWORD)
+    
+    assert await hasher.verify(PASSWORD, bcrypt_hash)
+    assert hasher.needs_update(bcrypt_hash)
+    assert not hasher.needs_update(await hasher.hash(PASSWORD))
+
+
+async def test_rehash_runs_outside_the_request_deadline(hasher):
+    stored = asyncio.get_running_loop().create_future()
+    
+    async def store(new_hash):
+        stored.set_result((new_hash, time_remaining()))
+        return True
+    
+    token = set_deadline(0.001)
+    try:
+        hasher.rehash_in_background(PASSWORD, store)
+    finally:
+        reset_deadline(token)
+    
+    new_hash, deadline_left = await asyncio.wait_for(stored, 30)
+    assert deadline_left is None
+    assert await hasher.verify(PASSWORD, new_hash)
+
+
+async def test_rehash_that_lost_a_race_counts_as_a_conflict():
+    metrics = MetricsRegistry()
+    hasher = PasswordHasher(
+        options=hash_options(bcrypt_rounds=4, argon2_time_cost=1, argon2_memory_cost=1024),
+        workers=1,
+        metrics=metrics,
+    )
+    attempts = []
+    
+    async def store(new_hash):
+        attempts.append(new_hash)
+        # The first store finds the hash already replaced
+        return len(attempts) > 1
+    
+    try:
+        await hasher._rehash(PASSWORD, store)
+        await hasher._rehash(PASSWORD, store)
+    finally:
+        hasher.close()
+    
+    rehashed = metrics.counter("password_rehash_total", "", ("result",))
+    assert rehashed.get(result="conflict") == 1
+    assert rehashed.get(result="ok") == 1
+
+
+async def test_saturated_pool_rejects_right_away():
+    hasher = PasswordHasher(workers=1, max_pending=0)
+    
+    with pytest.raises(PasswordHasherBusyError):
+        await hasher.hash(PASSWORD)
+
+
+async def test_operation_expected_to_wait_too_long_is_rejected():
+    hasher = PasswordHasher(workers=2, max_pending=64, max_wait=0.5)
+    # Four operations ahead per worker, each taking about 250 ms
+    hasher._pending = 8
+    
+    with pytest.raises(PasswordHasherBusyError) as error:
+        await hasher.verify(PASSWORD, "hash")
+    
+    assert hasher.expected_wait() == 1.0
+    assert error.value.retry_after == 1.0
+
+
+async def test_busy_pool_answers_503_with_retry_after():
+    app = FastAPI()
+    app.middleware("http")(error_handler_middleware)
+    
+    @app.post("/login")
+    async def login():
+        raise PasswordHasherBusyError(retry_after=2.4)
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/login")
+    
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
@@ -0,0 +1,213 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import pytest
+from fakeredis import aioredis
+from jose import jwt
+
+from application.dtos.auth import LogoutRequest
+from application.services.auth_service import AuthService
+from config.settings import Settings
+from domain.entities.token import Token, TokenType, digest_token
+from domain.repositories.token_repository import TokenRepository
+from infrastructure.password_hasher import PasswordHasher
+from infrastructure.repositories.redis_token_repository import RedisCachedTokenRepository
+
+
+class InMemoryTokenRepository(TokenRepository):
+    """Stands in for the database repository"""
+    
+    def __init__(self):
+        self.tokens: Dict[uuid.UUID, Token] = {}
+    
+    async def create(self, token: Token) -> Token:
+        self.tokens[token.id] = token
+        return token
+    
+    async def create_if_absent(self, token: Token) -> bool:
+        if any(stored.token_digest == token.token_digest for stored in self.tokens.values()):
+            return False
+        await self.create(token)
+        return True
+    
+    async def get_by_id(self, token_id: uuid.UUID) -> Optional[Token]:
+        return self.tokens.get(token_id)
+    
+    async def get_by_value(self, token_value: str) -> Optional[Token]:
+        return next((token for token in self.tokens.values() if token.token_value == token_value), None)
+    
+    async def get_active_by_user_and_type(self, user_id: uuid.UUID, token_type: TokenType) -> List[Token]:
+        return [
+            token for token in self.tokens.values()
+            if token.user_id == user_id and token.token_type == token_type and not token.revoked
+        ]
+    
+    async def revoke(self, token_id: uuid.UUID) -> Token:
+        token = self.tokens.get(token_id)
+        if token is not None:
+            token = self.tokens[token_id] = token.model_copy(update={"revoked": True, "revoked_at": datetime.utcnow()})
+        return token
+    
+    async def revoke_by_value(self, token_value: str) -> Token:
+        token = await self.get_by_value(token_value)
+        return await self.revoke(token.id) if token else None
+    
+    async def revoke_all_for_user(self, user_id: uuid.UUID, token_type: Optional[TokenType] = None) -> int:
+        active = [token for token in self.tokens.values() if token.user_id == user_id and not token.revoked]
+        for token in active:
+            if token_type is None or token.token_type == token_type:
+                await self.revoke(token.id)
+        return len(active)
+    
+    async def is_token_valid(self, token_value: str) -> bool:
+        token = await self.get_by_value(token_value)
+        return token is not None and not token.revoked
+    
+    async def is_access_token_revoked(self, jti: str) -> bool:
+        return any(
+            token.token_type == TokenType.ACCESS and token.token_value == jti and token.revoked
+            for token in self.tokens.values()
+        )
+    
+    async def get_revoked_access_tokens(self) -> List[Token]:
+        return [token for token in self.tokens.values() if token.token_type == TokenType.ACCESS and token.revoked]
+    
+    async def clean_expired_tokens(self, before_date: datetime) -> int:
+        return 0
+
+
+class Transaction:
+    """Collects the after-commit callbacks of one request, like Database.session()"""
+    
+    def __init__(self):
+        self.callbacks = []
+    
+    def after_commit(self, callback) -> None:
+        self.callbacks.append(callback)
+    
+    async def commit(self) -> None:
+        for callback in self.callbacks:
+            await callback()
+        self.callbacks = []
+
+
+def make_token(token_type: TokenType = TokenType.REFRESH, value: Optional[str] = None, revoked: bool = False) -> Token:
+    now = datetime.utcnow()
+    return Token(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        token_type=token_type,
+        token_value=value or str(uuid.uuid4()),
+        expires_at=now + timedelta(hours=1),
+        created_at=now,
+        revoked=revoked,
+        revoked_at=now if revoked else None,
+    )
+
+
+@pytest.fixture
+def redis_client():
+    return aioredis.FakeRedis()
+
+
+@pytest.fixture
+def database():
+    return InMemoryTokenRepository()
+
+
+@pytest.fixture
+def transaction():
+    return Transaction()
+
+
+@pytest.fixture
+def repository(database, redis_client, transaction):
+    return RedisCachedTokenRepository(database, redis_client, transaction.after_commit)
+
+
+async def test_create_writes_redis_only_after_commit(repository, redis_client, transaction):
+    token = await repository.create(make_token())
+    key = repository._token_key(token.token_digest)
+    
+    assert not await redis_client.exists(key)
+    await transaction.commit()
+    assert await redis_client.exists(key)
+
+
+async def test_rolled_back_logout_leaves_no_denylist_entry(repository, redis_client, transaction):
+    await repository.create(make_token(TokenType.ACCESS, value="jti-1", revoked=True))
+    
+    # The transaction rolls back: its callbacks are dropped
+    transaction.callbacks = []
+    
+    assert not await redis_client.exists(repository._denylist_key("jti-1"))
+
+
+async def test_repeated_logout_stores_the_revoked_token_once(repository, database, redis_client, transaction):
+    assert await repository.create_if_absent(make_token(TokenType.ACCESS, value="jti-1", revoked=True))
+    assert not await repository.create_if_absent(make_token(TokenType.ACCESS, value="jti-1", revoked=True))
+    
+    assert len(database.tokens) == 1
+    assert len(transaction.callbacks) == 1
+    await transaction.commit()
+    assert await redis_client.exists(repository._denylist_key("jti-1"))
+
+
+async def test_logout_twice_with_the_same_token(database):
+    settings = Settings()
+    service = AuthService(None, database, settings, PasswordHasher())
+    access_token = jwt.encode(
+        {"sub": str(uuid.uuid4()), "type": "access", "jti": "jti-1", "exp": datetime.utcnow() + timedelta(minutes=5)},
+        settings.SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    
+    assert await service.logout(access_token, LogoutRequest())
+    assert await service.logout(access_token, LogoutRequest())
+    
+    assert await database.is_access_token_revoked("jti-1")
+    assert len(database.tokens) == 1
+
+
+async def test_revoke_drops_cached_state_before_commit(repository, database, redis_client, transaction):
+    token = await database.create(make_token())
+    key = repository._token_key(token.token_digest)
+    await repository.get_by_value(token.token_value)
+    assert await redis_client.exists(key)
+    
+    await repository.revoke(token.id)
+    
+    assert not await redis_client.exists(key)
+    await transaction.commit()
+    assert (await repository.get_by_value(token.token_value)).revoked
+
+
+async def test_denylist_is_trusted_once_restored(repository, database, redis_client):
+    await database.create(make_token(TokenType.ACCESS, value="jti-1", revoked=True))
+    assert await repository.restore_denylist() == 1
+    
+    assert await repository.is_access_token_revoked("jti-1")
+    assert not await repository.is_access_token_revoked("jti-2")
+
+
+async def test_lost_denylist_is_read_from_the_database_and_restored(repository, database, redis_client):
+    await database.create(make_token(TokenType.ACCESS, value="jti-1", revoked=True))
+    await repository.restore_denylist()
+    
+    await redis_client.flushall()
+    
+    assert await repository.is_access_token_revoked("jti-1")
+    assert await redis_client.exists(repository._restored_key)
+    assert await redis_client.exists(repository._denylist_key("jti-1"))
+
+
+async def test_cached_state_holds_the_digest_but_not_the_value(repository, redis_client, transaction):
+    token = await repository.create(make_token(value="secret"))
+    await transaction.commit()
+    
+    cached = await redis_client.get(repository._token_key(digest_token("secret")))
+    
+    assert b"secret" not in cached
+    found = await repository.get_by_value("secret")
+    assert found.id == token.id and found.token_value is None and found.token_digest == digest_token("secret")
@@ -0,0 +1,45 @@
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from domain.entities.token import Token, TokenType, digest_token
+
+
+def token_fields(**fields):
+    now = datetime.utcnow()
+    return {
+        "id": uuid.uuid4(),
+        "user_id": uuid.uuid4(),
+        "token_type": TokenType.REFRESH,
+        "expires_at": now + timedelta(hours=1),
+        "created_at": now,
+        **fields,
+    }
+
+
+def test_digest_is_the_hex_sha256_of_the_value():
+    assert digest_token("secret") == hashlib.sha256(b"secret").hexdigest()
+
+
+def test_digest_is_filled_from_the_value():
+    token = Token(**token_fields(token_value="secret"))
+    
+    assert token.token_digest == digest_token("secret")
+
+
+def test_token_stored_without_its_value_keeps_its_digest():
+    # Rows read from the database hold the raw 32-byte digest
+    row = SimpleNamespace(**token_fields(
+        token_value=None,
+        token_digest=hashlib.sha256(b"secret").digest(),
+        revoked=False,
+        revoked_at=None,
+        device_info={},
+        metadata={},
+    ))
+    
+    token = Token.model_validate(row)
+    
+    assert token.token_value is None
+    assert token.token_digest == digest_token("secret")
@@ -1,6 +1,9 @@
 import os
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from lms_shared.deadline import time_remaining
 
 DATABASE_URL = os.getenv(
     "DATABASE_URL", 
@@ -14,10 +17,27 @@ engine = create_async_engine(
     future=True,
 )
 
+
+class DeadlineSession(Session):
+    """
+    Session whose transactions may run no longer than the call's deadline.
+    """
+
+
+@event.listens_for(DeadlineSession, "after_begin")
+def apply_statement_timeout(session, transaction, connection):
+    """Give each transaction the time left of the call as statement_timeout"""
+    left = time_remaining()
+    if left is not None:
+        # SET LOCAL ends with the transaction; 0 would mean no timeout at all
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}")
+
+
 # Create an async session factory
 async_session_factory = sessionmaker(
     engine, 
     class_=AsyncSession, 
+    sync_session_class=DeadlineSession,
     expire_on_commit=False,
     autocommit=False, 
     autoflush=False
@@ -36,4 +56,10 @@ async def init_db():
     
     async with engine.begin() as conn:
         # Create all tables
-        await conn.run_sync(Base.metadata.create_all) 
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all) 
+
+
+async def check_db():
+    """Check the database over a pooled connection"""
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
\ No newline at end of file
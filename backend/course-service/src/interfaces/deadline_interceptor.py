@@ -0,0 +1,48 @@
+import asyncio
+import logging
+
+import grpc
+
+from lms_shared.deadline import reset_deadline, set_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Server interceptor that makes the caller's gRPC deadline the deadline
+    of the work done for the call.
+    
+    Unary calls with a deadline run with it set (so database transactions
+    get the time left as ``statement_timeout``) and are cancelled with
+    DEADLINE_EXCEEDED once it passes, instead of running on for a caller
+    that has stopped waiting. Streaming calls are passed through.
+    """
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        
+        behavior = handler.unary_unary
+        method = handler_call_details.method
+
+        async def with_deadline(request, context):
+            timeout = context.time_remaining()
+            if timeout is None:
+                return await behavior(request, context)
+            
+            token = set_deadline(timeout)
+            try:
+                return await asyncio.wait_for(behavior(request, context), timeout)
+            except asyncio.TimeoutError:
+                logger.info(f"Abandoned {method}: deadline exceeded")
+                await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline exceeded")
+            finally:
+                reset_deadline(token)
+
+        return grpc.unary_unary_rpc_method_handler(
+            with_deadline,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
\ No newline at end of file
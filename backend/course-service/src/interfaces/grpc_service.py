@@ -6,6 +6,7 @@ from uuid import UUID, uuid4
 
 import grpc
 from google.protobuf import timestamp_pb2
+from google.protobuf.field_mask_pb2 import FieldMask
 
 from ..application.use_cases import CourseUseCases, CourseContentUseCases
 from ..domain.models import CourseStatus, ContentType, CourseSettings, EnrollmentType, GradingSchema, GradeRange
@@ -178,21 +179,50 @@ class CourseGrpcService(CourseServiceServicer):
         return pb_settings
 
     @staticmethod
-    def _course_to_pb_response(course) -> CourseResponse:
-        """Convert domain Course to protobuf CourseResponse."""
+    def _read_mask(request) -> Optional[FieldMask]:
+        """Get a request's read mask, or None if all fields are wanted."""
+        if not request.HasField("read_mask") or not request.read_mask.paths:
+            return None
+        if not request.read_mask.IsValidForDescriptor(CourseResponse.DESCRIPTOR):
+            raise ValueError(f"Invalid read_mask: {', '.join(request.read_mask.paths)}")
+        return request.read_mask
+
+    @staticmethod
+    def _course_to_pb_response(course, read_mask: Optional[FieldMask] = None) -> CourseResponse:
+        """Convert domain Course to protobuf CourseResponse, filling only the fields in read_mask."""
+        fields = {path.split(".", 1)[0] for path in read_mask.paths} if read_mask is not None else None
         response = CourseResponse()
-        response.id = str(course.id)
-        response.organization_id = str(course.organization_id)
-        response.branch_id = str(course.branch_id)
-        response.title = course.title
-        response.description = course.description
-        response.code = course.code
-        response.instructor_id = str(course.instructor_id)
-        response.tags.extend(course.tags)
-        response.status = CourseGrpcService._course_status_to_pb(course.status)
-        response.settings.CopyFrom(CourseGrpcService._course_settings_to_pb(course.settings))
-        response.created_at = course.created_at.isoformat()
-        response.updated_at = course.updated_at.isoformat()
+        if fields is None or "id" in fields:
+            response.id = str(course.id)
+        if fields is None or "organization_id" in fields:
+            response.organization_id = str(course.organization_id)
+        if fields is None or "branch_id" in fields:
+            response.branch_id = str(course.branch_id)
+        if fields is None or "title" in fields:
+            response.title = course.title
+        if fields is None or "description" in fields:
+            response.description = course.description
+        if fields is None or "code" in fields:
+            response.code = course.code
+        if fields is None or "instructor_id" in fields:
+            response.instructor_id = str(course.instructor_id)
+        if fields is None or "tags" in fields:
+            response.tags.extend(course.tags)
+        if fields is None or "status" in fields:
+            response.status = CourseGrpcService._course_status_to_pb(course.status)
+        # Settings are the costliest part to convert; skipped unless asked for
+        if fields is None or "settings" in fields:
+            response.settings.CopyFrom(CourseGrpcService._course_settings_to_pb(course.settings))
+        if fields is None or "created_at" in fields:
+            response.created_at = course.created_at.isoformat()
+        if fields is None or "updated_at" in fields:
+            response.updated_at = course.updated_at.isoformat()
+        
+        if read_mask is not None and any("." in path for path in read_mask.paths):
+            # Drop the nested fields outside the mask, e.g. for "settings.hidden"
+            masked = CourseResponse()
+            read_mask.MergeMessage(response, masked)
+            return masked
         return response
 
     @staticmethod
@@ -238,6 +268,13 @@ class CourseGrpcService(CourseServiceServicer):
 
     async def GetCourse(self, request, context):
         """Implementation of GetCourse RPC method."""
+        try:
+            read_mask = self._read_mask(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return CourseResponse()
+        
         try:
             course = await self.course_use_cases.get_course(
                 course_id=self._str_to_uuid(request.course_id),
@@ -247,7 +284,7 @@ class CourseGrpcService(CourseServiceServicer):
                 context.set_details(f"Course with ID {request.course_id} not found")
                 return CourseResponse()
                 
-            return self._course_to_pb_response(course)
+            return self._course_to_pb_response(course, read_mask)
         except Exception as e:
             logger.error(f"Error getting course: {e}")
             context.set_code(grpc.StatusCode.INTERNAL)
@@ -306,6 +343,13 @@ class CourseGrpcService(CourseServiceServicer):
         """Implementation of ListCourses RPC method."""
         from ..infrastructure.proto.course_pb2 import ListCoursesResponse
         
+        try:
+            read_mask = self._read_mask(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return ListCoursesResponse()
+        
         try:
             organization_id = None
             if request.HasField("organization_id") and request.organization_id:
@@ -339,7 +383,7 @@ class CourseGrpcService(CourseServiceServicer):
             response = ListCoursesResponse()
             for course in courses:
                 course_response = response.courses.add()
-                course_response.CopyFrom(self._course_to_pb_response(course))
+                course_response.CopyFrom(self._course_to_pb_response(course, read_mask))
                 
             response.total_count = total_count
             response.page = request.page
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Iterable, Optional
+
+from grpc_health.v1 import health, health_pb2
+
+logger = logging.getLogger(__name__)
+
+
+class HealthReporter:
+    """
+    Keeps the standard gRPC health service (grpc.health.v1.Health) up to
+    date from a background check.
+    
+    The check runs every ``interval`` seconds; ``Check`` and ``Watch``
+    calls only read the last status, so probes never reach the database
+    themselves. Services are NOT_SERVING until the first check passes and
+    again once the server starts shutting down.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[None]],
+        services: Iterable[str],
+        interval: float = 5.0,
+        timeout: float = 2.0,
+    ):
+        self.check = check
+        # "" is the overall server status probes ask for by default
+        self.services = ["", *services]
+        self.interval = interval
+        self.timeout = timeout
+        self.servicer = health.aio.HealthServicer()
+        self._serving: Optional[bool] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Report NOT_SERVING and start checking on the running loop."""
+        await self._set(False)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop checking and report NOT_SERVING for good."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.servicer.enter_graceful_shutdown()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.check(), self.timeout)
+                serving = True
+            except Exception as e:
+                if self._serving is not False:
+                    logger.warning(f"Health check failed: {e!r}")
+                serving = False
+            await self._set(serving)
+            await asyncio.sleep(self.interval)
+
+    async def _set(self, serving: bool):
+        if serving == self._serving:
+            return
+        self._serving = serving
+        status = health_pb2.HealthCheckResponse.SERVING if serving else health_pb2.HealthCheckResponse.NOT_SERVING
+        for service in self.services:
+            await self.servicer.set(service, status)
\ No newline at end of file
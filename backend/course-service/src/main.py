@@ -10,8 +10,10 @@ import grpc
 
 from .application.use_cases import CourseUseCases, CourseContentUseCases
 from .infrastructure.repositories import SQLAlchemyCourseRepository, SQLAlchemyCourseContentRepository
+from .interfaces.deadline_interceptor import DeadlineInterceptor
 from .interfaces.grpc_service import CourseGrpcService
-from .config.database import async_session_factory, init_db
+from .interfaces.health import HealthReporter
+from .config.database import async_session_factory, check_db, init_db
 
 
 # Configure logging
@@ -48,7 +50,9 @@ async def generate_proto():
     """Generate Python code from .proto file."""
     try:
         import grpc_tools.protoc as protoc
+        from importlib.resources import files
         
+        well_known_dir = files("grpc_tools") / "_proto"
         proto_dir = Path(__file__).parent.parent / "proto"
         target_dir = Path(__file__).parent / "infrastructure" / "proto"
         
@@ -72,6 +76,8 @@ async def generate_proto():
             args = [
                 "grpc_tools.protoc",
                 f"--proto_path={proto_dir}",
+                # Well-known types such as google/protobuf/field_mask.proto
+                f"--proto_path={well_known_dir}",
                 f"--python_out={target_dir}",
                 f"--grpc_python_out={target_dir}",
                 str(proto_file),
@@ -107,6 +113,8 @@ def serve():
             ("grpc.max_send_message_length", 50 * 1024 * 1024),  # 50 MB
             ("grpc.max_receive_message_length", 50 * 1024 * 1024),  # 50 MB
         ],
+        # Stop work for callers whose deadline has passed
+        interceptors=[DeadlineInterceptor()],
     )
     
     # Initialize application and add service to server
@@ -114,6 +122,16 @@ def serve():
     from .infrastructure.proto.course_pb2_grpc import add_CourseServiceServicer_to_server
     add_CourseServiceServicer_to_server(service, server)
     
+    # Standard gRPC health service, fed by a background database check
+    from grpc_health.v1 import health_pb2_grpc
+    health_reporter = HealthReporter(
+        check_db,
+        services=["course.CourseService"],
+        interval=float(os.getenv("HEALTH_CHECK_INTERVAL", "5")),
+        timeout=float(os.getenv("HEALTH_CHECK_TIMEOUT", "2")),
+    )
+    health_pb2_grpc.add_HealthServicer_to_server(health_reporter.servicer, server)
+    
     # Add port
     server.add_insecure_port(server_address)
     
@@ -126,6 +144,8 @@ def serve():
     async def shutdown(signal_):
         logger.info(f"Received exit signal {signal_.name}...")
         logger.info("Shutting down gRPC server...")
+        # Probes see NOT_SERVING while calls in flight finish
+        await health_reporter.stop()
         await server.stop(5)  # 5 seconds grace period
         loop.stop()
         
@@ -135,6 +155,7 @@ def serve():
     # Start server and wait for termination
     async def start_server():
         await server.start()
+        await health_reporter.start()
         logger.info("Server started, waiting for termination...")
         await server.wait_for_termination()
         
@@ -0,0 +1,3 @@
+"""
+Code shared by the LMS services: deadlines, JSON responses and monitoring.
+"""
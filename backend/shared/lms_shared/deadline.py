@@ -0,0 +1,79 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+# Header carrying a request's remaining time budget in milliseconds. It is
+# relative rather than an absolute time, so hosts need not agree on the clock.
+HEADER_REQUEST_TIMEOUT = "X-Request-Timeout-Ms"
+
+# Monotonic time by which the request being handled must be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def set_deadline(timeout: float) -> Token:
+    """
+    Give the current request a deadline ``timeout`` seconds from now.
+    
+    The deadline applies to the current task and the tasks it starts.
+    
+    Returns:
+        A token for ``reset_deadline``
+    """
+    return _deadline.set(time.monotonic() + timeout)
+
+
+def reset_deadline(token: Token) -> None:
+    """
+    Restore the deadline in place before ``set_deadline``.
+    """
+    _deadline.reset(token)
+
+
+def time_remaining(timeout: Optional[float] = None) -> Optional[float]:
+    """
+    Get the seconds left until the current request's deadline.
+    
+    Args:
+        timeout: The caller's own timeout for the next step; the smaller
+            of the two is returned
+    
+    Returns:
+        The seconds left, negative once the deadline passed, or None if
+        there is neither a deadline nor a timeout
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return timeout
+    left = deadline - time.monotonic()
+    return left if timeout is None else min(left, timeout)
+
+
+def deadline_expired() -> bool:
+    """
+    Whether the current request's deadline has passed.
+    """
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def parse_timeout_header(value: Optional[str]) -> Optional[float]:
+    """
+    Read a remaining budget header.
+    
+    Returns:
+        The budget in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        milliseconds = int(value)
+    except ValueError:
+        return None
+    return milliseconds / 1000 if milliseconds >= 0 else None
+
+
+def timeout_header_value(seconds: float) -> str:
+    """
+    Format a remaining budget for the header.
+    """
+    return str(max(0, int(seconds * 1000)))
\ No newline at end of file
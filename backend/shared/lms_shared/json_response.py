@@ -0,0 +1,67 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode what the JSON encoders do not know, the way jsonable_encoder would."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True) if hasattr(value, "model_dump") else value.dict(by_alias=True)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact UTF-8 JSON.
+    
+    UUIDs, datetimes, enums and pydantic models are encoded directly,
+    without a jsonable_encoder pass first.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson when it is installed.
+    
+    It is the default response class, so the output of ``jsonable_encoder``
+    is rendered with it. Routes that return trusted data can return one
+    directly: FastAPI then neither validates the data against the
+    ``response_model`` (which still documents the route) nor runs
+    ``jsonable_encoder`` over it.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        if hasattr(content, "model_dump_json"):
+            # pydantic v2 models serialize themselves faster than any dict encoder
+            return content.model_dump_json(by_alias=True).encode("utf-8")
+        return dumps(content)
\ No newline at end of file
@@ -0,0 +1,151 @@
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, TextIO, Tuple
+
+from lms_shared.monitoring.metrics import metrics as default_metrics
+
+# Timestamp, method, path, query, status, duration, client address, request ID
+AccessRecord = Tuple[float, str, str, str, int, float, str, Optional[str]]
+
+_STOP = object()
+
+
+class AccessLog:
+    """
+    Structured access log written off the event loop.
+    
+    ``record`` only decides whether to keep the request and puts a tuple
+    on a bounded queue; it never blocks. A background thread turns queued
+    records into JSON lines and writes them in batches, so a slow stdout
+    holds up that thread, not request handling. When the queue is full,
+    records are dropped and counted in ``access_log_dropped_total``.
+    
+    Successful requests are sampled at ``sample_rate``; errors (status
+    400 and above) and requests slower than ``slow_threshold`` are always
+    logged.
+    """
+    
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        sample_rate: float = 1.0,
+        slow_threshold: float = 1.0,
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        metrics=None,
+    ):
+        """
+        Initialize the access log.
+        
+        Args:
+            stream: Where to write; stdout by default
+            sample_rate: Share of successful, fast requests to log
+            slow_threshold: Seconds after which a request is always logged
+            queue_size: Records buffered before new ones are dropped
+            batch_size: Records written per write call at most
+            flush_interval: Seconds a record may wait for its batch to fill
+            metrics: Metrics registry to count dropped records in
+        """
+        self.stream = stream
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        
+        metrics = metrics or default_metrics
+        self._dropped = metrics.counter("access_log_dropped_total", "Access log records dropped because the queue was full")
+    
+    def start(self) -> None:
+        """
+        Start the writer thread.
+        
+        Called from the application's startup, so each forked worker
+        process runs its own thread.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="access-log", daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Write the remaining records and stop the writer thread.
+        """
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def record(
+        self,
+        method: str,
+        path: str,
+        query: str,
+        status_code: int,
+        duration: float,
+        client: str,
+        request_id: Optional[str] = None,
+    ) -> None:
+        """
+        Queue a finished request for logging, unless it is sampled out.
+        """
+        if status_code < 400 and duration < self.slow_threshold and random.random() >= self.sample_rate:
+            return
+        try:
+            self._queue.put_nowait((time.time(), method, path, query, status_code, duration, client, request_id))
+        except queue.Full:
+            self._dropped.inc()
+    
+    def _run(self) -> None:
+        stream = self.stream or sys.stdout
+        while True:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stopping = any(record is _STOP for record in batch)
+            lines = [self._format(record) for record in batch if record is not _STOP]
+            if lines:
+                try:
+                    stream.write("\n".join(lines) + "\n")
+                    stream.flush()
+                except (OSError, ValueError):
+                    self._dropped.inc(len(lines))
+            if stopping:
+                return
+    
+    @staticmethod
+    def _format(record: AccessRecord) -> str:
+        timestamp, method, path, query, status_code, duration, client, request_id = record
+        entry = {
+            "time": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="milliseconds"),
+            "type": "access",
+            "method": method,
+            "path": path,
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "client": client,
+        }
+        if query:
+            entry["query"] = query
+        if request_id:
+            entry["request_id"] = request_id
+        return json.dumps(entry, separators=(",", ":"))
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from lms_shared.monitoring.metrics import metrics as default_metrics
+
+logger = logging.getLogger(__name__)
+
+# A check returns details worth reporting, or raises if its dependency is unavailable
+Check = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class HealthMonitor:
+    """
+    Checks dependencies in the background and caches the results.
+    
+    Every ``interval`` seconds each registered check runs with a
+    ``timeout``; one that raises or times out marks its dependency as
+    down. Readiness probes only read the cached report, so they cost
+    nothing and never touch a dependency however often they come.
+    
+    Critical checks decide readiness; the others are reported and turn the
+    status to ``degraded``. The service is also not ready before the first
+    round of checks, when the report is older than three intervals (the
+    checks themselves are stuck) or when the event loop lags more than
+    ``max_loop_lag`` seconds.
+    """
+    
+    def __init__(
+        self,
+        service: str,
+        interval: float = 5.0,
+        timeout: float = 2.0,
+        loop_lag_monitor=None,
+        max_loop_lag: float = 1.0,
+        metrics=None,
+    ):
+        """
+        Initialize the monitor.
+        
+        Args:
+            service: The service name to report
+            interval: Seconds between rounds of checks
+            timeout: Seconds a check may take
+            loop_lag_monitor: Monitor whose lag reading is reported
+            max_loop_lag: Lag in seconds above which the service is not ready
+            metrics: Metrics registry to export check results to
+        """
+        self.service = service
+        self.interval = interval
+        self.timeout = timeout
+        self.loop_lag_monitor = loop_lag_monitor
+        self.max_loop_lag = max_loop_lag
+        self._checks: List[Tuple[str, Check, bool]] = []
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        
+        metrics = metrics or default_metrics
+        self._up = metrics.gauge("health_check_up", "Whether a dependency passed its last health check", ("check",))
+    
+    def add_check(self, name: str, check: Check, critical: bool = True) -> None:
+        """
+        Register a dependency check.
+        
+        Args:
+            name: The name to report the check under
+            check: Coroutine function that returns details or raises
+            critical: Whether the service is not ready while the check fails
+        """
+        self._checks.append((name, check, critical))
+    
+    def start(self) -> None:
+        """
+        Start checking on the running loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self) -> None:
+        """
+        Stop checking.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def check_all(self) -> None:
+        """
+        Run every check once and cache the results.
+        """
+        results = await asyncio.gather(*(self._check(name, check, critical) for name, check, critical in self._checks))
+        self._results = dict(zip((name for name, _, _ in self._checks), results))
+        self._checked_at = time.monotonic()
+    
+    async def _check(self, name: str, check: Check, critical: bool) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), self.timeout)
+            result = {"status": "up", **(details or {})}
+        except asyncio.TimeoutError:
+            result = {"status": "down", "error": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            result = {"status": "down", "error": str(e) or type(e).__name__}
+        if result["status"] == "down" and self._results.get(name, {}).get("status") != "down":
+            logger.warning(f"Health check {name} failed: {result['error']}")
+        result["critical"] = critical
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self._up.set(1 if result["status"] == "up" else 0, check=name)
+        return result
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check_all()
+            except Exception as e:
+                logger.error(f"Error running health checks: {e}")
+            await asyncio.sleep(self.interval)
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Get the cached readiness report.
+        
+        Returns:
+            ``status`` is ``ready``, ``degraded`` (ready, but a non-critical
+            check fails) or ``not_ready``, with the result of each check
+        """
+        checks = dict(self._results)
+        reasons = []
+        if self._checked_at is None:
+            reasons.append("starting")
+        elif time.monotonic() - self._checked_at > 3 * self.interval:
+            reasons.append("stale")
+        
+        if self.loop_lag_monitor is not None:
+            lag = self.loop_lag_monitor.current_lag()
+            checks["event_loop"] = {
+                "status": "up" if lag <= self.max_loop_lag else "down",
+                "critical": True,
+                "lag_seconds": round(lag, 4),
+            }
+        
+        down = [name for name, result in checks.items() if result["status"] == "down"]
+        if reasons or any(checks[name]["critical"] for name in down):
+            status = "not_ready"
+        else:
+            status = "degraded" if down else "ready"
+        
+        report = {"status": status, "service": self.service, "checks": checks}
+        if reasons:
+            report["reason"] = reasons[0]
+        if self._checked_at is not None:
+            report["checked_seconds_ago"] = round(time.monotonic() - self._checked_at, 1)
+        return report
\ No newline at end of file
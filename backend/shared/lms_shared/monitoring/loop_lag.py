@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from typing import Optional
+
+from lms_shared.monitoring.metrics import metrics as default_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop scheduling delay.
+    
+    A background task sleeps for ``interval`` and records how much later
+    than requested it woke up. The lag is smoothed with an exponentially
+    weighted moving average and exported as the ``event_loop_lag_seconds``
+    gauge.
+    """
+    
+    def __init__(self, interval: float = 0.05, smoothing: float = 0.3, metrics=None):
+        """
+        Initialize the monitor.
+        
+        Args:
+            interval: Seconds between measurements
+            smoothing: Weight of the newest sample in the moving average
+            metrics: Metrics registry to export the lag to
+        """
+        self.interval = interval
+        self.smoothing = smoothing
+        self.lag = 0.0
+        self._expected_wakeup: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        
+        metrics = metrics or default_metrics
+        self._lag_gauge = metrics.gauge("event_loop_lag_seconds", "Smoothed event loop scheduling delay")
+        self._lag_histogram = metrics.histogram("event_loop_lag_sample_seconds", "Event loop scheduling delay samples")
+    
+    def start(self) -> None:
+        """
+        Start measuring on the running loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self) -> None:
+        """
+        Stop measuring.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def current_lag(self) -> float:
+        """
+        Get the current lag estimate.
+        
+        If the monitor's own wake-up is already overdue, that delay is
+        counted too, so a stall is visible before the next sample lands.
+        """
+        if self._expected_wakeup is None:
+            return self.lag
+        overdue = asyncio.get_running_loop().time() - self._expected_wakeup
+        return max(self.lag, overdue)
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._expected_wakeup = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            sample = max(0.0, loop.time() - self._expected_wakeup)
+            self.lag = self.smoothing * sample + (1 - self.smoothing) * self.lag
+            self._lag_gauge.set(self.lag)
+            self._lag_histogram.observe(sample)
+            if sample > 1.0:
+                logger.warning(f"Event loop was blocked for {sample:.3f}s")
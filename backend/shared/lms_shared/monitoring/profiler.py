@@ -0,0 +1,193 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import CodeType
+from typing import Dict, Tuple
+
+# Leaf frames of threads that are waiting rather than running
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("thread.py", "_worker"),
+    ("queue.py", "get"),
+}
+
+# GIL switch interval while sampling; see SamplingProfiler
+SAMPLING_SWITCH_INTERVAL = 0.0002
+
+
+class ProfilerBusyError(Exception):
+    """
+    Raised when a profile is requested while another one is running.
+    """
+
+
+class SamplingProfiler:
+    """
+    On-demand statistical profiler for a running process.
+    
+    ``sample`` records the Python stack of every thread at a fixed
+    interval from a separate thread. Coroutines show up in the stack of
+    the event loop thread while they run, below ``Task.__step``. Nothing
+    is hooked into the interpreter, so the cost is one stack walk per
+    thread per interval and nothing at all between profiles.
+    
+    The sampler can only look while it holds the GIL, which it would
+    mostly get when the event loop releases it to wait for I/O, so busy
+    coroutines would hardly show. While sampling, the GIL switch interval
+    is therefore lowered so other threads give up the GIL at arbitrary
+    points; it is restored afterwards. Stacks are
+    returned in collapsed format (``thread;outer;inner count``), which
+    flamegraph.pl, speedscope and similar tools read directly.
+    
+    ``allocations`` traces memory allocations with tracemalloc for a
+    while and reports where memory grew. Tracing slows allocation down
+    noticeably, so it only runs for the requested time.
+    
+    Only one profile runs at a time and durations are capped.
+    """
+    
+    def __init__(self, max_duration: float = 60.0, min_interval: float = 0.001):
+        """
+        Initialize the profiler.
+        
+        Args:
+            max_duration: Seconds a profile may run at most
+            min_interval: Shortest allowed sampling interval in seconds
+        """
+        self.max_duration = max_duration
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._labels: Dict[CodeType, str] = {}
+    
+    async def sample(self, duration: float, interval: float = 0.01, include_idle: bool = False) -> Tuple[str, int]:
+        """
+        Sample the stacks of all threads.
+        
+        Args:
+            duration: Seconds to sample for (capped at ``max_duration``)
+            interval: Seconds between samples
+            include_idle: Whether to keep samples of threads that are waiting
+        
+        Returns:
+            The collapsed stacks and the number of samples taken
+        
+        Raises:
+            ProfilerBusyError: If another profile is running
+        """
+        duration = min(duration, self.max_duration)
+        interval = max(interval, self.min_interval)
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._sample, duration, interval, include_idle,
+            )
+        finally:
+            self._lock.release()
+    
+    def _sample(self, duration: float, interval: float, include_idle: bool) -> Tuple[str, int]:
+        own_thread = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, SAMPLING_SWITCH_INTERVAL))
+        try:
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    code = frame.f_code
+                    if not include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(frame.f_code)
+                        frame = frame.f_back
+                    stacks[(thread_id, tuple(stack))] += 1
+                samples += 1
+                time.sleep(interval)
+        finally:
+            sys.setswitchinterval(switch_interval)
+        
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        lines = []
+        for (thread_id, stack), count in stacks.most_common():
+            frames = ";".join(self._label(code) for code in reversed(stack))
+            thread_name = thread_names.get(thread_id, f"thread-{thread_id}").replace(";", ":")
+            lines.append(f"{thread_name};{frames} {count}")
+        return "\n".join(lines) + "\n" if lines else "", samples
+    
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            label = self._labels[code] = label.replace(";", ":")
+        return label
+    
+    async def allocations(
+        self,
+        duration: float,
+        limit: int = 50,
+        frames: int = 16,
+        collapsed: bool = True,
+    ) -> str:
+        """
+        Trace allocations and report where memory grew.
+        
+        Args:
+            duration: Seconds to trace for (capped at ``max_duration``)
+            limit: Number of allocation sites in the ``collapsed=False`` report
+            frames: Frames kept per allocation traceback
+            collapsed: Whether to return collapsed stacks weighted by bytes
+                allocated and not yet freed; otherwise a text report of
+                the top allocation sites
+        
+        Raises:
+            ProfilerBusyError: If another profile is running
+        """
+        duration = min(duration, self.max_duration)
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        loop = asyncio.get_running_loop()
+        # Leave tracing alone if it was started by someone else (PYTHONTRACEMALLOC)
+        started = not tracemalloc.is_tracing()
+        try:
+            if started:
+                tracemalloc.start(frames)
+            baseline = await loop.run_in_executor(None, tracemalloc.take_snapshot)
+            await asyncio.sleep(duration)
+            snapshot = await loop.run_in_executor(None, tracemalloc.take_snapshot)
+        finally:
+            if started:
+                tracemalloc.stop()
+            self._lock.release()
+        
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ]
+        snapshot = snapshot.filter_traces(filters)
+        baseline = baseline.filter_traces(filters)
+        
+        if not collapsed:
+            stats = snapshot.compare_to(baseline, "lineno")[:limit]
+            return "\n".join(str(stat) for stat in stats) + "\n"
+        
+        lines = []
+        for stat in snapshot.compare_to(baseline, "traceback"):
+            if stat.size_diff <= 0:
+                continue
+            # Tracebacks run from the outermost frame, as collapsed stacks do
+            stack = ";".join(f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in stat.traceback)
+            lines.append(f"{stack} {stat.size_diff}")
+        return "\n".join(lines) + "\n" if lines else ""
+
@@ -0,0 +1,92 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+
+# Uses the FastAPI and pydantic of the service that imports it
+pytest.importorskip("fastapi")
+
+from pydantic import BaseModel, Field  # noqa: E402
+
+from lms_shared import json_response  # noqa: E402
+from lms_shared.json_response import FastJSONResponse, dumps  # noqa: E402
+
+COURSE_ID = uuid.UUID("6f1c2a3e-0b5d-4c1a-9e7f-2d3b4c5d6e7f")
+
+
+class Status(Enum):
+    PUBLISHED = "published"
+
+
+class Course(BaseModel):
+    id: uuid.UUID
+    title: str
+    max_students: int = Field(alias="maxStudents")
+
+
+@pytest.fixture(params=["orjson", "json"], autouse=True)
+def encoder(request, monkeypatch):
+    """Run each test with orjson, when installed, and with the standard library"""
+    if request.param == "orjson" and json_response.orjson is None:
+        pytest.skip("orjson is not installed")
+    if request.param == "json":
+        monkeypatch.setattr(json_response, "orjson", None)
+    return request.param
+
+
+def test_encodes_compact_utf8_json():
+    assert dumps({"title": "Álgebra", "tags": ["a", "b"]}) == '{"title":"Álgebra","tags":["a","b"]}'.encode("utf-8")
+
+
+def test_encodes_uuids_datetimes_and_enums():
+    content = {
+        "id": COURSE_ID,
+        "created_at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+        "starts_on": date(2024, 6, 1),
+        "status": Status.PUBLISHED,
+    }
+    
+    assert json.loads(dumps(content)) == {
+        "id": str(COURSE_ID),
+        "created_at": "2024-05-01T12:30:00+00:00",
+        "starts_on": "2024-06-01",
+        "status": "published",
+    }
+
+
+def test_encodes_decimals_and_sets_as_numbers_and_lists():
+    decoded = json.loads(dumps({"price": Decimal("19.90"), "tags": {"math"}}))
+    
+    assert decoded == {"price": 19.9, "tags": ["math"]}
+
+
+def test_encodes_pydantic_models_by_alias():
+    course = Course(id=COURSE_ID, title="Algebra", maxStudents=30)
+    
+    assert json.loads(dumps({"course": course})) == {
+        "course": {"id": str(COURSE_ID), "title": "Algebra", "maxStudents": 30},
+    }
+
+
+def test_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+def test_response_renders_content_as_json():
+    response = FastJSONResponse({"id": COURSE_ID}, status_code=201)
+    
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == {"id": str(COURSE_ID)}
+
+
+def test_response_renders_a_model_directly():
+    course = Course(id=COURSE_ID, title="Algebra", maxStudents=30)
+    
+    response = FastJSONResponse(course)
+    
+    assert json.loads(response.body) == {"id": str(COURSE_ID), "title": "Algebra", "maxStudents": 30}
@@ -0,0 +1,126 @@
+import asyncio
+import io
+import json
+import time
+
+from lms_shared.monitoring.access_log import AccessLog
+from lms_shared.monitoring.health import HealthMonitor
+from lms_shared.monitoring.loop_lag import LoopLagMonitor
+from lms_shared.monitoring.metrics import MetricsRegistry
+
+
+def test_metrics_render_in_the_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests", ("status",)).inc(status="200")
+    registry.gauge("in_flight", "In flight").set(3)
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    
+    rendered = registry.render()
+    
+    assert 'requests_total{status="200"} 1' in rendered
+    assert "in_flight 3" in rendered
+    assert 'latency_seconds_bucket{le="1.0"} 2' in rendered
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in rendered
+    assert latency.count() == 3 and latency.quantile(0.5) == 1.0
+    assert registry.counter("requests_total", "Requests", ("status",)).get(status="200") == 1
+
+
+async def test_loop_lag_shows_a_blocked_loop():
+    registry = MetricsRegistry()
+    monitor = LoopLagMonitor(interval=0.01, smoothing=1.0, metrics=registry)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    assert monitor.current_lag() < 0.05
+    
+    time.sleep(0.2)
+    # Overdue before the monitor's next sample lands
+    assert monitor.current_lag() > 0.15
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    
+    samples = registry.histogram("event_loop_lag_sample_seconds", "")
+    assert samples.sum() > 0.15
+    assert monitor.lag < 0.05
+
+
+def make_health_monitor(**kwargs) -> HealthMonitor:
+    return HealthMonitor("test", interval=60.0, timeout=0.05, metrics=MetricsRegistry(), **kwargs)
+
+
+async def up():
+    return {"version": "1"}
+
+
+async def down():
+    raise ConnectionError("refused")
+
+
+async def stuck():
+    await asyncio.sleep(1)
+
+
+async def test_not_ready_until_the_first_round_of_checks():
+    monitor = make_health_monitor()
+    monitor.add_check("database", up)
+    
+    assert monitor.report()["status"] == "not_ready"
+    await monitor.check_all()
+    report = monitor.report()
+    
+    assert report["status"] == "ready"
+    assert report["checks"]["database"]["version"] == "1"
+
+
+async def test_failing_checks_decide_readiness_by_criticality():
+    monitor = make_health_monitor()
+    monitor.add_check("database", up)
+    monitor.add_check("cache", down, critical=False)
+    await monitor.check_all()
+    
+    assert monitor.report()["status"] == "degraded"
+    assert monitor.report()["checks"]["cache"]["error"] == "refused"
+    
+    monitor.add_check("queue", stuck)
+    await monitor.check_all()
+    
+    assert monitor.report()["status"] == "not_ready"
+    assert "timed out" in monitor.report()["checks"]["queue"]["error"]
+
+
+async def test_a_lagging_loop_is_not_ready():
+    lag = LoopLagMonitor(metrics=MetricsRegistry())
+    monitor = make_health_monitor(loop_lag_monitor=lag, max_loop_lag=0.5)
+    await monitor.check_all()
+    
+    lag.lag = 2.0
+    
+    assert monitor.report()["status"] == "not_ready"
+    assert monitor.report()["checks"]["event_loop"]["lag_seconds"] == 2.0
+
+
+def test_access_log_writes_errors_and_slow_requests_when_sampling_out_the_rest():
+    stream = io.StringIO()
+    log = AccessLog(stream, sample_rate=0.0, slow_threshold=1.0, flush_interval=0.01, metrics=MetricsRegistry())
+    log.start()
+    
+    log.record("GET", "/fast", "", 200, 0.01, "10.0.0.1")
+    log.record("GET", "/missing", "a=1", 404, 0.01, "10.0.0.1", request_id="abc")
+    log.record("GET", "/slow", "", 200, 2.0, "10.0.0.1")
+    log.stop()
+    
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    
+    assert [entry["path"] for entry in entries] == ["/missing", "/slow"]
+    assert entries[0]["query"] == "a=1" and entries[0]["request_id"] == "abc"
+
+
+def test_access_log_drops_records_when_the_queue_is_full():
+    registry = MetricsRegistry()
+    log = AccessLog(io.StringIO(), queue_size=1, metrics=registry)
+    
+    for _ in range(3):
+        log.record("GET", "/", "", 200, 0.01, "10.0.0.1")
+    
+    assert registry.counter("access_log_dropped_total", "").get() == 2